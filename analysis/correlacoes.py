@@ -23,7 +23,7 @@ import pandas as pd
 from scipy import stats
 from statsmodels.tsa.stattools import grangercausalitytests
 
-from geoespacial.centroides import CENTROIDES_RA
+from util.dimensao_ra import COLUNA_RA_ID, codificar_ra
 from util.log import logs
 
 logger = logs()
@@ -193,12 +193,6 @@ def causalidade_granger(
 # =========================================================
 # CORRELAÇÃO ESPACIAL ENTRE TABELAS GOLD (cross-section por RA)
 # =========================================================
-def _chave_ra(nome: str) -> str:
-    from util.padronizacao import remover_acentos
-
-    return remover_acentos(str(nome).strip()).upper()
-
-
 def correlacao_idosos_patrimoniais(
     idosos: pd.DataFrame, patrimonial: pd.DataFrame, ano_patrimonial: int = 2016
 ) -> dict:
@@ -217,24 +211,26 @@ def correlacao_idosos_patrimoniais(
     if coluna_idosos not in idosos.columns:
         raise ValueError(f"Coluna '{coluna_idosos}' ausente na tabela de idosos")
 
+    # join pela chave inteira da dimensão de RA; totalizadores e nomes fora
+    # da dimensão ficam com ra_id nulo e saem do cruzamento
     base_idosos = (
-        idosos.assign(regiao=lambda d: d["regiao_administrativa"].map(_chave_ra))
-        .loc[lambda d: d["regiao"].isin(set(CENTROIDES_RA))]
-        [["regiao", coluna_idosos]]
+        idosos.assign(**{COLUNA_RA_ID: lambda d: codificar_ra(d["regiao_administrativa"])})
+        .dropna(subset=[COLUNA_RA_ID])
+        [[COLUNA_RA_ID, coluna_idosos]]
         .rename(columns={coluna_idosos: "violencia_idosos"})
     )
 
     tipos = [c for c in patrimonial.columns if c.startswith("ocorrencia_")]
     base_patrimonial = (
         patrimonial.query("ano == @ano_patrimonial")
-        .assign(regiao=lambda d: d["regiao_administrativa"].map(_chave_ra))
-        .groupby("regiao", as_index=False)[tipos]
+        .assign(**{COLUNA_RA_ID: lambda d: codificar_ra(d["regiao_administrativa"])})
+        .groupby(COLUNA_RA_ID, as_index=False)[tipos]
         .sum()
         .assign(patrimonial_total=lambda d: d[tipos].sum(axis=1))
-        [["regiao", "patrimonial_total"]]
+        [[COLUNA_RA_ID, "patrimonial_total"]]
     )
 
-    cruzamento = base_idosos.merge(base_patrimonial, on="regiao", how="inner")
+    cruzamento = base_idosos.merge(base_patrimonial, on=COLUNA_RA_ID, how="inner")
     n = len(cruzamento)
 
     if n < 3:
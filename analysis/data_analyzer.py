@@ -3,7 +3,10 @@
 # =========================================================
 import glob
 import json
+import multiprocessing
 import os
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 import joblib
 import numpy as np
@@ -28,6 +31,11 @@ TABELA_MODELO = _config_modelagem.get("tabela_gold", "violencia_contra_mulher_go
 COLUNA_ALVO = _config_modelagem.get("coluna_alvo", "crimes_contra_mulher")
 HORIZONTE_ANOS_PADRAO = int(_config_modelagem.get("horizonte_anos", 5))
 
+# Folds do backtesting avaliados em paralelo (processos "spawn"; 1 = serial)
+WORKERS_BACKTESTING = int(
+    _config_modelagem.get("workers_backtesting", min(3, os.cpu_count() or 1))
+)
+
 FEATURES = [
     "lag_1",
     "lag_2",
@@ -312,44 +320,122 @@ def _numero_folds(n_amostras):
     return 0
 
 
-def avaliar_generalizacao(df, valor_col):
+def _avaliar_fold_cronometrado(df_treino, df_teste, valor_col):
+    inicio = time.perf_counter()
+    m_res, m_orig = _avaliar_fold(df_treino, df_teste, valor_col)
+    return m_res, m_orig, time.perf_counter() - inicio
+
+
+def _executar_folds(valor_col, janelas, workers):
+    """
+    Avalia as janelas (treino, teste), em série ou em um pool de processos.
+
+    :return: lista de (metricas_residuo, metricas_original, segundos), na
+        ordem das janelas.
+    """
+    if workers <= 1 or len(janelas) <= 1:
+        return [
+            _avaliar_fold_cronometrado(df_treino, df_teste, valor_col)
+            for df_treino, df_teste in janelas
+        ]
+
+    contexto = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(janelas)), mp_context=contexto
+    ) as pool:
+        futuros = [
+            pool.submit(_avaliar_fold_cronometrado, df_treino, df_teste, valor_col)
+            for df_treino, df_teste in janelas
+        ]
+        return [f.result() for f in futuros]
+
+
+def backtesting(df, valor_col, workers=None):
     """
     Backtesting rolling-origin via TimeSeriesSplit: em cada fold o Prophet é
     ajustado apenas com o passado daquele fold, eliminando o vazamento de
     avaliar com informação do período de teste. Com série escassa demais para
     múltiplos folds, cai para um único holdout 80/20 (também sem vazamento).
 
-    :return: tupla `(metricas_residuo_log, metricas_escala_original)`, cada
-        uma com mae/rmse/r2 agregados pela média dos folds.
+    Os folds são independentes e rodam em paralelo com `workers` > 1
+    (padrão: `modelagem.workers_backtesting`).
+
+    :return: tupla `(metricas_residuo_log, metricas_escala_original,
+        detalhes)`, com as métricas agregadas pela média dos folds e, em
+        `detalhes`, o tempo de cada fold.
     """
+    workers = WORKERS_BACKTESTING if workers is None else workers
     n_folds = _numero_folds(len(df))
 
     if n_folds == 0:
         logger.warning("⚠️ Série curta demais para backtesting; usando holdout único (80/20)")
         split = int(len(df) * 0.8)
-        return _avaliar_fold(df.iloc[:split], df.iloc[split:], valor_col)
+        janelas = [(df.iloc[:split], df.iloc[split:])]
+    else:
+        janelas = [
+            (df.iloc[idx_treino], df.iloc[idx_teste])
+            for idx_treino, idx_teste in TimeSeriesSplit(n_splits=n_folds).split(df)
+        ]
+
+    inicio = time.perf_counter()
+    resultados = _executar_folds(valor_col, janelas, workers)
+    total = time.perf_counter() - inicio
+
+    folds = []
+    for (df_treino, df_teste), (m_res, m_orig, segundos) in zip(janelas, resultados):
+        logger.info(
+            f"📊 Fold ({len(df_treino)} treino / {len(df_teste)} teste, {segundos:.2f}s): {m_orig}"
+        )
+        folds.append(
+            {
+                "treino": len(df_treino),
+                "teste": len(df_teste),
+                "segundos": round(segundos, 3),
+            }
+        )
+
+    detalhes = {
+        "workers": workers,
+        "segundos_total": round(total, 3),
+        "folds": folds,
+    }
+
+    return (
+        _media_metricas([r[0] for r in resultados]),
+        _media_metricas([r[1] for r in resultados]),
+        detalhes,
+    )
 
-    metricas_residuo_folds = []
-    metricas_original_folds = []
 
-    for idx_treino, idx_teste in TimeSeriesSplit(n_splits=n_folds).split(df):
-        m_res, m_orig = _avaliar_fold(df.iloc[idx_treino], df.iloc[idx_teste], valor_col)
-        metricas_residuo_folds.append(m_res)
-        metricas_original_folds.append(m_orig)
-        logger.info(f"📊 Fold ({len(idx_treino)} treino / {len(idx_teste)} teste): {m_orig}")
+def avaliar_generalizacao(df, valor_col, workers=None):
+    """
+    Métricas do backtesting (ver `backtesting`).
 
-    return _media_metricas(metricas_residuo_folds), _media_metricas(metricas_original_folds)
+    :return: tupla `(metricas_residuo_log, metricas_escala_original)`, cada
+        uma com mae/rmse/r2 agregados pela média dos folds.
+    """
+    metricas_residuo, metricas_original, _ = backtesting(df, valor_col, workers)
+    return metricas_residuo, metricas_original
 
 
 # =========================================================
 # TREINAMENTO RESIDUAL (ROBUSTO)
 # =========================================================
-def treinar_residual(df, valor_col):
+def treinar_residual(df, valor_col, workers=None):
+    """
+    Backtesting + ajuste final do par Prophet/XGBoost na série completa.
+
+    :param workers: processos para os folds (padrão `WORKERS_BACKTESTING`).
+    """
     logger.info("🤖 Treinando modelo residual LOG (validação por backtesting)")
 
     # Métricas honestas: nenhum componente vê o período de teste durante a validação
-    metricas_residuo, metricas_original = avaliar_generalizacao(df, valor_col)
-    metrics = {**metricas_residuo, "escala_original": metricas_original}
+    metricas_residuo, metricas_original, detalhes = backtesting(df, valor_col, workers)
+    metrics = {
+        **metricas_residuo,
+        "escala_original": metricas_original,
+        "backtesting": detalhes,
+    }
 
     # Modelo final: Prophet + XGBoost ajustados na série completa
     prophet_model, prophet_fit = treinar_prophet(df, valor_col)
@@ -375,74 +461,87 @@ def treinar_residual(df, valor_col):
 def prever_futuro(
     model, prophet_model, df, valor_col, residual_min, residual_max, anos=5
 ):
+    """
+    Previsão recursiva Prophet + resíduo XGBoost para os próximos `anos`.
+
+    O Prophet é consultado uma única vez para todo o horizonte. As features
+    de cada passo ficam em uma matriz NumPy pré-alocada (uma linha por ano),
+    atualizada a partir da linha anterior. Cada passo depende apenas dos
+    anteriores, então o resultado de um horizonte menor é prefixo do de um
+    horizonte maior (ver `forecast_service`, que calcula o horizonte máximo
+    uma vez e serve os demais recortando).
+    """
     logger.info("🔮 Previsão híbrida LOG + XGB (produção)")
 
     future = prophet_model.make_future_dataframe(periods=anos, freq="YS")
     forecast = prophet_model.predict(future)
 
-    futuro_prophet = forecast.tail(anos).reset_index(drop=True)
+    bases = forecast.tail(anos)["yhat"].to_numpy(dtype=float)
 
-    ultimo = df.iloc[-1:].copy()
-    resultados = []
+    ultimo = df.iloc[-1]
+    datas = [ultimo["ano"] + pd.DateOffset(years=i + 1) for i in range(anos)]
 
-    for i in range(anos):
-        base = float(futuro_prophet.loc[i, "yhat"])
+    col = {nome: i for i, nome in enumerate(FEATURES)}
+    X = np.empty((anos, len(FEATURES)), dtype=float)
+    X[0] = ultimo[FEATURES].to_numpy(dtype=float)
 
-        residual_log = float(model.predict(ultimo[FEATURES])[0])
+    residuos = np.empty(anos, dtype=float)
+    finais = np.empty(anos, dtype=float)
 
-        # CLIP DINÂMICO
-        residual_log = np.clip(residual_log, residual_min, residual_max)
+    # DECAY TEMPORAL
+    decays = np.maximum(0.4, 1 - (np.arange(anos) * 0.15))
+
+    y_linha = float(ultimo[valor_col])
 
-        # DECAY TEMPORAL
-        decay = 1 - (i * 0.15)
-        decay = max(0.4, decay)
+    for i in range(anos):
+        residual_log = float(model.predict(X[i : i + 1])[0])
 
-        residual_log *= decay
+        # CLIP DINÂMICO
+        residual_log = np.clip(residual_log, residual_min, residual_max) * decays[i]
 
         # RECONSTRUÇÃO LOG
-        final = np.expm1(np.log1p(base) + residual_log)
+        final = np.expm1(np.log1p(bases[i]) + residual_log)
 
         # SUAVIZAÇÃO
-        if len(resultados) > 0:
-            prev = resultados[-1]["final"]
-            final = 0.7 * final + 0.3 * prev
+        if i > 0:
+            final = 0.7 * final + 0.3 * finais[i - 1]
 
         final = max(0.1, final)
 
+        residuos[i] = residual_log
+        finais[i] = final
+
+        if i + 1 == anos:
+            break
+
         # UPDATE FEATURES — mesma semântica causal do treino:
         # para a linha r, lag_1=y[r-1], lag_2=y[r-2], diff_1=y[r-1]-y[r-2].
         # Quando o ano anterior foi previsto, seu valor previsto é usado.
-        novo = ultimo.copy()
-        novo["ano"] += pd.DateOffset(years=1)
-        novo[valor_col] = final
-
-        y_anterior = float(ultimo[valor_col].values[0])
-        lag2_novo = float(ultimo["lag_1"].values[0])
-        lag3_novo = float(ultimo["lag_2"].values[0])
-
-        novo["lag_1"] = y_anterior
-        novo["lag_2"] = lag2_novo
-
-        novo["rolling_mean_2"] = np.mean([y_anterior, lag2_novo])
-        novo["rolling_mean_3"] = np.mean([y_anterior, lag2_novo, lag3_novo])
-
-        novo["diff_1"] = float(y_anterior - lag2_novo)
-        novo["trend"] = ultimo["trend"].values[0] + 1
-        novo["ano_num"] = novo["ano"].dt.year
-        novo["taxa_feminicidio"] = ultimo["taxa_feminicidio"]
-
-        resultados.append(
-            {
-                "ano": novo["ano"].values[0],
-                "prophet": base,
-                "residual_log": residual_log,
-                "final": final,
-            }
-        )
-
-        ultimo = novo
-
-    return pd.DataFrame(resultados)
+        atual, proxima = X[i], X[i + 1]
+        proxima[:] = atual
+
+        y_anterior = y_linha
+        lag2_novo = atual[col["lag_1"]]
+        lag3_novo = atual[col["lag_2"]]
+
+        proxima[col["lag_1"]] = y_anterior
+        proxima[col["lag_2"]] = lag2_novo
+        proxima[col["rolling_mean_2"]] = np.mean([y_anterior, lag2_novo])
+        proxima[col["rolling_mean_3"]] = np.mean([y_anterior, lag2_novo, lag3_novo])
+        proxima[col["diff_1"]] = y_anterior - lag2_novo
+        proxima[col["trend"]] = atual[col["trend"]] + 1
+        proxima[col["ano_num"]] = datas[i].year
+
+        y_linha = final
+
+    return pd.DataFrame(
+        {
+            "ano": pd.to_datetime(datas),
+            "prophet": bases,
+            "residual_log": residuos,
+            "final": finais,
+        }
+    )
 
 
 # =========================================================
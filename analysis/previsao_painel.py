@@ -0,0 +1,271 @@
+# analysis/previsao_painel.py
+"""
+Previsão em painel: um par Prophet + XGBoost (resíduo) por Região
+Administrativa, reaproveitando o pipeline híbrido de `data_analyzer`.
+
+Cada RA é ajustada de forma independente em um pool de processos
+(`modelagem.painel.workers`). O resultado — previsão até o horizonte
+máximo, métricas de backtesting e limites do resíduo de cada RA — é
+gravado como um artefato JSON versionado em `models/painel/`, lido pela
+API (`GET /previsao/{indicador}/por-ra`) sem treinar nada na requisição.
+
+Uso pela linha de comando:
+    python -m analysis.previsao_painel --indicador crimes-contra-mulher
+"""
+
+import glob
+import json
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, Optional
+
+import pandas as pd
+
+from analysis.data_analyzer import (
+    MODELS_DIR,
+    TABELA_MODELO,
+    VERSAO_FEATURES,
+    preparar_dados,
+    prever_futuro,
+    treinar_residual,
+)
+from ingestion.repository_adapter import Repository
+from util.config_loader import get_config
+from util.dimensao_ra import COLUNA_RA, nome_canonico, resolver_ra
+from util.log import logs
+
+logger = logs()
+
+_config_painel = get_config().get("modelagem", {}).get("painel", {})
+
+# slug da URL -> coluna alvo na tabela gold de modelagem
+INDICADORES: Dict[str, str] = dict(
+    _config_painel.get(
+        "indicadores",
+        {
+            "crimes-contra-mulher": "crimes_contra_mulher",
+            "feminicidios": "casos_feminicidios",
+        },
+    )
+)
+HORIZONTE_PAINEL = int(_config_painel.get("horizonte_anos", 10))
+WORKERS_PAINEL = int(_config_painel.get("workers", min(4, os.cpu_count() or 1)))
+METODO_INICIO = "spawn"
+DIRETORIO_PAINEL = os.path.join(MODELS_DIR, "painel")
+
+MINIMO_ANOS = 4  # linhas após o feature engineering (mesmo piso da API)
+
+
+def series_por_ra(df: pd.DataFrame, coluna: str) -> Dict[str, pd.DataFrame]:
+    """
+    Uma série anual por RA (ano, alvo e feminicídios, usados nas features),
+    chaveada pelo nome canônico quando a RA é reconhecida.
+    """
+    colunas = list(dict.fromkeys(["ano", coluna, "casos_feminicidios"]))
+    nomes = df[COLUNA_RA].astype(str).map(lambda ra: nome_canonico(ra) or ra.strip().upper())
+    return {
+        nome: grupo[colunas].sort_values("ano").reset_index(drop=True)
+        for nome, grupo in df.assign(**{COLUNA_RA: nomes}).groupby(COLUNA_RA, sort=True)
+    }
+
+
+def _pontos(forecast: pd.DataFrame) -> list:
+    return [
+        {
+            "ano": int(row.ano.year),
+            "valor_previsto": round(float(row.final), 2),
+            "componente_prophet": round(float(row.prophet), 2),
+            "residual_log_aplicado": round(float(row.residual_log), 6),
+        }
+        for row in forecast.itertuples(index=False)
+    ]
+
+
+def ajustar_ra(ra: str, df_ra: pd.DataFrame, coluna: str, horizonte: int) -> dict:
+    """
+    Treina e projeta uma RA (executado nos workers do pool).
+
+    :return: dict com `ra` e `previsao`/`metricas` ou, em caso de falha,
+        `erro` com o motivo.
+    """
+    try:
+        df_preparado = preparar_dados(df_ra, coluna)
+        if len(df_preparado) < MINIMO_ANOS:
+            return {"ra": ra, "erro": f"série curta ({len(df_preparado)} anos após preparo)"}
+
+        # já roda dentro de um worker do pool: folds em série
+        model, prophet_model, metrics, rmin, rmax, _ = treinar_residual(
+            df_preparado, coluna, workers=1
+        )
+        forecast = prever_futuro(
+            model, prophet_model, df_preparado, coluna, rmin, rmax, anos=horizonte
+        )
+    except Exception as e:  # noqa: BLE001 - uma RA não derruba o painel
+        return {"ra": ra, "erro": f"{type(e).__name__}: {e}"}
+
+    return {
+        "ra": ra,
+        "metricas": metrics,
+        "residual_bounds": {"min": rmin, "max": rmax},
+        "previsao": _pontos(forecast),
+    }
+
+
+def _ajustar_todas(series, coluna, horizonte, workers):
+    if workers <= 1:
+        return [ajustar_ra(ra, df_ra, coluna, horizonte) for ra, df_ra in series.items()]
+
+    contexto = multiprocessing.get_context(METODO_INICIO)
+    with ProcessPoolExecutor(max_workers=workers, mp_context=contexto) as pool:
+        futuros = [
+            pool.submit(ajustar_ra, ra, df_ra, coluna, horizonte)
+            for ra, df_ra in series.items()
+        ]
+        return [f.result() for f in futuros]
+
+
+def _versao_dados() -> Optional[str]:
+    try:
+        from database.repository.repository import obter_versao_dados
+
+        return obter_versao_dados()
+    except Exception:
+        return None
+
+
+def _gravar(artefato: dict) -> str:
+    os.makedirs(DIRETORIO_PAINEL, exist_ok=True)
+    caminho = os.path.join(
+        DIRETORIO_PAINEL, f"{artefato['indicador']}_{artefato['versao']}.json"
+    )
+    temporario = f"{caminho}.tmp"
+    with open(temporario, "w", encoding="utf-8") as f:
+        json.dump(artefato, f, ensure_ascii=False)
+    os.replace(temporario, caminho)
+    return caminho
+
+
+def treinar_painel(
+    indicador: str,
+    horizonte: int = HORIZONTE_PAINEL,
+    workers: Optional[int] = None,
+    df: Optional[pd.DataFrame] = None,
+) -> str:
+    """
+    Ajusta todas as RAs do indicador e grava o artefato versionado.
+
+    :return: caminho do artefato JSON gravado.
+    """
+    if indicador not in INDICADORES:
+        raise ValueError(f"Indicador desconhecido: '{indicador}'. Opções: {sorted(INDICADORES)}")
+
+    coluna = INDICADORES[indicador]
+    workers = WORKERS_PAINEL if workers is None else workers
+    df = Repository.load(TABELA_MODELO) if df is None else df
+
+    if df is None or df.empty:
+        raise ValueError(f"A tabela '{TABELA_MODELO}' está vazia ou não foi materializada.")
+
+    series = series_por_ra(df, coluna)
+    logger.info(
+        "🗺️ Painel %s: ajustando %s RAs (workers=%s, horizonte=%s)",
+        indicador,
+        len(series),
+        workers,
+        horizonte,
+    )
+
+    resultados = _ajustar_todas(series, coluna, horizonte, workers)
+
+    gerado_em = datetime.now()
+    artefato = {
+        "indicador": indicador,
+        "versao": gerado_em.strftime("%Y%m%d_%H%M%S"),
+        "versao_dados": _versao_dados(),
+        "versao_features": VERSAO_FEATURES,
+        "gerado_em": gerado_em.isoformat(),
+        "tabela_origem": TABELA_MODELO,
+        "coluna_alvo": coluna,
+        "horizonte_anos": horizonte,
+        "series": {
+            r["ra"]: {
+                "ra_id": resolver_ra(r["ra"]),
+                "metricas": r["metricas"],
+                "residual_bounds": r["residual_bounds"],
+                "previsao": r["previsao"],
+            }
+            for r in resultados
+            if "erro" not in r
+        },
+        "falhas": {r["ra"]: r["erro"] for r in resultados if "erro" in r},
+    }
+
+    for ra, motivo in artefato["falhas"].items():
+        logger.warning("⚠️ Painel %s: RA %s sem previsão (%s)", indicador, ra, motivo)
+
+    caminho = _gravar(artefato)
+    logger.info(
+        "✅ Painel %s salvo em %s (%s RAs, %s falhas)",
+        indicador,
+        caminho,
+        len(artefato["series"]),
+        len(artefato["falhas"]),
+    )
+    return caminho
+
+
+# ---------------------------------------------------------------
+# Leitura (serving)
+# ---------------------------------------------------------------
+_cache_artefatos: Dict[str, tuple] = {}
+_lock = threading.Lock()
+
+
+def localizar_painel(indicador: str) -> Optional[str]:
+    """Artefato mais recente do indicador (a versão no nome ordena no tempo)."""
+    candidatos = sorted(glob.glob(os.path.join(DIRETORIO_PAINEL, f"{indicador}_*.json")))
+    return candidatos[-1] if candidatos else None
+
+
+def carregar_painel(indicador: str) -> Optional[dict]:
+    """
+    Artefato mais recente do indicador, mantido em memória enquanto o
+    arquivo não muda (caminho + mtime). None quando ainda não existe.
+    """
+    caminho = localizar_painel(indicador)
+    if caminho is None:
+        return None
+
+    assinatura = (caminho, os.path.getmtime(caminho))
+
+    with _lock:
+        em_memoria = _cache_artefatos.get(indicador)
+        if em_memoria and em_memoria[0] == assinatura:
+            return em_memoria[1]
+
+    with open(caminho, encoding="utf-8") as f:
+        artefato = json.load(f)
+
+    with _lock:
+        _cache_artefatos[indicador] = (assinatura, artefato)
+
+    return artefato
+
+
+def limpar_cache() -> None:
+    _cache_artefatos.clear()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Treina a previsão por RA (painel).")
+    parser.add_argument("--indicador", choices=sorted(INDICADORES), default="crimes-contra-mulher")
+    parser.add_argument("--horizonte", type=int, default=HORIZONTE_PAINEL)
+    parser.add_argument("--workers", type=int, default=WORKERS_PAINEL)
+    args = parser.parse_args()
+
+    print(treinar_painel(args.indicador, args.horizonte, args.workers))
@@ -50,6 +50,10 @@ _config_modelagem = get_config().get("modelagem", {})
 TABELA_MODELO_PREVISAO = _config_modelagem.get("tabela_gold", "violencia_contra_mulher_gold")
 COLUNA_ALVO_PREVISAO = _config_modelagem.get("coluna_alvo", "crimes_contra_mulher")
 
+# Maior horizonte aceito pelos endpoints de previsão: é calculado uma vez e
+# os horizontes menores são servidos como prefixo.
+HORIZONTE_PREVISAO_MAXIMO = 10
+
 # TTL (segundos) do cache em memória da previsão, evitando re-treinar o
 # modelo (Prophet + XGBoost) a cada requisição.
 CACHE_PREVISAO_TTL_SEGUNDOS = 60 * 30  # 30 minutos
@@ -14,13 +14,16 @@ Documentação interativa: http://localhost:8000/docs
 
 import asyncio
 import sys
+from contextlib import asynccontextmanager
 from datetime import datetime
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from api.routers import analise, classificacao, gold, previsao
+from api.routers import analise, classificacao, gold, pipeline, previsao
 from api.schemas import HealthResponse
+from api.services import jobs_service
+from api.services.registro_modelos import registro
 from database.repository.repository import listar_tabelas
 from util.log import logs
 
@@ -32,6 +35,16 @@ logger = logs()
 if sys.platform == "win32":
     asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # modelos residentes antes da primeira requisição
+    registro.aquecer()
+    yield
+    # jobs de re-treino ainda na fila não sobrevivem ao desligamento
+    jobs_service.encerrar(aguardar=False)
+
+
 app = FastAPI(
     title="API - Criminalidade Brasília/DF",
     description=(
@@ -43,6 +56,7 @@ app = FastAPI(
         "Forest e zonas quentes na malha geoespacial)."
     ),
     version="1.1.0",
+    lifespan=lifespan,
 )
 
 # CORS liberado por padrão para permitir consumo de um dashboard/frontend
@@ -60,6 +74,7 @@ app.include_router(gold.router)
 app.include_router(previsao.router)
 app.include_router(classificacao.router)
 app.include_router(analise.router)
+app.include_router(pipeline.router)
 
 
 @app.get("/", include_in_schema=False)
@@ -0,0 +1,26 @@
+# api/routers/pipeline.py
+from typing import Optional
+
+from fastapi import APIRouter, Query
+
+from api.schemas import TelemetriaResponse
+from api.services import pipeline_service
+
+router = APIRouter(prefix="/pipeline", tags=["Pipeline"])
+
+
+@router.get(
+    "/telemetria",
+    response_model=TelemetriaResponse,
+    summary="Tempos por step do pipeline (p50/p95) e regressões contra a linha de base",
+)
+def telemetria(
+    janela_recente: int = Query(5, ge=1, le=50, description="Execuções recentes comparadas à base"),
+    tolerancia: Optional[float] = Query(
+        None, ge=0, description="Aumento relativo da mediana considerado regressão (padrão do config)"
+    ),
+    limite_runs: int = Query(50, ge=1, le=500, description="Runs do histórico considerados"),
+):
+    return pipeline_service.obter_telemetria(
+        janela_recente=janela_recente, tolerancia=tolerancia, limite_runs=limite_runs
+    )
@@ -1,8 +1,16 @@
 # api/routers/previsao.py
+from typing import Optional
+
 from fastapi import APIRouter, HTTPException, Query
 
-from api.schemas import ModelosTreinadosResponse, PrevisaoResponse
-from api.services import forecast_service
+from api.config import HORIZONTE_PREVISAO_MAXIMO
+from api.schemas import (
+    JobRetreinoResponse,
+    ModelosTreinadosResponse,
+    PrevisaoPorRaResponse,
+    PrevisaoResponse,
+)
+from api.services import forecast_service, jobs_service
 
 router = APIRouter(prefix="/previsao", tags=["Previsão"])
 
@@ -20,7 +28,7 @@ router = APIRouter(prefix="/previsao", tags=["Previsão"])
     ),
 )
 def previsao_crimes_contra_mulher(
-    horizonte_anos: int = Query(5, ge=1, le=10, description="Quantos anos à frente prever"),
+    horizonte_anos: int = Query(5, ge=1, le=HORIZONTE_PREVISAO_MAXIMO, description="Quantos anos à frente prever"),
     usar_cache: bool = Query(True, description="Reaproveita previsão recente em cache (30 min)"),
     persistir_modelo: bool = Query(
         False,
@@ -49,32 +57,35 @@ def previsao_crimes_contra_mulher(
 
 @router.post(
     "/retrain",
-    response_model=PrevisaoResponse,
-    summary="Força o re-treino do par Prophet+XGBoost e persiste o novo bundle em models/",
+    response_model=JobRetreinoResponse,
+    status_code=202,
+    summary="Enfileira o re-treino do par Prophet+XGBoost (job em background)",
     description=(
-        "Ignora qualquer artefato existente, treina um novo par Prophet+XGBoost "
-        "a partir da tabela gold mais recente, salva o bundle em `models/` "
-        "(`fonte_modelo='retreino'`) e retorna a previsão resultante. As "
-        "próximas chamadas a GET /previsao/crimes-contra-mulher passam a servir "
-        "a partir deste novo artefato."
+        "Registra um job que treina um novo par Prophet+XGBoost a partir da "
+        "tabela gold mais recente, em um pool de processos separado da API, e "
+        "devolve o id imediatamente. Acompanhe por `GET /previsao/jobs/{job_id}`. "
+        "Ao concluir, o bundle salvo em `models/` passa a ser servido por "
+        "GET /previsao/crimes-contra-mulher sem esperar o cache expirar. Pedidos "
+        "feitos enquanto um re-treino está em andamento recebem o mesmo job."
     ),
 )
-def retreinar_previsao(
-    horizonte_anos: int = Query(5, ge=1, le=10, description="Quantos anos à frente prever"),
-):
+def retreinar_previsao():
     try:
-        return forecast_service.gerar_previsao(
-            horizonte_anos=horizonte_anos,
-            usar_cache=False,
-            forcar_retreino=True,
-            persistir_modelo=True,
-        )
-    except forecast_service.DadosInsuficientesError as exc:
+        return jobs_service.solicitar_retreino()
+    except jobs_service.RetreinoIndisponivelError as exc:
         raise HTTPException(status_code=503, detail=str(exc)) from exc
-    except Exception as exc:  # noqa: BLE001 - erro inesperado de treinamento/infra
-        raise HTTPException(
-            status_code=500, detail=f"Falha ao re-treinar modelo: {exc}"
-        ) from exc
+
+
+@router.get(
+    "/jobs/{job_id}",
+    response_model=JobRetreinoResponse,
+    summary="Status de um job de re-treino",
+)
+def status_job(job_id: str):
+    try:
+        return jobs_service.obter_job(job_id)
+    except jobs_service.JobNaoEncontradoError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
 
 
 @router.get(
@@ -84,3 +95,31 @@ def retreinar_previsao(
 )
 def modelos_treinados():
     return forecast_service.listar_modelos_treinados()
+
+
+@router.get(
+    "/{indicador}/por-ra",
+    response_model=PrevisaoPorRaResponse,
+    summary="Previsão por Região Administrativa (um modelo por RA)",
+    description=(
+        "Serve as previsões de todas as RAs a partir do artefato mais recente "
+        "em `models/painel/`, gerado por `python -m analysis.previsao_painel` "
+        "(modelos ajustados em paralelo, fora da requisição). Indicadores "
+        "disponíveis em `modelagem.painel.indicadores` no config.yaml."
+    ),
+)
+def previsao_por_ra(
+    indicador: str,
+    horizonte_anos: int = Query(5, ge=1, le=HORIZONTE_PREVISAO_MAXIMO, description="Quantos anos à frente prever"),
+    regiao_administrativa: Optional[str] = Query(None, description="Filtra uma única RA"),
+):
+    try:
+        return forecast_service.obter_previsao_por_ra(
+            indicador=indicador,
+            horizonte_anos=horizonte_anos,
+            regiao_administrativa=regiao_administrativa,
+        )
+    except forecast_service.IndicadorDesconhecidoError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    except forecast_service.DadosInsuficientesError as exc:
+        raise HTTPException(status_code=503, detail=str(exc)) from exc
@@ -88,6 +88,50 @@ class PrevisaoResponse(BaseModel):
     )
 
 
+class SeriePrevisaoRa(BaseModel):
+    regiao_administrativa: str
+    ra_id: Optional[int] = None
+    metricas_residual: Optional[MetricasModelo] = None
+    previsao: List[PontoPrevisao]
+
+
+class PrevisaoPorRaResponse(BaseModel):
+    indicador: str = Field(..., examples=["crimes-contra-mulher"])
+    tabela_origem: str
+    coluna_alvo: str
+    versao: str = Field(
+        ..., description="Versão do artefato do painel em models/painel/ (data do treino)"
+    )
+    gerado_em: datetime
+    horizonte_anos: int
+    series: List[SeriePrevisaoRa]
+    falhas: Dict[str, str] = Field(
+        default_factory=dict,
+        description="RAs sem previsão no artefato e o motivo (ex.: série curta)",
+    )
+
+
+class JobRetreinoResponse(BaseModel):
+    job_id: str
+    status: str = Field(
+        ..., description="pendente | executando | concluido | falhou", examples=["pendente"]
+    )
+    criado_em: datetime
+    concluido_em: Optional[datetime] = None
+    solicitacoes: int = Field(
+        1, description="Pedidos de re-treino agrupados neste job (pedidos concorrentes)"
+    )
+    modelo_arquivo: Optional[str] = Field(
+        None, description="Bundle .pkl salvo em models/ pelo job"
+    )
+    metricas_residual: Optional[MetricasModelo] = None
+    modelo_em_servico: Optional[str] = Field(
+        None,
+        description="Bundle servido a partir da próxima previsão (cache invalidado ao fim do job)",
+    )
+    erro: Optional[str] = None
+
+
 class ModeloTreinadoInfo(BaseModel):
     arquivo: str
     criado_em: Optional[str] = None
@@ -219,5 +263,28 @@ class ZonasQuentesResponse(BaseModel):
     )
 
 
+class TelemetriaStepItem(BaseModel):
+    step: str
+    execucoes: int = Field(..., description="Execuções bem-sucedidas no histórico")
+    falhas: int = Field(..., description="Tentativas com erro, timeout ou falha de validação")
+    p50_s: Optional[float] = None
+    p95_s: Optional[float] = None
+    p50_recente_s: Optional[float] = None
+    p50_base_s: Optional[float] = None
+    variacao_pct: Optional[float] = None
+    regressao: bool
+    cpu_p50_s: Optional[float] = None
+    rss_pico_mb: Optional[float] = None
+    linhas_saida: Optional[int] = None
+
+
+class TelemetriaResponse(BaseModel):
+    janela_recente: int
+    tolerancia: float
+    total_steps: int
+    regressoes: List[str] = Field(..., description="Steps cuja mediana recente regrediu")
+    steps: List[TelemetriaStepItem]
+
+
 class ErrorResponse(BaseModel):
     detail: str
@@ -21,6 +21,7 @@ from analysis.correlacoes import (
 )
 from analysis.mapa import gerar_agregado_celulas
 from analysis.pipeline_analise import _carregar_tabelas as carregar_tabelas_gold
+from database.cache_tabelas import cache_tabelas
 from util.log import logs
 
 logger = logs()
@@ -40,6 +41,7 @@ class DadosIndisponiveisError(LookupError):
 # Cache em memória com TTL (mesmo padrão de forecast/classificacao_service):
 # as análises recalculam sobre as tabelas gold e o Isolation Forest por RA é
 # caro (~10 s), então repetições dentro da janela são servidas sem recomputar.
+# Uma nova versão dos dados gold também esvazia o cache.
 TTL_CACHE_SEGUNDOS = 1800
 _cache_resultados: dict[str, tuple[float, dict]] = {}
 
@@ -49,7 +51,11 @@ def limpar_cache() -> None:
     _cache_resultados.clear()
 
 
+cache_tabelas.registrar_ouvinte(limpar_cache)
+
+
 def _com_cache(chave: str, calculadora) -> dict:
+    cache_tabelas.verificar_versao()
     agora = time.monotonic()
     entrada = _cache_resultados.get(chave)
     if entrada is not None and agora - entrada[0] < TTL_CACHE_SEGUNDOS:
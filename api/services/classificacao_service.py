@@ -14,7 +14,8 @@ nenhum artefato utilizável existir — ou se `forcar_retreino=True` — o
 modelo é treinado sob demanda a partir das tabelas gold mais recentes
 (`fonte_modelo="retreino"`), caminho usado pelo endpoint explícito
 `POST /classificacao/retrain`. Um cache simples em memória evita repetir
-carga/predição a cada requisição.
+carga/predição a cada requisição, e o pipeline desserializado fica residente
+no `registro_modelos` (relido só quando `models/` muda).
 """
 
 import glob
@@ -38,15 +39,19 @@ from analysis.logistic_regression import (
     treinar_regressao_logistica,
 )
 from api.config import CACHE_PREVISAO_TTL_SEGUNDOS
+from api.services.registro_modelos import registro
+from database.cache_tabelas import cache_tabelas
 from util.log import logs
 
 logger = logs()
 
 # Cache simples em memória: {chave: (expira_em_epoch, payload)}
+# (esvaziado também quando a versão dos dados gold muda)
 _CACHE: Dict[str, tuple] = {}
 _CHAVE_CACHE = "classificacao_criminalidade_letal"
 
 PREFIXO_ARTEFATO = "logreg_criminalidade_letal_"
+TIPO_MODELO = "classificacao_logreg"
 
 
 class DadosInsuficientesError(ValueError):
@@ -58,6 +63,9 @@ def limpar_cache() -> None:
     _CACHE.clear()
 
 
+cache_tabelas.registrar_ouvinte(limpar_cache)
+
+
 def _localizar_ultimo_artefato(models_dir: Optional[str] = None) -> Tuple[Optional[str], Optional[dict]]:
     """
     Procura o artefato de Regressão Logística mais recente em `models_dir`
@@ -96,6 +104,15 @@ def _localizar_ultimo_artefato(models_dir: Optional[str] = None) -> Tuple[Option
     return candidatos[0][1], candidatos[0][2]
 
 
+# lambdas: resolvem joblib/MODELS_DIR do módulo a cada uso (permite patch nos testes)
+registro.registrar(
+    TIPO_MODELO,
+    localizar=lambda models_dir: _localizar_ultimo_artefato(models_dir),
+    carregar=lambda model_path: joblib.load(model_path),
+    diretorio=lambda: MODELS_DIR,
+)
+
+
 def _classificar_com_modelo(modelo, df) -> Tuple[List[int], List[float]]:
     """Gera classes e probabilidades previstas para todas as linhas de df."""
     preds = modelo.predict(df[FEATURES]).tolist()
@@ -110,19 +127,19 @@ def _tentar_servir_de_artefato(df):
     :return: dict parcial do resultado, ou None quando não há artefato
         utilizável (inexistente ou corrompido).
     """
-    model_path, meta = _localizar_ultimo_artefato()
-
-    if model_path is None:
-        return None
-
     try:
-        modelo = joblib.load(model_path)
+        carregado = registro.obter(TIPO_MODELO)
     except Exception:
         logger.exception(
-            "⚠️ Falha ao carregar artefato persistido em %s, re-treinando.", model_path
+            "⚠️ Falha ao carregar o artefato mais recente em %s, re-treinando.", MODELS_DIR
         )
         return None
 
+    if carregado is None:
+        return None
+
+    model_path, meta, modelo = carregado.model_path, carregado.meta, carregado.objeto
+
     preds, probas = _classificar_com_modelo(modelo, df)
 
     extra = (meta or {}).get("extra", {})
@@ -170,6 +187,7 @@ def classificar_criminalidade(
     :param persistir_modelo: se True e um treino ocorrer nesta chamada, o
         novo pipeline é salvo em models/.
     """
+    cache_tabelas.verificar_versao()
     agora = time.time()
 
     if usar_cache and not forcar_retreino and _CHAVE_CACHE in _CACHE:
@@ -14,10 +14,25 @@ previsão a partir do bundle mais recente em disco (`fonte_modelo=
 "artefato"`, sem re-treinar). Se nenhum bundle utilizável existir (ainda
 não há nenhum na primeira execução, ou o argumento `forcar_retreino=True`
 foi passado), o par Prophet/XGBoost é re-treinado sob demanda a partir da
-tabela gold mais recente (`fonte_modelo="retreino"`) — esse é o caminho
-usado pelo endpoint explícito `POST /previsao/retrain`. Em ambos os
+tabela gold mais recente (`fonte_modelo="retreino"`). Em ambos os
 casos, mantém-se um cache simples em memória para não repetir trabalho
-a cada requisição.
+a cada requisição. O bundle desserializado fica residente no
+`registro_modelos` (aquecido no startup da API e relido só quando `models/`
+muda), então um cache miss não repete o glob dos metadados nem o
+`joblib.load`.
+
+O endpoint explícito `POST /previsao/retrain` não treina na requisição:
+`jobs_service` executa `retreinar_e_persistir` em background e, ao fim,
+esvazia o cache de previsão: a requisição seguinte serve o novo bundle.
+
+A previsão é sempre calculada para o maior horizonte aceito
+(`HORIZONTE_PREVISAO_MAXIMO`); como cada ano previsto depende só dos
+anteriores, qualquer horizonte menor é o prefixo dessa série e sai do
+mesmo cache, sem novo `predict` do Prophet nem nova recursão.
+
+A previsão por RA (`obter_previsao_por_ra`) não treina nada na requisição:
+lê o artefato do painel gerado por `analysis.previsao_painel` (um modelo
+por RA, ajustados em paralelo) e recorta o horizonte pedido.
 """
 
 import glob
@@ -27,6 +42,7 @@ import time
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional
 
+from analysis import previsao_painel
 from analysis.data_analyzer import (
     FEATURES,
     HORIZONTE_ANOS_PADRAO,
@@ -43,21 +59,34 @@ from analysis.data_analyzer import (
 from api.config import (
     CACHE_PREVISAO_TTL_SEGUNDOS,
     COLUNA_ALVO_PREVISAO,
+    HORIZONTE_PREVISAO_MAXIMO,
     TABELA_MODELO_PREVISAO,
 )
+from api.services.registro_modelos import registro
+from database.cache_tabelas import cache_tabelas
 from ingestion.repository_adapter import Repository
+from util.dimensao_ra import nome_canonico
 from util.log import logs
 
 logger = logs()
 
-# Cache simples em memória: {horizonte_anos: (expira_em_epoch, payload)}
-_CACHE: Dict[int, tuple] = {}
+# Cache simples em memória: {_CHAVE_CACHE: (expira_em_epoch, previsao_calculada)}
+# com a série do maior horizonte já calculado (esvaziado também quando a
+# versão dos dados gold muda)
+_CACHE: Dict[str, tuple] = {}
+_CHAVE_CACHE = "previsao"
+
+TIPO_MODELO = "previsao_bundle"
 
 
 class DadosInsuficientesError(ValueError):
     """Levantada quando não há dados suficientes na tabela gold para treinar/prever."""
 
 
+class IndicadorDesconhecidoError(LookupError):
+    """Levantada quando o indicador (ou a RA) pedido não existe no painel."""
+
+
 def gerar_previsao(
     horizonte_anos: int | None = None,
     usar_cache: bool = True,
@@ -74,20 +103,38 @@ def gerar_previsao(
         padrão definido no config.yaml (`modelagem.horizonte_anos`).
     :param forcar_retreino: se True, ignora qualquer artefato persistido em
         `models/` e treina um par Prophet/XGBoost novo a partir dos dados
-        atuais (usado pelo endpoint `POST /previsao/retrain`).
+        atuais.
     :param persistir_modelo: se True e um re-treino de fato ocorrer (seja
         por `forcar_retreino=True`, seja por não existir nenhum bundle
         salvo ainda), o novo par Prophet/XGBoost é salvo em `models/`.
     """
     horizonte_anos = int(horizonte_anos or HORIZONTE_ANOS_PADRAO)
+    cache_tabelas.verificar_versao()
     agora = time.time()
 
-    if usar_cache and not forcar_retreino and horizonte_anos in _CACHE:
-        expira_em, payload = _CACHE[horizonte_anos]
-        if agora < expira_em:
+    if usar_cache and not forcar_retreino and _CHAVE_CACHE in _CACHE:
+        expira_em, calculada = _CACHE[_CHAVE_CACHE]
+        if agora < expira_em and calculada["horizonte_anos"] >= horizonte_anos:
             logger.info("♻️ Retornando previsão do cache (horizonte=%s anos)", horizonte_anos)
-            return payload
+            return _montar_payload(calculada, horizonte_anos)
+
+    df_preparado = _carregar_dados_preparados()
+
+    # horizontes menores são prefixo do maior: calcula o máximo uma vez
+    horizonte_calculado = max(horizonte_anos, HORIZONTE_PREVISAO_MAXIMO)
+
+    forecast_df, metrics, fonte_modelo, modelo_arquivo = _obter_previsao(
+        df_preparado, horizonte_calculado, forcar_retreino, persistir_modelo
+    )
 
+    calculada = _guardar_no_cache(
+        forecast_df, horizonte_calculado, metrics, fonte_modelo, modelo_arquivo, agora
+    )
+
+    return _montar_payload(calculada, horizonte_anos)
+
+
+def _carregar_dados_preparados():
     df = Repository.load(TABELA_MODELO_PREVISAO)
 
     if df is None or len(df) == 0:
@@ -104,10 +151,11 @@ def gerar_previsao(
             "(mínimo recomendado: 4 anos) para treinar o modelo residual."
         )
 
-    forecast_df, metrics, fonte_modelo, modelo_arquivo = _obter_previsao(
-        df_preparado, horizonte_anos, forcar_retreino, persistir_modelo
-    )
+    return df_preparado
+
 
+def _guardar_no_cache(forecast_df, horizonte_calculado, metrics, fonte_modelo, modelo_arquivo, agora):
+    """Grava a série calculada no cache (substituição atômica da entrada)."""
     pontos = [
         {
             "ano": int(row["ano"].year) if hasattr(row["ano"], "year") else int(row["ano"]),
@@ -119,23 +167,55 @@ def gerar_previsao(
     ]
 
     gerado_em = datetime.now()
-    cache_ate = gerado_em + timedelta(seconds=CACHE_PREVISAO_TTL_SEGUNDOS)
 
-    payload = {
-        "tabela_origem": TABELA_MODELO_PREVISAO,
-        "coluna_alvo": COLUNA_ALVO_PREVISAO,
-        "horizonte_anos": horizonte_anos,
+    calculada = {
+        "horizonte_anos": horizonte_calculado,
         "gerado_em": gerado_em,
-        "cache_ate": cache_ate,
+        "cache_ate": gerado_em + timedelta(seconds=CACHE_PREVISAO_TTL_SEGUNDOS),
         "metricas_residual": metrics,
         "previsao": pontos,
         "fonte_modelo": fonte_modelo,
         "modelo_arquivo": modelo_arquivo,
     }
 
-    _CACHE[horizonte_anos] = (agora + CACHE_PREVISAO_TTL_SEGUNDOS, payload)
+    _CACHE[_CHAVE_CACHE] = (agora + CACHE_PREVISAO_TTL_SEGUNDOS, calculada)
+
+    return calculada
+
+
+def retreinar_e_persistir() -> Dict[str, Any]:
+    """
+    Treina um par Prophet/XGBoost novo com os dados gold atuais e salva o
+    bundle em `models/` (executado pelos jobs de `jobs_service`, em outro
+    processo).
+
+    :return: dict com `modelo_arquivo` e `metricas_residual`.
+    """
+    df_preparado = _carregar_dados_preparados()
+
+    model, prophet_model, metrics, residual_min, residual_max, hyperparams = treinar_residual(
+        df_preparado, COLUNA_ALVO_PREVISAO
+    )
+    modelo_arquivo = _persistir_modelo(
+        df_preparado, model, prophet_model, metrics, hyperparams, residual_min, residual_max
+    )
+
+    return {"modelo_arquivo": modelo_arquivo, "metricas_residual": metrics}
 
-    return payload
+
+def _montar_payload(calculada: Dict[str, Any], horizonte_anos: int) -> Dict[str, Any]:
+    """Resposta para `horizonte_anos` a partir da série do horizonte calculado."""
+    return {
+        "tabela_origem": TABELA_MODELO_PREVISAO,
+        "coluna_alvo": COLUNA_ALVO_PREVISAO,
+        "horizonte_anos": horizonte_anos,
+        "gerado_em": calculada["gerado_em"],
+        "cache_ate": calculada["cache_ate"],
+        "metricas_residual": calculada["metricas_residual"],
+        "previsao": calculada["previsao"][:horizonte_anos],
+        "fonte_modelo": calculada["fonte_modelo"],
+        "modelo_arquivo": calculada["modelo_arquivo"],
+    }
 
 
 def _obter_previsao(df_preparado, horizonte_anos, forcar_retreino, persistir_modelo):
@@ -185,17 +265,18 @@ def _tentar_servir_de_artefato(df_preparado, horizonte_anos):
         (nenhum bundle salvo ainda, artefato corrompido, ou metadados
         sem os limites do resíduo necessários para `prever_futuro`).
     """
-    model_path, meta = localizar_ultimo_modelo_bundle(MODELS_DIR)
-
-    if model_path is None:
-        return None, None, None
-
     try:
-        xgb_model, prophet_model = carregar_modelo(model_path)
+        modelo = registro.obter(TIPO_MODELO, MODELS_DIR)
     except Exception:
-        logger.exception("⚠️ Falha ao carregar artefato persistido em %s, re-treinando.", model_path)
+        logger.exception("⚠️ Falha ao carregar o bundle mais recente em %s, re-treinando.", MODELS_DIR)
         return None, None, None
 
+    if modelo is None:
+        return None, None, None
+
+    model_path, meta = modelo.model_path, modelo.meta
+    xgb_model, prophet_model = modelo.objeto
+
     if xgb_model is None or prophet_model is None:
         logger.warning(
             "⚠️ Artefato %s não contém o par Prophet+XGBoost completo, re-treinando.", model_path
@@ -284,6 +365,61 @@ def _persistir_modelo(
     return os.path.basename(model_path)
 
 
+def obter_previsao_por_ra(
+    indicador: str,
+    horizonte_anos: int,
+    regiao_administrativa: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Previsão de cada RA a partir do artefato mais recente do painel.
+
+    :param regiao_administrativa: quando informada (qualquer grafia/apelido
+        conhecido), devolve apenas a série dessa RA.
+    """
+    if indicador not in previsao_painel.INDICADORES:
+        raise IndicadorDesconhecidoError(
+            f"Indicador desconhecido: '{indicador}'. "
+            f"Opções: {sorted(previsao_painel.INDICADORES)}"
+        )
+
+    artefato = previsao_painel.carregar_painel(indicador)
+    if artefato is None:
+        raise DadosInsuficientesError(
+            f"Nenhuma previsão por RA treinada para '{indicador}'. Execute "
+            f"`python -m analysis.previsao_painel --indicador {indicador}`."
+        )
+
+    series = artefato["series"]
+    if regiao_administrativa is not None:
+        nome = nome_canonico(regiao_administrativa) or regiao_administrativa.strip().upper()
+        if nome not in series:
+            raise IndicadorDesconhecidoError(
+                f"RA '{regiao_administrativa}' sem previsão no painel '{indicador}'."
+            )
+        series = {nome: series[nome]}
+
+    horizonte_anos = min(horizonte_anos, artefato["horizonte_anos"])
+
+    return {
+        "indicador": indicador,
+        "tabela_origem": artefato["tabela_origem"],
+        "coluna_alvo": artefato["coluna_alvo"],
+        "versao": artefato["versao"],
+        "gerado_em": artefato["gerado_em"],
+        "horizonte_anos": horizonte_anos,
+        "series": [
+            {
+                "regiao_administrativa": ra,
+                "ra_id": serie["ra_id"],
+                "metricas_residual": serie["metricas"],
+                "previsao": serie["previsao"][:horizonte_anos],
+            }
+            for ra, serie in series.items()
+        ],
+        "falhas": artefato["falhas"],
+    }
+
+
 def listar_modelos_treinados(models_dir: str = "models") -> Dict[str, Any]:
     """Lista os modelos já persistidos em disco (`models/*_meta.json`)."""
     padrao = os.path.join(models_dir, "*_meta.json")
@@ -316,3 +452,14 @@ def listar_modelos_treinados(models_dir: str = "models") -> Dict[str, Any]:
 def limpar_cache() -> None:
     """Utilitário de suporte a testes/operacional: limpa o cache em memória."""
     _CACHE.clear()
+
+
+cache_tabelas.registrar_ouvinte(limpar_cache)
+
+# lambdas: resolvem as funções do módulo a cada uso (permite patch nos testes)
+registro.registrar(
+    TIPO_MODELO,
+    localizar=lambda models_dir: localizar_ultimo_modelo_bundle(models_dir),
+    carregar=lambda model_path: carregar_modelo(model_path),
+    diretorio=lambda: MODELS_DIR,
+)
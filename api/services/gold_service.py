@@ -2,19 +2,19 @@
 """
 Camada de serviço da API para as tabelas Gold.
 
-Reaproveita deliberadamente o `Repository` (ingestion/repository_adapter.py)
-e as funções de `database/repository/repository.py` já existentes e
-testadas no projeto, em vez de reimplementar acesso a banco aqui.
+Reaproveita deliberadamente as funções de `database/repository/repository.py`
+já existentes e testadas no projeto, em vez de reimplementar acesso a banco
+aqui. A consulta paginada (`carregar_pagina`) empurra filtros, contagem e
+LIMIT/OFFSET para o Postgres.
 """
 
 from math import ceil
-from typing import Any, Dict, Optional
-
-import pandas as pd
+from typing import Any, Dict, Optional, Tuple
 
 from api.config import COLUNA_ANO_POR_TABELA, TABELAS_GOLD
-from database.repository.repository import analisar_tabela, listar_tabelas
-from ingestion.repository_adapter import Repository
+from database.cache_tabelas import cache_tabelas
+from database.repository.repository import analisar_tabela, carregar_pagina, listar_tabelas
+from util.dimensao_ra import COLUNA_RA_ID, nome_canonico, resolver_ra
 from util.log import logs
 
 logger = logs()
@@ -86,27 +86,30 @@ def obter_dados_tabela(
     """
     Retorna registros paginados de uma tabela gold, com filtros opcionais
     de intervalo de anos e Região Administrativa.
+
+    Filtros, contagem e LIMIT/OFFSET rodam no Postgres: cada requisição lê
+    apenas a página pedida, não a tabela inteira.
     """
     _validar_tabela_gold(nome_tabela)
 
-    df = Repository.load(nome_tabela)
-
-    if df is None:
-        raise TabelaNaoEncontradaError(
-            f"A tabela '{nome_tabela}' ainda não foi materializada no banco "
-            f"(execute o pipeline gold antes de consultar)."
-        )
-
-    df = _aplicar_filtros(df, nome_tabela, ano_min, ano_max, regiao_administrativa)
+    filtros = _montar_filtros(nome_tabela, ano_min, ano_max, regiao_administrativa)
+    ordenar_por = tuple(
+        c for c in (COLUNA_ANO_POR_TABELA.get(nome_tabela), "regiao_administrativa") if c
+    )
 
-    total_linhas = len(df)
+    df, total_linhas = _carregar_pagina_ou_erro(
+        nome_tabela, pagina, tamanho_pagina, filtros, ordenar_por
+    )
     total_paginas = max(1, ceil(total_linhas / tamanho_pagina))
-    pagina = max(1, min(pagina, total_paginas))
 
-    inicio = (pagina - 1) * tamanho_pagina
-    fim = inicio + tamanho_pagina
+    if pagina > total_paginas:
+        # página fora do intervalo: devolve a última (mesmo contrato de antes)
+        pagina = total_paginas
+        df, total_linhas = _carregar_pagina_ou_erro(
+            nome_tabela, pagina, tamanho_pagina, filtros, ordenar_por
+        )
 
-    registros = df.iloc[inicio:fim].to_dict(orient="records")
+    registros = df.to_dict(orient="records")
 
     return {
         "tabela": nome_tabela,
@@ -118,23 +121,67 @@ def obter_dados_tabela(
     }
 
 
-def _aplicar_filtros(
-    df: pd.DataFrame,
+def _carregar_pagina_ou_erro(nome_tabela, pagina, tamanho_pagina, filtros, ordenar_por):
+    """Página da tabela; TabelaNaoEncontradaError se ela não está no banco."""
+    resultado = _carregar_pagina_cache(
+        nome_tabela, pagina, tamanho_pagina, filtros, ordenar_por
+    )
+
+    if resultado is None:
+        raise TabelaNaoEncontradaError(
+            f"A tabela '{nome_tabela}' ainda não foi materializada no banco "
+            f"(execute o pipeline gold antes de consultar)."
+        )
+
+    return resultado
+
+
+def _carregar_pagina_cache(nome_tabela, pagina, tamanho_pagina, filtros, ordenar_por):
+    """Página da tabela via cache do processo (invalidado por versão dos dados)."""
+    deslocamento = (pagina - 1) * tamanho_pagina
+    chave = ("pagina", nome_tabela, tamanho_pagina, deslocamento, filtros, ordenar_por)
+
+    def carregar():
+        return carregar_pagina(
+            nome_tabela,
+            limite=tamanho_pagina,
+            deslocamento=deslocamento,
+            filtros=filtros,
+            ordenar_por=ordenar_por,
+        )
+
+    return cache_tabelas.obter(chave, carregar)
+
+
+def _montar_filtros(
     nome_tabela: str,
     ano_min: Optional[int],
     ano_max: Optional[int],
     regiao_administrativa: Optional[str],
-) -> pd.DataFrame:
+) -> Tuple[Tuple[str, str, Any], ...]:
+    """Traduz os query params em filtros `(coluna, operador, valor)` para o SQL."""
+    filtros = []
     coluna_ano = COLUNA_ANO_POR_TABELA.get(nome_tabela)
 
-    if coluna_ano and coluna_ano in df.columns:
+    if coluna_ano:
         if ano_min is not None:
-            df = df[df[coluna_ano] >= ano_min]
+            filtros.append((coluna_ano, ">=", ano_min))
         if ano_max is not None:
-            df = df[df[coluna_ano] <= ano_max]
-
-    if regiao_administrativa and "regiao_administrativa" in df.columns:
-        alvo = regiao_administrativa.strip().upper()
-        df = df[df["regiao_administrativa"].astype(str).str.upper() == alvo]
-
-    return df
+            filtros.append((coluna_ano, "<=", ano_max))
+
+    if regiao_administrativa:
+        ra_id = resolver_ra(regiao_administrativa)
+
+        if ra_id is None:
+            filtros.append(
+                ("regiao_administrativa", "igual_texto", regiao_administrativa.strip().upper())
+            )
+        else:
+            # apelidos resolvidos pela dimensão de RA; em tabelas com `ra_id`
+            # o filtro é por inteiro (o de texto é ignorado pelo SQL se não houver)
+            filtros.append((COLUNA_RA_ID, "=", ra_id))
+            filtros.append(
+                ("regiao_administrativa", "igual_texto", nome_canonico(regiao_administrativa))
+            )
+
+    return tuple(filtros)
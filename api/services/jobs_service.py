@@ -0,0 +1,232 @@
+# api/services/jobs_service.py
+"""
+Jobs de re-treino em background para `POST /previsao/retrain`.
+
+O endpoint apenas registra o job e devolve seu id; o treino
+(`forecast_service.retreinar_e_persistir`) roda em um pool limitado de
+processos (`modelagem.workers_retreino`), então nenhuma thread da API fica
+presa durante o ajuste do Prophet/XGBoost. Ao terminar, o callback só
+registra o resultado e esvazia o cache de previsão (sem esperar o TTL): a
+próxima requisição encontra o bundle novo pelo `registro_modelos`, que relê
+`models/` quando o diretório muda. Nenhuma carga ou `predict` roda na thread
+de gerenciamento do pool.
+
+Pedidos de re-treino enquanto outro ainda está pendente/em execução são
+agrupados no job em andamento (mesmo id), já que ambos treinariam o mesmo
+modelo com os mesmos dados.
+
+O job só é registrado depois que o pool aceita o envio; um pool quebrado
+ou encerrado é recriado uma vez e, se ainda assim recusar, o pedido falha
+com `RetreinoIndisponivelError` (HTTP 503) sem deixar job pendente.
+
+O estado dos jobs fica em memória do processo da API (os mais antigos já
+finalizados são descartados acima de `LIMITE_JOBS`).
+"""
+
+import multiprocessing
+import threading
+import uuid
+from concurrent.futures import (
+    BrokenExecutor,
+    CancelledError,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from datetime import datetime
+from functools import partial
+from typing import Any, Dict, Optional
+
+from api.services import forecast_service
+from util.config_loader import get_config
+from util.log import logs
+
+logger = logs()
+
+_config_modelagem = get_config().get("modelagem", {})
+
+WORKERS_RETREINO = int(_config_modelagem.get("workers_retreino", 1))
+# "processes" (padrão) ou "threads" (depuração/testes: mocks não atravessam processos)
+BACKEND_RETREINO = _config_modelagem.get("backend_retreino", "processes")
+LIMITE_JOBS = 100
+
+PENDENTE = "pendente"
+EXECUTANDO = "executando"
+CONCLUIDO = "concluido"
+FALHOU = "falhou"
+
+_jobs: Dict[str, Dict[str, Any]] = {}
+_futuros: Dict[str, Any] = {}
+_job_ativo: Optional[str] = None
+_executor = None
+_lock = threading.Lock()
+
+
+class JobNaoEncontradoError(LookupError):
+    """Levantada quando o id informado não corresponde a nenhum job conhecido."""
+
+
+class RetreinoIndisponivelError(RuntimeError):
+    """Levantada quando o pool de re-treino não aceita o job (nem recriado)."""
+
+
+def _obter_executor():
+    global _executor
+    if _executor is None:
+        if BACKEND_RETREINO == "threads":
+            _executor = ThreadPoolExecutor(
+                max_workers=WORKERS_RETREINO, thread_name_prefix="retreino"
+            )
+        else:
+            _executor = ProcessPoolExecutor(
+                max_workers=WORKERS_RETREINO,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+    return _executor
+
+
+def _submeter():
+    """
+    Envia o re-treino ao pool (chamado com `_lock`). Um pool quebrado (ex.:
+    processo filho morto -> BrokenProcessPool) ou já encerrado é descartado
+    e recriado uma vez antes de desistir.
+    """
+    global _executor
+    try:
+        return _obter_executor().submit(forecast_service.retreinar_e_persistir)
+    except (BrokenExecutor, RuntimeError) as erro:
+        logger.warning("⚠️ Pool de re-treino indisponível (%s); recriando", erro)
+        quebrado, _executor = _executor, None
+        if quebrado is not None:
+            quebrado.shutdown(wait=False, cancel_futures=True)
+
+    try:
+        return _obter_executor().submit(forecast_service.retreinar_e_persistir)
+    except (BrokenExecutor, RuntimeError) as erro:
+        raise RetreinoIndisponivelError(
+            f"Pool de re-treino indisponível: {type(erro).__name__}: {erro}"
+        ) from erro
+
+
+def _em_andamento(job: Optional[dict]) -> bool:
+    return job is not None and job["status"] in (PENDENTE, EXECUTANDO)
+
+
+def _descartar_antigos() -> None:
+    finalizados = [i for i, job in _jobs.items() if not _em_andamento(job)]
+    for job_id in finalizados[: max(0, len(_jobs) - LIMITE_JOBS)]:
+        _jobs.pop(job_id, None)
+
+
+def _visao(job: dict) -> Dict[str, Any]:
+    """Cópia do job com o status atualizado pelo estado do futuro."""
+    visao = dict(job)
+    futuro = _futuros.get(job["job_id"])
+    if visao["status"] == PENDENTE and futuro is not None and futuro.running():
+        visao["status"] = EXECUTANDO
+    return visao
+
+
+def solicitar_retreino() -> Dict[str, Any]:
+    """
+    Registra um job de re-treino (ou reaproveita o que está em andamento).
+
+    :return: estado do job; `solicitacoes` > 1 indica pedidos agrupados.
+    """
+    global _job_ativo
+
+    with _lock:
+        ativo = _jobs.get(_job_ativo) if _job_ativo else None
+        if _em_andamento(ativo):
+            ativo["solicitacoes"] += 1
+            logger.info("♻️ Re-treino já em andamento, pedido agrupado no job %s", ativo["job_id"])
+            return _visao(ativo)
+
+        # envia antes de registrar: se o pool recusar, nenhum job fica
+        # pendente para sempre agrupando os pedidos seguintes
+        futuro = _submeter()
+
+        job_id = uuid.uuid4().hex
+        job = {
+            "job_id": job_id,
+            "status": PENDENTE,
+            "criado_em": datetime.now(),
+            "concluido_em": None,
+            "solicitacoes": 1,
+            "modelo_arquivo": None,
+            "metricas_residual": None,
+            "modelo_em_servico": None,
+            "erro": None,
+        }
+        _jobs[job_id] = job
+        _job_ativo = job_id
+        _futuros[job_id] = futuro
+        _descartar_antigos()
+        visao = _visao(job)
+
+    logger.info("🧵 Job de re-treino %s enfileirado", job_id)
+    futuro.add_done_callback(partial(_finalizar, job_id))
+    return visao
+
+
+def _finalizar(job_id: str, futuro) -> None:
+    """
+    Registra o resultado do job (callback do futuro, na thread de
+    gerenciamento do pool) e invalida a previsão em cache.
+    """
+    if futuro.cancelled():
+        # ex.: pool encerrado com cancel_futures (desligamento da API)
+        erro = CancelledError("job cancelado antes de executar")
+    else:
+        erro = futuro.exception()
+    resultado = None if erro else futuro.result()
+
+    if resultado is not None:
+        # a próxima previsão relê `models/` pelo registro e serve o bundle novo
+        forecast_service.limpar_cache()
+
+    with _lock:
+        job = _jobs.get(job_id)
+        _futuros.pop(job_id, None)
+        if job is None:
+            return
+
+        job["concluido_em"] = datetime.now()
+        if erro is not None:
+            job["status"] = FALHOU
+            job["erro"] = f"{type(erro).__name__}: {erro}"
+        else:
+            job["status"] = CONCLUIDO
+            job["modelo_arquivo"] = resultado["modelo_arquivo"]
+            job["metricas_residual"] = resultado["metricas_residual"]
+            job["modelo_em_servico"] = resultado["modelo_arquivo"]
+
+    if erro is not None:
+        logger.error("❌ Job de re-treino %s falhou: %s", job_id, erro)
+    else:
+        logger.info("✅ Job de re-treino %s concluído: %s", job_id, resultado["modelo_arquivo"])
+
+
+def obter_job(job_id: str) -> Dict[str, Any]:
+    with _lock:
+        job = _jobs.get(job_id)
+        if job is None:
+            raise JobNaoEncontradoError(f"Job de re-treino não encontrado: '{job_id}'")
+        return _visao(job)
+
+
+def encerrar(aguardar: bool = True) -> None:
+    """Finaliza o pool de re-treino (desligamento da API e testes)."""
+    global _executor
+    with _lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=aguardar, cancel_futures=not aguardar)
+
+
+def limpar() -> None:
+    """Utilitário de suporte a testes: esquece os jobs registrados."""
+    global _job_ativo
+    with _lock:
+        _jobs.clear()
+        _futuros.clear()
+        _job_ativo = None
@@ -0,0 +1,37 @@
+# api/services/pipeline_service.py
+"""
+Camada de serviço da API para a telemetria do pipeline.
+
+Expõe o resumo de `src.core.telemetria.relatorio_steps` (p50/p95 por step e
+regressões contra a linha de base) no formato dos schemas da API.
+"""
+
+import numpy as np
+
+from src.core import telemetria
+from util.log import logs
+
+logger = logs()
+
+
+def obter_telemetria(janela_recente: int = 5, tolerancia: float = None, limite_runs: int = 50) -> dict:
+    tolerancia = telemetria.TOLERANCIA_REGRESSAO if tolerancia is None else tolerancia
+
+    relatorio = telemetria.relatorio_steps(
+        janela_recente=janela_recente, tolerancia=tolerancia, limite_runs=limite_runs
+    )
+
+    # NaN não é JSON válido
+    registros = relatorio.astype(object).replace({np.nan: None}).to_dict(orient="records")
+
+    regressoes = [r["step"] for r in registros if r["regressao"]]
+    if regressoes:
+        logger.warning("⚠️ Regressão de tempo nos steps: %s", ", ".join(regressoes))
+
+    return {
+        "janela_recente": janela_recente,
+        "tolerancia": tolerancia,
+        "total_steps": len(registros),
+        "regressoes": regressoes,
+        "steps": registros,
+    }
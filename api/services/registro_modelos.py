@@ -0,0 +1,143 @@
+# api/services/registro_modelos.py
+"""
+Registro em memória dos modelos servidos pela API.
+
+Cada serviço registra um tipo de artefato com a função que localiza o
+artefato mais recente em um diretório (pelo `created_at` dos
+`*_meta.json`) e a que o desserializa. `obter` devolve o modelo já
+carregado e só volta ao disco quando o diretório muda — a assinatura é a
+listagem de `models/` (nome, tamanho e mtime de cada arquivo), obtida sem
+abrir nenhum JSON nem `.pkl`. Um artefato cujo arquivo não mudou não é
+desserializado de novo, mesmo que outros arquivos tenham aparecido.
+
+O registro é aquecido no startup da API (`aquecer`, chamado no lifespan de
+`api.main`), então a primeira requisição já encontra os modelos residentes.
+"""
+
+import os
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from util.log import logs
+
+logger = logs()
+
+
+@dataclass(frozen=True)
+class ModeloCarregado:
+    model_path: str
+    meta: dict
+    objeto: Any
+    mtime_ns: Optional[int]
+
+
+@dataclass
+class _Entrada:
+    assinatura: Optional[tuple]
+    modelo: Optional[ModeloCarregado]
+
+
+def assinatura_diretorio(diretorio: str) -> Optional[tuple]:
+    """(nome, tamanho, mtime) de cada arquivo do diretório, ou None se não existe."""
+    try:
+        with os.scandir(diretorio) as entradas:
+            return tuple(
+                sorted(
+                    (e.name, e.stat().st_size, e.stat().st_mtime_ns)
+                    for e in entradas
+                    if e.is_file()
+                )
+            )
+    except FileNotFoundError:
+        return None
+
+
+def _mtime_ns(caminho: str) -> Optional[int]:
+    try:
+        return os.stat(caminho).st_mtime_ns
+    except OSError:
+        return None
+
+
+class RegistroModelos:
+    def __init__(self):
+        self._tipos: Dict[str, Tuple[Callable, Callable, Callable]] = {}
+        self._entradas: Dict[Tuple[str, str], _Entrada] = {}
+        self._lock = threading.Lock()
+
+    def registrar(
+        self,
+        tipo: str,
+        localizar: Callable[[str], Tuple[Optional[str], Optional[dict]]],
+        carregar: Callable[[str], Any],
+        diretorio: Callable[[], str],
+    ) -> None:
+        """
+        :param localizar: `models_dir -> (model_path, meta)` do mais recente.
+        :param carregar: `model_path -> objeto` desserializado.
+        :param diretorio: diretório padrão do tipo (resolvido a cada chamada).
+        """
+        self._tipos[tipo] = (localizar, carregar, diretorio)
+
+    def obter(self, tipo: str, models_dir: Optional[str] = None) -> Optional[ModeloCarregado]:
+        """
+        Modelo mais recente do tipo, carregado uma única vez por versão do
+        diretório. None quando não há artefato; erros de desserialização
+        propagam (e a próxima chamada tenta de novo).
+        """
+        localizar, carregar, diretorio = self._tipos[tipo]
+        models_dir = models_dir or diretorio()
+        chave = (tipo, models_dir)
+        assinatura = assinatura_diretorio(models_dir)
+
+        with self._lock:
+            entrada = self._entradas.get(chave)
+        if entrada is not None and entrada.assinatura == assinatura:
+            return entrada.modelo
+
+        model_path, meta = localizar(models_dir)
+        if model_path is None:
+            self._guardar(chave, _Entrada(assinatura, None))
+            return None
+
+        mtime_ns = _mtime_ns(model_path)
+        anterior = entrada.modelo if entrada is not None else None
+
+        if (
+            anterior is not None
+            and mtime_ns is not None
+            and (anterior.model_path, anterior.mtime_ns) == (model_path, mtime_ns)
+        ):
+            modelo = ModeloCarregado(model_path, meta or {}, anterior.objeto, mtime_ns)
+        else:
+            modelo = ModeloCarregado(model_path, meta or {}, carregar(model_path), mtime_ns)
+            logger.info("📦 Registro de modelos: %s carregado (%s)", os.path.basename(model_path), tipo)
+
+        self._guardar(chave, _Entrada(assinatura, modelo))
+        return modelo
+
+    def _guardar(self, chave, entrada: _Entrada) -> None:
+        with self._lock:
+            self._entradas[chave] = entrada
+
+    def aquecer(self) -> Dict[str, Optional[str]]:
+        """Carrega o modelo mais recente de cada tipo registrado (startup da API)."""
+        carregados = {}
+        for tipo in list(self._tipos):
+            try:
+                modelo = self.obter(tipo)
+            except Exception:
+                logger.exception("⚠️ Registro de modelos: falha ao carregar o tipo %s", tipo)
+                modelo = None
+            carregados[tipo] = os.path.basename(modelo.model_path) if modelo else None
+
+        logger.info("🔥 Registro de modelos aquecido: %s", carregados)
+        return carregados
+
+    def invalidar(self) -> None:
+        with self._lock:
+            self._entradas.clear()
+
+
+registro = RegistroModelos()
@@ -13,6 +13,8 @@ import re
 import pandas as pd
 import plotly.graph_objects as go
 
+from processing.otimizacao_tipos import otimizar_tipos
+
 CORES_SEXO = {"masculino": "#5dade2", "feminino": "#ec7063"}
 CORES_STATUS = {"localizados": "#58d68d", "ainda desaparecidos": "#e74c3c"}
 
@@ -80,8 +82,12 @@ class SemDadosParaGraficoError(ValueError):
 
 
 def registros_para_dataframe(registros: List[Dict[str, Any]]) -> pd.DataFrame:
-    """Converte a lista de registros da API em DataFrame."""
-    return pd.DataFrame(registros or [])
+    """
+    Converte a lista de registros da API em DataFrame com tipos numéricos
+    enxutos (int32/float32 exatos). O texto segue como objeto para que os
+    agrupamentos por RA não virem categóricos.
+    """
+    return otimizar_tipos(pd.DataFrame(registros or []), inteiro_minimo="int32", categorizar=False)
 
 
 def colunas_numericas(df: pd.DataFrame) -> List[str]:
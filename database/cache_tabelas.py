@@ -0,0 +1,266 @@
+# database/cache_tabelas.py
+"""
+Cache em memória, compartilhado pelo processo, das tabelas gold lidas do banco.
+
+As entradas ficam em um LRU limitado em bytes (`database.cache_tabelas_mb`)
+e são invalidadas pelo "carimbo de versão" que o pipeline gold grava em `pipeline_runs` ao final de
+cada execução (`registrar_versao_dados`). A versão é consultada no banco no
+máximo uma vez a cada `intervalo_versao` segundos, então endpoints quentes não
+voltam ao Postgres enquanto os dados não mudam e deixam de servir dados
+antigos logo após um refresh.
+
+Os caches de payload dos serviços da API (previsão, classificação, análises)
+se registram como ouvintes e são esvaziados junto quando a versão muda.
+
+`LeituraCompartilhada` é o cache de leitura de um run do pipeline gold: cada
+tabela silver é lida do banco no máximo uma vez por run, mesmo quando vários
+steps a pedem ao mesmo tempo (single-flight).
+"""
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable, List, Optional
+
+import pandas as pd
+
+from database.repository.repository import obter_versao_dados
+from util.config_loader import get_config
+from util.log import logs
+
+logger = logs()
+
+CAPACIDADE_BYTES_PADRAO = (
+    int(get_config().get("database", {}).get("cache_tabelas_mb", 256)) * 1024 * 1024
+)
+INTERVALO_VERSAO_SEGUNDOS = 5.0
+
+
+def _versao_do_banco() -> Optional[str]:
+    return obter_versao_dados()
+
+
+@dataclass
+class _Entrada:
+    valor: Any
+    tamanho: int
+    geracao: int
+
+
+class CacheTabelas:
+    """
+    LRU de tabelas invalidado pela versão dos dados no banco.
+
+    O limite é em bytes (`DataFrame.memory_usage(deep=True)`), já que uma
+    única tabela gold pode ocupar mais que dezenas de páginas pequenas.
+    Cada entrada guarda a geração do cache em que foi carregada; uma carga
+    que termina depois de uma invalidação (mudança de versão ou
+    `invalidar()`) é devolvida ao chamador, mas não entra no cache.
+    """
+
+    def __init__(
+        self,
+        capacidade_bytes: int = CAPACIDADE_BYTES_PADRAO,
+        intervalo_versao: float = INTERVALO_VERSAO_SEGUNDOS,
+        obter_versao: Callable[[], Optional[str]] = _versao_do_banco,
+    ):
+        self.capacidade_bytes = capacidade_bytes
+        self.intervalo_versao = intervalo_versao
+        self._obter_versao = obter_versao
+        self._entradas: "OrderedDict[Hashable, _Entrada]" = OrderedDict()
+        self._bytes = 0
+        self._geracao = 0
+        self._ouvintes: List[Callable[[], None]] = []
+        self._versao: Optional[str] = None
+        self._verificado_em: Optional[float] = None
+        self._lock = threading.RLock()
+
+    def registrar_ouvinte(self, callback: Callable[[], None]) -> None:
+        """Registra uma função chamada sempre que o cache é invalidado por versão."""
+        with self._lock:
+            if callback not in self._ouvintes:
+                self._ouvintes.append(callback)
+
+    def verificar_versao(self) -> None:
+        """
+        Consulta a versão dos dados (respeitando `intervalo_versao`) e, se ela
+        mudou desde a última consulta, descarta todas as entradas e avisa os
+        ouvintes. Falha ao consultar a versão mantém o conteúdo atual.
+
+        A consulta ao banco roda fora do lock: só a thread que reservou a
+        verificação a faz, e as demais seguem servindo o cache enquanto isso.
+        """
+        with self._lock:
+            agora = time.monotonic()
+            if (
+                self._verificado_em is not None
+                and agora - self._verificado_em < self.intervalo_versao
+            ):
+                return
+
+            self._verificado_em = agora
+
+        try:
+            versao = self._obter_versao()
+        except Exception:
+            logger.exception("⚠️ Não foi possível consultar a versão dos dados")
+            return
+
+        with self._lock:
+            if versao == self._versao:
+                return
+
+            logger.info(
+                "♻️ Versão dos dados mudou (%s -> %s); invalidando cache de tabelas",
+                self._versao,
+                versao,
+            )
+            self._versao = versao
+            self._limpar()
+            ouvintes = list(self._ouvintes)
+
+        for callback in ouvintes:
+            callback()
+
+    def obter(self, chave: Hashable, carregar: Callable[[], Any]) -> Any:
+        """
+        Retorna o valor em cache para `chave` ou o carrega com `carregar()`.
+        Resultados None (tabela ausente/erro) não são armazenados. DataFrames
+        são devolvidos como cópia para que o chamador não altere o cache.
+        """
+        self.verificar_versao()
+
+        with self._lock:
+            entrada = self._entradas.get(chave)
+            if entrada is not None:
+                self._entradas.move_to_end(chave)
+                logger.info("♻️ Tabela servida do cache: %s", chave)
+                return _copia(entrada.valor)
+            geracao = self._geracao
+
+        valor = carregar()
+
+        if valor is None:
+            return None
+
+        self._guardar(chave, _Entrada(valor, _tamanho(valor), geracao))
+        return _copia(valor)
+
+    def _guardar(self, chave: Hashable, entrada: _Entrada) -> None:
+        with self._lock:
+            if entrada.geracao != self._geracao:
+                logger.info("⏭️ Carga de %s anterior à invalidação; não guardada", chave)
+                return
+            if entrada.tamanho > self.capacidade_bytes:
+                logger.info(
+                    "⏭️ %s ocupa %.1f MB, acima do limite do cache; não guardada",
+                    chave,
+                    entrada.tamanho / 1024**2,
+                )
+                return
+
+            anterior = self._entradas.pop(chave, None)
+            if anterior is not None:
+                self._bytes -= anterior.tamanho
+
+            self._entradas[chave] = entrada
+            self._bytes += entrada.tamanho
+
+            while self._bytes > self.capacidade_bytes:
+                _, descartada = self._entradas.popitem(last=False)
+                self._bytes -= descartada.tamanho
+
+    def _limpar(self) -> None:
+        self._entradas.clear()
+        self._bytes = 0
+        self._geracao += 1
+
+    def invalidar(self, chave: Optional[Hashable] = None) -> None:
+        """Descarta uma entrada (ou todas, quando `chave` é None)."""
+        with self._lock:
+            if chave is None:
+                self._limpar()
+                self._verificado_em = None
+            else:
+                entrada = self._entradas.pop(chave, None)
+                if entrada is not None:
+                    self._bytes -= entrada.tamanho
+
+    @property
+    def bytes_ocupados(self) -> int:
+        return self._bytes
+
+    def __len__(self) -> int:
+        return len(self._entradas)
+
+
+class LeituraCompartilhada:
+    """
+    Cache de leitura de escopo de um run, com de-duplicação de leituras
+    concorrentes: o primeiro pedido por uma chave carrega a tabela e os
+    pedidos simultâneos esperam pelo mesmo resultado.
+
+    Falhas e resultados None não ficam guardados (o próximo pedido, ex.: o
+    retry do step, tenta de novo). DataFrames são devolvidos como cópia.
+    """
+
+    def __init__(self):
+        self._entradas: "dict[Hashable, Future]" = {}
+        self._lock = threading.Lock()
+        self.leituras = 0
+
+    def obter(self, chave: Hashable, carregar: Callable[[], Any]) -> Any:
+        with self._lock:
+            futuro = self._entradas.get(chave)
+            dono = futuro is None
+            if dono:
+                futuro = Future()
+                self._entradas[chave] = futuro
+
+        if not dono:
+            logger.info("♻️ Tabela compartilhada no run: %s", chave)
+            return _copia(futuro.result())
+
+        try:
+            with self._lock:
+                self.leituras += 1
+            valor = carregar()
+        except BaseException as e:
+            self._descartar(chave)
+            futuro.set_exception(e)
+            raise
+
+        if valor is None:
+            self._descartar(chave)
+        futuro.set_result(valor)
+
+        return _copia(valor)
+
+    def _descartar(self, chave: Hashable) -> None:
+        with self._lock:
+            self._entradas.pop(chave, None)
+
+    def __len__(self) -> int:
+        return len(self._entradas)
+
+
+def _copia(valor: Any) -> Any:
+    if isinstance(valor, tuple):
+        return tuple(_copia(v) for v in valor)
+    return valor.copy() if isinstance(valor, pd.DataFrame) else valor
+
+
+def _tamanho(valor: Any) -> int:
+    """Bytes ocupados por `valor` (DataFrames por `memory_usage(deep=True)`)."""
+    if isinstance(valor, pd.DataFrame):
+        return int(valor.memory_usage(deep=True).sum())
+    if isinstance(valor, tuple):
+        return sum(_tamanho(v) for v in valor)
+    return sys.getsizeof(valor)
+
+
+# Instância única do processo
+cache_tabelas = CacheTabelas()
@@ -0,0 +1,100 @@
+# database/estrategias_carga.py
+"""
+Registro declarativo da estratégia de carga de cada tabela no Postgres.
+
+- FULL_REFRESH: recria a tabela inteira (staging + swap, ver `inserir_dados`).
+- APPEND_PARTICOES: acrescenta apenas as partições (ex.: anos) que ainda não
+  existem no banco; partições já carregadas não são reescritas.
+- UPSERT: grava pelas `chaves` somente as linhas novas ou alteradas; com
+  `remover_ausentes=True` também apaga as chaves que não vêm mais na carga
+  (sincronização completa).
+
+As chaves das tabelas gold vêm de `EsquemaTabela.chaves` em
+`validation/esquemas.py`; como cada carga gold é o resultado inteiro da
+agregação, elas removem as chaves ausentes. As tabelas silver
+(`database/load_csvs.py`) usam UPSERT pela chave real: `ano` nas séries
+anuais (um ano revisto na fonte é regravado) e a coluna de RA nas tabelas
+wide (RA × ano). Tabelas sem registro seguem em FULL_REFRESH.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Tuple
+
+from validation.esquemas import GOLD
+
+FULL_REFRESH = "full_refresh"
+APPEND_PARTICOES = "append_particoes"
+UPSERT = "upsert"
+
+MODOS_VALIDOS = frozenset({FULL_REFRESH, APPEND_PARTICOES, UPSERT})
+
+
+@dataclass(frozen=True)
+class EstrategiaCarga:
+    """Como uma tabela deve ser gravada a cada execução do pipeline."""
+
+    modo: str = FULL_REFRESH
+    chaves: Tuple[str, ...] = ()
+    coluna_particao: str = "ano"
+    remover_ausentes: bool = False
+
+    def __post_init__(self):
+        if self.modo not in MODOS_VALIDOS:
+            raise ValueError(
+                f"Modo de carga inválido: '{self.modo}'. "
+                f"Modos válidos: {sorted(MODOS_VALIDOS)}"
+            )
+        if self.modo == UPSERT and not self.chaves:
+            raise ValueError("Estratégia UPSERT exige ao menos uma chave")
+
+
+ESTRATEGIA_PADRAO = EstrategiaCarga()
+
+ESTRATEGIAS_GOLD: Dict[str, EstrategiaCarga] = {
+    tabela: EstrategiaCarga(modo=UPSERT, chaves=esquema.chaves, remover_ausentes=True)
+    for tabela, esquema in GOLD.items()
+    if esquema.chaves
+}
+
+# Coluna de RA de cada tabela silver no formato wide (uma linha por RA)
+_CHAVE_RA_SILVER = {
+    "feminicidio": "região_administrativa",
+    "homicidio": "regiao_administrativa",
+    "desaparecimento_regiao": "regiao_administrativa",
+    "violencia_idosos": "regiao_administrativa",
+    "furto_em_veiculo": "Região Administrativa",
+    "roubo_comercio": "Região Administrativa",
+    "roubo_pedestre": "Região Administrativa",
+    "roubo_transporte_coletivo": "Região Administrativa",
+    "roubo_veiculo": "Região Administrativa",
+    "injuria_racial": "regiao",
+    "latrocinio": "regiao",
+    "lesao_corporal_morte": "regiao",
+    "racismo": "regiao",
+}
+
+ESTRATEGIAS_SILVER: Dict[str, EstrategiaCarga] = {
+    # séries anuais (uma linha por ano): anos revistos na fonte são regravados
+    "populacao_df": EstrategiaCarga(modo=UPSERT, chaves=("ano",)),
+    "violencia_idosos_ocorrencias": EstrategiaCarga(modo=UPSERT, chaves=("ano",)),
+    "violencia_idosos_sexo": EstrategiaCarga(modo=UPSERT, chaves=("ano",)),
+    # o ano corrente ainda recebe meses/linhas: UPSERT pela chave completa
+    "violencia_idosos_mensais": EstrategiaCarga(modo=UPSERT, chaves=("ano", "mes")),
+    "desaparecidos_idade_sexo": EstrategiaCarga(
+        modo=UPSERT, chaves=("ano", "faixa_etaria", "sexo")
+    ),
+    "desaparecimento_localizados": EstrategiaCarga(
+        modo=UPSERT, chaves=("ano", "faixa_etaria", "status")
+    ),
+    **{
+        tabela: EstrategiaCarga(modo=UPSERT, chaves=(coluna,))
+        for tabela, coluna in _CHAVE_RA_SILVER.items()
+    },
+}
+
+ESTRATEGIAS: Dict[str, EstrategiaCarga] = {**ESTRATEGIAS_SILVER, **ESTRATEGIAS_GOLD}
+
+
+def estrategia_carga(tabela: str) -> EstrategiaCarga:
+    """Estratégia registrada para `tabela` (FULL_REFRESH quando ausente)."""
+    return ESTRATEGIAS.get(tabela, ESTRATEGIA_PADRAO)
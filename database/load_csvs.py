@@ -1,7 +1,8 @@
 # database/load_csvs.py
 
 from database.connection import obter_engine, close_engine
-from database.repository.repository import inserir_dados
+from database.repository.repository import salvar_dados
+from util.armazenamento import ler_dataset
 from util.log import logs
 import pandas as pd
 import time
@@ -43,14 +44,15 @@ def salvar_tabela():
         try:
             logger.info(f"📄 Lendo arquivo: {arquivo}")
 
-            df = pd.read_csv(arquivo, sep=";", encoding="utf-8")
+            # Parquet tipado quando existir; CSV como fallback
+            df = ler_dataset(arquivo)
 
             logger.info(
                 f"✅ Arquivo lido com sucesso | "
                 f"Linhas: {len(df)} | Colunas: {len(df.columns)}"
             )
 
-            inserir_dados(df, tabela)
+            salvar_dados(df, tabela)
 
             tempo_execucao = round(time.time() - inicio, 2)
 
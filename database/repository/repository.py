@@ -1,18 +1,39 @@
 # database/repository/repository.py
 
+import csv
+import io
+import re
 import time
 import pandas as pd
 from sqlalchemy import text
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy import inspect
 from sqlalchemy.engine import Engine
+from sqlalchemy.types import BigInteger, Double
 from database.connection import obter_engine
+from database.estrategias_carga import (
+    APPEND_PARTICOES,
+    FULL_REFRESH,
+    UPSERT,
+    EstrategiaCarga,
+    estrategia_carga,
+)
 from util.log import logs
+from validation.esquemas import GOLD
 
 logger = logs()
 
 _ENGINE: Engine | None = None
 
+# Sufixo da tabela sombra usada no refresh (carga + swap via RENAME)
+SUFIXO_STAGING = "__staging"
+
+# Sufixo da tabela temporária com as linhas novas/alteradas (carga incremental)
+SUFIXO_DELTA = "__delta"
+
+# Tabela com o carimbo de cada execução concluída do pipeline gold
+TABELA_VERSOES = "pipeline_runs"
+
 
 def conectar_banco() -> Engine:
     """
@@ -65,10 +86,234 @@ def carregar_tabela(nome_tabela: str) -> pd.DataFrame | None:
         logger.exception("🔥 Erro inesperado ao carregar a tabela '%s'", nome_tabela)
         return None
 
-def inserir_dados(dataframe: pd.DataFrame, tabela: str) -> None:
+# Operadores aceitos em `carregar_pagina` (coluna sempre citada, valor sempre
+# parâmetro de bind — nada do cliente é interpolado no SQL).
+_OPERADORES_FILTRO = {
+    ">=": "{coluna} >= {parametro}",
+    "<=": "{coluna} <= {parametro}",
+    "=": "{coluna} = {parametro}",
+    "igual_texto": "UPPER(CAST({coluna} AS TEXT)) = UPPER({parametro})",
+}
+
+
+def carregar_pagina(
+    nome_tabela: str,
+    limite: int,
+    deslocamento: int = 0,
+    filtros: tuple = (),
+    ordenar_por: tuple = (),
+) -> tuple[pd.DataFrame, int] | None:
+    """
+    Carrega uma página de registros com filtro, ordenação, LIMIT/OFFSET e
+    COUNT(*) executados no próprio banco.
+
+    `filtros` é uma sequência de `(coluna, operador, valor)`, com operador em
+    `_OPERADORES_FILTRO`. Filtros e ordenações sobre colunas que a tabela não
+    possui são ignorados. As chaves da tabela gold (`EsquemaTabela.chaves`)
+    entram no fim do ORDER BY como desempate, para que LIMIT/OFFSET devolva
+    páginas estáveis, sem linhas repetidas ou puladas entre uma e outra.
+
+    :return: tupla `(df_pagina, total_filtrado)`, ou None quando a tabela não
+        existe ou a consulta falha.
+    """
+    if not nome_tabela.isidentifier():
+        logger.error("🚫 Nome de tabela inválido: '%s'", nome_tabela)
+        return None
+
+    desconhecidos = {operador for _, operador, _ in filtros} - set(_OPERADORES_FILTRO)
+    if desconhecidos:
+        raise ValueError(f"Operadores de filtro inválidos: {sorted(desconhecidos)}")
+
+    _ENGINE = conectar_banco()
+    inicio = time.perf_counter()
+
+    try:
+        inspector = inspect(_ENGINE)
+        if not inspector.has_table(nome_tabela):
+            logger.warning("⚠️ Tabela '%s' não existe no banco", nome_tabela)
+            return None
+
+        colunas = {c["name"] for c in inspector.get_columns(nome_tabela)}
+
+        condicoes = []
+        parametros = {}
+        for i, (coluna, operador, valor) in enumerate(filtros):
+            if coluna not in colunas:
+                continue
+            nome_parametro = f"p{i}"
+            condicoes.append(
+                _OPERADORES_FILTRO[operador].format(
+                    coluna=_quote_ident(coluna), parametro=f":{nome_parametro}"
+                )
+            )
+            parametros[nome_parametro] = valor
+
+        origem = _quote_ident(nome_tabela)
+        where = f" WHERE {' AND '.join(condicoes)}" if condicoes else ""
+        esquema = GOLD.get(nome_tabela)
+        desempate = esquema.chaves if esquema else ()
+        ordem = [
+            _quote_ident(c)
+            for c in dict.fromkeys([*ordenar_por, *desempate])
+            if c in colunas
+        ]
+        order_by = f" ORDER BY {', '.join(ordem)}" if ordem else ""
+
+        with _ENGINE.connect() as conn:
+            total = conn.execute(
+                text(f"SELECT COUNT(*) FROM {origem}{where}"), parametros
+            ).scalar_one()
+
+            df = pd.read_sql(
+                text(
+                    f"SELECT * FROM {origem}{where}{order_by} "
+                    f"LIMIT :limite OFFSET :deslocamento"
+                ),
+                conn,
+                params={**parametros, "limite": limite, "deslocamento": deslocamento},
+            )
+
+        logger.info(
+            "✅ Página de '%s' carregada (%s de %s linhas) em %.2fs",
+            nome_tabela,
+            len(df),
+            total,
+            time.perf_counter() - inicio,
+        )
+
+        return df, int(total)
+
+    except SQLAlchemyError:
+        logger.exception("🔥 Erro SQL ao consultar a tabela '%s'", nome_tabela)
+        return None
+
+    except Exception:
+        logger.exception("🔥 Erro inesperado ao consultar a tabela '%s'", nome_tabela)
+        return None
+
+def _quote_ident(nome: str) -> str:
+    """Cita um identificador SQL (aspas duplas, escapando as internas)."""
+    return '"' + str(nome).replace('"', '""') + '"'
+
+
+def _copy_from_stdin(table, conn, keys, data_iter) -> int:
+    """
+    Método de inserção para `DataFrame.to_sql` via `COPY ... FROM STDIN`.
+
+    Serializa as linhas como CSV em memória e as envia ao PostgreSQL em um
+    único stream (`cursor.copy_expert` do psycopg2), evitando os INSERTs
+    parametrizados gigantes do `method="multi"`. Conexões cujo driver não
+    suporta COPY (ex.: SQLite usado como stand-in nos testes) recebem um
+    INSERT em lote equivalente.
+    """
+    linhas = list(data_iter)
+    dbapi_conn = conn.connection
+    cursor = dbapi_conn.cursor()
+
+    try:
+        if not hasattr(cursor, "copy_expert"):
+            if linhas:
+                conn.execute(
+                    table.table.insert(),
+                    [dict(zip(keys, linha)) for linha in linhas],
+                )
+            return len(linhas)
+
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(linhas)
+        buffer.seek(0)
+
+        nome = _quote_ident(table.name)
+        if table.schema:
+            nome = f"{_quote_ident(table.schema)}.{nome}"
+        colunas = ", ".join(_quote_ident(k) for k in keys)
+
+        cursor.copy_expert(
+            f"COPY {nome} ({colunas}) FROM STDIN WITH (FORMAT csv)", buffer
+        )
+        return len(linhas)
+
+    finally:
+        cursor.close()
+
+
+def _nome_indice(tabela: str, colunas) -> str:
+    """Nome determinístico do índice `colunas` da tabela `tabela`."""
+    return f"ix_{tabela}_{'_'.join(colunas)}"
+
+
+def _trocar_tabela_staging(conn, tabela: str, staging: str, indices) -> None:
+    """
+    Promove a tabela staging a definitiva na transação corrente.
+
+    Só executa DROP + RENAME (operações de catálogo), então o lock exclusivo
+    sobre `tabela` dura milissegundos: leitores nunca veem a tabela ausente
+    nem ficam bloqueados durante a carga em si.
+    """
+    conn.execute(text(f"DROP TABLE IF EXISTS {_quote_ident(tabela)}"))
+    conn.execute(
+        text(f"ALTER TABLE {_quote_ident(staging)} RENAME TO {_quote_ident(tabela)}")
+    )
+
+    for colunas in indices:
+        indice_staging = _quote_ident(_nome_indice(staging, colunas))
+        indice_final = _quote_ident(_nome_indice(tabela, colunas))
+
+        if conn.dialect.name == "postgresql":
+            conn.execute(text(f"ALTER INDEX {indice_staging} RENAME TO {indice_final}"))
+        else:
+            # Dialetos sem ALTER INDEX (ex.: SQLite nos testes) recriam o índice
+            conn.execute(text(f"DROP INDEX {indice_staging}"))
+            conn.execute(
+                text(
+                    f"CREATE INDEX {indice_final} ON {_quote_ident(tabela)} "
+                    f"({', '.join(_quote_ident(c) for c in colunas)})"
+                )
+            )
+
+
+def _tipos_sql(df: pd.DataFrame) -> dict:
+    """
+    Tipos SQL largos para as colunas numéricas de `df` (`dtype=` do
+    `to_sql`): inteiros de qualquer largura viram BIGINT e floats DOUBLE
+    PRECISION, em vez de SMALLINT/REAL inferidos de um int16/float32.
+    """
+    tipos = {}
+    for coluna, dtype in df.dtypes.items():
+        if pd.api.types.is_bool_dtype(dtype):
+            continue
+        if pd.api.types.is_integer_dtype(dtype):
+            tipos[coluna] = BigInteger()
+        elif pd.api.types.is_float_dtype(dtype):
+            tipos[coluna] = Double()
+    return tipos
+
+
+def inserir_dados(
+    dataframe: pd.DataFrame,
+    tabela: str,
+    bulk: bool = True,
+    indices: tuple = (),
+) -> None:
     """
     Insere dados na tabela com estratégia FULL REFRESH.
     Sempre apaga e recria a tabela ao rodar a aplicação.
+
+    A carga é feita em `<tabela>__staging` (DDL gerado a partir dos dtypes
+    do DataFrame); em seguida os `indices` (tuplas de colunas) são criados
+    na staging e a troca pela tabela definitiva acontece em uma transação
+    curta, via `ALTER TABLE ... RENAME`. Leitores da tabela antiga não são
+    bloqueados enquanto a carga roda.
+
+    Com `bulk=True` (padrão) as linhas seguem por `COPY FROM STDIN` em um
+    único stream; `bulk=False` mantém o INSERT multi-valores em chunks.
+
+    Colunas numéricas são criadas sempre como BIGINT/DOUBLE PRECISION
+    (`_tipos_sql`), mesmo que o DataFrame chegue com tipos reduzidos: as
+    cargas incrementais seguintes (UPSERT/APPEND) inserem na mesma tabela e
+    não podem esbarrar em um SMALLINT/REAL herdado da primeira carga. A
+    redução de tipos (`otimizar_tipos`) fica restrita ao que é servido em
+    memória pela API.
     """
     
     logger.info(
@@ -80,6 +325,16 @@ def inserir_dados(dataframe: pd.DataFrame, tabela: str) -> None:
     if not tabela.isidentifier():
         logger.error("🚫 Nome de tabela inválido: '%s'", tabela)
         return
+
+    # identificadores são citados; aceita nomes com espaço (ex.: "Região Administrativa")
+    colunas_invalidas = [
+        c for colunas in indices for c in colunas if not re.fullmatch(r"[\w ]+", c)
+    ]
+    if colunas_invalidas:
+        logger.error("🚫 Colunas de índice inválidas: %s", colunas_invalidas)
+        return
+
+    staging = f"{tabela}{SUFIXO_STAGING}"
     _ENGINE = conectar_banco()
     inicio = time.perf_counter()
 
@@ -91,24 +346,45 @@ def inserir_dados(dataframe: pd.DataFrame, tabela: str) -> None:
 
         logger.debug("🕒 Coluna 'inserido_em' adicionada com timestamp UTC")
 
-        # Transação segura
+        # Carga na staging: a tabela servida pela API segue intacta
         with _ENGINE.begin() as conn:
             df.to_sql(
-                tabela,
+                staging,
                 conn,
-                if_exists="replace",  # 🔥 recria tabela sempre
+                if_exists="replace",  # 🔥 descarta staging de carga anterior
                 index=False,
-                method="multi",
-                chunksize=5000,
+                dtype=_tipos_sql(df),
+                method=_copy_from_stdin if bulk else "multi",
+                chunksize=None if bulk else 5000,
             )
 
+            for colunas in indices:
+                conn.execute(
+                    text(
+                        f"CREATE INDEX {_quote_ident(_nome_indice(staging, colunas))} "
+                        f"ON {_quote_ident(staging)} "
+                        f"({', '.join(_quote_ident(c) for c in colunas)})"
+                    )
+                )
+
+        duracao_carga = time.perf_counter() - inicio
+
+        # Swap atômico e curto
+        with _ENGINE.begin() as conn:
+            _trocar_tabela_staging(conn, tabela, staging, indices)
+
         duracao = time.perf_counter() - inicio
+        linhas_por_segundo = len(df) / duracao_carga if duracao_carga > 0 else float(len(df))
 
         logger.info(
-            "✅ Tabela '%s' recriada com sucesso (%s linhas) em %.2fs",
+            "✅ Tabela '%s' recriada com sucesso (%s linhas) em %.2fs "
+            "(%.0f linhas/s, modo=%s, swap=%.3fs)",
             tabela,
             len(df),
             duracao,
+            linhas_por_segundo,
+            "copy" if bulk else "multi",
+            duracao - duracao_carga,
         )
 
     except SQLAlchemyError:
@@ -125,6 +401,236 @@ def inserir_dados(dataframe: pd.DataFrame, tabela: str) -> None:
         )
         raise
     
+def _carregar_delta(conn, df: pd.DataFrame, tabela: str) -> str:
+    """Copia `df` (via COPY) para a tabela auxiliar `<tabela>__delta`."""
+    tabela_delta = f"{tabela}{SUFIXO_DELTA}"
+    df.to_sql(
+        tabela_delta,
+        conn,
+        if_exists="replace",
+        index=False,
+        dtype=_tipos_sql(df),
+        method=_copy_from_stdin,
+    )
+    return tabela_delta
+
+
+def _gravar_delta(conn, delta: pd.DataFrame, tabela: str) -> int:
+    """
+    Acrescenta `delta` a `tabela` na transação corrente: as linhas vão para
+    a tabela auxiliar via COPY e seguem em um único INSERT ... SELECT.
+    """
+    tabela_delta = _carregar_delta(conn, delta, tabela)
+    colunas = ", ".join(_quote_ident(c) for c in delta.columns)
+
+    inseridas = conn.execute(
+        text(
+            f"INSERT INTO {_quote_ident(tabela)} ({colunas}) "
+            f"SELECT {colunas} FROM {_quote_ident(tabela_delta)}"
+        )
+    ).rowcount
+    conn.execute(text(f"DROP TABLE {_quote_ident(tabela_delta)}"))
+    return inseridas
+
+
+def _upsert_por_chaves(
+    conn, df: pd.DataFrame, tabela: str, chaves: tuple, remover_ausentes: bool = False
+) -> tuple[int, int]:
+    """
+    Aplica o UPSERT de `df` em `tabela` inteiramente no banco, na transação
+    corrente. O DataFrame completo vai para a tabela auxiliar via COPY e a
+    comparação com o conteúdo gravado acontece em SQL:
+
+    1. com `remover_ausentes`, remove as chaves que não existem mais em `df`;
+    2. remove as linhas cujas colunas diferem (`IS DISTINCT FROM`);
+    3. insere as chaves de `df` ausentes da tabela (novas + alteradas).
+
+    Chaves e valores são comparados com `IS [NOT] DISTINCT FROM`, então
+    nulos se equivalem e linhas com chave nula não são regravadas a cada
+    carga. Linhas iguais não são tocadas (mantêm o `inserido_em` original).
+
+    :return: (linhas removidas, linhas inseridas).
+    """
+    tabela_delta = _carregar_delta(conn, df, tabela)
+    t, d = _quote_ident(tabela), _quote_ident(tabela_delta)
+
+    mesma_chave = " AND ".join(
+        f"t.{_quote_ident(c)} IS NOT DISTINCT FROM d.{_quote_ident(c)}" for c in chaves
+    )
+    valores = [c for c in df.columns if c not in chaves and c != "inserido_em"]
+    colunas = ", ".join(_quote_ident(c) for c in df.columns)
+
+    removidas = 0
+    if remover_ausentes:
+        removidas = conn.execute(
+            text(
+                f"DELETE FROM {t} AS t WHERE NOT EXISTS "
+                f"(SELECT 1 FROM {d} AS d WHERE {mesma_chave})"
+            )
+        ).rowcount
+
+    if valores:
+        diferentes = " OR ".join(
+            f"t.{_quote_ident(c)} IS DISTINCT FROM d.{_quote_ident(c)}" for c in valores
+        )
+        removidas += conn.execute(
+            text(
+                f"DELETE FROM {t} AS t WHERE EXISTS "
+                f"(SELECT 1 FROM {d} AS d WHERE {mesma_chave} AND ({diferentes}))"
+            )
+        ).rowcount
+
+    inseridas = conn.execute(
+        text(
+            f"INSERT INTO {t} ({colunas}) SELECT {colunas} FROM {d} AS d "
+            f"WHERE NOT EXISTS (SELECT 1 FROM {t} AS t WHERE {mesma_chave})"
+        )
+    ).rowcount
+
+    conn.execute(text(f"DROP TABLE {d}"))
+    return removidas, inseridas
+
+
+def salvar_dados(
+    dataframe: pd.DataFrame,
+    tabela: str,
+    estrategia: EstrategiaCarga | None = None,
+) -> None:
+    """
+    Persiste `dataframe` segundo a estratégia de carga da tabela
+    (`database/estrategias_carga.py`).
+
+    APPEND_PARTICOES grava só as partições ainda ausentes no banco. UPSERT
+    grava pelas chaves, com a comparação feita no próprio banco (ver
+    `_upsert_por_chaves`): chaves novas entram e alteradas são regravadas;
+    as que sumiram do DataFrame só são removidas com
+    `estrategia.remover_ausentes`.
+    Se a tabela ainda não existe, as colunas divergem do que está gravado ou
+    o DataFrame repete chaves, a carga cai para FULL REFRESH.
+    """
+    estrategia = estrategia or estrategia_carga(tabela)
+    indices = (estrategia.chaves,) if estrategia.chaves else ()
+
+    if estrategia.modo == FULL_REFRESH or not tabela.isidentifier():
+        inserir_dados(dataframe, tabela, indices=indices)
+        return
+
+    if estrategia.modo == UPSERT and dataframe.duplicated(list(estrategia.chaves)).any():
+        logger.warning(
+            "⚠️ '%s' tem chaves %s repetidas; carga completa", tabela, estrategia.chaves
+        )
+        inserir_dados(dataframe, tabela, indices=indices)
+        return
+
+    _ENGINE = conectar_banco()
+
+    if not inspect(_ENGINE).has_table(tabela):
+        logger.info("🆕 Tabela '%s' ainda não existe; carga completa", tabela)
+        inserir_dados(dataframe, tabela, indices=indices)
+        return
+
+    colunas_banco = {
+        c["name"] for c in inspect(_ENGINE).get_columns(tabela)
+    } - {"inserido_em"}
+
+    if colunas_banco != set(dataframe.columns):
+        logger.warning(
+            "⚠️ Colunas de '%s' mudaram desde a última carga; carga completa", tabela
+        )
+        inserir_dados(dataframe, tabela, indices=indices)
+        return
+
+    inicio = time.perf_counter()
+
+    if estrategia.modo == APPEND_PARTICOES:
+        coluna = estrategia.coluna_particao
+        with _ENGINE.connect() as conn:
+            existentes = pd.read_sql(
+                text(f"SELECT DISTINCT {_quote_ident(coluna)} FROM {_quote_ident(tabela)}"),
+                conn,
+            )[coluna]
+        dados = dataframe[~dataframe[coluna].isin(existentes)]
+
+        if dados.empty:
+            logger.info(
+                "⏭️ Tabela '%s' sem alterações (%s); nada a gravar",
+                tabela,
+                estrategia.modo,
+            )
+            return
+    else:
+        dados = dataframe
+
+    dados = dados.copy()
+    dados["inserido_em"] = pd.Timestamp.now(tz="UTC")
+
+    try:
+        with _ENGINE.begin() as conn:
+            if estrategia.modo == APPEND_PARTICOES:
+                removidas, inseridas = 0, _gravar_delta(conn, dados, tabela)
+            else:
+                removidas, inseridas = _upsert_por_chaves(
+                    conn, dados, tabela, estrategia.chaves, estrategia.remover_ausentes
+                )
+
+    except Exception:
+        logger.exception(
+            "🔥 Erro na carga incremental da tabela '%s'",
+            tabela,
+        )
+        raise
+
+    if not (removidas or inseridas):
+        logger.info(
+            "⏭️ Tabela '%s' sem alterações (%s); nada a gravar",
+            tabela,
+            estrategia.modo,
+        )
+        return
+
+    logger.info(
+        "✅ Tabela '%s' atualizada (%s): %s linhas gravadas e %s removidas "
+        "de %s no DataFrame em %.2fs",
+        tabela,
+        estrategia.modo,
+        inseridas,
+        removidas,
+        len(dataframe),
+        time.perf_counter() - inicio,
+    )
+
+
+def registrar_versao_dados(run_id: str) -> None:
+    """
+    Grava em `pipeline_runs` o carimbo da execução do pipeline gold recém
+    concluída. O maior `concluido_em` é a versão dos dados usada para
+    invalidar os caches da API (`database/cache_tabelas.py`).
+    """
+    _ENGINE = conectar_banco()
+    registro = pd.DataFrame(
+        [{"run_id": run_id, "concluido_em": pd.Timestamp.now(tz="UTC")}]
+    )
+
+    with _ENGINE.begin() as conn:
+        registro.to_sql(TABELA_VERSOES, conn, if_exists="append", index=False)
+
+    logger.info("🏷️ Versão dos dados registrada (run_id=%s)", run_id)
+
+
+def obter_versao_dados() -> str | None:
+    """Versão atual dos dados (último `concluido_em`), ou None se nunca registrada."""
+    _ENGINE = conectar_banco()
+
+    with _ENGINE.connect() as conn:
+        if not inspect(conn).has_table(TABELA_VERSOES):
+            return None
+        versao = conn.execute(
+            text(f"SELECT MAX(concluido_em) FROM {TABELA_VERSOES}")
+        ).scalar()
+
+    return None if versao is None else str(versao)
+
+
 def listar_tabelas():
     logger.info("Listando tabelas do banco de dados")
 
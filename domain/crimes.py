@@ -1,14 +1,25 @@
 import pandas as pd
-from functools import reduce
-from typing import List
+from typing import List, Optional
+from util.dimensao_ra import COLUNA_RA, alinhar_categorias_ra
 from util.log import logs
 from validation.validator import validar_chaves
 
 logger = logs()
 
-def merge_seguro(dfs: List[pd.DataFrame], keys: List[str]) -> pd.DataFrame:
+def merge_seguro(
+    dfs: List[pd.DataFrame], keys: List[str], valor_ausente: Optional[object] = None
+) -> pd.DataFrame:
     """
-    Realiza merge seguro entre múltiplos DataFrames com validações e logging.
+    Consolida múltiplos DataFrames (outer join em `keys`) em uma única passada.
+
+    Cada DataFrame é indexado pelas chaves uma única vez; a unicidade é
+    checada no índice (só os que falham passam pela validação detalhada) e o
+    resultado é montado com um único `pd.concat(axis=1)` sobre a união das
+    chaves, sem as cópias intermediárias do merge progressivo.
+
+    :param valor_ausente: quando informado, preenche as colunas de valor das
+        combinações de chave ausentes em algum DataFrame (as chaves nunca
+        são preenchidas).
     """
 
     logger.info(
@@ -20,44 +31,54 @@ def merge_seguro(dfs: List[pd.DataFrame], keys: List[str]) -> pd.DataFrame:
         raise ValueError("A lista de DataFrames não pode ser vazia")
 
     try:
+        if len(dfs) == 1:
+            validar_chaves(dfs[0], keys)
+            resultado = dfs[0]
+            if valor_ausente is not None:
+                resultado = _preencher_valores(resultado, keys, valor_ausente)
+            return resultado
+
+        # chave de RA como Categorical comum: o alinhamento compara códigos inteiros
+        if COLUNA_RA in keys:
+            dfs = alinhar_categorias_ra(dfs, COLUNA_RA)
+
         # -------------------------
-        # VALIDA CHAVES
+        # INDEXA E VALIDA CHAVES
         # -------------------------
-        for i, df in enumerate(dfs):
-            logger.info(
-                "Validando chaves do DataFrame",
-                extra={"indice_df": i, "shape": df.shape},
+        indexados = [df.set_index(keys) for df in dfs]
+
+        for i, (df, indexado) in enumerate(zip(dfs, indexados)):
+            if not indexado.index.is_unique:
+                # 🔎 relatório detalhado das duplicidades (levanta ValueError)
+                validar_chaves(df, keys)
+
+        colunas = [c for indexado in indexados for c in indexado.columns]
+        repetidas = sorted({c for c in colunas if colunas.count(c) > 1})
+        if repetidas:
+            raise ValueError(
+                f"Colunas de valor repetidas entre os DataFrames: {repetidas}"
             )
-            validar_chaves(df, keys)
 
         # -------------------------
-        # MERGE PROGRESSIVO
+        # ALINHAMENTO ÚNICO
         # -------------------------
-        def merge_step(left: pd.DataFrame, right: pd.DataFrame, step: int):
-            linhas_left = len(left)
-            linhas_right = len(right)
-
-            resultado = pd.merge(left, right, on=keys, how="outer")
-
-            linhas_resultado = len(resultado)
-
-            logger.info(
-                "Merge realizado",
-                extra={
-                    "step": step,
-                    "linhas_left": linhas_left,
-                    "linhas_right": linhas_right,
-                    "linhas_resultado": linhas_resultado,
-                    "delta_linhas": linhas_resultado - max(linhas_left, linhas_right),
-                },
-            )
-
-            return resultado
+        resultado = (
+            pd.concat(indexados, axis=1, join="outer")
+            .sort_index()
+            .reset_index()
+        )
 
-        resultado = dfs[0]
+        logger.info(
+            "Merge realizado",
+            extra={
+                "linhas_por_df": [len(df) for df in dfs],
+                "linhas_resultado": len(resultado),
+                "delta_linhas": len(resultado) - max(len(df) for df in dfs),
+            },
+        )
 
-        for i in range(1, len(dfs)):
-            resultado = merge_step(resultado, dfs[i], i)
+        if valor_ausente is not None:
+            resultado = _preencher_valores(resultado, keys, valor_ausente)
 
         logger.info(
             "Merge concluído com sucesso", extra={"shape_final": resultado.shape}
@@ -67,4 +88,9 @@ def merge_seguro(dfs: List[pd.DataFrame], keys: List[str]) -> pd.DataFrame:
 
     except Exception:
         logger.exception("Erro durante o merge seguro", extra={"keys": keys})
-        raise
\ No newline at end of file
+        raise
+
+
+def _preencher_valores(df: pd.DataFrame, keys: List[str], valor) -> pd.DataFrame:
+    """fillna só nas colunas de valor (a RA categórica não aceita `valor`)."""
+    return df.fillna({coluna: valor for coluna in df.columns.difference(keys)})
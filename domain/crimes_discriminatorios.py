@@ -1,12 +1,10 @@
-import pandas as pd
-from functools import reduce
+from domain.crimes import merge_seguro
 from ingestion.repository_adapter import Repository
 from util.padronizacao import (
     padronizar_regiao,
     transformar_wide_para_long,
     normalizar_colunas,
 )
-from validation.validator import validar_chaves
 
 
 class CrimesDiscriminatoriosService:
@@ -46,22 +44,21 @@ class CrimesDiscriminatoriosService:
 
         dfs = [df_racismo, df_injuria]
 
-        # 🔒 validação antes do merge
-        for df in dfs:
-            validar_chaves(df, ["ano", "regiao_administrativa"])
-
-        df_final = reduce(
-            lambda left, right: pd.merge(
-                left, right, on=["ano", "regiao_administrativa"], how="outer"
-            ),
+        # 🔒 chaves validadas e alinhadas em uma única passada
+        df_final = merge_seguro(
             dfs,
+            keys=["ano", "regiao_administrativa"],
+            valor_ausente=0,
         )
 
-        df_final = df_final.fillna(0)
-
         # 🔧 tipagem
         for col in df_final.columns:
             if col not in ["ano", "regiao_administrativa"]:
                 df_final[col] = df_final[col].astype(int)
 
-        return df_final.sort_values(["ano", "regiao_administrativa"])
+        # a RA do merge é categórica ordenada por `ra_id`: ordena pelo nome
+        return df_final.sort_values(
+            ["ano", "regiao_administrativa"],
+            key=lambda serie: serie.astype(str) if serie.name == "regiao_administrativa" else serie,
+            kind="stable",
+        )
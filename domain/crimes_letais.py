@@ -1,5 +1,4 @@
-import pandas as pd
-from functools import reduce
+from domain.crimes import merge_seguro
 from ingestion.repository_adapter import Repository
 from processing.transform import processar_dataset_base
 from util.padronizacao import (
@@ -8,7 +7,6 @@ from util.padronizacao import (
     recriar_regiao_com_valor,
     normalizar_colunas,
 )
-from validation.validator import validar_chaves
 
 
 class CrimesLetaisService:
@@ -68,17 +66,9 @@ class CrimesLetaisService:
 
         dfs = [df_homicidio, df_latrocinio, df_lesao]
 
-        # 🔒 validação antes do merge
-        for df in dfs:
-            validar_chaves(df, ["ano", "regiao_administrativa"])
-
-        df_final = reduce(
-            lambda left, right: pd.merge(
-                left, right, on=["ano", "regiao_administrativa"], how="outer"
-            ),
+        # 🔒 chaves validadas e alinhadas em uma única passada
+        return merge_seguro(
             dfs,
+            keys=["ano", "regiao_administrativa"],
+            valor_ausente=0,
         )
-
-        df_final = df_final.fillna(0)
-
-        return df_final
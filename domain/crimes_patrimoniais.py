@@ -17,9 +17,8 @@ class CrimesPatrimoniaisService:
             for cfg in DATASETS_CONFIG
         ]
 
-        df_final = merge_seguro(
+        return merge_seguro(
             dfs,
             keys=["ano", "regiao_administrativa"],
+            valor_ausente=0,
         )
-
-        return df_final.fillna(0)
@@ -2,8 +2,8 @@ import pandas as pd
 from ingestion.repository_adapter import Repository
 from domain.violencia_mulher import ViolenciaMulherService
 from util.padronizacao import (
+    MAPEAMENTO_REGIOES_ADMINISTRATIVAS,
     padronizar_regiao,
-    renomear_regioes_conhecidas,
     normalizar_colunas,
 )
 
@@ -36,12 +36,16 @@ class IdentificacaoCrimesService:
             "motivação",
         ]
 
-        for col in colunas_padronizar:
-            df = padronizar_regiao(df, col)
-
         # 🔹 regras de negócio: mapeamento mestre de variantes de nome de RA
-        # (centralizado em util/padronizacao.py, ver MAPEAMENTO_REGIOES_ADMINISTRATIVAS)
-        df = renomear_regioes_conhecidas(df, "regiao_administrativa")
+        # (centralizado em util/padronizacao.py, ver MAPEAMENTO_REGIOES_ADMINISTRATIVAS),
+        # aplicado na mesma passada da padronização
+        for col in colunas_padronizar:
+            mapeamento = (
+                MAPEAMENTO_REGIOES_ADMINISTRATIVAS
+                if col == "regiao_administrativa"
+                else None
+            )
+            df = padronizar_regiao(df, col, mapeamento=mapeamento)
 
         # 🔹 tipagem segura
         df[["idade___vítima", "idade___autor"]] = (
@@ -1,8 +1,8 @@
 import pandas as pd
 from ingestion.repository_adapter import Repository
 from util.padronizacao import (
+    MAPEAMENTO_REGIOES_ADMINISTRATIVAS,
     padronizar_regiao,
-    renomear_regioes_conhecidas,
     recriar_regiao_com_valor,
     normalizar_colunas,
 )
@@ -18,10 +18,11 @@ class ViolenciaMulherService:
             coluna_regiao="região_administrativa",
             nome_valor="casos_feminicidios",
             drop=["inserido_em"],
+            # regras de negócio: mapeamento mestre de variantes de nome de RA
+            # (centralizado em util/padronizacao.py, ver MAPEAMENTO_REGIOES_ADMINISTRATIVAS)
+            mapeamento_regioes=MAPEAMENTO_REGIOES_ADMINISTRATIVAS,
         )
-        # regras de negócio: mapeamento mestre de variantes de nome de RA
-        # (centralizado em util/padronizacao.py, ver MAPEAMENTO_REGIOES_ADMINISTRATIVAS)
-        return renomear_regioes_conhecidas(df, "regiao_administrativa")
+        return df
 
     @staticmethod
     def carregar_crimes_contra_mulher():
@@ -38,13 +39,13 @@ class ViolenciaMulherService:
             .rename(columns={"ra": "regiao_administrativa"})
         )
 
-        df = padronizar_regiao(df, "regiao_administrativa")
-
-        df = df.rename(columns={"#_casos": "crimes_contra_mulher"})
-
         # regras de negócio: mapeamento mestre de variantes de nome de RA
         # (centralizado em util/padronizacao.py, ver MAPEAMENTO_REGIOES_ADMINISTRATIVAS)
-        df = renomear_regioes_conhecidas(df, "regiao_administrativa")
+        df = padronizar_regiao(
+            df, "regiao_administrativa", mapeamento=MAPEAMENTO_REGIOES_ADMINISTRATIVAS
+        )
+
+        df = df.rename(columns={"#_casos": "crimes_contra_mulher"})
 
         df = recriar_regiao_com_valor(df, nome_regiao="VARJAO", coluna_regiao="regiao_administrativa", valor_padrao=0)
         df = recriar_regiao_com_valor(df, nome_regiao="LAGO NORTE", coluna_regiao="regiao_administrativa", valor_padrao=0)
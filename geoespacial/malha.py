@@ -157,6 +157,8 @@ def agregar_por_celula(
             f"Tabela exige as colunas '{coluna_regiao}' e '{coluna_valor}'"
         )
 
+    from util.dimensao_ra import centroide_ra
+
     totais = (
         df_gold.groupby(df_gold[coluna_regiao].map(_chave_regiao))[coluna_valor]
         .sum()
@@ -164,7 +166,8 @@ def agregar_por_celula(
 
     registros = []
     for chave, valor in totais.items():
-        centroide = CENTROIDES_RA.get(chave)
+        # apelidos (ex.: "PLANO PILOTO", "SOL NASCENTE") resolvidos pela dimensão
+        centroide = CENTROIDES_RA.get(chave) or centroide_ra(chave)
         if centroide is None:
             logger.warning("Sem centróide cadastrado para RA", extra={"ra": chave})
             continue
@@ -1,10 +1,49 @@
-from database.repository.repository import carregar_tabela, inserir_dados
+from contextlib import contextmanager
+
+from database.cache_tabelas import LeituraCompartilhada, cache_tabelas
+from database.repository.repository import (
+    carregar_tabela,
+    registrar_versao_dados,
+    salvar_dados,
+)
+from validation.esquemas import GOLD
+
+# cache de leitura do run em andamento (ver Repository.leitura_compartilhada)
+_leitura_do_run = None
+
 
 class Repository:
     @staticmethod
     def load(nome):
+        # tabelas gold passam pelo cache do processo (invalidado por versão)
+        if nome in GOLD:
+            return cache_tabelas.obter(nome, lambda: carregar_tabela(nome))
+        # demais tabelas: uma leitura por run do pipeline, quando ativo
+        if _leitura_do_run is not None:
+            return _leitura_do_run.obter(nome, lambda: carregar_tabela(nome))
         return carregar_tabela(nome)
 
+    @staticmethod
+    @contextmanager
+    def leitura_compartilhada():
+        """
+        Durante o bloco, `load` de tabelas não gold é compartilhado por todos
+        os serviços (e threads): cada tabela é lida no máximo uma vez.
+        """
+        global _leitura_do_run
+
+        anterior = _leitura_do_run
+        _leitura_do_run = LeituraCompartilhada()
+        try:
+            yield _leitura_do_run
+        finally:
+            _leitura_do_run = anterior
+
     @staticmethod
     def save(df, nome):
-        inserir_dados(df, nome)
\ No newline at end of file
+        salvar_dados(df, nome)
+        cache_tabelas.invalidar(nome)
+
+    @staticmethod
+    def registrar_versao(run_id):
+        registrar_versao_dados(run_id)
@@ -32,12 +32,18 @@ Feature: Previsão de crimes contra a mulher
     Then status 422
 
   @retreino
-  Scenario: POST /previsao/retrain persiste um novo bundle e devolve previsão
+  Scenario: POST /previsao/retrain enfileira um job que persiste um novo bundle
     Given path 'previsao', 'retrain'
-    And param horizonte_anos = 1
     When method POST
+    Then status 202
+    And match response.job_id == '#string'
+    * def jobId = response.job_id
+    * configure retry = { count: 60, interval: 5000 }
+
+    Given path 'previsao', 'jobs', jobId
+    And retry until response.status == 'concluido' || response.status == 'falhou'
+    When method GET
     Then status 200
-    And match response.fonte_modelo == 'retreino'
+    And match response.status == 'concluido'
     And match response.modelo_arquivo != null
-    And match response.horizonte_anos == 1
-    And match karate.sizeOf(response.previsao) == 1
+    And match response.modelo_em_servico == response.modelo_arquivo
@@ -0,0 +1,168 @@
+# processing/otimizacao_tipos.py
+"""
+Redução de memória dos DataFrames antes da persistência e do serviço.
+
+`otimizar_tipos` troca cada coluna pelo menor tipo que representa os mesmos
+valores:
+
+- inteiros: menor largura com sinal que comporta mínimo e máximo (nunca
+  abaixo de `inteiro_minimo`; nulos mantêm o tipo anulável `Int*`);
+- floats: float32 somente quando a conversão é exata (sem perda);
+- texto: categórico quando há poucos valores distintos (ex.: ~35 RAs).
+
+Quando um `EsquemaTabela` é informado, os tipos declarados são respeitados:
+colunas NUMERICO só sofrem redução numérica, TEXTO só viram categóricas
+(aceitas por `validar_schema`) e DATA ficam intactas.
+"""
+
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from util.log import logs
+from validation.schema import DATA, NUMERICO, TEXTO, EsquemaTabela
+
+logger = logs()
+
+LIMITE_CATEGORIAS = 0.5  # distintos / linhas
+
+_INTEIROS = (np.int8, np.int16, np.int32, np.int64)
+_INTEIROS_ANULAVEIS = {
+    np.int8: "Int8",
+    np.int16: "Int16",
+    np.int32: "Int32",
+    np.int64: "Int64",
+}
+
+
+def _menor_inteiro(serie: pd.Series, inteiro_minimo) -> pd.Series:
+    valores = serie.dropna()
+    if valores.empty:
+        return serie
+
+    menor, maior = int(valores.min()), int(valores.max())
+    largura_minima = np.dtype(inteiro_minimo).itemsize
+
+    for tipo in _INTEIROS:
+        info = np.iinfo(tipo)
+        if np.dtype(tipo).itemsize >= largura_minima and info.min <= menor <= maior <= info.max:
+            break
+    else:
+        return serie  # ex.: uint64 acima do limite de int64
+
+    anulavel = isinstance(serie.dtype, pd.api.extensions.ExtensionDtype)
+    destino = _INTEIROS_ANULAVEIS[tipo] if anulavel else np.dtype(tipo)
+
+    return serie if serie.dtype == destino else serie.astype(destino)
+
+
+def _float_exato(serie: pd.Series) -> pd.Series:
+    if serie.dtype != np.float64:
+        return serie
+
+    reduzida = serie.astype(np.float32)
+    if np.array_equal(
+        reduzida.to_numpy(dtype=np.float64), serie.to_numpy(), equal_nan=True
+    ):
+        return reduzida
+    return serie
+
+
+def _categorica(serie: pd.Series, limite: float) -> pd.Series:
+    if not (
+        pd.api.types.is_object_dtype(serie) or pd.api.types.is_string_dtype(serie)
+    ) or isinstance(serie.dtype, pd.CategoricalDtype):
+        return serie
+
+    valores = serie.dropna()
+    if valores.empty or not valores.map(lambda v: isinstance(v, str)).all():
+        return serie
+
+    if valores.nunique() > limite * len(serie):
+        return serie
+    return serie.astype("category")
+
+
+def _otimizar_coluna(serie, tipo, inteiro_minimo, categorizar, limite):
+    if tipo == DATA or pd.api.types.is_bool_dtype(serie):
+        return serie
+
+    if tipo in (None, NUMERICO):
+        if pd.api.types.is_integer_dtype(serie):
+            return _menor_inteiro(serie, inteiro_minimo)
+        if pd.api.types.is_float_dtype(serie):
+            return _float_exato(serie)
+
+    if tipo in (None, TEXTO) and categorizar:
+        return _categorica(serie, limite)
+
+    return serie
+
+
+def memoria_mb(df: pd.DataFrame) -> float:
+    """Memória ocupada pelo DataFrame (incluindo objetos Python), em MB."""
+    return df.memory_usage(deep=True).sum() / (1024 * 1024)
+
+
+def relatorio_memoria(antes: pd.DataFrame, depois: pd.DataFrame) -> dict:
+    """Memória antes/depois da otimização e a economia obtida."""
+    antes_mb, depois_mb = float(memoria_mb(antes)), float(memoria_mb(depois))
+    economia = antes_mb - depois_mb
+    return {
+        "antes_mb": round(antes_mb, 3),
+        "depois_mb": round(depois_mb, 3),
+        "economia_mb": round(economia, 3),
+        "economia_pct": round(100 * economia / antes_mb, 1) if antes_mb else 0.0,
+    }
+
+
+def otimizar_tipos(
+    df: pd.DataFrame,
+    esquema: Optional[EsquemaTabela] = None,
+    nome: Optional[str] = None,
+    inteiro_minimo="int8",
+    categorizar: bool = True,
+    limite_categorias: float = LIMITE_CATEGORIAS,
+) -> pd.DataFrame:
+    """
+    Cópia de `df` com os menores tipos seguros por coluna.
+
+    :param esquema: tipos declarados a respeitar (ver `validation/esquemas.py`).
+    :param nome: quando informado, a economia de memória é registrada no log.
+    :param inteiro_minimo: menor largura inteira aceita (ex.: "int32" para
+        frames que ainda passam por aritmética).
+    :param categorizar: converte texto de baixa cardinalidade em categórico.
+    """
+    if not isinstance(df, pd.DataFrame):
+        return df
+    if df.empty:
+        return df.copy()
+
+    tipos = esquema.colunas if esquema else {}
+    otimizado = pd.concat(
+        [
+            _otimizar_coluna(
+                df.iloc[:, i],
+                tipos.get(coluna),
+                inteiro_minimo,
+                categorizar,
+                limite_categorias,
+            )
+            for i, coluna in enumerate(df.columns)
+        ],
+        axis=1,
+    )
+    otimizado.columns = df.columns
+
+    if nome:
+        relatorio = relatorio_memoria(df, otimizado)
+        logger.info(
+            "📉 Tipos otimizados: %s | %.3f MB → %.3f MB (-%.1f%%)",
+            nome,
+            relatorio["antes_mb"],
+            relatorio["depois_mb"],
+            relatorio["economia_pct"],
+        )
+
+    return otimizado
@@ -17,9 +17,13 @@ def processar_dataset_base(
     nome_valor: str,
     drop: Optional[List[str]] = None,
     filtro: Optional[str] = None,
+    mapeamento_regioes: Optional[dict] = None,
 ) -> pd.DataFrame:
     """
     Pipeline base de processamento de dataset com observabilidade.
+
+    `mapeamento_regioes` (variantes de nome de RA) é aplicado junto com a
+    padronização da coluna de região.
     """
 
     logger.info(
@@ -53,7 +57,7 @@ def processar_dataset_base(
                 },
             )
 
-        df = padronizar_regiao(df, coluna_regiao)
+        df = padronizar_regiao(df, coluna_regiao, mapeamento=mapeamento_regioes)
 
         logger.info("Região padronizada", extra={"coluna_regiao": coluna_regiao})
 
@@ -1,5 +1,6 @@
 # src/busca.py
 from util.arquivos import limpar_diretorios
+from util.cache_downloads import CACHE_ATIVO
 from src.coleta_gdf import coleta_dados
 from name_arquivos.names import (
     nome_arquivo_busca_dados_abertos as nomes_dados_abertos,
@@ -14,8 +15,8 @@ config = get_config()
 logger = logs()
 
 def coletar_dados_():
-    # Limpa diretórios e registra no log
-    limpar_diretorios()
+    # Limpa diretórios e registra no log (bronze fica para o cache de downloads)
+    limpar_diretorios(preservar_bronze=CACHE_ATIVO)
 
     start = datetime.now()
     
@@ -1,14 +1,68 @@
 # src/coleta_gdf.py
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
 from util.arquivos import download_arquivo
+from util.config_loader import get_config
 from util.log import logs
 from util.rotas import gerar_urls_rotas
 
 logger = logs()
 
+_config_coleta = get_config().get("coleta", {})
+
+DOWNLOADS_SIMULTANEOS = int(_config_coleta.get("downloads_simultaneos", 4))
+DOWNLOADS_POR_HOST = int(_config_coleta.get("downloads_por_host", 2))
+PRAZO_COLETA = float(_config_coleta.get("prazo_coleta", 1800))
+
+
+def criar_sessao(max_conexoes: int = DOWNLOADS_SIMULTANEOS) -> requests.Session:
+    """Sessão HTTP compartilhada, com pool keep-alive do tamanho da coleta."""
+    sessao = requests.Session()
+    adaptador = HTTPAdapter(pool_connections=max_conexoes, pool_maxsize=max_conexoes)
+    sessao.mount("http://", adaptador)
+    sessao.mount("https://", adaptador)
+    return sessao
+
+
+class LimitePorHost:
+    """Semáforo por host: no máximo `limite` downloads simultâneos no mesmo servidor."""
+
+    def __init__(self, limite: int = DOWNLOADS_POR_HOST):
+        self.limite = max(1, limite)
+        self._semaforos = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, url: str) -> threading.BoundedSemaphore:
+        host = urlparse(url).netloc
+        with self._lock:
+            if host not in self._semaforos:
+                self._semaforos[host] = threading.BoundedSemaphore(self.limite)
+            return self._semaforos[host]
+
 
-def coleta_dados(url_, lista_nomes, rotas):
-    """Função principal para coletar dados das URLs definidas."""
+def coleta_dados(
+    url_,
+    lista_nomes,
+    rotas,
+    max_simultaneos: int = DOWNLOADS_SIMULTANEOS,
+    prazo_segundos: float = PRAZO_COLETA,
+):
+    """
+    Função principal para coletar dados das URLs definidas.
+
+    Os downloads rodam em paralelo (`max_simultaneos` threads) sobre uma única
+    sessão keep-alive, respeitando `coleta.downloads_por_host` e um prazo
+    global; cada arquivo vai para a mesma pasta bronze de antes.
+
+    :return: dict nome do arquivo -> caminho salvo (None quando falhou).
+    """
 
     start = datetime.now()
     logger.info(f"Processo iniciado em {start.strftime('%Y-%m-%d %H:%M:%S')}")
@@ -23,15 +77,44 @@ def coleta_dados(url_, lista_nomes, rotas):
             f"ATENÇÃO: {len(urls_rotas)} URLs mas {len(planilhas)} nomes de arquivos!"
         )
 
-    for i, (url, _) in enumerate(urls_rotas):
-        file_name = planilhas[i] if i < len(planilhas) else f"arquivo_{i+1}"
-        logger.info(f"({i+1}/{len(urls_rotas)}) Baixando: {file_name}")
+    prazo = time.monotonic() + prazo_segundos
+    limite_host = LimitePorHost()
+
+    def _baixar(i, url, file_name):
+        with limite_host(url):
+            if time.monotonic() >= prazo:
+                logger.error(f"Prazo da coleta esgotado; {file_name} não foi baixado.")
+                return None
+
+            logger.info(f"({i+1}/{len(urls_rotas)}) Baixando: {file_name}")
+            return download_arquivo(
+                url, nome_arquivo=file_name, sessao=sessao, prazo=prazo
+            )
+
+    resultados = {}
 
-        download_arquivo(url, nome_arquivo=file_name)
+    with (
+        criar_sessao(max_simultaneos) as sessao,
+        ThreadPoolExecutor(max_workers=max(1, max_simultaneos)) as executor,
+    ):
+        futuros = {}
+        for i, (url, _) in enumerate(urls_rotas):
+            file_name = planilhas[i] if i < len(planilhas) else f"arquivo_{i+1}"
+            futuros[file_name] = executor.submit(_baixar, i, url, file_name)
+
+        for file_name, futuro in futuros.items():
+            try:
+                resultados[file_name] = futuro.result()
+            except Exception as e:
+                logger.error(f"Erro inesperado ao baixar {file_name}: {e}")
+                resultados[file_name] = None
+
+    falhas = [nome for nome, caminho in resultados.items() if caminho is None]
+    if falhas:
+        logger.warning(f"{len(falhas)} download(s) sem sucesso: {', '.join(falhas)}")
 
     end = datetime.now()
     logger.info(f"Processo finalizado em {end.strftime('%Y-%m-%d %H:%M:%S')}")
     logger.info(f"Duração total: {end - start}")
 
-
-
+    return resultados
@@ -0,0 +1,154 @@
+# src/core/agendador.py
+"""
+Agendamento por caminho crítico dos steps do pipeline.
+
+A prioridade de um step é o comprimento (em segundos estimados) da maior
+cadeia de dependentes que ele ainda destrava: sua própria duração mais a
+maior prioridade entre os steps que dependem dele. Steps prontos são
+submetidos em ordem decrescente de prioridade, então a cadeia que determina
+o tempo total começa primeiro.
+
+As durações vêm da mediana histórica (`telemetria.duracoes_medianas`);
+steps sem histórico usam a mediana dos demais. Cada step consome
+`PipelineStep.recursos` unidades da capacidade do pipeline (por padrão,
+`max_workers`): um step de memória pesada com `recursos` igual à capacidade
+roda sozinho.
+
+`simular` aplica a mesma política sobre as durações estimadas e devolve o
+cronograma e o makespan previsto (modo dry-run do `executar_pipeline`).
+"""
+
+import heapq
+import statistics
+from typing import Dict, Iterable, List, Tuple
+
+import pandas as pd
+
+from util.log import logs
+
+logger = logs()
+
+DURACAO_PADRAO = 1.0
+
+
+def estimar_duracoes(steps, historico: Dict[str, float]) -> Dict[str, float]:
+    """Duração estimada de cada step (histórico ou mediana dos conhecidos)."""
+    conhecidas = [historico[s.nome] for s in steps if s.nome in historico]
+    padrao = statistics.median(conhecidas) if conhecidas else DURACAO_PADRAO
+    return {s.nome: float(historico.get(s.nome, padrao)) for s in steps}
+
+
+def prioridades(steps, duracoes: Dict[str, float]) -> Dict[str, float]:
+    """Comprimento da maior cadeia (duração própria + dependentes) de cada step."""
+    dependentes = {s.nome: [] for s in steps}
+    for s in steps:
+        for dep in s.dependencias:
+            if dep in dependentes:
+                dependentes[dep].append(s.nome)
+
+    rank: Dict[str, float] = {}
+    visitando = set()
+
+    def calcular(nome: str) -> float:
+        if nome in rank:
+            return rank[nome]
+        if nome in visitando:
+            # ciclo: o executor marca esses steps como falha
+            return duracoes.get(nome, DURACAO_PADRAO)
+
+        visitando.add(nome)
+        cauda = max((calcular(d) for d in dependentes[nome]), default=0.0)
+        visitando.discard(nome)
+
+        rank[nome] = duracoes.get(nome, DURACAO_PADRAO) + cauda
+        return rank[nome]
+
+    for s in steps:
+        calcular(s.nome)
+
+    return rank
+
+
+def recursos_do_step(step, capacidade: float) -> float:
+    """Recursos pedidos pelo step, limitados à capacidade (nunca trava)."""
+    return min(max(float(step.recursos), 0.0), capacidade)
+
+
+def selecionar(
+    prontos: Iterable,
+    rank: Dict[str, float],
+    vagas: int,
+    capacidade_livre: float,
+    capacidade: float,
+) -> List:
+    """
+    Steps prontos a submeter agora, em ordem de prioridade.
+
+    Para no primeiro step que não cabe na capacidade livre: os de menor
+    prioridade não passam à frente dele (evita que um step pesado no caminho
+    crítico fique esperando indefinidamente).
+    """
+    escolhidos = []
+    for step in sorted(prontos, key=lambda s: (-rank.get(s.nome, 0.0), s.nome)):
+        if len(escolhidos) >= vagas:
+            break
+
+        recursos = recursos_do_step(step, capacidade)
+        if recursos > capacidade_livre + 1e-9:
+            break
+
+        escolhidos.append(step)
+        capacidade_livre -= recursos
+
+    return escolhidos
+
+
+def simular(
+    steps, max_workers: int, capacidade: float, duracoes: Dict[str, float]
+) -> Tuple[float, pd.DataFrame]:
+    """
+    Executa o agendamento sobre as durações estimadas, sem rodar nada.
+
+    :return: (makespan previsto em segundos, cronograma com inicio/fim por step).
+    """
+    rank = prioridades(steps, duracoes)
+    por_nome = {s.nome: s for s in steps}
+    pendentes = dict(por_nome)
+    concluidos = set()
+    em_execucao: List[Tuple[float, str]] = []  # heap (fim, nome)
+    cronograma = []
+    agora = 0.0
+    livre = capacidade
+
+    while pendentes or em_execucao:
+        prontos = [
+            s for s in pendentes.values() if all(d in concluidos for d in s.dependencias)
+        ]
+        for step in selecionar(
+            prontos, rank, max_workers - len(em_execucao), livre, capacidade
+        ):
+            pendentes.pop(step.nome)
+            livre -= recursos_do_step(step, capacidade)
+            fim = agora + duracoes[step.nome]
+            heapq.heappush(em_execucao, (fim, step.nome))
+            cronograma.append(
+                {
+                    "step": step.nome,
+                    "inicio_s": agora,
+                    "fim_s": fim,
+                    "duracao_s": duracoes[step.nome],
+                    "prioridade": rank[step.nome],
+                }
+            )
+
+        if not em_execucao:
+            # restante inalcançável (ciclo)
+            break
+
+        agora, nome = heapq.heappop(em_execucao)
+        concluidos.add(nome)
+        livre += recursos_do_step(por_nome[nome], capacidade)
+
+    return agora, pd.DataFrame(
+        cronograma, columns=["step", "inicio_s", "fim_s", "duracao_s", "prioridade"]
+    )
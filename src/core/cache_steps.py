@@ -0,0 +1,235 @@
+# src/core/cache_steps.py
+"""
+Memoização de steps do pipeline por impressão digital de conteúdo.
+
+A impressão digital de um step combina o nome, o código-fonte do módulo da
+função e dos módulos do projeto que ele usa, transitivamente (versão do
+código), os parâmetros da `Tarefa` e o SHA-256 dos arquivos declarados em
+`PipelineStep.entradas`. Quando ela coincide com a da
+última execução bem-sucedida, `executar_pipeline` não roda o step: devolve o
+resultado guardado e restaura os arquivos de `PipelineStep.saidas` que
+tenham sido apagados (ex.: CSVs da silver removidos por `limpar_diretorios`).
+
+Cada step guarda só a entrada mais recente em `data/.cache/steps/<nome>/`.
+Steps sem `entradas` nunca são memoizados — é o caso dos steps gold, que
+leem o banco e não arquivos.
+"""
+
+import glob
+import hashlib
+import importlib
+import inspect
+import json
+import os
+import pickle
+import shutil
+from typing import Any, Optional, Tuple
+
+from src.core.pipeline_step import Tarefa
+from util.config_loader import get_config
+from util.log import logs
+
+logger = logs()
+
+MEMOIZACAO_ATIVA = bool(get_config().get("pipeline", {}).get("memoizacao", True))
+DIRETORIO_CACHE_STEPS = "./data/.cache/steps"
+
+# Módulos com arquivo sob esta pasta (fora de site-packages) entram na versão do código
+RAIZ_PROJETO = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+
+_BLOCO = 1024 * 1024
+
+
+def _hash_arquivo(sha, caminho: str) -> None:
+    with open(caminho, "rb") as f:
+        for bloco in iter(lambda: f.read(_BLOCO), b""):
+            sha.update(bloco)
+
+
+def _arquivos_de(entrada: str) -> Optional[list]:
+    """Arquivos cobertos por `entrada` (arquivo, diretório ou glob); None se nada existir."""
+    if os.path.isdir(entrada):
+        arquivos = [
+            os.path.join(raiz, nome)
+            for raiz, _dirs, nomes in os.walk(entrada)
+            for nome in nomes
+        ]
+    elif os.path.isfile(entrada):
+        arquivos = [entrada]
+    else:
+        arquivos = [a for a in glob.glob(entrada) if os.path.isfile(a)]
+
+    return sorted(arquivos) or None
+
+
+def _modulo_do_projeto(modulo) -> bool:
+    arquivo = getattr(modulo, "__file__", None)
+    if not arquivo:
+        return False
+    arquivo = os.path.abspath(arquivo)
+    return arquivo.startswith(RAIZ_PROJETO + os.sep) and "site-packages" not in arquivo
+
+
+def _modulos_usados(modulo) -> list:
+    """
+    `modulo` e os módulos do projeto alcançáveis a partir dele pelos nomes
+    importados (módulos, funções e classes), ordenados pelo nome.
+    """
+    vistos = {modulo.__name__: modulo}
+    pendentes = [modulo]
+
+    while pendentes:
+        atual = pendentes.pop()
+        for valor in list(vars(atual).values()):
+            if inspect.ismodule(valor):
+                dependencia = valor
+            elif inspect.isclass(valor) or inspect.isfunction(valor):
+                dependencia = inspect.getmodule(valor)
+            else:
+                continue
+
+            if (
+                dependencia is None
+                or dependencia.__name__ in vistos
+                or not _modulo_do_projeto(dependencia)
+            ):
+                continue
+
+            vistos[dependencia.__name__] = dependencia
+            pendentes.append(dependencia)
+
+    return [vistos[nome] for nome in sorted(vistos)]
+
+
+def _versao_codigo(func) -> Optional[str]:
+    """
+    Fonte do módulo que define a função do step e dos módulos do projeto que
+    ele usa, transitivamente (None se a função não for resolvível): mudar um
+    helper importado pelo tratamento também invalida o cache.
+    """
+    alvo = func
+    if isinstance(func, Tarefa):
+        alvo = getattr(importlib.import_module(func.modulo), func.funcao, None)
+
+    if not (inspect.isfunction(alvo) or inspect.ismethod(alvo)):
+        return None
+
+    modulo = inspect.getmodule(alvo)
+    if modulo is None:
+        return None
+
+    partes = []
+    for usado in _modulos_usados(modulo):
+        try:
+            partes.append(f"# {usado.__name__}\n{inspect.getsource(usado)}")
+        except (TypeError, OSError):
+            if usado is modulo:
+                # ex.: função definida no console
+                return None
+
+    return "\n".join(partes)
+
+
+def impressao_digital(step) -> Optional[str]:
+    """
+    SHA-256 de (nome, código, parâmetros, conteúdo das entradas) do step.
+
+    None quando o step não pode ser memoizado: sem `entradas`, alguma
+    entrada inexistente ou código não resolvível.
+    """
+    if not step.entradas:
+        return None
+
+    codigo = _versao_codigo(step.func)
+    if codigo is None:
+        return None
+
+    sha = hashlib.sha256()
+    sha.update(step.nome.encode())
+    sha.update(hashlib.sha256(codigo.encode()).digest())
+
+    if isinstance(step.func, Tarefa):
+        sha.update(repr((step.func.args, sorted(step.func.kwargs.items()))).encode())
+
+    for entrada in step.entradas:
+        arquivos = _arquivos_de(str(entrada))
+        if arquivos is None:
+            return None
+
+        for arquivo in arquivos:
+            sha.update(os.path.relpath(arquivo).encode())
+            _hash_arquivo(sha, arquivo)
+
+    return sha.hexdigest()
+
+
+def _pasta(step) -> str:
+    return os.path.join(DIRETORIO_CACHE_STEPS, step.nome)
+
+
+def _copiar(origem: str, destino: str) -> None:
+    if os.path.isdir(destino):
+        shutil.rmtree(destino)
+    os.makedirs(os.path.dirname(destino) or ".", exist_ok=True)
+
+    if os.path.isdir(origem):
+        shutil.copytree(origem, destino)
+    else:
+        shutil.copy2(origem, destino)
+
+
+def carregar(step, digital: str) -> Tuple[bool, Any]:
+    """
+    (True, resultado) quando há entrada válida para `digital`.
+
+    Saídas declaradas que não existem mais são restauradas da cópia guardada;
+    se alguma cópia faltar, o cache é considerado inválido.
+    """
+    pasta = _pasta(step)
+    try:
+        with open(os.path.join(pasta, "manifesto.json"), encoding="utf-8") as f:
+            manifesto = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return False, None
+
+    if manifesto.get("digital") != digital:
+        return False, None
+
+    for i, saida in enumerate(manifesto.get("saidas", [])):
+        if os.path.exists(saida):
+            continue
+
+        copia = os.path.join(pasta, "saidas", str(i))
+        if not os.path.exists(copia):
+            return False, None
+
+        _copiar(copia, saida)
+        logger.info("♻️ Saída restaurada do cache de steps: %s", saida)
+
+    with open(os.path.join(pasta, "resultado.pkl"), "rb") as f:
+        return True, pickle.load(f)
+
+
+def gravar(step, digital: str, resultado: Any) -> None:
+    """Substitui a entrada de `step` pelo resultado e pelas saídas atuais."""
+    pasta = _pasta(step)
+    temporaria = f"{pasta}.tmp"
+    if os.path.isdir(temporaria):
+        shutil.rmtree(temporaria)
+    os.makedirs(temporaria)
+
+    with open(os.path.join(temporaria, "resultado.pkl"), "wb") as f:
+        pickle.dump(resultado, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    saidas = [str(s) for s in step.saidas if os.path.exists(str(s))]
+    for i, saida in enumerate(saidas):
+        _copiar(saida, os.path.join(temporaria, "saidas", str(i)))
+
+    with open(os.path.join(temporaria, "manifesto.json"), "w", encoding="utf-8") as f:
+        json.dump({"digital": digital, "saidas": saidas}, f, ensure_ascii=False, indent=2)
+
+    if os.path.isdir(pasta):
+        shutil.rmtree(pasta)
+    os.replace(temporaria, pasta)
@@ -1,30 +1,273 @@
+import multiprocessing
+import os
+import threading
 import time
+import traceback
+import uuid
 from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from typing import Any
+
+import pandas as pd
+
+from src.core import agendador, cache_steps, telemetria
+from util.armazenamento import PYARROW_DISPONIVEL
+from util.config_loader import get_config
 from util.log import logs
 
 logger = logs()
 
+BACKEND_THREADS = "threads"
+BACKEND_PROCESSOS = "processes"
+BACKEND_INLINE = "inline"
+BACKENDS = (BACKEND_THREADS, BACKEND_PROCESSOS, BACKEND_INLINE)
+
+_config_pipeline = get_config().get("pipeline", {})
+
+BACKEND_PADRAO = _config_pipeline.get("backend", BACKEND_THREADS)
+# Sobrepõe o backend de todos os steps (ex.: "inline" para depuração)
+BACKEND_FORCADO = os.getenv("PIPELINE_BACKEND") or None
+METODO_INICIO = _config_pipeline.get("metodo_inicio", "spawn")
+DIRETORIO_RESULTADOS = "./data/.cache/pipeline"
+
+
+class ErroNoProcesso(RuntimeError):
+    """Exceção levantada dentro do processo worker de um step."""
+
+
+def _backend_do_step(step, padrao: str) -> str:
+    return BACKEND_FORCADO or step.backend or padrao
+
+
+def _executar_em_thread(step, medidas: dict):
+    """
+    Roda `step.func` em uma thread daemon e espera até `step.timeout`.
+
+    Threads não podem ser interrompidas: no timeout a thread é abandonada
+    (segue em segundo plano) e o step é dado como falho.
+    """
+    saida = {}
+
+    def alvo():
+        inicio_cpu = time.thread_time()
+        try:
+            saida["resultado"] = step.func()
+        except BaseException as e:  # noqa: BLE001 - repassado ao chamador
+            saida["erro"] = e
+        finally:
+            medidas["cpu_s"] = time.thread_time() - inicio_cpu
+
+    thread = threading.Thread(target=alvo, name=f"step-{step.nome}", daemon=True)
+    thread.start()
+    thread.join(step.timeout)
+
+    if thread.is_alive():
+        raise TimeoutError(f"{step.nome} excedeu {step.timeout}s")
+
+    if "erro" in saida:
+        raise saida["erro"]
+
+    return saida.get("resultado")
+
+
+def _alvo_processo(func, destino: str, conexao) -> None:
+    """
+    Corpo do processo worker: executa `func` e devolve pelo pipe o caminho
+    do Parquet com o DataFrame resultante (ou o valor, se não for DataFrame).
+    """
+    inicio_cpu = time.process_time()
+
+    def _medidas():
+        return {
+            "cpu_s": time.process_time() - inicio_cpu,
+            "rss_pico_mb": telemetria.pico_rss_mb(),
+        }
+
+    try:
+        resultado = func()
+
+        if isinstance(resultado, pd.DataFrame) and PYARROW_DISPONIVEL:
+            try:
+                resultado.to_parquet(destino)
+                conexao.send(("parquet", destino, _medidas()))
+                return
+            except Exception:
+                # colunas que o Arrow não representa: cai para o pickle
+                pass
+
+        conexao.send(("valor", resultado, _medidas()))
+
+    except BaseException as e:  # noqa: BLE001 - repassado ao processo pai
+        conexao.send(
+            ("erro", (f"{type(e).__name__}: {e}", traceback.format_exc()), _medidas())
+        )
+
+    finally:
+        conexao.close()
 
-def _executar_passo(run_id, step):
+
+def _encerrar_processo(processo) -> None:
+    processo.terminate()
+    processo.join(5)
+
+    if processo.is_alive():
+        processo.kill()
+        processo.join()
+
+
+def _executar_em_processo(run_id, step, medidas: dict):
+    """
+    Roda `step.func` em um processo dedicado; no timeout o processo é morto.
+
+    `step.func` precisa ser picklável (função de módulo ou `Tarefa`). O
+    DataFrame volta como arquivo Parquet em DIRETORIO_RESULTADOS, lido aqui e
+    removido em seguida.
+    """
+    contexto = multiprocessing.get_context(METODO_INICIO)
+
+    pasta = os.path.join(DIRETORIO_RESULTADOS, str(run_id))
+    os.makedirs(pasta, exist_ok=True)
+    destino = os.path.join(pasta, f"{step.nome}-{uuid.uuid4().hex[:8]}.parquet")
+
+    receptor, emissor = contexto.Pipe(duplex=False)
+    processo = contexto.Process(
+        target=_alvo_processo,
+        args=(step.func, destino, emissor),
+        name=f"step-{step.nome}",
+    )
+    processo.start()
+    emissor.close()
+
+    try:
+        if not receptor.poll(step.timeout):
+            logger.error(f"[{run_id}] 🔪 Encerrando processo de {step.nome} (pid={processo.pid})")
+            _encerrar_processo(processo)
+            raise TimeoutError(f"{step.nome} excedeu {step.timeout}s")
+
+        try:
+            mensagem = receptor.recv()
+        except EOFError:
+            processo.join()
+            raise ErroNoProcesso(
+                f"Processo de {step.nome} terminou sem resultado "
+                f"(exitcode={processo.exitcode})"
+            )
+
+        processo.join()
+
+    finally:
+        receptor.close()
+
+    tipo, conteudo, medidas_processo = mensagem
+    medidas.update(medidas_processo)
+
+    if tipo == "erro":
+        descricao, rastro = conteudo
+        logger.debug(f"[{run_id}] Traceback do processo de {step.nome}:\n{rastro}")
+        raise ErroNoProcesso(descricao)
+
+    if tipo == "parquet":
+        try:
+            return pd.read_parquet(conteudo)
+        finally:
+            os.remove(conteudo)
+            try:
+                os.rmdir(pasta)  # só sai quando o último step do run terminou
+            except OSError:
+                pass
+
+    return conteudo
+
+
+def _executar_func(run_id, step, backend: str, medidas: dict):
+    """Executa `step.func` no backend; `medidas` recebe cpu_s / rss_pico_mb."""
+    if backend == BACKEND_PROCESSOS:
+        return _executar_em_processo(run_id, step, medidas)
+
+    try:
+        if backend == BACKEND_INLINE:
+            # sem isolamento: o timeout não é aplicado
+            inicio_cpu = time.thread_time()
+            try:
+                return step.func()
+            finally:
+                medidas["cpu_s"] = time.thread_time() - inicio_cpu
+
+        return _executar_em_thread(step, medidas)
+
+    finally:
+        # threads/inline: pico de memória do processo todo, não só do step
+        medidas["rss_pico_mb"] = telemetria.pico_rss_mb()
+
+
+def _consultar_cache(run_id, step):
+    """
+    (digital, achou, resultado) da memoização do step.
+
+    `digital` é None quando o step não é memoizável; erros no cache nunca
+    derrubam o step, apenas fazem com que ele rode normalmente.
+    """
+    if not cache_steps.MEMOIZACAO_ATIVA:
+        return None, False, None
+
+    try:
+        digital = cache_steps.impressao_digital(step)
+        if digital is None:
+            return None, False, None
+
+        achou, resultado = cache_steps.carregar(step, digital)
+    except Exception as e:
+        logger.warning(f"[{run_id}] ⚠️ Cache de {step.nome} ignorado: {e}")
+        return None, False, None
+
+    if achou:
+        logger.info(f"[{run_id}] ♻️ {step.nome} | entradas inalteradas, resultado do cache")
+
+    return digital, achou, resultado
+
+
+def _guardar_cache(run_id, step, digital, resultado) -> None:
+    try:
+        cache_steps.gravar(step, digital, resultado)
+    except Exception as e:
+        logger.warning(f"[{run_id}] ⚠️ Não foi possível memoizar {step.nome}: {e}")
+
+
+def _executar_passo(run_id, step, backend: str = BACKEND_THREADS):
     """
     Executa um step com retry e timeout. Retorna (nome, resultado, sucesso).
 
     O hook `step.validacao` roda sobre o resultado dentro do mesmo ciclo de
     retry: falha de validação (ex.: schema check) conta como falha do step.
+    Cada tentativa é registrada no histórico de execuções (`telemetria`).
     """
+    backend = _backend_do_step(step, backend)
+    registro = telemetria.Registro(run_id, step, backend)
+
+    inicio_cache = time.perf_counter()
+    digital, achou, resultado = _consultar_cache(run_id, step)
+    if achou:
+        registro.tentativa(
+            1, telemetria.CACHE, time.perf_counter() - inicio_cache, {}, resultado
+        )
+        return step.nome, resultado, True
+
     tentativa = 0
 
     while tentativa <= step.retries:
         start = time.time()
+        inicio = time.perf_counter()
+        medidas = {}
+        etapa = "execucao"
+        result = None
 
         try:
-            logger.info(f"[{run_id}] ▶️ {step.nome} | tentativa={tentativa + 1}")
+            logger.info(
+                f"[{run_id}] ▶️ {step.nome} | tentativa={tentativa + 1} | backend={backend}"
+            )
 
-            with ThreadPoolExecutor(max_workers=1) as executor:
-                future = executor.submit(step.func)
-                result = future.result(timeout=step.timeout)
+            result = _executar_func(run_id, step, backend, medidas)
 
+            etapa = "validacao"
             if step.validacao is not None and result is not None:
                 step.validacao(result)
 
@@ -34,16 +277,33 @@ def _executar_passo(run_id, step):
 
             logger.info(f"[{run_id}] ✅ {step.nome} | linhas={linhas} | tempo={tempo}s")
 
+            registro.tentativa(
+                tentativa + 1, telemetria.SUCESSO, time.perf_counter() - inicio, medidas, result
+            )
+
+            if digital is not None:
+                _guardar_cache(run_id, step, digital, result)
+
             return step.nome, result, True
 
         except TimeoutError:
             logger.error(f"[{run_id}] ⏱️ TIMEOUT em {step.nome}")
+            registro.tentativa(
+                tentativa + 1, telemetria.TIMEOUT, time.perf_counter() - inicio, medidas
+            )
 
         except Exception as e:
             logger.error(
                 f"[{run_id}] ❌ ERRO em {step.nome}: {str(e)}",
                 exc_info=True,
             )
+            registro.tentativa(
+                tentativa + 1,
+                telemetria.INVALIDO if etapa == "validacao" else telemetria.ERRO,
+                time.perf_counter() - inicio,
+                medidas,
+                result,
+            )
 
         tentativa += 1
 
@@ -70,7 +330,38 @@ def _marcar_falha_sem_execucao(run_id, nome, motivo, resultados, falhas):
     falhas.add(nome)
 
 
-def executar_pipeline(run_id, steps, max_workers=4):
+def _logar_simulacao(run_id, makespan, cronograma, max_workers, capacidade):
+    logger.info(
+        f"[{run_id}] 🧮 Simulação: makespan previsto {makespan:.1f}s "
+        f"(max_workers={max_workers}, capacidade={capacidade:g})"
+    )
+    for linha in cronograma.itertuples(index=False):
+        logger.info(
+            f"[{run_id}]    {linha.inicio_s:8.1f}s → {linha.fim_s:8.1f}s  {linha.step} "
+            f"(caminho crítico {linha.prioridade:.1f}s)"
+        )
+
+
+def _notificar_conclusao(run_id, ao_concluir, step, resultado):
+    try:
+        ao_concluir(step, resultado)
+    except Exception as e:
+        logger.error(
+            f"[{run_id}] ❌ Erro no consumidor do resultado de {step.nome}: {e}",
+            exc_info=True,
+        )
+
+
+def executar_pipeline(
+    run_id,
+    steps,
+    max_workers=4,
+    backend=None,
+    capacidade=None,
+    simular=False,
+    ao_concluir=None,
+    reter_resultados=True,
+):
     """
     Orquestra os steps respeitando `dependencias`.
 
@@ -78,7 +369,28 @@ def executar_pipeline(run_id, steps, max_workers=4):
     step só é submetido quando TODAS as suas dependências concluíram com
     sucesso. Se uma dependência falha definitivamente, os passos dependentes
     são pulados (resultado None) e a falha se propaga pela cadeia.
+
+    Entre os steps prontos, os de maior caminho crítico (duração histórica
+    da telemetria somada à da cadeia de dependentes) são submetidos
+    primeiro; cada step ocupa `step.recursos` da `capacidade` (padrão:
+    `max_workers`). Com `simular=True` nada é executado: o cronograma e o
+    makespan previstos são registrados no log e devolvidos como
+    {"makespan_s": ..., "cronograma": DataFrame}.
+
+    Cada step roda no backend `step.backend` (ou `backend`, padrão do
+    config `pipeline.backend`): "threads", "processes" (isolado em um
+    processo, morto no timeout) ou "inline" (na própria thread de
+    orquestração, sem timeout).
+
+    `ao_concluir(step, resultado)` é chamado na thread de orquestração
+    assim que cada step conclui com sucesso (já validado); enquanto ele não
+    retorna, nenhum step novo é submetido. Com `reter_resultados=False` o
+    resultado não fica no dict devolvido (valor None), limitando a memória
+    aos resultados ainda não consumidos.
     """
+    backend = backend or BACKEND_PADRAO
+    capacidade = float(max_workers if capacidade is None else capacidade)
+
     por_nome = {}
     for step in steps:
         if step.nome in por_nome:
@@ -96,20 +408,32 @@ def executar_pipeline(run_id, steps, max_workers=4):
             f"Dependências inexistentes no pipeline: {sorted(desconhecidas)}"
         )
 
+    invalidos = {
+        _backend_do_step(step, backend)
+        for step in steps
+    } - set(BACKENDS)
+    if invalidos:
+        raise ValueError(f"Backend de execução inválido: {sorted(invalidos)}")
+
+    duracoes = agendador.estimar_duracoes(steps, telemetria.duracoes_medianas())
+
+    if simular:
+        makespan, cronograma = agendador.simular(steps, max_workers, capacidade, duracoes)
+        _logar_simulacao(run_id, makespan, cronograma, max_workers, capacidade)
+        return {"makespan_s": makespan, "cronograma": cronograma}
+
+    rank = agendador.prioridades(steps, duracoes)
+
     resultados: dict[str, Any] = {}
     sucesso = set()
     falhas = set()
     pendentes = dict(por_nome)
+    livre = capacidade
 
     with ThreadPoolExecutor(max_workers=max_workers) as pool:
         futuros = {}
 
         while pendentes or futuros:
-            prontos = [
-                nome
-                for nome, step in pendentes.items()
-                if all(dep in sucesso for dep in step.dependencias)
-            ]
             bloqueados = [
                 nome
                 for nome, step in pendentes.items()
@@ -117,7 +441,7 @@ def executar_pipeline(run_id, steps, max_workers=4):
             ]
 
             for nome in bloqueados:
-                pendentes.pop(nome)
+                step = pendentes.pop(nome)
                 _marcar_falha_sem_execucao(
                     run_id,
                     nome,
@@ -126,9 +450,18 @@ def executar_pipeline(run_id, steps, max_workers=4):
                     falhas,
                 )
 
-            for nome in prontos:
-                step = pendentes.pop(nome)
-                futuros[pool.submit(_executar_passo, run_id, step)] = nome
+            prontos = [
+                step
+                for step in pendentes.values()
+                if all(dep in sucesso for dep in step.dependencias)
+            ]
+
+            for step in agendador.selecionar(
+                prontos, rank, max_workers - len(futuros), livre, capacidade
+            ):
+                pendentes.pop(step.nome)
+                livre -= agendador.recursos_do_step(step, capacidade)
+                futuros[pool.submit(_executar_passo, run_id, step, backend)] = step.nome
 
             if not futuros:
                 if pendentes:
@@ -153,8 +486,13 @@ def executar_pipeline(run_id, steps, max_workers=4):
 
             for future in concluidos:
                 nome = futuros.pop(future)
+                livre += agendador.recursos_do_step(por_nome[nome], capacidade)
                 _nome, resultado, deuCerto = future.result()
-                resultados[nome] = resultado
                 (sucesso if deuCerto else falhas).add(nome)
 
+                if deuCerto and ao_concluir is not None:
+                    _notificar_conclusao(run_id, ao_concluir, por_nome[nome], resultado)
+
+                resultados[nome] = resultado if reter_resultados else None
+
     return resultados
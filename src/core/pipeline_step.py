@@ -1,4 +1,5 @@
-from dataclasses import dataclass
+import importlib
+from dataclasses import dataclass, field
 from typing import Any, Callable, Optional
 import pandas as pd
 
@@ -12,3 +13,30 @@ class PipelineStep:
     timeout: int = 300
     dependencias: tuple = ()
     validacao: Optional[Callable[[Any], None]] = None
+    # "threads" | "processes" | "inline"; None usa o padrão do executar_pipeline
+    backend: Optional[str] = None
+    # arquivos/diretórios lidos e gravados pelo step (memoização, ver cache_steps)
+    entradas: tuple = ()
+    saidas: tuple = ()
+    # fração da capacidade do pipeline ocupada pelo step (ver agendador)
+    recursos: float = 1.0
+
+
+@dataclass(frozen=True)
+class Tarefa:
+    """
+    Chamada picklável `modulo.funcao(*args, **kwargs)` para `PipelineStep.func`.
+
+    A função é resolvida pelo nome só no momento da execução, então a tarefa
+    atravessa processos (backend "processes") e respeita patches aplicados
+    no módulo (testes).
+    """
+
+    modulo: str
+    funcao: str
+    args: tuple = ()
+    kwargs: dict = field(default_factory=dict)
+
+    def __call__(self):
+        funcao = getattr(importlib.import_module(self.modulo), self.funcao)
+        return funcao(*self.args, **self.kwargs)
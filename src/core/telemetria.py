@@ -0,0 +1,347 @@
+# src/core/telemetria.py
+"""
+Histórico estruturado das execuções dos steps do pipeline.
+
+Cada tentativa de cada step vira uma linha em `execucoes_steps` (run_id,
+step, tentativa, backend, tempo de parede, tempo de CPU, pico de RSS,
+linhas de entrada/saída e resultado). O armazenamento é um SQLite local
+(`pipeline.telemetria.caminho`) ou, com `backend: postgres`, o mesmo banco
+das tabelas gold.
+
+`relatorio_steps` resume o histórico em p50/p95 por step e sinaliza
+regressões: mediana das execuções recentes acima da mediana das anteriores
+(linha de base) mais a tolerância configurada.
+
+Uso pela linha de comando:
+    python -m src.core.telemetria --janela 5 --tolerancia 0.25
+"""
+
+import os
+import sys
+import threading
+from datetime import datetime
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Float,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    and_,
+    create_engine,
+    func,
+    select,
+)
+
+from util.config_loader import get_config
+from util.log import logs
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    resource = None
+
+logger = logs()
+
+_config_telemetria = get_config().get("pipeline", {}).get("telemetria", {})
+
+TELEMETRIA_ATIVA = bool(_config_telemetria.get("ativa", True))
+BACKEND_TELEMETRIA = _config_telemetria.get("backend", "sqlite")
+CAMINHO_TELEMETRIA = _config_telemetria.get("caminho", "./data/.cache/telemetria.db")
+TOLERANCIA_REGRESSAO = float(_config_telemetria.get("tolerancia_regressao", 0.25))
+
+TABELA_TELEMETRIA = "execucoes_steps"
+
+SUCESSO = "sucesso"
+CACHE = "cache"
+ERRO = "erro"
+TIMEOUT = "timeout"
+INVALIDO = "falha_validacao"
+
+_metadata = MetaData()
+
+execucoes_steps = Table(
+    TABELA_TELEMETRIA,
+    _metadata,
+    Column("run_id", String(64), index=True),
+    Column("step", String(128), index=True),
+    Column("tentativa", Integer),
+    Column("backend", String(16)),
+    Column("resultado", String(32)),
+    Column("wall_s", Float),
+    Column("cpu_s", Float),
+    Column("rss_pico_mb", Float),
+    Column("linhas_entrada", Integer),
+    Column("linhas_saida", Integer),
+    Column("registrado_em", DateTime),
+)
+
+_engines = {}
+_lock = threading.Lock()
+
+
+def _obter_engine():
+    """Engine do armazenamento (criado uma vez por destino, com a tabela)."""
+    chave = "postgres" if BACKEND_TELEMETRIA == "postgres" else CAMINHO_TELEMETRIA
+
+    with _lock:
+        if chave not in _engines:
+            if chave == "postgres":
+                from database.repository.repository import conectar_banco
+
+                engine = conectar_banco()
+            else:
+                os.makedirs(os.path.dirname(CAMINHO_TELEMETRIA) or ".", exist_ok=True)
+                engine = create_engine(
+                    f"sqlite:///{CAMINHO_TELEMETRIA}", connect_args={"timeout": 30}
+                )
+
+            _metadata.create_all(engine, checkfirst=True)
+            _engines[chave] = engine
+
+        return _engines[chave]
+
+
+def pico_rss_mb() -> Optional[float]:
+    """Pico de memória residente do processo atual, em MB (None sem `resource`)."""
+    if resource is None:
+        return None
+
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reporta em KB; macOS em bytes
+    return pico / (1024 * 1024) if sys.platform == "darwin" else pico / 1024
+
+
+def contar_linhas(resultado) -> Optional[int]:
+    """Linhas de um DataFrame (ou soma das linhas de uma tupla/lista deles)."""
+    if isinstance(resultado, pd.DataFrame):
+        return len(resultado)
+
+    if isinstance(resultado, (tuple, list)) and resultado and all(
+        isinstance(df, pd.DataFrame) for df in resultado
+    ):
+        return sum(len(df) for df in resultado)
+
+    return None
+
+
+def _linhas_csv(caminho: str) -> int:
+    with open(caminho, "rb") as f:
+        quebras = sum(bloco.count(b"\n") for bloco in iter(lambda: f.read(1024 * 1024), b""))
+    return max(quebras - 1, 0)  # sem o cabeçalho
+
+
+def linhas_entradas(step) -> Optional[int]:
+    """Linhas de dados dos CSVs declarados em `step.entradas` (None se não houver)."""
+    csvs = [
+        str(e) for e in step.entradas if str(e).endswith(".csv") and os.path.isfile(str(e))
+    ]
+    if not csvs:
+        return None
+    return sum(_linhas_csv(c) for c in csvs)
+
+
+def registrar(**registro) -> None:
+    """Grava uma tentativa no histórico; falhas só geram aviso no log."""
+    if not TELEMETRIA_ATIVA:
+        return
+
+    registro.setdefault("registrado_em", datetime.now())
+
+    try:
+        with _obter_engine().begin() as conn:
+            conn.execute(execucoes_steps.insert(), [registro])
+    except Exception as e:
+        logger.warning("⚠️ Telemetria do step %s não registrada: %s", registro.get("step"), e)
+
+
+class Registro:
+    """Coletor das tentativas de um step em um run (usado por `_executar_passo`)."""
+
+    def __init__(self, run_id, step, backend: str):
+        self.run_id = str(run_id)
+        self.step = step
+        self.backend = backend
+        self._linhas_entrada = None
+        self._linhas_entrada_lidas = False
+
+    def _entrada(self) -> Optional[int]:
+        if not self._linhas_entrada_lidas:
+            try:
+                self._linhas_entrada = linhas_entradas(self.step)
+            except OSError:
+                self._linhas_entrada = None
+            self._linhas_entrada_lidas = True
+        return self._linhas_entrada
+
+    def tentativa(self, numero: int, resultado: str, wall_s: float, medidas: dict, saida=None):
+        if not TELEMETRIA_ATIVA:
+            return
+
+        registrar(
+            run_id=self.run_id,
+            step=self.step.nome,
+            tentativa=numero,
+            backend=self.backend,
+            resultado=resultado,
+            wall_s=round(wall_s, 4),
+            cpu_s=medidas.get("cpu_s"),
+            rss_pico_mb=medidas.get("rss_pico_mb"),
+            linhas_entrada=self._entrada(),
+            linhas_saida=contar_linhas(saida),
+        )
+
+
+def _consulta_historico(limite_runs: int):
+    """
+    SELECT das tentativas dos últimos `limite_runs` runs de cada step.
+
+    O corte é feito no banco (janela `row_number` por step sobre o início de
+    cada run), para não ler a tabela inteira a cada `executar_pipeline`.
+    """
+    t = execucoes_steps
+    runs = (
+        select(
+            t.c.step,
+            t.c.run_id,
+            func.min(t.c.registrado_em).label("inicio_run"),
+        )
+        .group_by(t.c.step, t.c.run_id)
+        .subquery()
+    )
+    ordenados = select(
+        runs,
+        func.row_number()
+        .over(
+            partition_by=runs.c.step,
+            order_by=(runs.c.inicio_run.desc(), runs.c.run_id.desc()),
+        )
+        .label("ordem"),
+    ).subquery()
+
+    return (
+        select(t, ordenados.c.inicio_run)
+        .join(
+            ordenados,
+            and_(t.c.step == ordenados.c.step, t.c.run_id == ordenados.c.run_id),
+        )
+        .where(ordenados.c.ordem <= limite_runs)
+        .order_by(ordenados.c.inicio_run, t.c.registrado_em)
+    )
+
+
+def carregar_historico(limite_runs: int = 50) -> pd.DataFrame:
+    """Tentativas dos últimos `limite_runs` runs de cada step, em ordem cronológica."""
+    with _obter_engine().connect() as conn:
+        df = pd.read_sql(_consulta_historico(limite_runs), conn)
+
+    if df.empty:
+        return df
+
+    df["registrado_em"] = pd.to_datetime(df["registrado_em"])
+    df["inicio_run"] = pd.to_datetime(df["inicio_run"])
+    return df
+
+
+def duracoes_medianas(limite_runs: int = 50) -> dict:
+    """Mediana do tempo de parede das execuções bem-sucedidas de cada step."""
+    if not TELEMETRIA_ATIVA:
+        return {}
+
+    try:
+        historico = carregar_historico(limite_runs)
+    except Exception as e:
+        logger.warning("⚠️ Histórico de telemetria indisponível: %s", e)
+        return {}
+
+    if historico.empty:
+        return {}
+
+    ok = historico[historico["resultado"] == SUCESSO]
+    return ok.groupby("step")["wall_s"].median().astype(float).to_dict()
+
+
+def relatorio_steps(
+    janela_recente: int = 5,
+    tolerancia: float = None,
+    limite_runs: int = 50,
+    historico: pd.DataFrame = None,
+) -> pd.DataFrame:
+    """
+    p50/p95 do tempo de parede por step e sinalização de regressões.
+
+    As `janela_recente` execuções bem-sucedidas mais novas de cada step são
+    comparadas com as anteriores (linha de base, ao menos 3): há regressão
+    quando a mediana recente supera a da base em mais de `tolerancia`.
+    """
+    tolerancia = TOLERANCIA_REGRESSAO if tolerancia is None else tolerancia
+    historico = carregar_historico(limite_runs) if historico is None else historico
+
+    colunas = [
+        "step", "execucoes", "falhas", "p50_s", "p95_s", "p50_recente_s",
+        "p50_base_s", "variacao_pct", "regressao", "cpu_p50_s",
+        "rss_pico_mb", "linhas_saida",
+    ]
+    if historico.empty:
+        return pd.DataFrame(columns=colunas)
+
+    linhas = []
+    for step, grupo in historico.groupby("step", sort=True):
+        ok = grupo[grupo["resultado"] == SUCESSO]
+        falhas = int(grupo["resultado"].isin([ERRO, TIMEOUT, INVALIDO]).sum())
+        tempos = ok["wall_s"].to_numpy(dtype=float)
+
+        recentes, base = tempos[-janela_recente:], tempos[:-janela_recente]
+        p50_recente = float(np.median(recentes)) if len(recentes) else np.nan
+        p50_base = float(np.median(base)) if len(base) >= 3 else np.nan
+
+        variacao = (
+            (p50_recente / p50_base - 1) * 100
+            if p50_base and not np.isnan(p50_base)
+            else np.nan
+        )
+
+        linhas.append(
+            {
+                "step": step,
+                "execucoes": len(tempos),
+                "falhas": falhas,
+                "p50_s": float(np.percentile(tempos, 50)) if len(tempos) else np.nan,
+                "p95_s": float(np.percentile(tempos, 95)) if len(tempos) else np.nan,
+                "p50_recente_s": p50_recente,
+                "p50_base_s": p50_base,
+                "variacao_pct": variacao,
+                "regressao": bool(not np.isnan(variacao) and variacao > tolerancia * 100),
+                "cpu_p50_s": float(ok["cpu_s"].median()) if ok["cpu_s"].notna().any() else np.nan,
+                "rss_pico_mb": float(ok["rss_pico_mb"].max()) if ok["rss_pico_mb"].notna().any() else np.nan,
+                "linhas_saida": ok["linhas_saida"].iloc[-1] if len(ok) else None,
+            }
+        )
+
+    return pd.DataFrame(linhas, columns=colunas)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Tempos por step do pipeline (p50/p95) e regressões.")
+    parser.add_argument("--janela", type=int, default=5, help="execuções recentes comparadas à base")
+    parser.add_argument("--tolerancia", type=float, default=TOLERANCIA_REGRESSAO)
+    parser.add_argument("--runs", type=int, default=50, help="quantos runs do histórico considerar")
+    args = parser.parse_args()
+
+    relatorio = relatorio_steps(args.janela, args.tolerancia, args.runs)
+
+    if relatorio.empty:
+        print("Nenhuma execução registrada.")
+    else:
+        print(relatorio.round(3).to_string(index=False))
+        regressoes = relatorio.loc[relatorio["regressao"], "step"].tolist()
+        if regressoes:
+            print(f"\n⚠️ Regressões: {', '.join(regressoes)}")
+            sys.exit(1)
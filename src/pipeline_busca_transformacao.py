@@ -32,9 +32,11 @@ from src.tratamento_crimes import (
 )
 from database.load_csvs import salvar_tabela
 from database.connection import close_engine
-from src.core.pipeline_step import PipelineStep
+from src.core.pipeline_step import PipelineStep, Tarefa
 from src.core.executor import executar_pipeline
 from validation.esquemas import validador_silver
+from util.armazenamento import caminho_parquet
+from util.config_loader import get_config
 from util.log import logs
 import time
 
@@ -46,6 +48,10 @@ PASTA_BRONZE_PLANILHA = Path("./data/bronze/planilha")
 PASTA_BRONZE_CSV_DIR = Path(PASTA_BRONZE_CSV)
 TIMEOUT_TRATAMENTO = 900
 
+# Tratamentos são pandas/Python puro (presos ao GIL): por padrão cada um roda
+# em um processo próprio, encerrado se estourar TIMEOUT_TRATAMENTO.
+BACKEND_TRATAMENTOS = get_config().get("pipeline", {}).get("backend_tratamentos", "processes")
+
 
 def log_tempo_inicio(func_name):
     logger.info("========== ETAPA: %s ==========", func_name)
@@ -60,67 +66,87 @@ def log_tempo_fim(func_name, start_time):
     )
 
 
+def _tarefa(funcao: str, *args) -> Tarefa:
+    """Chamada picklável de uma função importada neste módulo."""
+    return Tarefa(__name__, funcao, args)
+
+
 # 🔹 definição declarativa dos tratamentos independentes (executados em paralelo)
 TRATAMENTOS = [
     PipelineStep(
         "crimes_contra_mulher",
-        lambda: tratar_crimes_contra_mulher(
+        _tarefa(
+            "tratar_crimes_contra_mulher",
             f"{PASTA_BRONZE_CSV}/crimes-contra-mulher.csv",
             f"{PASTA_SILVER_OUTPUT}/crimes-contra-mulher_tratado.csv",
         ),
         timeout=TIMEOUT_TRATAMENTO,
+        backend=BACKEND_TRATAMENTOS,
     ),
     PipelineStep(
         "feminicidio",
-        lambda: tratar_feminicidio(
+        _tarefa(
+            "tratar_feminicidio",
             f"{PASTA_BRONZE_CSV}/feminicidio.csv",
             f"{PASTA_SILVER_OUTPUT}/feminicidio_tratado.csv",
         ),
         timeout=TIMEOUT_TRATAMENTO,
+        backend=BACKEND_TRATAMENTOS,
     ),
     PipelineStep(
         "desaparecidos_idade_sexo",
-        lambda: tratar_desaparecidos_idade_sexo(
+        _tarefa(
+            "tratar_desaparecidos_idade_sexo",
             f"{PASTA_BRONZE_CSV}/desaparecimento-idade-sexo.csv",
             f"{PASTA_SILVER_OUTPUT}/desaparecidos_idade_sexo_tratado.csv",
         ),
         timeout=TIMEOUT_TRATAMENTO,
+        backend=BACKEND_TRATAMENTOS,
     ),
     PipelineStep(
         "desaparecidos_localizados",
-        lambda: tratar_desaparecidos_localizados(
+        _tarefa(
+            "tratar_desaparecidos_localizados",
             f"{PASTA_BRONZE_CSV}/desaparecimento-localizados.csv",
             f"{PASTA_SILVER_OUTPUT}/desaparecimento-localizados_tratado.csv",
         ),
         timeout=TIMEOUT_TRATAMENTO,
+        backend=BACKEND_TRATAMENTOS,
     ),
     PipelineStep(
         "desaparecidos_regiao",
-        lambda: tratar_desaparecidos_regiao(
+        _tarefa(
+            "tratar_desaparecidos_regiao",
             f"{PASTA_BRONZE_CSV}/desaparecimento-regiao.csv",
             f"{PASTA_SILVER_OUTPUT}/desaparecimento-regiao_tratado.csv",
         ),
         timeout=TIMEOUT_TRATAMENTO,
+        backend=BACKEND_TRATAMENTOS,
     ),
     PipelineStep(
         "furto_veiculo",
-        lambda: tratar_furto_veiculo(
+        _tarefa(
+            "tratar_furto_veiculo",
             f"{PASTA_BRONZE_CSV}/furto-em-veiculo.csv",
             f"{PASTA_SILVER_OUTPUT}/furto_em_veiculo_tratado.csv",
         ),
         timeout=TIMEOUT_TRATAMENTO,
+        backend=BACKEND_TRATAMENTOS,
     ),
     PipelineStep(
         "homicidio",
-        lambda: tratar_homicidio(
+        _tarefa(
+            "tratar_homicidio",
             f"{PASTA_BRONZE_CSV}/homicidio.csv",
             f"{PASTA_SILVER_OUTPUT}/homicidio_tratado.csv",
         ),
         timeout=TIMEOUT_TRATAMENTO,
+        backend=BACKEND_TRATAMENTOS,
     ),
     PipelineStep(
         "violencia_idosos",
-        lambda: tratar_violencia_idosos(
+        _tarefa(
+            "tratar_violencia_idosos",
             f"{PASTA_BRONZE_CSV}/idosos_7_anos.csv",
             [
                 f"{PASTA_SILVER_OUTPUT}/idosos_tabela4.csv",
@@ -128,95 +154,118 @@ TRATAMENTOS = [
             ],
         ),
         timeout=TIMEOUT_TRATAMENTO,
+        backend=BACKEND_TRATAMENTOS,
     ),
     PipelineStep(
         "crimes_idosos_ranking",
-        lambda: tratar_crimes_idosos_ranking(
+        _tarefa(
+            "tratar_crimes_idosos_ranking",
             f"{PASTA_BRONZE_CSV}/idosos_2016.csv",
             f"{PASTA_SILVER_OUTPUT}/idosos_2016_tratado.csv",
         ),
         timeout=TIMEOUT_TRATAMENTO,
+        backend=BACKEND_TRATAMENTOS,
     ),
     PipelineStep(
         "crimes_idosos_mensais",
-        lambda: crimes_idosos_por_mes(
+        _tarefa(
+            "crimes_idosos_por_mes",
             f"{PASTA_BRONZE_CSV}/idosos_mensais.csv",
             ["registro", "fato"],
             f"{PASTA_SILVER_OUTPUT}/idosos_mensais_tratado.csv",
         ),
         timeout=TIMEOUT_TRATAMENTO,
+        backend=BACKEND_TRATAMENTOS,
     ),
     PipelineStep(
         "injuria_racial",
-        lambda: tratar_injuria_racial_por_regiao(
+        _tarefa(
+            "tratar_injuria_racial_por_regiao",
             f"{PASTA_BRONZE_CSV}/injuria-racial.csv",
             f"{PASTA_SILVER_OUTPUT}/injuria_racial_tratado.csv",
         ),
         timeout=TIMEOUT_TRATAMENTO,
+        backend=BACKEND_TRATAMENTOS,
     ),
     PipelineStep(
         "latrocinio",
-        lambda: tratar_latrocinio_por_regiao(
+        _tarefa(
+            "tratar_latrocinio_por_regiao",
             f"{PASTA_BRONZE_CSV}/latrocinio.csv",
             f"{PASTA_SILVER_OUTPUT}/latrocinio_tratado.csv",
         ),
         timeout=TIMEOUT_TRATAMENTO,
+        backend=BACKEND_TRATAMENTOS,
     ),
     PipelineStep(
         "lesao_corporal_morte_regiao",
-        lambda: tratar_lesao_corporal_morte_por_regiao(
+        _tarefa(
+            "tratar_lesao_corporal_morte_por_regiao",
             f"{PASTA_BRONZE_CSV}/lesao-corporal-morte.csv",
             f"{PASTA_SILVER_OUTPUT}/lesao_corporal_morte_tratada.csv",
         ),
         timeout=TIMEOUT_TRATAMENTO,
+        backend=BACKEND_TRATAMENTOS,
     ),
     PipelineStep(
         "lesao_corporal_morte_total",
-        lambda: tratar_lesao_corporal_morte(
+        _tarefa(
+            "tratar_lesao_corporal_morte",
             f"{PASTA_BRONZE_CSV}/lesao-corporal-morte.csv",
             f"{PASTA_SILVER_OUTPUT}/lesao_corporal_morte_total_tratada.csv",
         ),
         timeout=TIMEOUT_TRATAMENTO,
+        backend=BACKEND_TRATAMENTOS,
     ),
     PipelineStep(
         "racismo",
-        lambda: tratar_racismo(
+        _tarefa(
+            "tratar_racismo",
             f"{PASTA_BRONZE_CSV}/racismo.csv",
             f"{PASTA_SILVER_OUTPUT}/racismo_tratado.csv",
         ),
         timeout=TIMEOUT_TRATAMENTO,
+        backend=BACKEND_TRATAMENTOS,
     ),
     PipelineStep(
         "roubo_pedestre",
-        lambda: tratar_roubo_pedestre(
+        _tarefa(
+            "tratar_roubo_pedestre",
             f"{PASTA_BRONZE_CSV}/roubo-a-transeunte.csv",
             f"{PASTA_SILVER_OUTPUT}/roubo-a-transeunte_tratado.csv",
         ),
         timeout=TIMEOUT_TRATAMENTO,
+        backend=BACKEND_TRATAMENTOS,
     ),
     PipelineStep(
         "roubo_veiculo",
-        lambda: tratar_roubo_veiculo(
+        _tarefa(
+            "tratar_roubo_veiculo",
             f"{PASTA_BRONZE_CSV}/roubo-de-veiculo.csv",
             f"{PASTA_SILVER_OUTPUT}/roubo_veiculo_tratado.csv",
         ),
         timeout=TIMEOUT_TRATAMENTO,
+        backend=BACKEND_TRATAMENTOS,
     ),
     PipelineStep(
         "roubo_comercio",
-        lambda: roubo_comercio(
+        _tarefa(
+            "roubo_comercio",
             f"{PASTA_BRONZE_CSV}/roubo-em-comercio.csv",
             f"{PASTA_SILVER_OUTPUT}/roubo_comercio.csv",
         ),
         timeout=TIMEOUT_TRATAMENTO,
+        backend=BACKEND_TRATAMENTOS,
     ),
     PipelineStep(
         "roubo_transporte_coletivo",
-        lambda: roubo_transporte_coletivo(
+        _tarefa(
+            "roubo_transporte_coletivo",
             f"{PASTA_BRONZE_CSV}/roubo-em-transporte-coletivo.csv",
             f"{PASTA_SILVER_OUTPUT}/roubo_transporte_coletivo_tratado.csv",
         ),
         timeout=TIMEOUT_TRATAMENTO,
+        backend=BACKEND_TRATAMENTOS,
     ),
 ]
 
@@ -261,7 +310,7 @@ def _fase_carga():
 # 🔹 orquestração unificada: todas as fases (inclusive as sequenciais) são
 # PipelineStep com dependências, executadas pelo mesmo motor do Gold.
 FASES_BASE = [
-    PipelineStep("coleta", lambda: (_fase_coleta(), None)[1], retries=0, timeout=1800),
+    PipelineStep("coleta", _fase_coleta, retries=0, timeout=1800),
     PipelineStep(
         "populacao", _fase_populacao, dependencias=("coleta",), retries=0, timeout=1800
     ),
@@ -271,16 +320,45 @@ FASES_BASE = [
 ]
 
 
+def _arquivos_da_tarefa(tarefa: Tarefa):
+    """
+    (entradas, saídas) de um tratamento, pelos argumentos da tarefa: CSVs da
+    bronze são entradas; arquivos da silver (CSV + Parquet) são saídas.
+    """
+    caminhos = [
+        caminho
+        for arg in tarefa.args
+        for caminho in (arg if isinstance(arg, list) else [arg])
+        if isinstance(caminho, str)
+    ]
+    entradas = tuple(c for c in caminhos if c.startswith(PASTA_BRONZE_CSV))
+    saidas = tuple(
+        arquivo
+        for c in caminhos
+        if c.startswith(PASTA_SILVER_OUTPUT)
+        for arquivo in (c, str(caminho_parquet(c)))
+    )
+    return entradas, saidas
+
+
 def _preparar_tratamentos(steps):
-    """Adiciona dependência da fase de planilhas e o hook de schema check."""
-    return [
-        replace(
-            step,
-            dependencias=("planilhas",),
-            validacao=validador_silver(step.nome),
+    """
+    Adiciona dependência da fase de planilhas, o hook de schema check e os
+    arquivos de entrada/saída usados na memoização do step.
+    """
+    preparados = []
+    for step in steps:
+        entradas, saidas = _arquivos_da_tarefa(step.func)
+        preparados.append(
+            replace(
+                step,
+                dependencias=("planilhas",),
+                validacao=validador_silver(step.nome),
+                entradas=entradas,
+                saidas=saidas,
+            )
         )
-        for step in steps
-    ]
+    return preparados
 
 
 TRATAMENTOS_PREPARADOS = _preparar_tratamentos(TRATAMENTOS)
@@ -1,6 +1,9 @@
+import threading
 import time
 import uuid
-from dataclasses import replace
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Callable
 from ingestion.repository_adapter import Repository
 from domain.desaparecimentos import DesaparecimentosService
 from domain.violencia_mulher import ViolenciaMulherService
@@ -13,10 +16,14 @@ from src.core.pipeline_step import PipelineStep
 from src.core.executor import executar_pipeline
 from validation.schema import validador_de_esquema
 from validation.esquemas import GOLD
+from util.config_loader import get_config
+from util.dimensao_ra import TABELA_DIMENSAO_RA, categorizar_ra, dimensao_ra
 from util.log import logs
 
 logger = logs()
 
+ESCRITORES_GOLD = int(get_config().get("pipeline", {}).get("escritores_gold", 2))
+
 
 # 🔹 definição declarativa
 STEPS = [
@@ -82,6 +89,26 @@ STEPS = [
     ),
 ]
 
+@dataclass(frozen=True)
+class ComRaCanonica:
+    """
+    Função de step gold com a coluna de RA já canônica (+ `ra_id`).
+
+    Roda dentro do step, antes da validação de schema: grafias diferentes da
+    mesma RA (ex.: "Brasília" e "Plano Piloto") viram a mesma chave e a
+    duplicidade em `(ano, regiao_administrativa)` é acusada pelo validador.
+    Picklável (backend "processes") desde que `func` também seja.
+    """
+
+    func: Callable
+
+    def __call__(self):
+        df = self.func()
+        return categorizar_ra(df) if hasattr(df, "columns") else df
+
+
+STEPS = [replace(step, func=ComRaCanonica(step.func)) for step in STEPS]
+
 # 🔹 data quality: cada tabela gold é validada contra o schema declarado
 # antes da persistência (falha de schema conta como falha do step).
 STEPS = [
@@ -91,36 +118,111 @@ STEPS = [
     for step in STEPS
 ]
 
+# 🔹 sem memoização (`entradas` vazias): os steps gold leem as tabelas silver
+# do Postgres, cujo conteúdo não é descrito por nenhum arquivo local.
 
-def criar_tabela_gold(max_workers: int = 6):
-    run_id = str(uuid.uuid4())[:8]
-    start_total = time.time()
 
-    logger.info(f"[{run_id}] 🚀 START PIPELINE GOLD")
+class GravadorGold:
+    """
+    Persistência das tabelas gold à medida que os steps concluem.
 
-    try:
-        # ⚡ execução paralela
-        resultados = executar_pipeline(run_id, STEPS, max_workers=max_workers)
+    Usado como `ao_concluir` do `executar_pipeline`: cada DataFrame validado
+    é entregue a um pool de `escritores` threads. Com todos os escritores
+    ocupados, a entrega bloqueia a orquestração (nenhum step novo começa),
+    então a memória fica limitada aos DataFrames em cálculo ou em gravação.
+    """
 
-        # 💾 persistência
-        for step in STEPS:
-            df = resultados.get(step.nome)
+    def __init__(self, run_id, escritores: int = ESCRITORES_GOLD):
+        escritores = max(1, int(escritores))
+        self.run_id = run_id
+        self.recebidos = set()
+        self._vagas = threading.BoundedSemaphore(escritores)
+        self._pool = ThreadPoolExecutor(
+            max_workers=escritores, thread_name_prefix="gold-escritor"
+        )
+
+    def __call__(self, step, df):
+        self.recebidos.add(step.nome)
 
-            if df is None:
-                logger.warning(f"[{run_id}] ⚠️ Pulando {step.output} (sem dados)")
-                continue
+        if df is None:
+            self.pular(step)
+            return
 
+        self._vagas.acquire()
+        try:
+            self._pool.submit(self._salvar, step, df)
+        except Exception:
+            self._vagas.release()
+            raise
+
+    def pular(self, step):
+        logger.warning(f"[{self.run_id}] ⚠️ Pulando {step.output} (sem dados)")
+
+    def _salvar(self, step, df):
+        try:
             linhas = len(df) if hasattr(df, "__len__") else "N/A"
 
-            logger.info(f"[{run_id}] 💾 Salvando: {step.output} | linhas={linhas}")
+            logger.info(f"[{self.run_id}] 💾 Salvando: {step.output} | linhas={linhas}")
+
+            Repository.save(df, step.output)
+        except Exception as e:
+            logger.error(
+                f"[{self.run_id}] ❌ Erro ao salvar {step.output}: {str(e)}",
+                exc_info=True,
+            )
+        finally:
+            self._vagas.release()
+
+    def encerrar(self):
+        """Espera as gravações pendentes terminarem."""
+        self._pool.shutdown(wait=True)
+
+
+def criar_tabela_gold(max_workers: int = 6):
+    run_id = str(uuid.uuid4())[:8]
+    start_total = time.time()
+
+    logger.info(f"[{run_id}] 🚀 START PIPELINE GOLD")
 
-            try:
-                Repository.save(df, step.output)
-            except Exception as e:
-                logger.error(
-                    f"[{run_id}] ❌ Erro ao salvar {step.output}: {str(e)}",
-                    exc_info=True,
+    try:
+        # ⚡ execução paralela, 💾 persistência à medida que cada step conclui
+        # ♻️ cada tabela silver é lida do banco no máximo uma vez no run
+        gravador = GravadorGold(run_id)
+        try:
+            with Repository.leitura_compartilhada() as leitura:
+                executar_pipeline(
+                    run_id,
+                    STEPS,
+                    max_workers=max_workers,
+                    ao_concluir=gravador,
+                    reter_resultados=False,
                 )
+            logger.info(f"[{run_id}] 📚 Tabelas silver lidas: {leitura.leituras}")
+        finally:
+            gravador.encerrar()
+
+        # steps que falharam não chegam ao gravador
+        for step in STEPS:
+            if step.nome not in gravador.recebidos:
+                gravador.pular(step)
+
+        # 🗺️ dimensão de RA (chave `ra_id` referenciada pelas tabelas gold)
+        try:
+            Repository.save(dimensao_ra(), TABELA_DIMENSAO_RA)
+        except Exception as e:
+            logger.error(
+                f"[{run_id}] ❌ Erro ao salvar {TABELA_DIMENSAO_RA}: {str(e)}",
+                exc_info=True,
+            )
+
+        # 🏷️ carimbo de versão: invalida os caches da API
+        try:
+            Repository.registrar_versao(run_id)
+        except Exception as e:
+            logger.error(
+                f"[{run_id}] ❌ Erro ao registrar versão dos dados: {str(e)}",
+                exc_info=True,
+            )
 
         total_time = round(time.time() - start_total, 2)
 
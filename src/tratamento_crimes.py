@@ -2,6 +2,7 @@
 import pandas as pd
 import unicodedata
 from io import StringIO
+from util.armazenamento import salvar_dataset
 from util.log import logs
 
 logger = logs()
@@ -61,7 +62,7 @@ def tratar_crimes_contra_mulher(arquivo_entrada, arquivo_saida):
     logger.debug("Estrutura final | linhas=%d | colunas=%d", df.shape[0], df.shape[1])
     logger.debug("Colunas finais: %s", df.columns.tolist())
 
-    df.to_csv(arquivo_saida, sep=";", index=False)
+    salvar_dataset(df, arquivo_saida)
     logger.info("Arquivo tratado salvo com sucesso: %s", arquivo_saida)
 
 def tratar_feminicidio(arquivo_entr_feminicidio, arquivo_saida_feminicidio):
@@ -107,7 +108,7 @@ def tratar_feminicidio(arquivo_entr_feminicidio, arquivo_saida_feminicidio):
     )
     logger.debug("Colunas finais: %s", df.columns.tolist())
  
-    df.to_csv(arquivo_saida_feminicidio, sep=";", index=False)
+    salvar_dataset(df, arquivo_saida_feminicidio)
     logger.info(
         "Arquivo de feminicídio tratado e salvo em: %s", arquivo_saida_feminicidio
     )
@@ -226,7 +227,7 @@ def tratar_desaparecidos_idade_sexo(arquivo_entrada, arquivo_saida):
         df_final.shape[1],
     )
 
-    df_final.to_csv(arquivo_saida, index=False, sep=";", encoding="utf-8")
+    salvar_dataset(df_final, arquivo_saida)
     logger.info(
         "Desaparecidos por idade e sexo tratados e salvos em: %s",
         arquivo_saida,
@@ -342,7 +343,7 @@ def tratar_desaparecidos_localizados(arquivo_entrada, arquivo_saida):
         df_final.shape[1],
     )
 
-    df_final.to_csv(arquivo_saida, index=False, sep=";", encoding="utf-8")
+    salvar_dataset(df_final, arquivo_saida)
     logger.info(
         "Desaparecidos localizados tratados e salvos em: %s",
         arquivo_saida,
@@ -455,7 +456,7 @@ def tratar_desaparecidos_regiao(arquivo_entrada, arquivo_saida):
         df.shape[1],
     )
 
-    df.to_csv(arquivo_saida, index=False, sep=";", encoding="utf-8")
+    salvar_dataset(df, arquivo_saida)
     logger.info(
         "Desaparecidos por região tratados e salvos em: %s",
         arquivo_saida,
@@ -508,7 +509,7 @@ def tratar_furto_veiculo(arquivo_entrada, arquivo_saida):
     logger.debug("Conversão de colunas numéricas concluída")
 
     # Salvando CSV final
-    df.to_csv(arquivo_saida, sep=";", index=False)
+    salvar_dataset(df, arquivo_saida)
     logger.info("Furto em veículo tratado e salvo em: %s", arquivo_saida)
 
 def tratar_homicidio(arquivo_entrada, arquivo_saida):
@@ -575,7 +576,7 @@ def tratar_homicidio(arquivo_entrada, arquivo_saida):
     logger.debug("Colunas finalizadas e renomeadas: %s", list(df.columns))
 
     # Salvar CSV
-    df.to_csv(arquivo_saida, sep=";", index=False, encoding="utf-8")
+    salvar_dataset(df, arquivo_saida)
     logger.info("Homicídio tratado e salvo em: %s", arquivo_saida)
 
 def tratar_violencia_idosos(caminho_arquivo, arquivo_saida):
@@ -614,8 +615,8 @@ def tratar_violencia_idosos(caminho_arquivo, arquivo_saida):
 
     # Salvar CSVs
     if isinstance(arquivo_saida, (list, tuple)) and len(arquivo_saida) == 2:
-        df_t4.to_csv(arquivo_saida[0], sep=";", index=False, encoding="utf-8")
-        df_t5.to_csv(arquivo_saida[1], sep=";", index=False, encoding="utf-8")
+        salvar_dataset(df_t4, arquivo_saida[0])
+        salvar_dataset(df_t5, arquivo_saida[1])
         logger.info("Tabelas salvas em: %s e %s", arquivo_saida[0], arquivo_saida[1])
     else:
         logger.error("arquivo_saida deve ser lista/tupla com 2 caminhos")
@@ -783,7 +784,7 @@ def tratar_crimes_idosos_ranking(caminho_arquivo, arquivo_saida):
     logger.debug("Cálculo de variação concluído | amostra:\n%s", df.head())
 
     # Salvar CSV final
-    df.to_csv(arquivo_saida, sep=";", index=False, encoding="utf-8")
+    salvar_dataset(df, arquivo_saida)
     logger.info("Ranking de crimes contra idosos tratado e salvo em: %s", arquivo_saida)
 
 def tratar_crimes_idosos_por_mes(caminho_arquivo, tipo):
@@ -921,7 +922,7 @@ def crimes_idosos_por_mes(arquivo_entrada, tipos, arquivo_saida):
     df_pivot["subnotificacao"] = df_pivot["registro"] - df_pivot["fato"]
     logger.debug("Campo subnotificacao calculado")
 
-    df_pivot.to_csv(arquivo_saida, sep=";", index=False, encoding="utf-8")
+    salvar_dataset(df_pivot, arquivo_saida)
     logger.info("Arquivo gerado com sucesso | caminho=%s", arquivo_saida)
 
 def tratar_injuria_racial_por_regiao(
@@ -1007,7 +1008,7 @@ def tratar_injuria_racial_por_regiao(
     df = df.fillna(0)
     logger.debug("Valores nulos substituídos por zero")
 
-    df.to_csv(caminho_arquivo_saida, sep=";", index=False, encoding="utf-8")
+    salvar_dataset(df, caminho_arquivo_saida)
     logger.info("Arquivo final gerado com sucesso | caminho=%s", caminho_arquivo_saida)
 
 def tratar_latrocinio_por_regiao(
@@ -1091,7 +1092,7 @@ def tratar_latrocinio_por_regiao(
     )
     logger.debug("Normalização de encoding aplicada na coluna regiao")
 
-    df.to_csv(caminho_arquivo_saida, sep=";", index=False, encoding="utf-8")
+    salvar_dataset(df, caminho_arquivo_saida)
     logger.info(
         "Arquivo final de latrocínio por região gerado com sucesso | caminho=%s",
         caminho_arquivo_saida,
@@ -1178,7 +1179,7 @@ def tratar_lesao_corporal_morte_por_regiao(caminho_entrada: str, caminho_saida:
     )
     logger.debug("Normalização de encoding aplicada na coluna regiao")
 
-    df.to_csv(caminho_saida, index=False, sep=";", encoding="utf-8")
+    salvar_dataset(df, caminho_saida)
     logger.info(
         "Arquivo final de lesão corporal seguida de morte por região gerado com sucesso | caminho=%s",
         caminho_saida,
@@ -1265,7 +1266,7 @@ def tratar_lesao_corporal_morte(caminho_entrada: str, caminho_saida: str):
     )
     logger.debug("Normalização de encoding aplicada na coluna regiao")
 
-    df.to_csv(caminho_saida, index=False, sep=";", encoding="utf-8")
+    salvar_dataset(df, caminho_saida)
     logger.info(
         "Arquivo final de lesão corporal seguida de morte gerado com sucesso | caminho=%s",
         caminho_saida,
@@ -1369,7 +1370,7 @@ def tratar_racismo(caminho_entrada: str, caminho_saida: str):
     df = df[df["regiao"] != "Região Administrativa"]
     logger.debug("Região Administrativa removida do dataset")
 
-    df.to_csv(caminho_saida, index=False, sep=";", encoding="utf-8")
+    salvar_dataset(df, caminho_saida)
     logger.info(
         "Arquivo final de racismo por região gerado com sucesso | caminho=%s",
         caminho_saida,
@@ -1455,7 +1456,7 @@ def tratar_roubo_pedestre(caminho_entrada: str, caminho_saida: str):
     df[colunas_anos] = df[colunas_anos].fillna(0)
     logger.debug("Conversão numérica aplicada às colunas de anos")
 
-    df.to_csv(caminho_saida, index=False, sep=";", encoding="utf-8")
+    salvar_dataset(df, caminho_saida)
     logger.info(
         "Arquivo final de roubo a pedestre gerado com sucesso | caminho=%s",
         caminho_saida,
@@ -1551,7 +1552,7 @@ def tratar_roubo_veiculo(caminho_entrada: str, caminho_saida: str):
     df[colunas_anos] = df[colunas_anos].fillna(0)
     logger.debug("Conversão numérica aplicada às colunas de anos")
 
-    df.to_csv(caminho_saida, index=False, sep=";", encoding="utf-8")
+    salvar_dataset(df, caminho_saida)
     logger.info(
         "Arquivo final de roubo de veículo gerado com sucesso | caminho=%s",
         caminho_saida,
@@ -1647,7 +1648,7 @@ def roubo_comercio(caminho_entrada: str, caminho_saida: str):
     df[colunas_anos] = df[colunas_anos].fillna(0)
     logger.debug("Conversão numérica aplicada às colunas de anos")
 
-    df.to_csv(caminho_saida, index=False, sep=";", encoding="utf-8")
+    salvar_dataset(df, caminho_saida)
     logger.info(
         "Arquivo final de roubo a comércio gerado com sucesso | caminho=%s",
         caminho_saida,
@@ -1741,5 +1742,5 @@ def roubo_transporte_coletivo(caminho_entrada: str, caminho_saida: str):
     logger.info("Conversão para numérico aplicada nas colunas: %s", colunas_anos)
 
     # Salvar resultado
-    df.to_csv(caminho_saida, index=False, sep=";", encoding="utf-8")
+    salvar_dataset(df, caminho_saida)
     logger.info("Arquivo processado salvo em: %s", caminho_saida)
@@ -10,6 +10,7 @@ from statsmodels.stats.stattools import jarque_bera
 from statsmodels.tsa.holtwinters import ExponentialSmoothing
 from statsmodels.tools.sm_exceptions import MissingDataError
 
+from util.armazenamento import salvar_dataset
 from util.log import logs
 
 # ======================================================
@@ -329,7 +330,7 @@ def analisar_populacao():
             if not match.empty:
                 df.at[idx, "populacao"] = match["previsto"].iloc[0] 
 
-    df.to_csv(OUTPUT / "df_analise_populacao.csv", sep=";", index=False)
+    salvar_dataset(df, OUTPUT / "df_analise_populacao.csv")
     logger.info(
         "Análise e preenchimento de dados concluído. CSV salvo em df_analise_populacao.csv"
     )
@@ -468,7 +469,7 @@ def tratar_populacao_regiao_administrativa(arquivo_entrada: str, arquivo_saida:
     )
 
     # Salvar CSV tratado
-    df.to_csv(arquivo_saida, sep=";", index=False)
+    salvar_dataset(df, arquivo_saida)
     logger.info(
         "Tratamento de dados de população concluído | CSV salvo em: %s", arquivo_saida
     )
@@ -5,12 +5,14 @@ import numpy as np
 import pandas as pd
 import pytest
 
+from analysis import data_analyzer
 from analysis.data_analyzer import (
     FEATURES,
     calcular_metricas,
     carregar_modelo,
     executar_pipeline,
     avaliar_generalizacao,
+    backtesting,
     localizar_ultimo_modelo_bundle,
     prever_futuro,
     preparar_dados,
@@ -351,7 +353,7 @@ def test_treinar_residual_retorna_modelo_metricas_e_bounds():
 
     # backtesting (2 folds na série de 7 linhas) + ajuste final = 3 chamadas
     assert mock_treinar_prophet.call_count == 3
-    assert set(metrics.keys()) == {"mae", "rmse", "r2", "escala_original"}
+    assert set(metrics.keys()) == {"mae", "rmse", "r2", "escala_original", "backtesting"}
     assert set(metrics["escala_original"].keys()) == {"mae", "rmse", "r2"}
     assert rmin <= rmax
     assert params["n_estimators"] == 600
@@ -410,6 +412,52 @@ def test_avaliar_generalizacao_usa_holdout_quando_serie_curta():
     assert set(metricas_residuo.keys()) == {"mae", "rmse", "r2"}
 
 
+def _prophet_media(df_treino, valor_col):
+    modelo = MagicMock()
+    base = float(df_treino[valor_col].mean())
+    modelo.predict.side_effect = lambda ds_df: pd.DataFrame({"yhat": np.full(len(ds_df), base)})
+    return modelo, pd.DataFrame({"yhat": np.full(len(df_treino), base)})
+
+
+def test_backtesting_registra_tempo_de_cada_fold():
+    df = _df_preparado(n=16)
+
+    with patch(f"{MODULO}.treinar_prophet", side_effect=_prophet_media):
+        _, _, detalhes = backtesting(df, "crimes_contra_mulher", workers=1)
+
+    assert detalhes["workers"] == 1
+    assert [f["treino"] for f in detalhes["folds"]] == [4, 7, 10]
+    assert all(f["segundos"] >= 0 for f in detalhes["folds"])
+
+
+def test_treinar_residual_registra_o_backtesting_e_ajusta_o_prophet_final():
+    df = _df_preparado()
+    tamanhos = []
+
+    def treinar(df_treino, valor_col):
+        tamanhos.append(len(df_treino))
+        return _prophet_media(df_treino, valor_col)
+
+    with patch(f"{MODULO}.treinar_prophet", side_effect=treinar):
+        _, _, metrics, *_ = treinar_residual(df.copy(), "crimes_contra_mulher")
+
+    # um Prophet por fold (só com o passado) e o final na série completa
+    assert tamanhos[:-1] and all(t < len(df) for t in tamanhos[:-1])
+    assert tamanhos[-1] == len(df)
+    assert len(metrics["backtesting"]["folds"]) == 2
+
+
+def test_backtesting_em_processos_tem_as_mesmas_metricas_da_execucao_serial():
+    df = _df_preparado(n=16)
+
+    serial = backtesting(df, "crimes_contra_mulher", workers=1)
+    paralelo = backtesting(df, "crimes_contra_mulher", workers=2)
+
+    assert paralelo[2]["workers"] == 2
+    assert paralelo[0] == pytest.approx(serial[0])
+    assert paralelo[1] == pytest.approx(serial[1])
+
+
 # ============================================================
 # prever_futuro
 # ============================================================
@@ -509,6 +557,51 @@ def test_prever_futuro_suaviza_com_resultado_anterior_a_partir_da_segunda_rodada
     assert resultado.loc[1, "final"] < 500
 
 
+def test_prever_futuro_horizonte_menor_e_prefixo_do_maior():
+    df = _df_para_previsao()
+    valor_col = "crimes_contra_mulher"
+    i_lag_1 = FEATURES.index("lag_1")
+
+    # resíduo depende das features: a recursão precisa ser a mesma nos dois horizontes
+    model_fake = MagicMock()
+    model_fake.predict.side_effect = lambda X: np.array([X[0, i_lag_1] / 10_000])
+
+    def prophet(anos):
+        modelo = MagicMock()
+        modelo.make_future_dataframe.return_value = pd.DataFrame({"ds": range(anos)})
+        modelo.predict.return_value = pd.DataFrame(
+            {"yhat": np.linspace(100.0, 100.0 + 10 * (anos - 1), anos)}
+        )
+        return modelo
+
+    curto = prever_futuro(model_fake, prophet(3), df, valor_col, -1.0, 1.0, anos=3)
+    longo = prever_futuro(model_fake, prophet(6), df, valor_col, -1.0, 1.0, anos=6)
+
+    pd.testing.assert_frame_equal(curto, longo.head(3))
+
+
+def test_prever_futuro_atualiza_lags_com_o_valor_previsto():
+    df = _df_para_previsao()
+    valor_col = "crimes_contra_mulher"
+    linhas = []
+
+    model_fake = MagicMock()
+    model_fake.predict.side_effect = lambda X: linhas.append(X.copy()) or np.array([0.0])
+
+    prophet_fake = MagicMock()
+    prophet_fake.predict.return_value = pd.DataFrame({"yhat": [200.0, 210.0, 220.0]})
+
+    resultado = prever_futuro(model_fake, prophet_fake, df, valor_col, -1.0, 1.0, anos=3)
+
+    ultimo = df.iloc[-1]
+    segunda, terceira = linhas[1][0], linhas[2][0]
+    assert segunda[FEATURES.index("lag_1")] == ultimo[valor_col]
+    assert segunda[FEATURES.index("lag_2")] == ultimo["lag_1"]
+    assert segunda[FEATURES.index("trend")] == ultimo["trend"] + 1
+    assert terceira[FEATURES.index("lag_1")] == pytest.approx(resultado.loc[0, "final"])
+    assert terceira[FEATURES.index("ano_num")] == ultimo["ano"].year + 2
+
+
 # ============================================================
 # executar_pipeline
 # ============================================================
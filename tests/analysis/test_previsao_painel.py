@@ -0,0 +1,105 @@
+import json
+import os
+
+import pandas as pd
+import pytest
+
+from analysis import previsao_painel
+
+
+@pytest.fixture(autouse=True)
+def diretorio_painel(tmp_path, monkeypatch):
+    monkeypatch.setattr(previsao_painel, "DIRETORIO_PAINEL", str(tmp_path))
+    monkeypatch.setattr(previsao_painel, "_versao_dados", lambda: "v1")
+    previsao_painel.limpar_cache()
+    yield tmp_path
+    previsao_painel.limpar_cache()
+
+
+def _mulher(dados_gold):
+    df = dados_gold["violencia_contra_mulher_gold"]
+    curta = pd.DataFrame(
+        {
+            "ano": [2023, 2024],
+            "regiao_administrativa": ["Xyz", "Xyz"],
+            "crimes_contra_mulher": [10, 12],
+            "casos_feminicidios": [1, 0],
+        }
+    )
+    return pd.concat([df, curta], ignore_index=True)
+
+
+def test_series_por_ra_usa_nome_canonico_e_ordena_por_ano(dados_gold):
+    df = dados_gold["violencia_contra_mulher_gold"].sample(frac=1, random_state=0)
+
+    series = previsao_painel.series_por_ra(df, "crimes_contra_mulher")
+
+    assert "CEILANDIA" in series
+    assert len(series) == 5
+    ceilandia = series["CEILANDIA"]
+    assert ceilandia.columns.tolist() == ["ano", "crimes_contra_mulher", "casos_feminicidios"]
+    assert ceilandia["ano"].is_monotonic_increasing
+
+
+def test_treinar_painel_grava_artefato_e_registra_falhas(dados_gold):
+    caminho = previsao_painel.treinar_painel(
+        "crimes-contra-mulher", horizonte=3, workers=1, df=_mulher(dados_gold)
+    )
+
+    with open(caminho, encoding="utf-8") as f:
+        artefato = json.load(f)
+
+    assert os.path.basename(caminho).startswith("crimes-contra-mulher_")
+    assert artefato["coluna_alvo"] == "crimes_contra_mulher"
+    assert artefato["versao_dados"] == "v1"
+    assert set(artefato["series"]) == {"PLANO PILOTO", "GAMA", "TAGUATINGA", "CEILANDIA", "SOBRADINHO"}
+    assert "série curta" in artefato["falhas"]["XYZ"]
+
+    gama = artefato["series"]["GAMA"]
+    assert gama["ra_id"] is not None
+    assert [p["ano"] for p in gama["previsao"]] == [2025, 2026, 2027]
+    assert {"mae", "rmse"} <= set(gama["metricas"])
+
+
+def test_treinar_painel_indicador_desconhecido():
+    with pytest.raises(ValueError, match="Indicador desconhecido"):
+        previsao_painel.treinar_painel("inexistente", workers=1, df=pd.DataFrame())
+
+
+def test_ajustar_ra_devolve_o_erro_em_vez_de_propagar(dados_gold, monkeypatch):
+    def falhar(*args, **kwargs):
+        raise RuntimeError("falha simulada")
+
+    monkeypatch.setattr(previsao_painel, "treinar_residual", falhar)
+    serie = previsao_painel.series_por_ra(
+        dados_gold["violencia_contra_mulher_gold"], "crimes_contra_mulher"
+    )["GAMA"]
+
+    resultado = previsao_painel.ajustar_ra("GAMA", serie, "crimes_contra_mulher", 2)
+
+    assert resultado == {"ra": "GAMA", "erro": "RuntimeError: falha simulada"}
+
+
+def _ajuste_fake(ra, df_ra, coluna, horizonte):
+    return {
+        "ra": ra,
+        "metricas": {"mae": 0.1, "rmse": 0.2},
+        "residual_bounds": {"min": -1.0, "max": 1.0},
+        "previsao": [{"ano": 2025 + h, "valor_previsto": 1.0} for h in range(horizonte)],
+    }
+
+
+def test_carregar_painel_usa_o_mais_recente_e_mantem_em_memoria(dados_gold, monkeypatch):
+    monkeypatch.setattr(previsao_painel, "ajustar_ra", _ajuste_fake)
+    df = dados_gold["violencia_contra_mulher_gold"]
+
+    assert previsao_painel.carregar_painel("feminicidios") is None
+
+    antigo = previsao_painel.treinar_painel("feminicidios", horizonte=2, workers=1, df=df)
+    os.rename(antigo, antigo.replace("feminicidios_", "feminicidios_0"))
+    previsao_painel.treinar_painel("feminicidios", horizonte=4, workers=1, df=df)
+
+    primeiro = previsao_painel.carregar_painel("feminicidios")
+    assert primeiro["horizonte_anos"] == 4
+    assert primeiro["coluna_alvo"] == "casos_feminicidios"
+    assert previsao_painel.carregar_painel("feminicidios") is primeiro
@@ -90,7 +90,7 @@ def test_resumo_tabela_banco_indisponivel_retorna_503():
 
 
 def test_dados_tabela_nao_materializada_retorna_503():
-    with patch("api.services.gold_service.Repository.load", return_value=None):
+    with patch("api.services.gold_service.carregar_pagina", return_value=None):
         resp = client.get("/gold/violencia_contra_mulher_gold/dados")
 
     assert resp.status_code == 503
@@ -110,7 +110,7 @@ def test_dados_tabela_sucesso_com_paginacao():
             "crimes_contra_mulher": [10, 20, 15],
         }
     )
-    with patch("api.services.gold_service.Repository.load", return_value=df):
+    with patch("api.services.gold_service.carregar_pagina", return_value=(df.head(2), 3)):
         resp = client.get(
             "/gold/violencia_contra_mulher_gold/dados",
             params={"pagina": 1, "tamanho_pagina": 2},
@@ -183,65 +183,60 @@ def test_previsao_erro_inesperado_retorna_500():
     assert resp.status_code == 500
 
 
-def test_retreinar_previsao_sucesso_chama_gerar_previsao_com_flags_corretas():
-    forecast_payload = {
-        "tabela_origem": "violencia_contra_mulher_gold",
-        "coluna_alvo": "crimes_contra_mulher",
-        "horizonte_anos": 5,
-        "gerado_em": "2026-08-14T10:00:00",
-        "cache_ate": "2026-08-14T10:30:00",
-        "metricas_residual": {"mae": 0.1, "rmse": 0.2},
-        "previsao": [
-            {
-                "ano": 2027,
-                "valor_previsto": 100.0,
-                "componente_prophet": 95.0,
-                "residual_log_aplicado": 0.05,
-            }
-        ],
-        "fonte_modelo": "retreino",
-        "modelo_arquivo": "xgb_residual_log_20260814_100000.pkl",
+def _job_fake(**campos):
+    return {
+        "job_id": "abc123",
+        "status": "pendente",
+        "criado_em": "2026-10-18T10:00:00",
+        "solicitacoes": 1,
+        **campos,
     }
+
+
+def test_retreinar_previsao_enfileira_job_e_responde_202():
     with patch(
-        "api.services.forecast_service.gerar_previsao", return_value=forecast_payload
-    ) as mock_gerar:
-        resp = client.post("/previsao/retrain", params={"horizonte_anos": 4})
+        "api.services.jobs_service.solicitar_retreino", return_value=_job_fake()
+    ) as mock_solicitar:
+        resp = client.post("/previsao/retrain")
 
-    assert resp.status_code == 200
-    assert resp.json()["fonte_modelo"] == "retreino"
-    assert resp.json()["modelo_arquivo"] == "xgb_residual_log_20260814_100000.pkl"
+    assert resp.status_code == 202
+    assert resp.json()["job_id"] == "abc123"
+    assert resp.json()["status"] == "pendente"
+    mock_solicitar.assert_called_once_with()
 
-    mock_gerar.assert_called_once_with(
-        horizonte_anos=4,
-        usar_cache=False,
-        forcar_retreino=True,
-        persistir_modelo=True,
-    )
 
+def test_retreinar_previsao_pool_indisponivel_responde_503():
+    from api.services.jobs_service import RetreinoIndisponivelError
 
-def test_retreinar_previsao_dados_insuficientes_retorna_503():
     with patch(
-        "api.services.forecast_service.Repository.load", return_value=None
+        "api.services.jobs_service.solicitar_retreino",
+        side_effect=RetreinoIndisponivelError("pool quebrado"),
     ):
         resp = client.post("/previsao/retrain")
 
     assert resp.status_code == 503
 
 
-def test_retreinar_previsao_erro_inesperado_retorna_500():
-    with patch(
-        "api.services.forecast_service.gerar_previsao",
-        side_effect=RuntimeError("falha ao treinar"),
-    ):
-        resp = client.post("/previsao/retrain")
+def test_status_job_concluido():
+    job = _job_fake(
+        status="concluido",
+        concluido_em="2026-10-18T10:01:00",
+        modelo_arquivo="xgb_residual_log_20261018_100100.pkl",
+        modelo_em_servico="xgb_residual_log_20261018_100100.pkl",
+        metricas_residual={"mae": 0.1, "rmse": 0.2},
+    )
+    with patch("api.services.jobs_service.obter_job", return_value=job) as mock_obter:
+        resp = client.get("/previsao/jobs/abc123")
 
-    assert resp.status_code == 500
+    assert resp.status_code == 200
+    assert resp.json()["modelo_em_servico"] == "xgb_residual_log_20261018_100100.pkl"
+    mock_obter.assert_called_once_with("abc123")
 
 
-def test_retreinar_previsao_horizonte_fora_do_limite_retorna_422():
-    resp = client.post("/previsao/retrain", params={"horizonte_anos": 99})
+def test_status_job_inexistente_retorna_404():
+    resp = client.get("/previsao/jobs/nao-existe")
 
-    assert resp.status_code == 422
+    assert resp.status_code == 404
 
 
 def test_modelos_treinados():
@@ -267,6 +262,61 @@ def test_modelos_treinados():
     assert resp.json() == payload
 
 
+def test_previsao_por_ra_sucesso():
+    payload = {
+        "indicador": "feminicidios",
+        "tabela_origem": "violencia_contra_mulher_gold",
+        "coluna_alvo": "casos_feminicidios",
+        "versao": "20261001_120000",
+        "gerado_em": "2026-10-01T12:00:00",
+        "horizonte_anos": 1,
+        "series": [
+            {
+                "regiao_administrativa": "GAMA",
+                "ra_id": 2,
+                "metricas_residual": {"mae": 0.1, "rmse": 0.2},
+                "previsao": [
+                    {
+                        "ano": 2025,
+                        "valor_previsto": 3.0,
+                        "componente_prophet": 2.9,
+                        "residual_log_aplicado": 0.01,
+                    }
+                ],
+            }
+        ],
+        "falhas": {},
+    }
+    with patch(
+        "api.services.forecast_service.obter_previsao_por_ra", return_value=payload
+    ) as servico:
+        resp = client.get(
+            "/previsao/feminicidios/por-ra",
+            params={"horizonte_anos": 1, "regiao_administrativa": "Gama"},
+        )
+
+    assert resp.status_code == 200
+    assert resp.json()["series"][0]["ra_id"] == 2
+    servico.assert_called_once_with(
+        indicador="feminicidios", horizonte_anos=1, regiao_administrativa="Gama"
+    )
+
+
+def test_previsao_por_ra_indicador_desconhecido_retorna_404():
+    resp = client.get("/previsao/inexistente/por-ra")
+
+    assert resp.status_code == 404
+
+
+def test_previsao_por_ra_sem_artefato_retorna_503():
+    with patch(
+        "api.services.forecast_service.previsao_painel.carregar_painel", return_value=None
+    ):
+        resp = client.get("/previsao/crimes-contra-mulher/por-ra")
+
+    assert resp.status_code == 503
+
+
 # ============================================================
 # /classificacao — Regressão Logística
 # ============================================================
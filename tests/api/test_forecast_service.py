@@ -6,7 +6,7 @@ import pandas as pd
 import pytest
 from unittest.mock import MagicMock, mock_open, patch
 
-from analysis.data_analyzer import VERSAO_FEATURES
+from analysis.data_analyzer import VERSAO_FEATURES, preparar_dados
 from api.services import forecast_service
 
 
@@ -115,7 +115,10 @@ def test_gerar_previsao_cache_expirado_forca_retreino():
     )
 
     # semeia uma entrada de cache já expirada (expira_em no passado)
-    forecast_service._CACHE[1] = (0.0, {"previsao": "stale"})
+    forecast_service._CACHE[forecast_service._CHAVE_CACHE] = (
+        0.0,
+        {"horizonte_anos": 10, "previsao": "stale"},
+    )
 
     with (
         patch("api.services.forecast_service.Repository.load", return_value=df),
@@ -553,3 +556,146 @@ def test_listar_modelos_treinados_diretorio_vazio(tmp_path):
     resultado = forecast_service.listar_modelos_treinados(models_dir=str(tmp_path))
 
     assert resultado == {"total": 0, "modelos": []}
+
+
+def test_horizontes_menores_sao_servidos_como_prefixo_do_maximo():
+    df = _df_base()
+    df_preparado = df.copy()
+    df_preparado["ano"] = pd.to_datetime(df_preparado["ano"], format="%Y")
+
+    maximo = forecast_service.HORIZONTE_PREVISAO_MAXIMO
+    forecast_fake = pd.DataFrame(
+        {
+            "ano": pd.date_range("2021-01-01", periods=maximo, freq="YS"),
+            "prophet": np.linspace(130.0, 150.0, maximo),
+            "residual_log": [0.01] * maximo,
+            "final": np.linspace(131.0, 151.0, maximo),
+        }
+    )
+
+    with (
+        patch("api.services.forecast_service.Repository.load", return_value=df),
+        patch("api.services.forecast_service.preparar_dados", return_value=df_preparado),
+        patch(
+            "api.services.forecast_service.localizar_ultimo_modelo_bundle",
+            return_value=(None, None),
+        ),
+        patch(
+            "api.services.forecast_service.treinar_residual",
+            return_value=(MagicMock(), MagicMock(), {"mae": 0.1}, -0.5, 0.5, {}),
+        ) as mock_treinar,
+        patch(
+            "api.services.forecast_service.prever_futuro", return_value=forecast_fake
+        ) as mock_prever,
+    ):
+        tres = forecast_service.gerar_previsao(horizonte_anos=3)
+        sete = forecast_service.gerar_previsao(horizonte_anos=7)
+        dez = forecast_service.gerar_previsao(horizonte_anos=maximo)
+
+    mock_treinar.assert_called_once()
+    mock_prever.assert_called_once()
+    assert mock_prever.call_args.kwargs["anos"] == maximo
+
+    assert [len(r["previsao"]) for r in (tres, sete, dez)] == [3, 7, maximo]
+    assert sete["horizonte_anos"] == 7
+    assert dez["previsao"][:3] == tres["previsao"]
+
+
+def _artefato_painel():
+    return {
+        "indicador": "crimes-contra-mulher",
+        "versao": "20261001_120000",
+        "gerado_em": "2026-10-01T12:00:00",
+        "tabela_origem": "violencia_contra_mulher_gold",
+        "coluna_alvo": "crimes_contra_mulher",
+        "horizonte_anos": 10,
+        "series": {
+            ra: {
+                "ra_id": ra_id,
+                "metricas": {"mae": 0.1, "rmse": 0.2},
+                "residual_bounds": {"min": -1.0, "max": 1.0},
+                "previsao": [
+                    {
+                        "ano": 2025 + h,
+                        "valor_previsto": 10.0 + h,
+                        "componente_prophet": 10.0,
+                        "residual_log_aplicado": 0.0,
+                    }
+                    for h in range(10)
+                ],
+            }
+            for ra, ra_id in [("CEILANDIA", 9), ("GAMA", 2)]
+        },
+        "falhas": {"FERCAL": "série curta (2 anos após preparo)"},
+    }
+
+
+def test_previsao_por_ra_recorta_o_horizonte():
+    with patch.object(
+        forecast_service.previsao_painel, "carregar_painel", return_value=_artefato_painel()
+    ):
+        payload = forecast_service.obter_previsao_por_ra("crimes-contra-mulher", 3)
+
+    assert payload["horizonte_anos"] == 3
+    assert [s["regiao_administrativa"] for s in payload["series"]] == ["CEILANDIA", "GAMA"]
+    assert all(len(s["previsao"]) == 3 for s in payload["series"])
+    assert payload["falhas"] == {"FERCAL": "série curta (2 anos após preparo)"}
+
+
+def test_previsao_por_ra_filtra_por_apelido_da_ra():
+    with patch.object(
+        forecast_service.previsao_painel, "carregar_painel", return_value=_artefato_painel()
+    ):
+        payload = forecast_service.obter_previsao_por_ra(
+            "crimes-contra-mulher", 2, regiao_administrativa="Ceilândia"
+        )
+        with pytest.raises(forecast_service.IndicadorDesconhecidoError):
+            forecast_service.obter_previsao_por_ra(
+                "crimes-contra-mulher", 2, regiao_administrativa="Fercal"
+            )
+
+    assert [s["ra_id"] for s in payload["series"]] == [9]
+
+
+def test_previsao_por_ra_sem_artefato_ou_indicador_invalido():
+    with pytest.raises(forecast_service.IndicadorDesconhecidoError):
+        forecast_service.obter_previsao_por_ra("inexistente", 3)
+
+    with patch.object(forecast_service.previsao_painel, "carregar_painel", return_value=None):
+        with pytest.raises(forecast_service.DadosInsuficientesError, match="previsao_painel"):
+            forecast_service.obter_previsao_por_ra("feminicidios", 3)
+
+
+# ============================================================
+# Re-treino em background (jobs_service) e hot-swap do cache
+# ============================================================
+def _df_longo():
+    return pd.DataFrame(
+        {
+            "ano": list(range(2012, 2022)),
+            "crimes_contra_mulher": [90, 95, 100, 110, 105, 120, 130, 125, 140, 150],
+            "casos_feminicidios": [2, 3, 1, 4, 2, 3, 2, 4, 3, 5],
+        }
+    )
+
+
+def test_retreinar_e_persistir_salva_bundle_novo():
+    with (
+        patch(
+            "api.services.forecast_service._carregar_dados_preparados",
+            return_value=preparar_dados(_df_longo(), "crimes_contra_mulher"),
+        ),
+        patch(
+            "api.services.forecast_service.treinar_residual",
+            return_value=(MagicMock(), MagicMock(), {"mae": 0.1, "rmse": 0.2}, -0.3, 0.3, {}),
+        ),
+        patch(
+            "api.services.forecast_service._persistir_modelo", return_value="novo.pkl"
+        ) as mock_persistir,
+        patch("api.services.forecast_service.prever_futuro") as mock_prever,
+    ):
+        resultado = forecast_service.retreinar_e_persistir()
+
+    assert resultado == {"modelo_arquivo": "novo.pkl", "metricas_residual": {"mae": 0.1, "rmse": 0.2}}
+    mock_persistir.assert_called_once()
+    mock_prever.assert_not_called()
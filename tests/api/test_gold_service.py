@@ -1,3 +1,4 @@
+import json
 import pandas as pd
 import pytest
 from unittest.mock import patch
@@ -61,13 +62,26 @@ def test_obter_dados_tabela_invalida():
         gold_service.obter_dados_tabela("tabela_inexistente")
 
 
-def test_obter_dados_tabela_nao_materializada():
-    with patch("api.services.gold_service.Repository.load", return_value=None):
-        with pytest.raises(gold_service.TabelaNaoEncontradaError):
-            gold_service.obter_dados_tabela("violencia_contra_mulher_gold")
+@pytest.fixture
+def banco_sqlite():
+    """Banco SQLite em memória no lugar do Postgres (mesmo SQL de paginação)."""
+    from sqlalchemy import create_engine
+
+    engine = create_engine("sqlite://")
+    with patch("database.repository.repository.conectar_banco", return_value=engine):
+        yield engine
+
+
+def _materializar(engine, df, tabela="violencia_contra_mulher_gold"):
+    df.to_sql(tabela, engine, index=False)
+
+
+def test_obter_dados_tabela_nao_materializada(banco_sqlite):
+    with pytest.raises(gold_service.TabelaNaoEncontradaError):
+        gold_service.obter_dados_tabela("violencia_contra_mulher_gold")
 
 
-def test_obter_dados_tabela_paginacao_e_filtros():
+def test_obter_dados_tabela_paginacao_e_filtros(banco_sqlite):
     df = pd.DataFrame(
         {
             "ano": [2020, 2021, 2022, 2023],
@@ -75,15 +89,15 @@ def test_obter_dados_tabela_paginacao_e_filtros():
             "crimes_contra_mulher": [10, 12, 5, 8],
         }
     )
-
-    with patch("api.services.gold_service.Repository.load", return_value=df):
-        resultado = gold_service.obter_dados_tabela(
-            "violencia_contra_mulher_gold",
-            pagina=1,
-            tamanho_pagina=2,
-            ano_min=2021,
-            regiao_administrativa="ceilandia",
-        )
+    _materializar(banco_sqlite, df)
+
+    resultado = gold_service.obter_dados_tabela(
+        "violencia_contra_mulher_gold",
+        pagina=1,
+        tamanho_pagina=2,
+        ano_min=2021,
+        regiao_administrativa="ceilandia",
+    )
 
     assert resultado["total_linhas"] == 2  # 2021 e 2023, CEILANDIA
     assert resultado["tamanho_pagina"] == 2
@@ -93,51 +107,122 @@ def test_obter_dados_tabela_paginacao_e_filtros():
     assert anos == {2021, 2023}
 
 
-def test_obter_dados_tabela_pagina_fora_do_intervalo_e_ajustada():
+def test_obter_dados_tabela_le_somente_a_pagina_pedida(banco_sqlite):
+    df = pd.DataFrame({"ano": [2023, 2020, 2022, 2021], "crimes_contra_mulher": [4, 1, 3, 2]})
+    _materializar(banco_sqlite, df)
+
+    resultado = gold_service.obter_dados_tabela(
+        "violencia_contra_mulher_gold", pagina=2, tamanho_pagina=2
+    )
+
+    assert resultado["total_linhas"] == 4
+    assert resultado["total_paginas"] == 2
+    assert [r["ano"] for r in resultado["registros"]] == [2022, 2023]
+
+
+def test_obter_dados_tabela_texto_nulo_vira_none_no_json(banco_sqlite):
+    df = pd.DataFrame(
+        {
+            "ano": [2020, 2021],
+            "regiao_administrativa": ["CEILANDIA", None],
+            "crimes_contra_mulher": [10, 12],
+        }
+    )
+    _materializar(banco_sqlite, df)
+
+    resultado = gold_service.obter_dados_tabela("violencia_contra_mulher_gold")
+
+    assert [r["regiao_administrativa"] for r in resultado["registros"]] == ["CEILANDIA", None]
+    json.dumps(resultado["registros"], allow_nan=False)
+
+
+def test_obter_dados_tabela_pagina_fora_do_intervalo_e_ajustada(banco_sqlite):
     df = pd.DataFrame({"ano": [2020, 2021, 2022], "crimes_contra_mulher": [1, 2, 3]})
+    _materializar(banco_sqlite, df)
 
-    with patch("api.services.gold_service.Repository.load", return_value=df):
-        resultado = gold_service.obter_dados_tabela(
-            "violencia_contra_mulher_gold", pagina=99, tamanho_pagina=10
-        )
+    resultado = gold_service.obter_dados_tabela(
+        "violencia_contra_mulher_gold", pagina=99, tamanho_pagina=10
+    )
 
     assert resultado["pagina"] == 1
     assert resultado["total_paginas"] == 1
     assert len(resultado["registros"]) == 3
 
 
-def test_obter_dados_tabela_filtro_somente_ano_max():
+def test_obter_dados_tabela_removida_entre_as_duas_leituras_levanta_erro():
+    """A tabela some (ex.: swap do FULL REFRESH) antes da leitura da última página."""
+    with patch(
+        "api.services.gold_service._carregar_pagina_cache",
+        side_effect=[(pd.DataFrame(), 3), None],
+    ):
+        with pytest.raises(gold_service.TabelaNaoEncontradaError):
+            gold_service.obter_dados_tabela(
+                "violencia_contra_mulher_gold", pagina=99, tamanho_pagina=10
+            )
+
+
+def test_obter_dados_tabela_filtro_somente_ano_max(banco_sqlite):
     df = pd.DataFrame({"ano": [2020, 2021, 2022], "crimes_contra_mulher": [1, 2, 3]})
+    _materializar(banco_sqlite, df)
 
-    with patch("api.services.gold_service.Repository.load", return_value=df):
-        resultado = gold_service.obter_dados_tabela(
-            "violencia_contra_mulher_gold", ano_max=2021
-        )
+    resultado = gold_service.obter_dados_tabela(
+        "violencia_contra_mulher_gold", ano_max=2021
+    )
 
     anos = {r["ano"] for r in resultado["registros"]}
     assert anos == {2020, 2021}
 
 
-def test_obter_dados_tabela_sem_filtros_retorna_tudo():
+def test_obter_dados_tabela_sem_filtros_retorna_tudo(banco_sqlite):
     df = pd.DataFrame({"ano": [2020, 2021], "crimes_contra_mulher": [1, 2]})
+    _materializar(banco_sqlite, df)
 
-    with patch("api.services.gold_service.Repository.load", return_value=df):
-        resultado = gold_service.obter_dados_tabela("violencia_contra_mulher_gold")
+    resultado = gold_service.obter_dados_tabela("violencia_contra_mulher_gold")
 
     assert resultado["total_linhas"] == 2
 
 
-def test_obter_dados_tabela_tabela_sem_coluna_de_ano_ignora_filtro_de_ano():
+def test_obter_dados_tabela_tabela_sem_coluna_de_ano_ignora_filtro_de_ano(banco_sqlite):
     """
     Tabelas fora de COLUNA_ANO_POR_TABELA (ex.: violencia_idosos_gold) não
     têm coluna de ano mapeada -> o filtro ano_min/ano_max deve ser
     simplesmente ignorado, sem erro.
     """
     df = pd.DataFrame({"regiao_administrativa": ["CEILANDIA", "GAMA"], "valor": [1, 2]})
+    _materializar(banco_sqlite, df, "violencia_idosos_gold")
+
+    resultado = gold_service.obter_dados_tabela(
+        "violencia_idosos_gold", ano_min=2020, ano_max=2021
+    )
+
+    assert resultado["total_linhas"] == 2
+
+
+def test_obter_dados_tabela_filtro_de_ra_em_tabela_sem_coluna_e_ignorado(banco_sqlite):
+    df = pd.DataFrame({"ano": [2020, 2021], "ocorrencias": [1, 2]})
+    _materializar(banco_sqlite, df, "violencia_idosos_ocorrencias_gold")
 
-    with patch("api.services.gold_service.Repository.load", return_value=df):
-        resultado = gold_service.obter_dados_tabela(
-            "violencia_idosos_gold", ano_min=2020, ano_max=2021
-        )
+    resultado = gold_service.obter_dados_tabela(
+        "violencia_idosos_ocorrencias_gold", regiao_administrativa="GAMA"
+    )
+
+    assert resultado["total_linhas"] == 2
+
+
+def test_obter_dados_tabela_filtro_de_ra_por_apelido_usa_ra_id(banco_sqlite):
+    df = pd.DataFrame(
+        {
+            "ano": [2022, 2023, 2023],
+            "regiao_administrativa": ["PLANO PILOTO", "PLANO PILOTO", "GAMA"],
+            "ra_id": [1, 1, 2],
+            "crimes_contra_mulher": [3, 4, 5],
+        }
+    )
+    _materializar(banco_sqlite, df)
+
+    resultado = gold_service.obter_dados_tabela(
+        "violencia_contra_mulher_gold", regiao_administrativa="Brasília"
+    )
 
     assert resultado["total_linhas"] == 2
+    assert {r["ra_id"] for r in resultado["registros"]} == {1}
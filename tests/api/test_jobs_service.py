@@ -0,0 +1,153 @@
+import threading
+
+import pytest
+from unittest.mock import patch
+
+from api.services import forecast_service, jobs_service
+
+
+@pytest.fixture(autouse=True)
+def jobs_em_threads(monkeypatch):
+    # os mocks de forecast_service não atravessam processos
+    monkeypatch.setattr(jobs_service, "BACKEND_RETREINO", "threads")
+    jobs_service.limpar()
+    yield
+    jobs_service.encerrar()
+    jobs_service.limpar()
+
+
+def _aguardar(job_id):
+    jobs_service._obter_executor().submit(lambda: None).result(timeout=5)
+    for _ in range(100):
+        job = jobs_service.obter_job(job_id)
+        if job["status"] in (jobs_service.CONCLUIDO, jobs_service.FALHOU):
+            return job
+        threading.Event().wait(0.01)
+    raise AssertionError("job não terminou")
+
+
+def test_job_conclui_e_invalida_a_previsao_em_cache():
+    resultado = {"modelo_arquivo": "novo.pkl", "metricas_residual": {"mae": 0.1, "rmse": 0.2}}
+    forecast_service._CACHE[forecast_service._CHAVE_CACHE] = (float("inf"), {"modelo_arquivo": "antigo.pkl"})
+
+    with patch.object(
+        forecast_service, "retreinar_e_persistir", return_value=resultado
+    ), patch.object(forecast_service, "_carregar_dados_preparados") as mock_carregar:
+        job = jobs_service.solicitar_retreino()
+        final = _aguardar(job["job_id"])
+
+    assert job["status"] in (jobs_service.PENDENTE, jobs_service.EXECUTANDO)
+    assert final["status"] == jobs_service.CONCLUIDO
+    assert final["modelo_arquivo"] == "novo.pkl"
+    assert final["modelo_em_servico"] == "novo.pkl"
+    assert final["concluido_em"] is not None
+    assert forecast_service._CHAVE_CACHE not in forecast_service._CACHE
+    # nada de carga de dados nem predict na thread de gerenciamento do pool
+    mock_carregar.assert_not_called()
+
+
+def test_pedidos_concorrentes_sao_agrupados_no_job_em_andamento():
+    liberar = threading.Event()
+    chamadas = []
+
+    def treinar():
+        chamadas.append(1)
+        liberar.wait(5)
+        return {"modelo_arquivo": "novo.pkl", "metricas_residual": {}}
+
+    with patch.object(forecast_service, "retreinar_e_persistir", side_effect=treinar):
+        primeiro = jobs_service.solicitar_retreino()
+        segundo = jobs_service.solicitar_retreino()
+        liberar.set()
+        _aguardar(primeiro["job_id"])
+
+        terceiro = jobs_service.solicitar_retreino()
+        _aguardar(terceiro["job_id"])
+
+    assert segundo["job_id"] == primeiro["job_id"]
+    assert segundo["solicitacoes"] == 2
+    assert terceiro["job_id"] != primeiro["job_id"]
+    assert len(chamadas) == 2
+
+
+def test_job_com_falha_registra_o_erro_e_nao_troca_o_modelo():
+    with patch.object(
+        forecast_service,
+        "retreinar_e_persistir",
+        side_effect=forecast_service.DadosInsuficientesError("tabela vazia"),
+    ), patch.object(forecast_service, "limpar_cache") as mock_limpar:
+        job = jobs_service.solicitar_retreino()
+        final = _aguardar(job["job_id"])
+
+    assert final["status"] == jobs_service.FALHOU
+    assert final["erro"] == "DadosInsuficientesError: tabela vazia"
+    mock_limpar.assert_not_called()
+
+
+def test_job_inexistente():
+    with pytest.raises(jobs_service.JobNaoEncontradoError):
+        jobs_service.obter_job("nao-existe")
+
+
+def test_jobs_finalizados_mais_antigos_sao_descartados(monkeypatch):
+    monkeypatch.setattr(jobs_service, "LIMITE_JOBS", 2)
+
+    with patch.object(
+        forecast_service, "retreinar_e_persistir", return_value={"modelo_arquivo": "x.pkl", "metricas_residual": {}}
+    ):
+        ids = []
+        for _ in range(3):
+            ids.append(jobs_service.solicitar_retreino()["job_id"])
+            _aguardar(ids[-1])
+
+    with pytest.raises(jobs_service.JobNaoEncontradoError):
+        jobs_service.obter_job(ids[0])
+    assert jobs_service.obter_job(ids[-1])["status"] == jobs_service.CONCLUIDO
+
+
+class _PoolQuebrado:
+    def submit(self, *args, **kwargs):
+        from concurrent.futures.process import BrokenProcessPool
+
+        raise BrokenProcessPool("processo filho morreu")
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        pass
+
+
+def test_pool_quebrado_e_recriado_antes_de_registrar_o_job():
+    resultado = {"modelo_arquivo": "novo.pkl", "metricas_residual": {}}
+    jobs_service._executor = _PoolQuebrado()
+
+    with patch.object(forecast_service, "retreinar_e_persistir", return_value=resultado):
+        job = jobs_service.solicitar_retreino()
+        final = _aguardar(job["job_id"])
+
+    assert not isinstance(jobs_service._executor, _PoolQuebrado)
+    assert final["status"] == jobs_service.CONCLUIDO
+
+
+def test_pool_indisponivel_nao_deixa_job_pendente(monkeypatch):
+    monkeypatch.setattr(jobs_service, "_obter_executor", lambda: _PoolQuebrado())
+
+    with pytest.raises(jobs_service.RetreinoIndisponivelError):
+        jobs_service.solicitar_retreino()
+
+    assert jobs_service._jobs == {}
+    assert jobs_service._job_ativo is None
+
+
+def test_job_cancelado_e_registrado_como_falha():
+    from concurrent.futures import Future
+
+    futuro = Future()
+    futuro.cancel()
+    jobs_service._jobs["j1"] = {"job_id": "j1", "status": jobs_service.PENDENTE, "concluido_em": None}
+
+    with patch.object(forecast_service, "limpar_cache") as mock_limpar:
+        jobs_service._finalizar("j1", futuro)
+
+    job = jobs_service.obter_job("j1")
+    assert job["status"] == jobs_service.FALHOU
+    assert job["erro"].startswith("CancelledError")
+    mock_limpar.assert_not_called()
@@ -0,0 +1,122 @@
+import json
+import os
+
+import pytest
+from unittest.mock import patch
+
+from api.services import classificacao_service
+from api.services.registro_modelos import RegistroModelos
+
+
+def _salvar(diretorio, nome, criado_em, conteudo="modelo"):
+    (diretorio / f"{nome}.pkl").write_text(conteudo, encoding="utf-8")
+    meta = {"model_file": f"{nome}.pkl", "created_at": criado_em}
+    (diretorio / f"{nome}_meta.json").write_text(json.dumps(meta), encoding="utf-8")
+
+
+def _localizar(models_dir):
+    metas = []
+    for arquivo in os.listdir(models_dir) if os.path.isdir(models_dir) else []:
+        if arquivo.endswith("_meta.json"):
+            with open(os.path.join(models_dir, arquivo), encoding="utf-8") as f:
+                metas.append(json.load(f))
+    if not metas:
+        return None, None
+    meta = max(metas, key=lambda m: m["created_at"])
+    return os.path.join(models_dir, meta["model_file"]), meta
+
+
+@pytest.fixture
+def registro(tmp_path):
+    carregados = []
+
+    def carregar(model_path):
+        carregados.append(os.path.basename(model_path))
+        with open(model_path, encoding="utf-8") as f:
+            return f.read()
+
+    registro = RegistroModelos()
+    registro.registrar("teste", _localizar, carregar, diretorio=lambda: str(tmp_path))
+    registro.carregados = carregados
+    return registro
+
+
+def test_modelo_fica_residente_enquanto_o_diretorio_nao_muda(registro, tmp_path):
+    _salvar(tmp_path, "a", "2026-01-01")
+
+    primeiro = registro.obter("teste")
+    segundo = registro.obter("teste")
+
+    assert primeiro.objeto == "modelo"
+    assert segundo is primeiro
+    assert registro.carregados == ["a.pkl"]
+
+
+def test_artefato_novo_no_diretorio_troca_o_modelo(registro, tmp_path):
+    _salvar(tmp_path, "a", "2026-01-01")
+    registro.obter("teste")
+
+    _salvar(tmp_path, "b", "2026-02-01", conteudo="novo")
+
+    assert registro.obter("teste").objeto == "novo"
+    assert registro.carregados == ["a.pkl", "b.pkl"]
+
+
+def test_arquivo_nao_relacionado_nao_recarrega_o_modelo(registro, tmp_path):
+    _salvar(tmp_path, "a", "2026-01-01")
+    registro.obter("teste")
+
+    (tmp_path / "anotacoes.txt").write_text("x", encoding="utf-8")
+    modelo = registro.obter("teste")
+
+    assert modelo.meta["model_file"] == "a.pkl"
+    assert registro.carregados == ["a.pkl"]
+
+
+def test_diretorio_vazio_ou_inexistente(registro, tmp_path):
+    assert registro.obter("teste") is None
+    assert registro.obter("teste", str(tmp_path / "nao_existe")) is None
+
+    _salvar(tmp_path, "a", "2026-01-01")
+    assert registro.obter("teste").objeto == "modelo"
+
+
+def test_falha_ao_carregar_propaga_e_tenta_de_novo(tmp_path):
+    tentativas = []
+
+    def carregar(model_path):
+        tentativas.append(model_path)
+        raise ValueError("pickle corrompido")
+
+    registro = RegistroModelos()
+    registro.registrar("teste", _localizar, carregar, diretorio=lambda: str(tmp_path))
+    _salvar(tmp_path, "a", "2026-01-01")
+
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            registro.obter("teste")
+    assert len(tentativas) == 2
+
+    assert registro.aquecer() == {"teste": None}
+
+
+def test_aquecer_carrega_todos_os_tipos(registro, tmp_path):
+    _salvar(tmp_path, "a", "2026-01-01")
+
+    assert registro.aquecer() == {"teste": "a.pkl"}
+    registro.obter("teste")
+    assert registro.carregados == ["a.pkl"]
+
+
+def test_classificacao_nao_desserializa_o_artefato_a_cada_cache_miss(tmp_path):
+    _salvar(tmp_path, f"{classificacao_service.PREFIXO_ARTEFATO}20260101_0000", "2026-01-01")
+
+    with (
+        patch(f"{classificacao_service.__name__}.MODELS_DIR", str(tmp_path)),
+        patch(f"{classificacao_service.__name__}.joblib.load", return_value="pipeline") as mock_load,
+        patch(f"{classificacao_service.__name__}._classificar_com_modelo", return_value=([], [])),
+    ):
+        for _ in range(3):
+            classificacao_service._tentar_servir_de_artefato(None)
+
+    mock_load.assert_called_once()
@@ -77,6 +77,7 @@ def test_limpar_diretorios_remove_arquivos(
         [],
         [],
         ["./logs/c.log"],
+        [],
     ]
 
     mock_logger = MagicMock()
@@ -90,6 +91,21 @@ def test_limpar_diretorios_remove_arquivos(
     assert logger == mock_logger
 
 
+@patch("util.arquivos.fechar_loggers")
+@patch("util.arquivos.logs")
+def test_limpar_diretorios_remove_datasets_parquet(mock_logs, mock_fechar, tmp_path, monkeypatch):
+    saida = tmp_path / "data" / "silver" / "output"
+    (saida / "homicidio.parquet" / "ano=2020").mkdir(parents=True)
+    (saida / "homicidio.parquet" / "ano=2020" / "parte-0.parquet").write_bytes(b"x")
+    (saida / "racismo.parquet").write_bytes(b"x")
+    (saida / "homicidio.csv").write_text("a")
+    monkeypatch.chdir(tmp_path)
+
+    limpar_diretorios()
+
+    assert list(saida.iterdir()) == []
+
+
 @patch("util.arquivos.glob.glob", return_value=[])
 @patch("util.arquivos.fechar_loggers")
 @patch("util.arquivos.logs")
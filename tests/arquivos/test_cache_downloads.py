@@ -0,0 +1,99 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from util import arquivos, cache_downloads
+
+CONTEUDO = b"ano;total\n2023;10\n"
+ETAG = '"v1"'
+
+
+class _Handler(BaseHTTPRequestHandler):
+    requisicoes = []
+
+    def do_GET(self):
+        _Handler.requisicoes.append(dict(self.headers))
+
+        if self.headers.get("If-None-Match") == ETAG:
+            self.send_response(304)
+            self.send_header("ETag", ETAG)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/csv")
+        self.send_header("Content-Length", str(len(CONTEUDO)))
+        self.send_header("ETag", ETAG)
+        self.end_headers()
+        self.wfile.write(CONTEUDO)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def servidor():
+    _Handler.requisicoes = []
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}/dados.csv"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def diretorio_temporario(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(arquivos, "sleep", lambda *_: None)
+    return tmp_path
+
+
+def test_segundo_download_revalida_com_304(servidor, diretorio_temporario):
+    primeiro = arquivos.download_arquivo(servidor, "dados", usar_cache=True)
+    segundo = arquivos.download_arquivo(servidor, "dados", usar_cache=True)
+
+    assert primeiro == segundo
+    assert open(segundo, "rb").read() == CONTEUDO
+
+    assert "If-None-Match" not in _Handler.requisicoes[0]
+    assert _Handler.requisicoes[1]["If-None-Match"] == ETAG
+
+    with open(cache_downloads.CAMINHO_MANIFESTO, encoding="utf-8") as f:
+        entrada = json.load(f)[servidor]
+
+    assert entrada["arquivo"] == primeiro
+    assert entrada["etag"] == ETAG
+    assert entrada["sha256"] == cache_downloads.hash_arquivo(primeiro)
+
+
+def test_arquivo_removido_forca_novo_download(servidor, diretorio_temporario):
+    caminho = arquivos.download_arquivo(servidor, "dados", usar_cache=True)
+    (diretorio_temporario / caminho).unlink()
+
+    assert cache_downloads.cabecalhos_condicionais(servidor) == {}
+
+    novo = arquivos.download_arquivo(servidor, "dados", usar_cache=True)
+
+    assert novo == caminho
+    assert "If-None-Match" not in _Handler.requisicoes[1]
+
+
+def test_cache_desligado_nao_envia_validadores(servidor, diretorio_temporario):
+    arquivos.download_arquivo(servidor, "dados", usar_cache=False)
+    arquivos.download_arquivo(servidor, "dados", usar_cache=False)
+
+    assert all("If-None-Match" not in r for r in _Handler.requisicoes)
+    assert _Handler.requisicoes[1]["Cache-Control"] == "no-cache"
+
+
+def test_limpar_diretorios_preserva_bronze(monkeypatch):
+    padroes = []
+    monkeypatch.setattr(arquivos.glob, "glob", lambda p: padroes.append(p) or [])
+
+    arquivos.limpar_diretorios(preservar_bronze=True)
+
+    assert padroes
+    assert not any(p.startswith("./data/bronze/") for p in padroes)
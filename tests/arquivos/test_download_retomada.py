@@ -0,0 +1,84 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from util import arquivos
+
+CONTEUDO = bytes(range(256)) * 64
+ETAG = '"zip-v1"'
+
+
+class _Handler(BaseHTTPRequestHandler):
+    requisicoes = []
+
+    def do_GET(self):
+        _Handler.requisicoes.append(dict(self.headers))
+        intervalo = self.headers.get("Range")
+
+        if intervalo and self.headers.get("If-Range") == ETAG:
+            inicio = int(intervalo.split("=")[1].rstrip("-"))
+            corpo = CONTEUDO[inicio:]
+            self.send_response(206)
+            self.send_header(
+                "Content-Range", f"bytes {inicio}-{len(CONTEUDO) - 1}/{len(CONTEUDO)}"
+            )
+        else:
+            corpo = CONTEUDO
+            self.send_response(200)
+
+        self.send_header("Content-Type", "application/zip")
+        self.send_header("Content-Length", str(len(corpo)))
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("ETag", ETAG)
+        self.end_headers()
+
+        if len(_Handler.requisicoes) == 1:
+            # primeira resposta cai no meio do corpo
+            self.wfile.write(corpo[: len(corpo) // 2])
+            self.wfile.flush()
+            self.connection.shutdown(2)
+            return
+
+        self.wfile.write(corpo)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def servidor(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(arquivos, "sleep", lambda *_: None)
+    _Handler.requisicoes = []
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}/dados.zip"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_download_interrompido_retoma_com_range(servidor):
+    caminho = arquivos.download_arquivo(servidor, "dados", usar_cache=False)
+
+    assert open(caminho, "rb").read() == CONTEUDO
+    assert len(_Handler.requisicoes) == 2
+    assert "Range" not in _Handler.requisicoes[0]
+    assert _Handler.requisicoes[1]["Range"].startswith("bytes=")
+    assert _Handler.requisicoes[1]["If-Range"] == ETAG
+
+
+def test_tempo_espera_exponencial_com_jitter(monkeypatch):
+    monkeypatch.setattr(arquivos, "BACKOFF_BASE", 2.0)
+    monkeypatch.setattr(arquivos, "BACKOFF_MAXIMO", 10.0)
+
+    for tentativa, teto in [(1, 2.0), (2, 4.0), (3, 8.0), (5, 10.0)]:
+        espera = arquivos.tempo_espera(tentativa)
+        assert teto / 2 <= espera <= teto
+
+
+def test_prazo_esgotado_nao_tenta(servidor):
+    resultado = arquivos.download_arquivo(servidor, "dados", usar_cache=False, prazo=0)
+
+    assert resultado is None
+    assert _Handler.requisicoes == []
@@ -1,10 +1,15 @@
+import hashlib
 import os
 import zipfile
 import pytest
 from pathlib import Path
 from unittest.mock import patch, MagicMock
 
-from util.extrator_zip import extrair_zip_seguro, arquivos_zip_execucao
+from util.extrator_zip import (
+    arquivos_zip_execucao,
+    extrair_zip_seguro,
+    iterar_membros_zip,
+)
 
 
 # =====================================================
@@ -124,8 +129,9 @@ def test_extrair_zip_seguro_erro_durante_extracao(tmp_path):
 # =====================================================
 # ▶️ Testes arquivos_zip_execucao
 # =====================================================
-def test_arquivos_zip_execucao_extrai_todos(temp_dirs):
+def test_arquivos_zip_execucao_extrai_todos(temp_dirs, monkeypatch):
     zip_dir, planilha_dir = temp_dirs
+    monkeypatch.setattr("util.extrator_zip.MODO_EXTRACAO", "disco")
 
     criar_zip(zip_dir / "a.zip", {"a.txt": "1"})
     criar_zip(zip_dir / "b.zip", {"b.txt": "2"})
@@ -171,3 +177,59 @@ def test_extrair_zip_seguro_permission_error_ao_remover(tmp_path):
     with patch("util.extrator_zip.os.remove", side_effect=PermissionError):
         with pytest.raises(PermissionError):
             extrair_zip_seguro(str(zip_path), str(destino))
+
+
+# =====================================================
+# 🌊 Leitura em streaming e hash de membros
+# =====================================================
+def test_extrair_zip_seguro_ignora_membro_inalterado(temp_dirs):
+    zip_dir, planilha_dir = temp_dirs
+
+    zip_path = zip_dir / "teste.zip"
+    criar_zip(zip_path, {"a.txt": "igual", "b.txt": "novo"})
+    (planilha_dir / "a.txt").write_text("igual")
+    (planilha_dir / "b.txt").write_text("velho")
+
+    with patch("util.extrator_zip.os.remove", wraps=os.remove) as mock_remove:
+        extrair_zip_seguro(str(zip_path), str(planilha_dir))
+
+    removidos = [os.path.basename(c.args[0]) for c in mock_remove.call_args_list]
+    assert removidos == ["b.txt"]
+    assert (planilha_dir / "b.txt").read_text() == "novo"
+
+
+def test_iterar_membros_zip_le_sem_extrair(temp_dirs):
+    zip_dir, planilha_dir = temp_dirs
+
+    zip_path = zip_dir / "pop.zip"
+    criar_zip(zip_path, {"UF_Municipio.xls": "dados", "leia-me.txt": "x"})
+
+    membros = list(
+        iterar_membros_zip(str(zip_path), filtro=lambda n: n.endswith(".xls"))
+    )
+
+    assert [m.nome for m in membros] == ["UF_Municipio.xls"]
+    assert membros[0].abrir().read() == b"dados"
+    assert membros[0].sha256 == hashlib.sha256(b"dados").hexdigest()
+    assert list(planilha_dir.iterdir()) == []
+
+
+def test_iterar_membros_zip_detecta_zip_slip(temp_dirs):
+    zip_dir, _ = temp_dirs
+
+    zip_path = zip_dir / "malicioso.zip"
+    with zipfile.ZipFile(zip_path, "w") as z:
+        z.writestr("../evil.xls", "ataque")
+
+    with pytest.raises(Exception, match="Zip Slip"):
+        list(iterar_membros_zip(str(zip_path)))
+
+
+def test_arquivos_zip_execucao_streaming_nao_extrai(temp_dirs, monkeypatch):
+    zip_dir, planilha_dir = temp_dirs
+    criar_zip(zip_dir / "a.zip", {"a.txt": "1"})
+
+    monkeypatch.setattr("util.extrator_zip.MODO_EXTRACAO", "streaming")
+    arquivos_zip_execucao()
+
+    assert list(planilha_dir.iterdir()) == []
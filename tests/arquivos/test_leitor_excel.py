@@ -1,3 +1,7 @@
+import io
+import os
+import zipfile
+
 import pandas as pd
 import pytest
 from unittest.mock import patch, MagicMock
@@ -15,6 +19,8 @@ from util.leitor_excel import (
     salvar_historico_csv,
     listar_arquivos_por_padrao,
     listar_arquivos_crimes,
+    _mapear_planilhas,
+    EM_VOO_POR_WORKER,
 )
 
 
@@ -457,4 +463,125 @@ def test_processar_crimes_fluxo_completo(tmp_path):
 
                 # Apenas arquivo1 deve ser processado
                 mock_processar.assert_called_once_with(arquivo1)
-                assert mock_salvar.call_count == 1
\ No newline at end of file
+                assert mock_salvar.call_count == 1
+
+# =====================================================
+# 🌊 Planilhas lidas direto dos ZIPs (modo streaming)
+# =====================================================
+def _zip_com_planilha(caminho_zip, nome_membro, df):
+    buffer = io.BytesIO()
+    df.to_excel(buffer, index=False, startrow=2)
+    with zipfile.ZipFile(caminho_zip, "w") as z:
+        z.writestr(nome_membro, buffer.getvalue())
+
+
+def test_processar_populacao_streaming_le_membros_do_zip(tmp_path, monkeypatch):
+    zip_dir = tmp_path / "zip"
+    zip_dir.mkdir()
+    df = pd.DataFrame({"UF": ["SP", "DF"], "População": [100, 3_000_000]})
+    _zip_com_planilha(zip_dir / "populacao_2015.zip", "UF_Municipio.xlsx", df)
+    _zip_com_planilha(zip_dir / "populacao_2016.zip", "UF_Municipio.xlsx", df)
+
+    monkeypatch.setattr("util.extrator_zip.MODO_EXTRACAO", "streaming")
+    monkeypatch.setattr("util.extrator_zip.diretorio_zip", str(zip_dir))
+
+    with (
+        patch("util.leitor_excel.listar_arquivos_populacao", return_value=[]),
+        patch("util.leitor_excel.salvar_historico_csv") as mock_salvar,
+    ):
+        processar_populacao()
+
+    historico = mock_salvar.call_args.args[0]
+    assert historico["ano"].tolist() == [2015, 2016]
+    assert historico["populacao"].tolist() == [3_000_000, 3_000_000]
+    assert not list(tmp_path.glob("**/*.xlsx"))
+
+
+def test_processar_crimes_streaming_le_membros_do_zip(tmp_path, monkeypatch):
+    zip_dir = tmp_path / "zip"
+    zip_dir.mkdir()
+    saida = tmp_path / "saida"
+    saida.mkdir()
+    with zipfile.ZipFile(zip_dir / "crimes.zip", "w") as z:
+        z.writestr("roubo.xlsx", b"fake")
+        z.writestr("outro.xlsx", b"fake")
+
+    monkeypatch.setattr("util.extrator_zip.MODO_EXTRACAO", "streaming")
+    monkeypatch.setattr("util.extrator_zip.diretorio_zip", str(zip_dir))
+
+    with (
+        patch("util.leitor_excel.listar_arquivos_crimes", return_value=[]),
+        patch(
+            "util.leitor_excel.processar_dados_crimes",
+            return_value=MagicMock(empty=False),
+        ) as mock_processar,
+        patch("util.leitor_excel.salvar_historico_csv") as mock_salvar,
+    ):
+        processar_crimes(tmp_path, saida)
+
+    mock_processar.assert_called_once()
+    assert mock_processar.call_args.args[0].nome_base == "roubo.xlsx"
+    assert mock_salvar.call_args.args[1] == saida / "roubo.csv"
+
+
+# =====================================================
+# ⚡ Leitura paralela e cache de abas por hash
+# =====================================================
+def _planilha_populacao(caminho, populacao):
+    pd.DataFrame({"UF": ["SP", "DF"], "População": [100, populacao]}).to_excel(
+        caminho, index=False, startrow=2
+    )
+
+
+def test_processar_arquivo_usa_cache_por_hash(tmp_path):
+    arquivo = tmp_path / "pop_2015.xlsx"
+    _planilha_populacao(arquivo, 2_900_000)
+
+    primeiro = processar_arquivo(str(arquivo))
+
+    with patch("util.leitor_excel.pd.read_excel") as mock_read:
+        segundo = processar_arquivo(str(arquivo))
+
+    mock_read.assert_not_called()
+    pd.testing.assert_frame_equal(primeiro, segundo)
+
+
+def test_processar_arquivo_conteudo_alterado_invalida_cache(tmp_path):
+    arquivo = tmp_path / "pop_2015.xlsx"
+    _planilha_populacao(arquivo, 2_900_000)
+    processar_arquivo(str(arquivo))
+
+    _planilha_populacao(arquivo, 3_100_000)
+    df = processar_arquivo(str(arquivo))
+
+    assert df.iloc[0]["populacao"] == 3_100_000
+
+
+def test_consolidar_historico_em_processos(tmp_path):
+    arquivos = []
+    for ano, populacao in [(2016, 2_970_000), (2015, 2_910_000), (2017, 3_030_000)]:
+        arquivo = tmp_path / f"pop_{ano}.xlsx"
+        _planilha_populacao(arquivo, populacao)
+        arquivos.append(str(arquivo))
+    arquivos.append(str(tmp_path / "pop_2018_inexistente.xlsx"))
+
+    df = consolidar_historico(arquivos, max_workers=2)
+
+    assert df["ano"].tolist() == [2015, 2016, 2017]
+    assert df["populacao"].tolist() == [2_910_000, 2_970_000, 3_030_000]
+
+
+def test_mapear_planilhas_consome_as_fontes_sob_demanda():
+    consumidas = []
+
+    def fontes():
+        for i in range(20):
+            consumidas.append(i)
+            yield f"/tmp/planilha_{i}.xlsx"
+
+    resultados = _mapear_planilhas(os.path.basename, fontes(), max_workers=2)
+
+    assert next(resultados) == ("/tmp/planilha_0.xlsx", "planilha_0.xlsx")
+    assert len(consumidas) <= 2 * EM_VOO_POR_WORKER + 1
+    assert [nome for _, nome in resultados][-1] == "planilha_19.xlsx"
+    assert len(consumidas) == 20
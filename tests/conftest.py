@@ -1313,3 +1313,66 @@ def configuracao_padrao():
         "timeout": 30,
         "encoding": "utf-8",
     }
+
+
+# ============================================================
+# FIXTURES - CACHE DE TABELAS
+# ============================================================
+
+
+@pytest.fixture(autouse=True)
+def cache_tabelas_isolado(monkeypatch):
+    """
+    Esvazia o cache de tabelas do processo entre testes e evita que a
+    verificação de versão tente abrir conexão com o banco.
+    """
+
+    from database.cache_tabelas import cache_tabelas
+
+    monkeypatch.setattr(cache_tabelas, "_obter_versao", lambda: None)
+    cache_tabelas.invalidar()
+
+    yield cache_tabelas
+
+    cache_tabelas.invalidar()
+
+
+@pytest.fixture(autouse=True)
+def registro_modelos_isolado():
+    """Modelos carregados por um teste (inclusive mocks) não vazam para o próximo."""
+
+    from api.services.registro_modelos import registro
+
+    registro.invalidar()
+    yield registro
+    registro.invalidar()
+
+
+@pytest.fixture(autouse=True)
+def planilhas_isoladas(tmp_path, monkeypatch):
+    """
+    Leitura de planilhas e folds do backtesting em série (os mocks de
+    `pd.read_excel`/Prophet não atravessam processos) e cache de abas em
+    diretório temporário por teste.
+    """
+
+    monkeypatch.setattr("util.leitor_excel.WORKERS_PLANILHAS", 1)
+    monkeypatch.setattr("analysis.data_analyzer.WORKERS_BACKTESTING", 1)
+    monkeypatch.setattr(
+        "util.leitor_excel.DIRETORIO_CACHE_PLANILHAS", str(tmp_path / "cache_planilhas")
+    )
+
+
+@pytest.fixture(autouse=True)
+def pipeline_em_threads(tmp_path, monkeypatch):
+    """
+    Steps do pipeline sempre em threads (os mocks aplicados nos módulos não
+    chegam aos processos worker do backend "processes"), cache de steps em
+    diretório temporário por teste e telemetria desligada.
+    """
+
+    monkeypatch.setattr("src.core.executor.BACKEND_FORCADO", "threads")
+    monkeypatch.setattr(
+        "src.core.cache_steps.DIRETORIO_CACHE_STEPS", str(tmp_path / "cache_steps")
+    )
+    monkeypatch.setattr("src.core.telemetria.TELEMETRIA_ATIVA", False)
@@ -0,0 +1,109 @@
+import threading
+import time
+
+import pytest
+
+from src.core import agendador, telemetria
+from src.core.executor import executar_pipeline
+from src.core.pipeline_step import PipelineStep
+
+
+def _step(nome, dependencias=(), func=None, **kwargs):
+    return PipelineStep(
+        nome=nome,
+        func=func or (lambda: None),
+        retries=0,
+        timeout=5,
+        dependencias=dependencias,
+        **kwargs,
+    )
+
+
+def test_prioridade_soma_a_cadeia_mais_longa_de_dependentes():
+    steps = [_step("a"), _step("b", ("a",)), _step("c", ("b",)), _step("d", ("a",))]
+    duracoes = {"a": 1.0, "b": 5.0, "c": 2.0, "d": 1.0}
+
+    rank = agendador.prioridades(steps, duracoes)
+
+    assert rank == {"a": 8.0, "b": 7.0, "c": 2.0, "d": 1.0}
+
+
+def test_steps_sem_historico_usam_a_mediana_dos_conhecidos():
+    steps = [_step("a"), _step("b"), _step("c"), _step("novo")]
+
+    duracoes = agendador.estimar_duracoes(steps, {"a": 1.0, "b": 3.0, "c": 10.0})
+
+    assert duracoes["novo"] == 3.0
+    assert agendador.estimar_duracoes(steps, {})["a"] == agendador.DURACAO_PADRAO
+
+
+def test_simulacao_comeca_pela_cadeia_critica():
+    # 1 worker: começar por "longo" (que destrava "final") encurta o total
+    steps = [_step("curto"), _step("longo"), _step("final", ("longo",))]
+    duracoes = {"curto": 1.0, "longo": 4.0, "final": 4.0}
+
+    makespan, cronograma = agendador.simular(steps, 2, 2, duracoes)
+
+    assert makespan == 8.0
+    assert cronograma.set_index("step").loc["longo", "inicio_s"] == 0.0
+
+    makespan_um_worker, cronograma = agendador.simular(steps, 1, 1, duracoes)
+    assert makespan_um_worker == 9.0
+    assert cronograma["step"].tolist() == ["longo", "final", "curto"]
+
+
+def test_recursos_impedem_steps_pesados_simultaneos():
+    steps = [_step("pesado_1", recursos=2), _step("pesado_2", recursos=2), _step("leve")]
+    duracoes = {"pesado_1": 3.0, "pesado_2": 3.0, "leve": 1.0}
+
+    makespan, cronograma = agendador.simular(steps, 4, 2, duracoes)
+    linhas = cronograma.set_index("step")
+
+    assert makespan == 7.0
+    assert linhas.loc["pesado_2", "inicio_s"] >= linhas.loc["pesado_1", "fim_s"]
+
+
+def test_executor_submete_primeiro_o_caminho_critico(monkeypatch):
+    ordem = []
+    monkeypatch.setattr(
+        telemetria, "duracoes_medianas", lambda: {"curto": 1.0, "longo": 4.0, "final": 4.0}
+    )
+
+    steps = [
+        _step("curto", func=lambda: ordem.append("curto")),
+        _step("longo", func=lambda: ordem.append("longo")),
+        _step("final", ("longo",), func=lambda: ordem.append("final")),
+    ]
+    executar_pipeline("run", steps, max_workers=1)
+
+    assert ordem == ["longo", "final", "curto"]
+
+
+def test_executor_respeita_recursos_de_steps_pesados():
+    ativos = {"atual": 0, "maximo": 0}
+    lock = threading.Lock()
+
+    def pesado():
+        with lock:
+            ativos["atual"] += 1
+            ativos["maximo"] = max(ativos["maximo"], ativos["atual"])
+        time.sleep(0.05)
+        with lock:
+            ativos["atual"] -= 1
+
+    steps = [_step(f"pesado_{i}", func=pesado, recursos=4) for i in range(3)]
+    resultados = executar_pipeline("run", steps, max_workers=4)
+
+    assert set(resultados) == {"pesado_0", "pesado_1", "pesado_2"}
+    assert ativos["maximo"] == 1
+
+
+def test_simular_nao_executa_os_steps():
+    chamadas = []
+    steps = [_step("a", func=lambda: chamadas.append("a")), _step("b", ("a",))]
+
+    plano = executar_pipeline("run", steps, max_workers=2, simular=True)
+
+    assert chamadas == []
+    assert plano["makespan_s"] == pytest.approx(2 * agendador.DURACAO_PADRAO)
+    assert plano["cronograma"]["step"].tolist() == ["a", "b"]
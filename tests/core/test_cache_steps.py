@@ -0,0 +1,164 @@
+from unittest.mock import MagicMock
+
+import pandas as pd
+import pytest
+
+from src.core import cache_steps
+from src.core.executor import _executar_passo
+from src.core.pipeline_step import PipelineStep, Tarefa
+
+CHAMADAS = {"n": 0}
+
+
+def tratar(entrada, saida):
+    """Tratamento de exemplo: lê a entrada, grava a saída e devolve o df."""
+    CHAMADAS["n"] += 1
+    df = pd.read_csv(entrada)
+    df.to_csv(saida, index=False)
+    return df
+
+
+@pytest.fixture
+def arquivos(tmp_path):
+    CHAMADAS["n"] = 0
+    entrada = tmp_path / "bronze.csv"
+    saida = tmp_path / "silver.csv"
+    entrada.write_text("ano,total\n2023,10\n")
+    return entrada, saida
+
+
+def _step(entrada, saida, **kwargs):
+    return PipelineStep(
+        nome="tratar",
+        func=Tarefa(__name__, "tratar", (str(entrada), str(saida))),
+        retries=0,
+        timeout=5,
+        entradas=(str(entrada),),
+        saidas=(str(saida),),
+        **kwargs,
+    )
+
+
+def test_entradas_inalteradas_reaproveitam_o_resultado(arquivos):
+    entrada, saida = arquivos
+
+    _nome, primeiro, _ok = _executar_passo("run-1", _step(entrada, saida))
+    _nome, segundo, sucesso = _executar_passo("run-2", _step(entrada, saida))
+
+    assert sucesso
+    assert CHAMADAS["n"] == 1
+    pd.testing.assert_frame_equal(primeiro, segundo)
+
+
+def test_saida_apagada_e_restaurada_do_cache(arquivos):
+    entrada, saida = arquivos
+    _executar_passo("run-1", _step(entrada, saida))
+    conteudo = saida.read_text()
+    saida.unlink()
+
+    _executar_passo("run-2", _step(entrada, saida))
+
+    assert CHAMADAS["n"] == 1
+    assert saida.read_text() == conteudo
+
+
+def test_entrada_alterada_invalida_o_cache(arquivos):
+    entrada, saida = arquivos
+    _executar_passo("run-1", _step(entrada, saida))
+
+    entrada.write_text("ano,total\n2023,11\n")
+    _nome, resultado, _ok = _executar_passo("run-2", _step(entrada, saida))
+
+    assert CHAMADAS["n"] == 2
+    assert resultado["total"].tolist() == [11]
+
+
+def test_parametros_diferentes_geram_outra_impressao_digital(arquivos, tmp_path):
+    entrada, saida = arquivos
+
+    a = cache_steps.impressao_digital(_step(entrada, saida))
+    b = cache_steps.impressao_digital(_step(entrada, tmp_path / "outra.csv"))
+
+    assert a and b and a != b
+
+
+def test_falha_de_validacao_nao_grava_cache(arquivos):
+    entrada, saida = arquivos
+
+    def validacao(_df):
+        raise ValueError("schema inválido")
+
+    _executar_passo("run-1", _step(entrada, saida, validacao=validacao))
+    _executar_passo("run-2", _step(entrada, saida))
+
+    assert CHAMADAS["n"] == 2
+
+
+def test_steps_nao_memoizaveis(arquivos, tmp_path):
+    entrada, saida = arquivos
+
+    sem_entradas = PipelineStep(nome="x", func=Tarefa(__name__, "tratar"))
+    entrada_inexistente = PipelineStep(
+        nome="y", func=Tarefa(__name__, "tratar"), entradas=(str(tmp_path / "nada.csv"),)
+    )
+    codigo_desconhecido = PipelineStep(nome="z", func=MagicMock(), entradas=(str(entrada),))
+
+    assert cache_steps.impressao_digital(sem_entradas) is None
+    assert cache_steps.impressao_digital(entrada_inexistente) is None
+    assert cache_steps.impressao_digital(codigo_desconhecido) is None
+
+
+def test_mudanca_em_modulo_importado_pelo_step_muda_a_impressao_digital(
+    arquivos, tmp_path, monkeypatch
+):
+    import importlib
+    import sys
+
+    entrada, _saida = arquivos
+    pacote = tmp_path / "projeto"
+    pacote.mkdir()
+    (pacote / "aux_helper_cache.py").write_text("def ajustar(x):\n    return x\n")
+    (pacote / "aux_step_cache.py").write_text(
+        "from aux_helper_cache import ajustar\n\n\ndef tratar():\n    return ajustar(1)\n"
+    )
+    monkeypatch.syspath_prepend(str(pacote))
+    monkeypatch.setattr(cache_steps, "RAIZ_PROJETO", str(tmp_path))
+    importlib.import_module("aux_step_cache")
+
+    step = PipelineStep(
+        nome="aux", func=Tarefa("aux_step_cache", "tratar"), entradas=(str(entrada),)
+    )
+    antes = cache_steps.impressao_digital(step)
+
+    (pacote / "aux_helper_cache.py").write_text("def ajustar(x):\n    return x * 2\n")
+    depois = cache_steps.impressao_digital(step)
+
+    for nome in ("aux_step_cache", "aux_helper_cache"):
+        sys.modules.pop(nome, None)
+
+    assert antes is not None
+    assert antes != depois
+
+
+def test_steps_gold_nao_sao_memoizados():
+    from src.pipeline_tabela_gold import STEPS
+
+    assert all(cache_steps.impressao_digital(step) is None for step in STEPS)
+
+
+def test_memoizacao_desligada_sempre_executa(arquivos, monkeypatch):
+    entrada, saida = arquivos
+    monkeypatch.setattr(cache_steps, "MEMOIZACAO_ATIVA", False)
+
+    _executar_passo("run-1", _step(entrada, saida))
+    _executar_passo("run-2", _step(entrada, saida))
+
+    assert CHAMADAS["n"] == 2
+
+
+def test_tratamentos_silver_declaram_entradas_e_saidas():
+    from src.pipeline_busca_transformacao import TRATAMENTOS_PREPARADOS
+
+    for step in TRATAMENTOS_PREPARADOS:
+        assert step.entradas and all("bronze/csv" in e for e in step.entradas)
+        assert step.saidas and all("silver/output" in s for s in step.saidas)
@@ -1,3 +1,4 @@
+import time
 from unittest.mock import patch
 
 import pandas as pd
@@ -308,3 +309,130 @@ def test_nome_de_step_duplicado_levanta_valueerror():
 
     with pytest.raises(ValueError, match="duplicado"):
         executar_pipeline("run-12", steps)
+
+
+# ============================================================
+# Backends de execução
+# ============================================================
+from src.core import executor as modulo_executor
+from src.core.pipeline_step import Tarefa
+
+
+@pytest.fixture
+def backend_real(tmp_path, monkeypatch):
+    """Desfaz o `pipeline_em_threads` do conftest e isola os Parquets."""
+    monkeypatch.setattr(modulo_executor, "BACKEND_FORCADO", None)
+    monkeypatch.setattr(modulo_executor, "DIRETORIO_RESULTADOS", str(tmp_path / "resultados"))
+    return tmp_path / "resultados"
+
+
+def test_tarefa_resolve_a_funcao_pelo_nome_na_execucao():
+    tarefa = Tarefa("operator", "add", (2, 3))
+
+    assert tarefa() == 5
+    with patch("operator.add", return_value=99):
+        assert tarefa() == 99
+
+
+def test_backend_processes_devolve_dataframe_via_parquet(backend_real):
+    step = PipelineStep(
+        nome="proc",
+        func=Tarefa("pandas", "DataFrame", ({"x": [1, 2, 3]},)),
+        retries=0,
+        timeout=60,
+        backend="processes",
+    )
+
+    nome, resultado, sucesso = _executar_passo("run-p1", step)
+
+    assert sucesso
+    pd.testing.assert_frame_equal(resultado, pd.DataFrame({"x": [1, 2, 3]}))
+    # o Parquet intermediário é removido depois de lido
+    assert not any(backend_real.rglob("*.parquet"))
+
+
+def test_backend_processes_mata_o_worker_no_timeout(backend_real):
+    step = PipelineStep(
+        nome="lento",
+        func=Tarefa("time", "sleep", (30,)),
+        retries=0,
+        timeout=3,
+        backend="processes",
+    )
+
+    inicio = time.monotonic()
+    with patch.object(modulo_executor, "_encerrar_processo", wraps=modulo_executor._encerrar_processo) as encerrar:
+        nome, resultado, sucesso = _executar_passo("run-p2", step)
+
+    assert not sucesso and resultado is None
+    assert time.monotonic() - inicio < 20
+    processo = encerrar.call_args.args[0]
+    assert not processo.is_alive()
+
+
+def test_backend_processes_repassa_excecao_do_worker(backend_real):
+    step = PipelineStep(
+        nome="quebra",
+        func=Tarefa("builtins", "int", ("não é número",)),
+        retries=0,
+        timeout=60,
+        backend="processes",
+    )
+
+    with patch(f"{MODULO}.logger.error") as mock_error:
+        _nome, resultado, sucesso = _executar_passo("run-p3", step)
+
+    assert not sucesso and resultado is None
+    assert any("ValueError" in str(call) for call in mock_error.call_args_list)
+
+
+def test_backend_inline_roda_na_thread_chamadora(backend_real):
+    import threading
+
+    threads = []
+    step = PipelineStep(
+        nome="inline",
+        func=lambda: threads.append(threading.current_thread()) or pd.DataFrame(),
+        retries=0,
+        timeout=5,
+        backend="inline",
+    )
+
+    _executar_passo("run-p4", step)
+
+    assert threads == [threading.current_thread()]
+
+
+def test_backend_do_step_tem_precedencia_sobre_o_do_pipeline(backend_real):
+    import threading
+
+    threads = []
+    steps = [
+        PipelineStep(
+            nome="t",
+            func=lambda: threads.append(threading.current_thread().name),
+            retries=0,
+            timeout=5,
+            backend="threads",
+        )
+    ]
+
+    executar_pipeline("run-p5", steps, backend="inline")
+
+    assert threads == ["step-t"]
+
+
+def test_backend_invalido_levanta_valueerror(backend_real):
+    steps = [PipelineStep(nome="x", func=lambda: None, backend="gpu")]
+
+    with pytest.raises(ValueError, match="Backend"):
+        executar_pipeline("run-p6", steps)
+
+
+def test_tratamentos_silver_sao_picklaveis():
+    import pickle
+
+    from src.pipeline_busca_transformacao import TRATAMENTOS
+
+    for step in TRATAMENTOS:
+        assert pickle.loads(pickle.dumps(step.func)) == step.func
@@ -0,0 +1,165 @@
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from src.core import telemetria
+from src.core.executor import _executar_passo, executar_pipeline
+from src.core.pipeline_step import PipelineStep
+
+
+@pytest.fixture
+def telemetria_sqlite(tmp_path, monkeypatch):
+    monkeypatch.setattr(telemetria, "TELEMETRIA_ATIVA", True)
+    monkeypatch.setattr(telemetria, "BACKEND_TELEMETRIA", "sqlite")
+    monkeypatch.setattr(telemetria, "CAMINHO_TELEMETRIA", str(tmp_path / "telemetria.db"))
+    yield
+    for engine in telemetria._engines.values():
+        engine.dispose()
+    telemetria._engines.clear()
+
+
+def _historico(tempos_por_run, step="racismo"):
+    inicio = datetime(2026, 1, 1)
+    return pd.DataFrame(
+        [
+            {
+                "run_id": f"run-{i}",
+                "step": step,
+                "tentativa": 1,
+                "resultado": telemetria.SUCESSO,
+                "wall_s": tempo,
+                "cpu_s": tempo / 2,
+                "rss_pico_mb": 100.0,
+                "linhas_saida": 10,
+                "registrado_em": inicio + timedelta(hours=i),
+            }
+            for i, tempo in enumerate(tempos_por_run)
+        ]
+    )
+
+
+def test_executor_registra_cada_tentativa(telemetria_sqlite, tmp_path):
+    entrada = tmp_path / "bronze.csv"
+    entrada.write_text("a\n1\n2\n3\n")
+    chamadas = {"n": 0}
+
+    def func():
+        chamadas["n"] += 1
+        if chamadas["n"] == 1:
+            raise ValueError("falha temporária")
+        return pd.DataFrame({"a": [1, 2]})
+
+    step = PipelineStep(nome="passo", func=func, retries=1, timeout=5, entradas=(str(entrada),))
+    _executar_passo("run-x", step)
+
+    historico = telemetria.carregar_historico()
+
+    assert historico["resultado"].tolist() == [telemetria.ERRO, telemetria.SUCESSO]
+    assert historico["tentativa"].tolist() == [1, 2]
+    assert historico["linhas_entrada"].tolist() == [3, 3]
+    assert historico["linhas_saida"].iloc[-1] == 2
+    assert historico["cpu_s"].notna().all()
+    assert (historico["run_id"] == "run-x").all()
+
+
+def test_falha_de_validacao_e_timeout_sao_distinguidos(telemetria_sqlite):
+    import time
+
+    def validacao(_df):
+        raise ValueError("schema")
+
+    steps = [
+        PipelineStep(nome="invalido", func=lambda: pd.DataFrame({"a": [1]}), retries=0, timeout=5, validacao=validacao),
+        PipelineStep(nome="lento", func=lambda: time.sleep(0.5), retries=0, timeout=0.05),
+    ]
+    executar_pipeline("run-y", steps, max_workers=2)
+
+    historico = telemetria.carregar_historico().set_index("step")
+
+    assert historico.loc["invalido", "resultado"] == telemetria.INVALIDO
+    assert historico.loc["lento", "resultado"] == telemetria.TIMEOUT
+
+
+def test_telemetria_desligada_nao_grava(telemetria_sqlite, monkeypatch):
+    monkeypatch.setattr(telemetria, "TELEMETRIA_ATIVA", False)
+
+    _executar_passo("run-z", PipelineStep(nome="p", func=lambda: None, retries=0, timeout=5))
+
+    monkeypatch.setattr(telemetria, "TELEMETRIA_ATIVA", True)
+    assert telemetria.carregar_historico().empty
+
+
+def test_relatorio_calcula_percentis_e_sinaliza_regressao():
+    historico = pd.concat(
+        [
+            _historico([1.0, 1.1, 0.9, 1.0, 2.0, 2.1, 2.2], step="racismo"),
+            _historico([3.0, 3.1, 2.9, 3.0, 3.0, 3.1, 2.9], step="homicidio"),
+        ]
+    )
+
+    relatorio = telemetria.relatorio_steps(janela_recente=3, tolerancia=0.25, historico=historico)
+    linhas = relatorio.set_index("step")
+
+    assert linhas.loc["racismo", "regressao"]
+    assert linhas.loc["racismo", "p50_recente_s"] == pytest.approx(2.1)
+    assert linhas.loc["racismo", "p50_base_s"] == pytest.approx(1.0)
+    assert not linhas.loc["homicidio", "regressao"]
+    assert linhas.loc["homicidio", "p95_s"] >= linhas.loc["homicidio", "p50_s"]
+
+
+def test_relatorio_sem_base_suficiente_nao_sinaliza():
+    relatorio = telemetria.relatorio_steps(
+        janela_recente=3, historico=_historico([1.0, 1.0, 10.0, 10.0])
+    )
+
+    assert not relatorio["regressao"].any()
+    assert pd.isna(relatorio["p50_base_s"].iloc[0])
+
+
+def test_endpoint_telemetria(telemetria_sqlite):
+    from api.main import app
+
+    for i, tempo in enumerate([1.0, 1.0, 1.0, 5.0]):
+        telemetria.registrar(
+            run_id=f"r{i}",
+            step="racismo",
+            tentativa=1,
+            resultado=telemetria.SUCESSO,
+            wall_s=tempo,
+            registrado_em=datetime(2026, 1, 1) + timedelta(hours=i),
+        )
+
+    resp = TestClient(app).get("/pipeline/telemetria", params={"janela_recente": 1})
+
+    assert resp.status_code == 200
+    corpo = resp.json()
+    assert corpo["regressoes"] == ["racismo"]
+    assert corpo["steps"][0]["execucoes"] == 4
+    assert corpo["steps"][0]["cpu_p50_s"] is None
+
+
+def test_duracoes_medianas_ignoram_tentativas_com_falha(telemetria_sqlite):
+    for tempo, resultado in [(1.0, telemetria.SUCESSO), (3.0, telemetria.SUCESSO), (50.0, telemetria.TIMEOUT)]:
+        telemetria.registrar(run_id="r", step="racismo", tentativa=1, resultado=resultado, wall_s=tempo)
+
+    assert telemetria.duracoes_medianas() == {"racismo": 2.0}
+
+
+def test_historico_limita_os_ultimos_runs_de_cada_step(telemetria_sqlite):
+    inicio = datetime(2026, 1, 1)
+    for i in range(4):
+        telemetria.registrar(
+            run_id=f"run-{i}", step="racismo", tentativa=1, resultado=telemetria.SUCESSO,
+            wall_s=float(i), registrado_em=inicio + timedelta(hours=i),
+        )
+    telemetria.registrar(
+        run_id="run-0", step="homicidio", tentativa=1, resultado=telemetria.SUCESSO,
+        wall_s=9.0, registrado_em=inicio,
+    )
+
+    historico = telemetria.carregar_historico(limite_runs=2)
+
+    assert historico.loc[historico["step"] == "racismo", "run_id"].tolist() == ["run-2", "run-3"]
+    assert historico.loc[historico["step"] == "homicidio", "run_id"].tolist() == ["run-0"]
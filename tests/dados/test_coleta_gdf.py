@@ -1,3 +1,6 @@
+import threading
+import time
+
 import pytest
 from unittest.mock import patch, MagicMock
 from src.coleta_gdf import coleta_dados
@@ -69,9 +72,10 @@ def test_coleta_dados_urls_excedentes(mock_logger, mock_gerar, mock_download):
         rotas=[f"r{i}" for i in range(25)],
     )
 
-    chamadas = mock_download.call_args_list
+    nomes = {c.kwargs["nome_arquivo"] for c in mock_download.call_args_list}
 
-    assert chamadas[-1].kwargs["nome_arquivo"] == "arquivo_25"
+    assert "arquivo_25" in nomes
+    assert "arquivo_11" in nomes
 
 
 # ============================================================
@@ -97,7 +101,79 @@ def test_coleta_dados_nomes_de_planilhas(mock_logger, mock_gerar, mock_download)
         rotas=["r1", "r2"],
     )
 
-    chamadas = mock_download.call_args_list
+    # downloads concorrentes: a ordem das chamadas não é garantida
+    urls = {c.args[0]: c.kwargs["nome_arquivo"] for c in mock_download.call_args_list}
+
+    assert urls == {
+        "http://url1": "roubo-a-transeunte",
+        "http://url2": "roubo-de-veiculo",
+    }
+
+
+# ============================================================
+# TESTE: downloads concorrentes
+# ============================================================
+
+
+@patch("src.coleta_gdf.gerar_urls_rotas")
+@patch("src.coleta_gdf.logger")
+def test_coleta_dados_respeita_limite_por_host(mock_logger, mock_gerar):
+    mock_gerar.return_value = [(f"http://host-a/{i}", f"a{i}") for i in range(6)] + [
+        (f"http://host-b/{i}", f"b{i}") for i in range(2)
+    ]
+
+    lock = threading.Lock()
+    ativos = {"host-a": 0, "host-b": 0}
+    picos = {"host-a": 0, "host-b": 0}
+
+    def fake_download(url, nome_arquivo, sessao, prazo):
+        host = url.split("/")[2]
+        with lock:
+            ativos[host] += 1
+            picos[host] = max(picos[host], ativos[host])
+        time.sleep(0.02)
+        with lock:
+            ativos[host] -= 1
+        return f"./data/bronze/csv/{nome_arquivo}.csv"
+
+    with patch("src.coleta_gdf.download_arquivo", side_effect=fake_download):
+        resultados = coleta_dados(
+            url_="http://base",
+            lista_nomes=[f"n{i}" for i in range(8)],
+            rotas={},
+            max_simultaneos=6,
+        )
+
+    assert len(resultados) == 8
+    assert picos["host-a"] == 2
+    assert picos["host-b"] <= 2
+
+
+@patch("src.coleta_gdf.download_arquivo")
+@patch("src.coleta_gdf.gerar_urls_rotas")
+@patch("src.coleta_gdf.logger")
+def test_coleta_dados_prazo_esgotado_nao_baixa(mock_logger, mock_gerar, mock_download):
+    mock_gerar.return_value = [("http://url1", "a1"), ("http://url2", "a2")]
+
+    resultados = coleta_dados(
+        url_="http://base",
+        lista_nomes=["a", "b"],
+        rotas={},
+        prazo_segundos=0,
+    )
+
+    mock_download.assert_not_called()
+    assert resultados == {"a": None, "b": None}
+    mock_logger.warning.assert_called_once()
+
+
+@patch("src.coleta_gdf.gerar_urls_rotas")
+@patch("src.coleta_gdf.logger")
+def test_coleta_dados_compartilha_sessao(mock_logger, mock_gerar):
+    mock_gerar.return_value = [("http://url1", "a1"), ("http://url2", "a2")]
+
+    with patch("src.coleta_gdf.download_arquivo") as mock_download:
+        coleta_dados(url_="http://base", lista_nomes=["a", "b"], rotas={})
 
-    assert chamadas[0].kwargs["nome_arquivo"] == "roubo-a-transeunte"
-    assert chamadas[1].kwargs["nome_arquivo"] == "roubo-de-veiculo"
+    sessoes = {id(c.kwargs["sessao"]) for c in mock_download.call_args_list}
+    assert len(sessoes) == 1
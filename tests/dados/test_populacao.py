@@ -5,6 +5,12 @@ from unittest.mock import patch, MagicMock
 
 import src.tratamento_populacional as mod  # ajuste para o nome real
 
+
+@pytest.fixture(autouse=True)
+def saida_temporaria(tmp_path, monkeypatch):
+    """Saídas (CSV + Parquet particionado) no tmp, não em data/silver/output."""
+    monkeypatch.setattr(mod, "OUTPUT", tmp_path)
+
 def mae(y_true, y_pred):
     y_true, y_pred = np.array(y_true), np.array(y_pred)
     return np.mean(np.abs(y_true - y_pred))
@@ -144,6 +150,7 @@ def test_analisar_populacao(
     mock_grid,
     mock_walk,
     mock_read,
+    tmp_path,
 ):
     mock_read.return_value = pd.DataFrame(
         {
@@ -183,6 +190,7 @@ def test_analisar_populacao(
 
     df = mod.analisar_populacao()
     assert not df.empty
+    assert (tmp_path / "df_analise_populacao.parquet").is_dir()
 
 @patch("src.tratamento_populacional.pd.read_csv")
 def test_tratar_populacao(mock_read, tmp_path):
@@ -503,3 +503,12 @@ def test_figura_desaparecidos_por_ra_agrupa_os_dois_anos():
 def test_figuras_desaparecidos_sem_colunas_levanta_erro(figura):
     with pytest.raises(SemDadosParaGraficoError):
         figura(pd.DataFrame({"outra": [1]}))
+
+
+def test_registros_para_dataframe_enxuga_tipos_numericos():
+    df = registros_para_dataframe([{"ano": 2020, "valor": 1.5, "taxa": 0.1, "ra": "GAMA"}])
+
+    assert df["ano"].dtype == "int32"
+    assert df["valor"].dtype == "float32"
+    assert df["taxa"].dtype == "float64"  # float32 perderia precisão
+    assert df["ra"].dtype == object
@@ -0,0 +1,200 @@
+import pandas as pd
+from unittest.mock import MagicMock
+
+from database.cache_tabelas import CacheTabelas
+
+
+def _cache(versoes=None, **kwargs):
+    versoes = versoes if versoes is not None else ["v1"]
+    return CacheTabelas(
+        intervalo_versao=kwargs.pop("intervalo_versao", 0.0),
+        obter_versao=lambda: versoes[0],
+        **kwargs,
+    )
+
+
+def test_obter_carrega_uma_vez_e_serve_do_cache():
+    cache = _cache()
+    carregar = MagicMock(return_value=pd.DataFrame({"a": [1]}))
+
+    primeiro = cache.obter("t", carregar)
+    segundo = cache.obter("t", carregar)
+
+    carregar.assert_called_once()
+    assert primeiro.equals(segundo)
+
+
+def test_obter_devolve_copia_do_dataframe():
+    cache = _cache()
+    cache.obter("t", lambda: pd.DataFrame({"a": [1]}))["a"] = 99
+
+    assert cache.obter("t", lambda: None)["a"].tolist() == [1]
+
+
+def test_resultado_none_nao_e_armazenado():
+    cache = _cache()
+    carregar = MagicMock(return_value=None)
+
+    assert cache.obter("t", carregar) is None
+    assert cache.obter("t", carregar) is None
+    assert carregar.call_count == 2
+    assert len(cache) == 0
+
+
+def _df(linhas):
+    return pd.DataFrame({"a": range(linhas)})
+
+
+def test_lru_descarta_a_entrada_menos_usada_pelo_limite_em_bytes():
+    tamanho = int(_df(100).memory_usage(deep=True).sum())
+    cache = _cache(capacidade_bytes=2 * tamanho)
+    cache.obter("a", lambda: _df(100))
+    cache.obter("b", lambda: _df(100))
+    cache.obter("a", lambda: None)  # "a" passa a ser a mais recente
+    cache.obter("c", lambda: _df(100))
+
+    assert len(cache) == 2
+    assert cache.bytes_ocupados == 2 * tamanho
+    assert len(cache.obter("a", lambda: "recarregado")) == 100
+    assert cache.obter("b", lambda: "recarregado") == "recarregado"
+
+
+def test_valor_maior_que_o_limite_nao_e_guardado():
+    cache = _cache(capacidade_bytes=10)
+
+    assert len(cache.obter("grande", lambda: _df(100))) == 100
+    assert len(cache) == 0
+    assert cache.bytes_ocupados == 0
+
+
+def test_carga_concorrente_com_invalidacao_nao_e_guardada():
+    cache = _cache()
+
+    def carregar():
+        cache.invalidar()  # ex.: refresh do pipeline durante a leitura
+        return "antigo"
+
+    assert cache.obter("t", carregar) == "antigo"
+    assert len(cache) == 0
+    assert cache.obter("t", lambda: "novo") == "novo"
+
+
+def test_consulta_de_versao_roda_fora_do_lock():
+    import threading
+
+    consultando = threading.Event()
+    liberar = threading.Event()
+
+    def obter_versao():
+        consultando.set()
+        liberar.wait(5)
+        return "v1"
+
+    cache = CacheTabelas(intervalo_versao=3600, obter_versao=obter_versao)
+    verificacao = threading.Thread(target=cache.verificar_versao)
+    verificacao.start()
+    consultando.wait(5)
+
+    # enquanto a consulta está pendente, outra thread usa o cache normalmente
+    adquirido = cache._lock.acquire(timeout=1)
+    if adquirido:
+        cache._lock.release()
+    liberar.set()
+    verificacao.join(5)
+
+    assert adquirido
+
+
+def test_mudanca_de_versao_invalida_entradas_e_avisa_ouvintes():
+    versoes = ["v1"]
+    cache = _cache(versoes)
+    ouvinte = MagicMock()
+    cache.registrar_ouvinte(ouvinte)
+    cache.registrar_ouvinte(ouvinte)
+
+    cache.obter("t", lambda: "antigo")
+    ouvinte.assert_called_once()  # None -> v1
+    versoes[0] = "v2"
+
+    assert cache.obter("t", lambda: "novo") == "novo"
+    assert ouvinte.call_count == 2
+
+
+def test_versao_so_e_consultada_apos_o_intervalo():
+    obter_versao = MagicMock(return_value="v1")
+    cache = CacheTabelas(intervalo_versao=3600, obter_versao=obter_versao)
+
+    cache.obter("t", lambda: 1)
+    cache.obter("t", lambda: 1)
+    cache.verificar_versao()
+
+    obter_versao.assert_called_once()
+
+
+def test_falha_ao_consultar_versao_mantem_conteudo():
+    versoes = ["v1"]
+    cache = _cache(versoes)
+    cache.obter("t", lambda: "valor")
+    cache._obter_versao = MagicMock(side_effect=Exception("banco fora"))
+
+    assert cache.obter("t", lambda: "outro") == "valor"
+
+
+def test_invalidar_uma_chave_ou_tudo():
+    cache = _cache()
+    cache.obter("a", lambda: 1)
+    cache.obter("b", lambda: 2)
+
+    cache.invalidar("a")
+    assert len(cache) == 1
+
+    cache.invalidar()
+    assert len(cache) == 0
+
+
+def test_leitura_compartilhada_carrega_uma_vez_para_pedidos_concorrentes():
+    import threading
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+
+    from database.cache_tabelas import LeituraCompartilhada
+
+    leitura = LeituraCompartilhada()
+    chamadas = []
+    liberar = threading.Event()
+
+    def carregar():
+        chamadas.append(1)
+        liberar.wait(1)
+        return pd.DataFrame({"a": [1]})
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futuros = [pool.submit(leitura.obter, "t", carregar) for _ in range(4)]
+        time.sleep(0.05)
+        liberar.set()
+        resultados = [f.result() for f in futuros]
+
+    assert len(chamadas) == 1
+    assert leitura.leituras == 1
+    assert all(r.equals(pd.DataFrame({"a": [1]})) for r in resultados)
+    # cópias independentes
+    resultados[0]["a"] = 99
+    assert leitura.obter("t", carregar)["a"].tolist() == [1]
+
+
+def test_leitura_compartilhada_nao_guarda_falhas_nem_none():
+    import pytest
+
+    from database.cache_tabelas import LeituraCompartilhada
+
+    leitura = LeituraCompartilhada()
+
+    with pytest.raises(ValueError):
+        leitura.obter("t", MagicMock(side_effect=ValueError("banco fora")))
+    assert leitura.obter("t", lambda: None) is None
+
+    carregar = MagicMock(return_value=pd.DataFrame({"a": [1]}))
+    leitura.obter("t", carregar)
+
+    carregar.assert_called_once()
+    assert len(leitura) == 1
@@ -0,0 +1,59 @@
+import pytest
+
+from database.estrategias_carga import (
+    ESTRATEGIA_PADRAO,
+    FULL_REFRESH,
+    UPSERT,
+    EstrategiaCarga,
+    estrategia_carga,
+)
+from validation.esquemas import GOLD
+
+
+def test_tabelas_gold_com_chaves_usam_upsert_nas_chaves_do_esquema():
+    estrategia = estrategia_carga("crimes_letais_gold")
+
+    assert estrategia.modo == UPSERT
+    assert estrategia.chaves == GOLD["crimes_letais_gold"].chaves
+
+
+def test_tabela_sem_registro_usa_full_refresh():
+    assert estrategia_carga("crimes_contra_mulher") is ESTRATEGIA_PADRAO
+    assert ESTRATEGIA_PADRAO.modo == FULL_REFRESH
+
+
+def test_tabelas_gold_removem_chaves_ausentes():
+    assert estrategia_carga("crimes_letais_gold").remover_ausentes
+
+
+def test_series_anuais_silver_usam_upsert_por_ano():
+    for tabela in ("populacao_df", "violencia_idosos_ocorrencias", "violencia_idosos_sexo"):
+        estrategia = estrategia_carga(tabela)
+
+        assert estrategia.modo == UPSERT
+        assert estrategia.chaves == ("ano",)
+        assert not estrategia.remover_ausentes
+
+
+def test_tabelas_silver_wide_usam_upsert_pela_coluna_de_ra():
+    assert estrategia_carga("homicidio").chaves == ("regiao_administrativa",)
+    assert estrategia_carga("roubo_veiculo").chaves == ("Região Administrativa",)
+    assert estrategia_carga("homicidio").modo == UPSERT
+
+
+def test_todas_as_tabelas_de_load_csvs_tem_estrategia_valida():
+    from database.load_csvs import arquivos
+
+    sem_registro = {"crimes_contra_mulher", "populacao_regiao_administrativa"}
+    for tabela in arquivos.values():
+        assert (estrategia_carga(tabela) is ESTRATEGIA_PADRAO) == (tabela in sem_registro)
+
+
+def test_modo_invalido_rejeitado():
+    with pytest.raises(ValueError, match="Modo de carga inválido"):
+        EstrategiaCarga(modo="merge")
+
+
+def test_upsert_sem_chaves_rejeitado():
+    with pytest.raises(ValueError, match="exige ao menos uma chave"):
+        EstrategiaCarga(modo=UPSERT)
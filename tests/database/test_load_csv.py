@@ -10,7 +10,7 @@ def test_salvar_tabela_parser_error():
     with (
         patch("database.load_csvs.arquivos", arquivos_mock),
         patch("pandas.read_csv", side_effect=pd.errors.ParserError("Erro de parsing")),
-        patch("database.load_csvs.inserir_dados") as inserir_mock,
+        patch("database.load_csvs.salvar_dados") as inserir_mock,
     ):
         salvar_tabela()
 
@@ -22,7 +22,7 @@ def test_salvar_tabela_exception_generica():
     with (
         patch("database.load_csvs.arquivos", arquivos_mock),
         patch("pandas.read_csv", side_effect=Exception("Erro genérico")),
-        patch("database.load_csvs.inserir_dados") as inserir_mock,
+        patch("database.load_csvs.salvar_dados") as inserir_mock,
         patch("database.load_csvs.logger") as logger_mock,
     ):
         salvar_tabela()
@@ -42,7 +42,7 @@ def test_salvar_tabela_sucesso():
     with (
         patch("database.load_csvs.arquivos", arquivos_mock),
         patch("pandas.read_csv", return_value=df_mock),
-        patch("database.load_csvs.inserir_dados") as inserir_mock,
+        patch("database.load_csvs.salvar_dados") as inserir_mock,
     ):
         salvar_tabela()
 
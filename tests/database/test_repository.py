@@ -88,10 +88,124 @@ def test_inserir_dados_sucesso():
 
         # Você pode checar argumentos mínimos
         args, kwargs = to_sql_mock.call_args
-        assert args[0] == "clientes"  # nome da tabela
+        assert args[0] == "clientes__staging"  # carga vai para a staging
         assert "index" in kwargs
         assert kwargs["if_exists"] == "replace"
-        assert kwargs["method"] == "multi"
+        assert kwargs["method"] is repo._copy_from_stdin
+
+
+def test_inserir_dados_sem_bulk_usa_insert_multi():
+    df = pd.DataFrame({"id": [1, 2]})
+
+    with (
+        patch("database.repository.repository.conectar_banco", return_value=MagicMock()),
+        patch("pandas.DataFrame.to_sql") as to_sql_mock,
+    ):
+        repo.inserir_dados(df, "clientes", bulk=False)
+
+    kwargs = to_sql_mock.call_args.kwargs
+    assert kwargs["method"] == "multi"
+    assert kwargs["chunksize"] == 5000
+
+
+def test_inserir_dados_bulk_em_sqlite_recria_tabela_com_inserido_em():
+    from sqlalchemy import create_engine
+
+    engine = create_engine("sqlite://")
+    df = pd.DataFrame({"ano": [2023, 2024], "regiao_administrativa": ["GAMA", "GUARA"]})
+
+    with patch("database.repository.repository.conectar_banco", return_value=engine):
+        repo.inserir_dados(df, "clientes")
+        repo.inserir_dados(df.head(1), "clientes")
+
+    resultado = pd.read_sql("SELECT * FROM clientes", engine)
+
+    assert len(resultado) == 1
+    assert list(resultado.columns) == ["ano", "regiao_administrativa", "inserido_em"]
+    assert "clientes__staging" not in repo.inspect(engine).get_table_names()
+
+
+def test_inserir_dados_falha_na_carga_preserva_tabela_atual():
+    from sqlalchemy import create_engine
+
+    engine = create_engine("sqlite://")
+    df = pd.DataFrame({"id": [1, 2]})
+
+    with patch("database.repository.repository.conectar_banco", return_value=engine):
+        repo.inserir_dados(df, "clientes")
+
+        with (
+            patch(
+                "database.repository.repository._copy_from_stdin",
+                side_effect=RuntimeError("falha no COPY"),
+            ),
+            pytest.raises(RuntimeError),
+        ):
+            repo.inserir_dados(pd.DataFrame({"id": [9]}), "clientes")
+
+    resultado = pd.read_sql("SELECT id FROM clientes", engine)
+    assert resultado["id"].tolist() == [1, 2]
+
+
+def test_inserir_dados_cria_indices_na_staging_e_renomeia_no_swap():
+    engine_mock = MagicMock()
+    conn = engine_mock.begin.return_value.__enter__.return_value
+    conn.dialect.name = "postgresql"
+
+    with (
+        patch("database.repository.repository.conectar_banco", return_value=engine_mock),
+        patch("pandas.DataFrame.to_sql"),
+    ):
+        repo.inserir_dados(
+            pd.DataFrame({"ano": [2024]}),
+            "clientes",
+            indices=(("ano", "regiao_administrativa"),),
+        )
+
+    sqls = [str(call.args[0]) for call in conn.execute.call_args_list]
+    assert sqls == [
+        'CREATE INDEX "ix_clientes__staging_ano_regiao_administrativa" '
+        'ON "clientes__staging" ("ano", "regiao_administrativa")',
+        'DROP TABLE IF EXISTS "clientes"',
+        'ALTER TABLE "clientes__staging" RENAME TO "clientes"',
+        'ALTER INDEX "ix_clientes__staging_ano_regiao_administrativa" '
+        'RENAME TO "ix_clientes_ano_regiao_administrativa"',
+    ]
+
+
+def test_inserir_dados_indice_com_coluna_invalida_nao_carrega():
+    with (
+        patch("database.repository.repository.conectar_banco") as conectar_mock,
+        patch("pandas.DataFrame.to_sql") as to_sql_mock,
+    ):
+        repo.inserir_dados(pd.DataFrame({"id": [1]}), "clientes", indices=(("id;drop",),))
+
+    conectar_mock.assert_not_called()
+    to_sql_mock.assert_not_called()
+
+
+def test_copy_from_stdin_envia_csv_pelo_copy_expert():
+    cursor = MagicMock()
+    enviado = {}
+    cursor.copy_expert.side_effect = lambda sql, buf: enviado.update(
+        sql=sql, dados=buf.read()
+    )
+    conn = MagicMock()
+    conn.connection.cursor.return_value = cursor
+    table = MagicMock()
+    table.name = "clientes"
+    table.schema = None
+
+    total = repo._copy_from_stdin(
+        table, conn, ["id", "nome"], iter([(1, "a,b"), (2, None)])
+    )
+
+    assert total == 2
+    assert enviado["sql"] == (
+        'COPY "clientes" ("id", "nome") FROM STDIN WITH (FORMAT csv)'
+    )
+    assert enviado["dados"].splitlines() == ['1,"a,b"', "2,"]
+    cursor.close.assert_called_once()
 
 
 def test_inserir_dados_nome_invalido():
@@ -133,7 +247,9 @@ def test_inserir_dados_exception_generica_a():
             side_effect=Exception,
         ),
     ):
-        repo.inserir_dados(df, "clientes")
+        # a carga usa uma cópia do df; sem banco real o to_sql dela falha
+        with pytest.raises(Exception):
+            repo.inserir_dados(df, "clientes")
 
 
 def test_inserir_dados_exception_generica_b():
@@ -281,3 +397,249 @@ def test_resumo_tabelas_erro_geral_propaga():
     ):
         with pytest.raises(Exception, match="falha geral"):
             repo.resumo_tabelas()
+
+
+# ============================================================
+# salvar_dados (estratégias de carga)
+# ============================================================
+from database.estrategias_carga import APPEND_PARTICOES, UPSERT, EstrategiaCarga
+
+
+@pytest.fixture
+def engine_sqlite():
+    from sqlalchemy import create_engine
+
+    engine = create_engine("sqlite://")
+    with patch("database.repository.repository.conectar_banco", return_value=engine):
+        yield engine
+
+
+def _gold(anos, valores):
+    return pd.DataFrame(
+        {
+            "ano": anos,
+            "regiao_administrativa": ["GAMA"] * len(anos),
+            "casos": valores,
+        }
+    )
+
+
+def _inserido_em(engine, ano):
+    return pd.read_sql(
+        f"SELECT inserido_em FROM clientes WHERE ano = {ano}", engine
+    )["inserido_em"].iloc[0]
+
+
+def test_salvar_dados_upsert_grava_apenas_linhas_novas_ou_alteradas(engine_sqlite):
+    estrategia = EstrategiaCarga(modo=UPSERT, chaves=("ano", "regiao_administrativa"))
+    repo.salvar_dados(_gold([2022, 2023], [10, 20]), "clientes", estrategia)
+    gravado_antes = _inserido_em(engine_sqlite, 2022)
+
+    with patch("database.repository.repository.carregar_tabela") as carregar_mock:
+        repo.salvar_dados(_gold([2022, 2023, 2024], [10, 25, 30]), "clientes", estrategia)
+
+    # a comparação acontece no banco, sem trazer a tabela para o pandas
+    carregar_mock.assert_not_called()
+
+    resultado = pd.read_sql("SELECT ano, casos FROM clientes ORDER BY ano", engine_sqlite)
+    assert resultado.values.tolist() == [[2022, 10], [2023, 25], [2024, 30]]
+    assert _inserido_em(engine_sqlite, 2022) == gravado_antes
+    assert "clientes__delta" not in repo.inspect(engine_sqlite).get_table_names()
+
+
+def test_salvar_dados_upsert_mantem_chaves_ausentes_da_carga(engine_sqlite):
+    estrategia = EstrategiaCarga(modo=UPSERT, chaves=("ano", "regiao_administrativa"))
+    repo.salvar_dados(_gold([2022, 2023, 2024], [10, 20, 30]), "clientes", estrategia)
+
+    repo.salvar_dados(_gold([2023, 2024], [21, 30]), "clientes", estrategia)
+
+    resultado = pd.read_sql("SELECT ano, casos FROM clientes ORDER BY ano", engine_sqlite)
+    assert resultado.values.tolist() == [[2022, 10], [2023, 21], [2024, 30]]
+
+
+def test_salvar_dados_upsert_remove_chaves_ausentes_quando_pedido(engine_sqlite):
+    estrategia = EstrategiaCarga(
+        modo=UPSERT, chaves=("ano", "regiao_administrativa"), remover_ausentes=True
+    )
+    repo.salvar_dados(_gold([2022, 2023, 2024], [10, 20, 30]), "clientes", estrategia)
+
+    repo.salvar_dados(_gold([2023, 2024], [20, 30]), "clientes", estrategia)
+
+    resultado = pd.read_sql("SELECT ano, casos FROM clientes ORDER BY ano", engine_sqlite)
+    assert resultado.values.tolist() == [[2023, 20], [2024, 30]]
+
+
+def test_salvar_dados_upsert_chave_nula_nao_e_regravada(engine_sqlite):
+    estrategia = EstrategiaCarga(
+        modo=UPSERT, chaves=("ano", "regiao_administrativa"), remover_ausentes=True
+    )
+    df = _gold([2022, 2023], [10, 20]).assign(regiao_administrativa=["GAMA", None])
+    repo.salvar_dados(df, "clientes", estrategia)
+    gravado_antes = _inserido_em(engine_sqlite, 2023)
+
+    with patch.object(repo.logger, "info") as info_mock:
+        repo.salvar_dados(df, "clientes", estrategia)
+
+    assert _inserido_em(engine_sqlite, 2023) == gravado_antes
+    assert pd.read_sql("SELECT COUNT(*) AS n FROM clientes", engine_sqlite)["n"].iloc[0] == 2
+    assert any("sem alterações" in c.args[0] for c in info_mock.call_args_list)
+
+
+def test_salvar_dados_upsert_sem_alteracoes_nao_grava(engine_sqlite):
+    estrategia = EstrategiaCarga(modo=UPSERT, chaves=("ano", "regiao_administrativa"))
+    df = _gold([2022], [10.5]).assign(obs=[None])
+    repo.salvar_dados(df, "clientes", estrategia)
+    gravado_antes = _inserido_em(engine_sqlite, 2022)
+
+    with patch.object(repo.logger, "info") as info_mock:
+        repo.salvar_dados(df, "clientes", estrategia)
+
+    assert _inserido_em(engine_sqlite, 2022) == gravado_antes
+    assert any("sem alterações" in c.args[0] for c in info_mock.call_args_list)
+
+
+def test_salvar_dados_upsert_com_chaves_repetidas_faz_carga_completa(engine_sqlite):
+    estrategia = EstrategiaCarga(modo=UPSERT, chaves=("ano", "regiao_administrativa"))
+    repo.salvar_dados(_gold([2022], [10]), "clientes", estrategia)
+
+    repetido = _gold([2023, 2023], [1, 2])
+    with patch("database.repository.repository.inserir_dados") as inserir_mock:
+        repo.salvar_dados(repetido, "clientes", estrategia)
+
+    inserir_mock.assert_called_once_with(
+        repetido, "clientes", indices=(("ano", "regiao_administrativa"),)
+    )
+
+
+def test_salvar_dados_append_acrescenta_so_particoes_novas(engine_sqlite):
+    estrategia = EstrategiaCarga(modo=APPEND_PARTICOES)
+    repo.salvar_dados(_gold([2022], [10]), "clientes", estrategia)
+    repo.salvar_dados(_gold([2022, 2023], [99, 20]), "clientes", estrategia)
+
+    resultado = pd.read_sql("SELECT ano, casos FROM clientes ORDER BY ano", engine_sqlite)
+    assert resultado.values.tolist() == [[2022, 10], [2023, 20]]
+
+
+def test_salvar_dados_colunas_divergentes_fazem_carga_completa(engine_sqlite):
+    estrategia = EstrategiaCarga(modo=UPSERT, chaves=("ano", "regiao_administrativa"))
+    repo.salvar_dados(_gold([2022], [10]), "clientes", estrategia)
+
+    novo = _gold([2023], [5]).assign(extra=1)
+    with patch("database.repository.repository.inserir_dados") as inserir_mock:
+        repo.salvar_dados(novo, "clientes", estrategia)
+
+    inserir_mock.assert_called_once_with(
+        novo, "clientes", indices=(("ano", "regiao_administrativa"),)
+    )
+
+
+def test_inserir_dados_cria_colunas_numericas_largas_mesmo_com_tipos_reduzidos(engine_sqlite):
+    df = pd.DataFrame(
+        {
+            "ano": pd.Series([2022], dtype="int16"),
+            "regiao_administrativa": pd.Categorical(["GAMA"]),
+            "casos": pd.Series([1.5], dtype="float32"),
+        }
+    )
+
+    repo.inserir_dados(df, "clientes")
+
+    tipos = {c["name"]: str(c["type"]) for c in repo.inspect(engine_sqlite).get_columns("clientes")}
+    assert tipos["ano"] == "BIGINT"
+    assert tipos["casos"] == "DOUBLE"
+
+
+def test_salvar_dados_full_refresh_por_padrao_delega_para_inserir_dados():
+    df = pd.DataFrame({"id": [1]})
+
+    with patch("database.repository.repository.inserir_dados") as inserir_mock:
+        repo.salvar_dados(df, "tabela_sem_estrategia")
+
+    inserir_mock.assert_called_once_with(df, "tabela_sem_estrategia", indices=())
+
+
+# ============================================================
+# carregar_pagina
+# ============================================================
+def test_carregar_pagina_filtra_ordena_e_conta_no_banco(engine_sqlite):
+    pd.DataFrame(
+        {"ano": [2023, 2021, 2022, 2020], "regiao_administrativa": ["gama", "GAMA", "Guara", "GAMA"]}
+    ).to_sql("clientes", engine_sqlite, index=False)
+
+    df, total = repo.carregar_pagina(
+        "clientes",
+        limite=1,
+        deslocamento=1,
+        filtros=(("ano", ">=", 2021), ("regiao_administrativa", "igual_texto", "GAMA")),
+        ordenar_por=("ano", "coluna_inexistente"),
+    )
+
+    assert total == 2
+    assert df["ano"].tolist() == [2023]
+
+
+def test_carregar_pagina_desempata_pelas_chaves_da_tabela_gold(engine_sqlite):
+    pd.DataFrame(
+        {
+            "ano": [2021, 2021, 2021, 2020],
+            "regiao_administrativa": ["GUARA", "AGUAS CLARAS", "GAMA", "GAMA"],
+            "crimes_contra_mulher": [1, 2, 3, 4],
+        }
+    ).to_sql("violencia_contra_mulher_gold", engine_sqlite, index=False)
+
+    paginas = [
+        repo.carregar_pagina(
+            "violencia_contra_mulher_gold", limite=1, deslocamento=i, ordenar_por=("ano",)
+        )[0]
+        for i in range(4)
+    ]
+
+    assert [p["regiao_administrativa"].iloc[0] for p in paginas] == [
+        "GAMA", "AGUAS CLARAS", "GAMA", "GUARA"
+    ]
+
+
+def test_carregar_pagina_tabela_inexistente_retorna_none(engine_sqlite):
+    assert repo.carregar_pagina("clientes", limite=10) is None
+
+
+def test_carregar_pagina_nome_invalido_retorna_none():
+    assert repo.carregar_pagina("clientes;drop", limite=10) is None
+
+
+def test_carregar_pagina_operador_invalido_levanta_value_error():
+    with pytest.raises(ValueError, match="Operadores de filtro inválidos"):
+        repo.carregar_pagina("clientes", limite=10, filtros=(("ano", "LIKE", 1),))
+
+
+def test_carregar_pagina_erro_sql_retorna_none():
+    with patch(
+        "database.repository.repository.conectar_banco",
+        return_value=MagicMock(),
+    ), patch("database.repository.repository.inspect", side_effect=SQLAlchemyError):
+        assert repo.carregar_pagina("clientes", limite=10) is None
+
+
+def test_carregar_pagina_erro_inesperado_retorna_none():
+    with patch(
+        "database.repository.repository.conectar_banco",
+        return_value=MagicMock(),
+    ), patch("database.repository.repository.inspect", side_effect=RuntimeError):
+        assert repo.carregar_pagina("clientes", limite=10) is None
+
+
+# ============================================================
+# versão dos dados (pipeline_runs)
+# ============================================================
+def test_obter_versao_dados_sem_registro_retorna_none(engine_sqlite):
+    assert repo.obter_versao_dados() is None
+
+
+def test_registrar_versao_dados_atualiza_versao(engine_sqlite):
+    repo.registrar_versao_dados("run1")
+    primeira = repo.obter_versao_dados()
+    repo.registrar_versao_dados("run2")
+
+    assert primeira is not None
+    assert repo.obter_versao_dados() >= primeira
+    assert len(pd.read_sql("SELECT * FROM pipeline_runs", engine_sqlite)) == 2
@@ -35,13 +35,50 @@ def test_merge_seguro_faz_merge_progressivo_outer():
 
 
 def test_merge_seguro_valida_chaves_de_cada_df():
+    df1 = pd.DataFrame({"ano": [2020], "regiao_administrativa": ["A"], "x": [1]})
+    df2 = pd.DataFrame(
+        {"ano": [2020, 2020], "regiao_administrativa": ["A", "A"], "y": [2, 3]}
+    )
+
+    with pytest.raises(ValueError, match="Duplicidade"):
+        merge_seguro([df1, df2], keys=["ano", "regiao_administrativa"])
+
+
+def test_merge_seguro_so_detalha_validacao_dos_dfs_com_duplicidade():
     df1 = pd.DataFrame({"ano": [2020], "regiao_administrativa": ["A"], "x": [1]})
     df2 = pd.DataFrame({"ano": [2020], "regiao_administrativa": ["A"], "y": [2]})
 
     with patch("domain.crimes.validar_chaves") as mock_validar:
         merge_seguro([df1, df2], keys=["ano", "regiao_administrativa"])
 
-    assert mock_validar.call_count == 2
+    mock_validar.assert_not_called()
+
+
+def test_merge_seguro_varios_dfs_em_uma_passada_com_valor_ausente():
+    keys = ["ano", "regiao_administrativa"]
+    dfs = [
+        pd.DataFrame({"ano": [2021, 2020], "regiao_administrativa": ["GAMA", "GAMA"], "a": [1, 2]}),
+        pd.DataFrame({"ano": [2020], "regiao_administrativa": ["CEILANDIA"], "b": [3]}),
+        pd.DataFrame({"ano": [2021], "regiao_administrativa": ["GAMA"], "c": [4]}),
+    ]
+
+    with patch("domain.crimes.pd.merge") as mock_merge:
+        resultado = merge_seguro(dfs, keys=keys, valor_ausente=0)
+
+    mock_merge.assert_not_called()
+    assert resultado.columns.tolist() == keys + ["a", "b", "c"]
+    assert resultado["ano"].tolist() == [2020, 2020, 2021]
+    linhas = resultado.set_index(keys)
+    assert linhas.loc[(2021, "GAMA")].tolist() == [1, 0, 4]
+    assert linhas.loc[(2020, "CEILANDIA")].tolist() == [0, 3, 0]
+
+
+def test_merge_seguro_colunas_de_valor_repetidas_levanta_erro():
+    df1 = pd.DataFrame({"ano": [2020], "regiao_administrativa": ["A"], "x": [1]})
+    df2 = pd.DataFrame({"ano": [2021], "regiao_administrativa": ["A"], "x": [2]})
+
+    with pytest.raises(ValueError, match="repetidas"):
+        merge_seguro([df1, df2], keys=["ano", "regiao_administrativa"])
 
 
 def test_merge_seguro_propaga_e_loga_excecao():
@@ -53,3 +53,22 @@ def test_consolidar_mescla_racismo_e_injuria(mock_load):
             assert pd.api.types.is_integer_dtype(resultado[col])
     # deve estar ordenado por ano, regiao_administrativa
     assert list(resultado["ano"]) == sorted(resultado["ano"])
+
+
+@patch("domain.crimes_discriminatorios.Repository.load")
+def test_consolidar_ordena_regioes_pelo_nome(mock_load):
+    wide = pd.DataFrame(
+        {
+            "regiao": ["TAGUATINGA", "BRASILIA", "AGUAS CLARAS", "GAMA"],
+            "inserido_em": ["2024-01-01"] * 4,
+            "2020": [1, 2, 3, 4],
+            "2021": [5, 6, 7, 8],
+        }
+    )
+    mock_load.side_effect = [wide.copy(), wide.copy()]
+
+    resultado = CrimesDiscriminatoriosService.consolidar()
+
+    por_ano = resultado.groupby("ano")["regiao_administrativa"].apply(lambda s: list(s.astype(str)))
+    for regioes in por_ano:
+        assert regioes == ["AGUAS CLARAS", "BRASILIA", "GAMA", "TAGUATINGA"]
@@ -15,10 +15,54 @@ def test_repository_load_delega_para_carregar_tabela(mock_carregar):
     assert resultado.equals(pd.DataFrame({"a": [1]}))
 
 
-@patch("ingestion.repository_adapter.inserir_dados")
-def test_repository_save_delega_para_inserir_dados(mock_inserir):
+@patch("ingestion.repository_adapter.salvar_dados")
+def test_repository_save_delega_para_salvar_dados(mock_inserir):
     df = pd.DataFrame({"a": [1]})
 
     Repository.save(df, "minha_tabela")
 
     mock_inserir.assert_called_once_with(df, "minha_tabela")
+
+
+@patch("ingestion.repository_adapter.carregar_tabela")
+def test_repository_load_de_tabela_gold_usa_cache(mock_carregar):
+    mock_carregar.return_value = pd.DataFrame({"a": [1]})
+
+    Repository.load("crimes_letais_gold")
+    resultado = Repository.load("crimes_letais_gold")
+
+    mock_carregar.assert_called_once_with("crimes_letais_gold")
+    assert resultado.equals(pd.DataFrame({"a": [1]}))
+
+
+@patch("ingestion.repository_adapter.salvar_dados")
+@patch("ingestion.repository_adapter.carregar_tabela")
+def test_repository_save_invalida_tabela_no_cache(mock_carregar, _mock_salvar):
+    mock_carregar.return_value = pd.DataFrame({"a": [1]})
+    Repository.load("crimes_letais_gold")
+
+    Repository.save(pd.DataFrame({"a": [2]}), "crimes_letais_gold")
+    Repository.load("crimes_letais_gold")
+
+    assert mock_carregar.call_count == 2
+
+
+@patch("ingestion.repository_adapter.registrar_versao_dados")
+def test_repository_registrar_versao_delega(mock_registrar):
+    Repository.registrar_versao("abc123")
+
+    mock_registrar.assert_called_once_with("abc123")
+
+
+@patch("ingestion.repository_adapter.carregar_tabela")
+def test_leitura_compartilhada_le_cada_tabela_silver_uma_vez_no_run(mock_carregar):
+    mock_carregar.return_value = pd.DataFrame({"a": [1]})
+
+    with Repository.leitura_compartilhada() as leitura:
+        Repository.load("crimes_contra_mulher")
+        Repository.load("crimes_contra_mulher")
+
+    Repository.load("crimes_contra_mulher")  # fora do run: sem cache
+
+    assert mock_carregar.call_count == 2
+    assert leitura.leituras == 1
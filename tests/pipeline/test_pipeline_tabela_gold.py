@@ -4,10 +4,22 @@ import pandas as pd
 import pytest
 
 from src.pipeline_tabela_gold import criar_tabela_gold, STEPS
+from util.dimensao_ra import TABELA_DIMENSAO_RA
 
 MODULO = "src.pipeline_tabela_gold"
 
 
+@pytest.fixture(autouse=True)
+def mock_registrar_versao():
+    with patch(f"{MODULO}.Repository.registrar_versao") as mock:
+        yield mock
+
+
+def _saves_de_steps(mock_save):
+    """Chamadas de Repository.save das tabelas gold (exclui a dimensão de RA)."""
+    return [c for c in mock_save.call_args_list if c.args[1] != TABELA_DIMENSAO_RA]
+
+
 def _resultados_fake(valor_por_step=None):
     """
     Gera um dict {nome_do_step: dataframe} cobrindo todos os STEPS reais
@@ -20,11 +32,26 @@ def _resultados_fake(valor_por_step=None):
     }
 
 
+def _executar_fake(resultados):
+    """
+    Substituto de executar_pipeline() que entrega cada resultado ao
+    `ao_concluir` (como o executor real faz ao fim de cada step).
+    """
+
+    def executar(run_id, steps, **kwargs):
+        for step in steps:
+            if step.nome in resultados:
+                kwargs["ao_concluir"](step, resultados[step.nome])
+        return {step.nome: None for step in steps}
+
+    return executar
+
+
 def test_criar_tabela_gold_fluxo_completo_salva_todos_os_steps():
     resultados = _resultados_fake()
 
     with (
-        patch(f"{MODULO}.executar_pipeline", return_value=resultados) as mock_exec,
+        patch(f"{MODULO}.executar_pipeline", side_effect=_executar_fake(resultados)) as mock_exec,
         patch(f"{MODULO}.Repository.save") as mock_save,
     ):
         criar_tabela_gold(max_workers=3)
@@ -34,10 +61,11 @@ def test_criar_tabela_gold_fluxo_completo_salva_todos_os_steps():
         args, kwargs = mock_exec.call_args
         assert args[1] == STEPS
         assert kwargs["max_workers"] == 3
+        assert kwargs["reter_resultados"] is False
 
         # Repository.save deve ser chamado uma vez por step, com o output correto
-        assert mock_save.call_count == len(STEPS)
-        outputs_salvos = {call.args[1] for call in mock_save.call_args_list}
+        assert len(_saves_de_steps(mock_save)) == len(STEPS)
+        outputs_salvos = {call.args[1] for call in _saves_de_steps(mock_save)}
         assert outputs_salvos == {step.output for step in STEPS}
 
 
@@ -48,15 +76,15 @@ def test_criar_tabela_gold_pula_step_sem_dados():
     resultados[step_sem_dados] = None
 
     with (
-        patch(f"{MODULO}.executar_pipeline", return_value=resultados),
+        patch(f"{MODULO}.executar_pipeline", side_effect=_executar_fake(resultados)),
         patch(f"{MODULO}.Repository.save") as mock_save,
         patch(f"{MODULO}.logger.warning") as mock_warning,
     ):
         criar_tabela_gold()
 
         # Um step a menos deve ter sido salvo
-        assert mock_save.call_count == len(STEPS) - 1
-        outputs_salvos = {call.args[1] for call in mock_save.call_args_list}
+        assert len(_saves_de_steps(mock_save)) == len(STEPS) - 1
+        outputs_salvos = {call.args[1] for call in _saves_de_steps(mock_save)}
         assert STEPS[0].output not in outputs_salvos
 
         mock_warning.assert_called_once()
@@ -72,14 +100,14 @@ def test_criar_tabela_gold_erro_ao_salvar_nao_interrompe_os_demais():
         return None
 
     with (
-        patch(f"{MODULO}.executar_pipeline", return_value=resultados),
+        patch(f"{MODULO}.executar_pipeline", side_effect=_executar_fake(resultados)),
         patch(f"{MODULO}.Repository.save", side_effect=save_com_falha_no_primeiro) as mock_save,
         patch(f"{MODULO}.logger.error") as mock_error,
     ):
         # não deve levantar, o erro de um step é capturado individualmente
         criar_tabela_gold()
 
-        assert mock_save.call_count == len(STEPS)
+        assert len(_saves_de_steps(mock_save)) == len(STEPS)
         mock_error.assert_called_once()
         assert "Erro de conexão simulado" in str(mock_error.call_args)
 
@@ -107,13 +135,13 @@ def test_criar_tabela_gold_dataframe_sem_len_usa_na():
     resultados[STEPS[0].nome] = object()  # sem __len__
 
     with (
-        patch(f"{MODULO}.executar_pipeline", return_value=resultados),
+        patch(f"{MODULO}.executar_pipeline", side_effect=_executar_fake(resultados)),
         patch(f"{MODULO}.Repository.save") as mock_save,
     ):
         criar_tabela_gold()
 
         # mesmo sem __len__, o step ainda deve ser salvo normalmente
-        assert mock_save.call_count == len(STEPS)
+        assert len(_saves_de_steps(mock_save)) == len(STEPS)
 
 
 def test_modulo_executado_como_main_chama_criar_tabela_gold():
@@ -130,4 +158,152 @@ def test_modulo_executado_como_main_chama_criar_tabela_gold():
     mock_exec.assert_called_once()
     _, kwargs = mock_exec.call_args
     assert kwargs["max_workers"] == 6
-    mock_save.assert_not_called()  # resultados vazios -> nenhum step salvo
+    assert _saves_de_steps(mock_save) == []  # resultados vazios -> nenhum step salvo
+
+
+def test_criar_tabela_gold_registra_versao_dos_dados_ao_final(mock_registrar_versao):
+    with (
+        patch(f"{MODULO}.executar_pipeline", side_effect=_executar_fake(_resultados_fake())),
+        patch(f"{MODULO}.Repository.save"),
+    ):
+        criar_tabela_gold(max_workers=2)
+
+    mock_registrar_versao.assert_called_once()
+
+
+def test_criar_tabela_gold_falha_ao_registrar_versao_nao_derruba_pipeline(
+    mock_registrar_versao,
+):
+    mock_registrar_versao.side_effect = Exception("banco fora")
+
+    with (
+        patch(f"{MODULO}.executar_pipeline", side_effect=_executar_fake(_resultados_fake())),
+        patch(f"{MODULO}.Repository.save"),
+    ):
+        criar_tabela_gold(max_workers=2)
+
+
+def test_criar_tabela_gold_salva_dimensao_ra():
+    with (
+        patch(f"{MODULO}.executar_pipeline", side_effect=_executar_fake(_resultados_fake())),
+        patch(f"{MODULO}.Repository.save") as mock_save,
+    ):
+        criar_tabela_gold()
+
+    salvos = {call.args[1]: call.args[0] for call in mock_save.call_args_list}
+
+    assert len(salvos[TABELA_DIMENSAO_RA]) == 35
+
+
+def test_steps_gold_devolvem_regiao_canonica_e_categorizada():
+    from src.pipeline_tabela_gold import ComRaCanonica
+
+    assert all(isinstance(step.func, ComRaCanonica) for step in STEPS)
+
+    gold = pd.DataFrame({"regiao_administrativa": ["Ceilândia", "Brasília"], "total": [1, 2]})
+    df = ComRaCanonica(lambda: gold)()
+
+    assert isinstance(df["regiao_administrativa"].dtype, pd.CategoricalDtype)
+    assert df["regiao_administrativa"].tolist() == ["CEILANDIA", "PLANO PILOTO"]
+    assert df["ra_id"].tolist() == [9, 1]
+
+
+def test_grafias_da_mesma_ra_viram_chave_duplicada_na_validacao():
+    from src.core.executor import executar_pipeline
+    from src.core.pipeline_step import PipelineStep
+    from src.pipeline_tabela_gold import ComRaCanonica
+    from validation.schema import NUMERICO, TEXTO, EsquemaTabela, validador_de_esquema
+
+    esquema = EsquemaTabela(
+        nome="gold:teste",
+        colunas={"ano": NUMERICO, "regiao_administrativa": TEXTO},
+        chaves=("ano", "regiao_administrativa"),
+    )
+    gold = pd.DataFrame({"ano": [2023, 2023], "regiao_administrativa": ["Brasília", "Plano Piloto"]})
+    consumidos = []
+
+    executar_pipeline(
+        "run",
+        [
+            PipelineStep(
+                "gold",
+                ComRaCanonica(lambda: gold),
+                retries=0,
+                timeout=5,
+                validacao=validador_de_esquema(esquema),
+            )
+        ],
+        max_workers=1,
+        ao_concluir=lambda step, df: consumidos.append(step.nome),
+        reter_resultados=False,
+    )
+
+    assert consumidos == []
+
+
+def test_step_com_falha_e_pulado_sem_gravacao():
+    resultados = _resultados_fake()
+    del resultados[STEPS[0].nome]  # falhou: o executor não chama ao_concluir
+
+    with (
+        patch(f"{MODULO}.executar_pipeline", side_effect=_executar_fake(resultados)),
+        patch(f"{MODULO}.Repository.save") as mock_save,
+        patch(f"{MODULO}.logger.warning") as mock_warning,
+    ):
+        criar_tabela_gold()
+
+    assert len(_saves_de_steps(mock_save)) == len(STEPS) - 1
+    assert STEPS[0].output in str(mock_warning.call_args)
+
+
+def test_gravador_limita_gravacoes_simultaneas():
+    import threading
+    import time
+
+    from src.pipeline_tabela_gold import GravadorGold
+
+    ativos = {"atual": 0, "maximo": 0}
+    lock = threading.Lock()
+
+    def save_lento(df, output):
+        with lock:
+            ativos["atual"] += 1
+            ativos["maximo"] = max(ativos["maximo"], ativos["atual"])
+        time.sleep(0.02)
+        with lock:
+            ativos["atual"] -= 1
+
+    with patch(f"{MODULO}.Repository.save", side_effect=save_lento) as mock_save:
+        gravador = GravadorGold("run", escritores=2)
+        for step in STEPS:
+            gravador(step, pd.DataFrame({"valor": [1]}))
+        gravador.encerrar()
+
+    assert mock_save.call_count == len(STEPS)
+    assert ativos["maximo"] <= 2
+
+
+def test_executor_entrega_resultados_validados_ao_consumidor():
+    from src.core.executor import executar_pipeline
+    from src.core.pipeline_step import PipelineStep
+
+    consumidos = []
+
+    def validacao(_df):
+        raise ValueError("schema")
+
+    steps = [
+        PipelineStep("ok", lambda: pd.DataFrame({"a": [1]}), retries=0, timeout=5),
+        PipelineStep("invalido", lambda: pd.DataFrame({"a": [1]}), retries=0, timeout=5, validacao=validacao),
+    ]
+
+    resultados = executar_pipeline(
+        "run",
+        steps,
+        max_workers=2,
+        ao_concluir=lambda step, df: consumidos.append(step.nome),
+        reter_resultados=False,
+    )
+
+    assert consumidos == ["ok"]
+    assert resultados == {"ok": None, "invalido": None}
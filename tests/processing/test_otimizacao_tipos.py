@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+
+from processing.otimizacao_tipos import otimizar_tipos, relatorio_memoria
+from validation.esquemas import GOLD
+from validation.schema import validar_schema
+
+
+def _gold_violencia_mulher(linhas=70):
+    ras = [f"RA {i % 35}" for i in range(linhas)]
+    return pd.DataFrame(
+        {
+            "ano": [2015 + i // 35 for i in range(linhas)],
+            "regiao_administrativa": ras,
+            "casos_feminicidios": [i % 3 for i in range(linhas)],
+            "crimes_contra_mulher": [i * 10 for i in range(linhas)],
+        }
+    )
+
+
+def test_inteiros_usam_a_menor_largura_que_comporta_os_valores():
+    df = pd.DataFrame({"pequeno": [0, 127], "medio": [-1, 2000], "grande": [0, 10**10]})
+
+    otimizado = otimizar_tipos(df)
+
+    assert otimizado.dtypes.tolist() == [np.int8, np.int16, np.int64]
+    assert otimizado.astype("int64").equals(df)
+
+
+def test_inteiro_minimo_e_inteiros_anulaveis():
+    df = pd.DataFrame({"n": pd.array([1, None, 3], dtype="Int64"), "m": [1, 2, 3]})
+
+    otimizado = otimizar_tipos(df, inteiro_minimo="int32")
+
+    assert str(otimizado["n"].dtype) == "Int32"
+    assert otimizado["m"].dtype == np.int32
+
+
+def test_float32_apenas_quando_a_conversao_e_exata():
+    df = pd.DataFrame({"exato": [0.5, 2.0, np.nan], "inexato": [0.1, 0.2, 0.3]})
+
+    otimizado = otimizar_tipos(df)
+
+    assert otimizado["exato"].dtype == np.float32
+    assert otimizado["inexato"].dtype == np.float64
+
+
+def test_texto_de_baixa_cardinalidade_vira_categorico():
+    df = pd.DataFrame({"ra": ["A", "B"] * 10, "id_unico": [f"x{i}" for i in range(20)]})
+
+    otimizado = otimizar_tipos(df)
+
+    assert isinstance(otimizado["ra"].dtype, pd.CategoricalDtype)
+    assert otimizado["id_unico"].dtype == object
+
+
+def test_respeita_o_esquema_declarado():
+    esquema = GOLD["identificacao_crimes_contra_mulher_gold"]
+    df = pd.DataFrame(
+        {
+            "ano": [2020, 2021] * 5,
+            "regiao_administrativa": ["CEILANDIA", "GAMA"] * 5,
+            "meio_utilizado": ["x"] * 10,
+            "local": ["casa"] * 10,
+            "motivacao": ["y"] * 10,
+            "idade_vitima": [30, 40] * 5,
+            "idade_autor": [35, 45] * 5,
+            "data_do_crime": pd.to_datetime(["2020-01-01", "2021-01-01"] * 5),
+        }
+    )
+
+    otimizado = otimizar_tipos(df, esquema)
+
+    validar_schema(otimizado, esquema)
+    assert otimizado["data_do_crime"].dtype == df["data_do_crime"].dtype
+    assert otimizado["idade_vitima"].dtype == np.int8
+
+
+def test_coluna_numerica_declarada_nao_vira_categorica():
+    esquema = GOLD["violencia_contra_mulher_gold"]
+    df = _gold_violencia_mulher()
+    df["casos_feminicidios"] = df["casos_feminicidios"].astype(object)
+
+    otimizado = otimizar_tipos(df, esquema)
+
+    assert otimizado["casos_feminicidios"].dtype == object
+
+
+def test_relatorio_de_memoria_mostra_economia():
+    df = _gold_violencia_mulher()
+
+    relatorio = relatorio_memoria(df, otimizar_tipos(df, GOLD["violencia_contra_mulher_gold"]))
+
+    assert relatorio["depois_mb"] < relatorio["antes_mb"]
+    assert relatorio["economia_pct"] > 30
+
@@ -0,0 +1,122 @@
+import pandas as pd
+import pytest
+from unittest.mock import patch
+
+from util import armazenamento
+from util.armazenamento import caminho_parquet, ler_dataset, salvar_dataset
+
+
+@pytest.fixture
+def df_anual():
+    return pd.DataFrame(
+        {
+            "ano": [2020, 2021, 2021],
+            "regiao_administrativa": ["GAMA", "GAMA", "GUARA"],
+            "quantidade": [1.5, 2.0, 3.0],
+        }
+    )
+
+
+def test_salvar_dataset_grava_parquet_particionado_e_csv(tmp_path, df_anual):
+    saida = tmp_path / "tabela.csv"
+
+    salvar_dataset(df_anual, saida)
+
+    assert saida.exists()
+    assert (caminho_parquet(saida) / "ano=2021").is_dir()
+
+
+def test_ler_dataset_preserva_dtypes_e_ordem_das_colunas(tmp_path, df_anual):
+    saida = tmp_path / "tabela.csv"
+    salvar_dataset(df_anual, saida, exportar_csv=False)
+
+    resultado = ler_dataset(saida).sort_values(["ano", "regiao_administrativa"])
+
+    assert not saida.exists()
+    assert list(resultado.columns) == ["ano", "regiao_administrativa", "quantidade"]
+    assert resultado["ano"].dtype.kind == "i"
+    assert resultado["quantidade"].tolist() == [1.5, 2.0, 3.0]
+
+
+def test_ler_dataset_parquet_e_csv_tem_o_mesmo_esquema(tmp_path):
+    df = pd.DataFrame(
+        {"regiao_administrativa": ["GAMA", "GUARA"], "ano": [2020, 2021], "quantidade": [1, 2]}
+    )
+    saida = tmp_path / "tabela.csv"
+    salvar_dataset(df, saida)
+
+    do_parquet = ler_dataset(saida)
+    with patch.object(armazenamento, "PYARROW_DISPONIVEL", False):
+        do_csv = ler_dataset(saida)
+
+    pd.testing.assert_frame_equal(do_parquet, do_csv)
+
+
+def test_ler_dataset_aplica_projecao_e_filtro_no_parquet(tmp_path, df_anual):
+    saida = tmp_path / "tabela.csv"
+    salvar_dataset(df_anual, saida)
+
+    resultado = ler_dataset(saida, colunas=["quantidade"], filtros=[("ano", ">=", 2021)])
+
+    assert list(resultado.columns) == ["quantidade"]
+    assert sorted(resultado["quantidade"]) == [2.0, 3.0]
+
+
+def test_ler_dataset_sem_parquet_usa_csv_com_mesma_semantica(tmp_path, df_anual):
+    saida = tmp_path / "tabela.csv"
+    df_anual.to_csv(saida, sep=";", index=False)
+
+    resultado = ler_dataset(
+        saida,
+        colunas=["regiao_administrativa"],
+        filtros=[("ano", "==", 2021), ("regiao_administrativa", "in", ["GUARA"])],
+    )
+
+    assert resultado.to_dict(orient="records") == [{"regiao_administrativa": "GUARA"}]
+
+
+def test_salvar_dataset_sem_coluna_de_particao_grava_arquivo_unico(tmp_path):
+    saida = tmp_path / "wide.csv"
+    df = pd.DataFrame({"regiao": ["GAMA"], "2020": [4]})
+
+    salvar_dataset(df, saida)
+    salvar_dataset(df, saida)  # regravação substitui o arquivo anterior
+
+    assert caminho_parquet(saida).is_file()
+    assert ler_dataset(saida).equals(df)
+
+
+def test_salvar_dataset_regrava_dataset_particionado(tmp_path, df_anual):
+    saida = tmp_path / "tabela.csv"
+    salvar_dataset(df_anual, saida)
+    salvar_dataset(df_anual.head(1), saida)
+
+    assert len(ler_dataset(saida)) == 1
+
+
+def test_falha_na_gravacao_preserva_o_dataset_anterior(tmp_path, df_anual):
+    saida = tmp_path / "tabela.csv"
+    salvar_dataset(df_anual, saida)
+
+    with patch.object(pd.DataFrame, "to_parquet", side_effect=OSError("disco cheio")):
+        with pytest.raises(OSError):
+            salvar_dataset(df_anual.head(1), saida)
+
+    assert len(ler_dataset(saida)) == 3
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["tabela.csv", "tabela.parquet"]
+
+
+def test_sem_pyarrow_grava_e_le_somente_csv(tmp_path, df_anual):
+    saida = tmp_path / "tabela.csv"
+
+    with patch.object(armazenamento, "PYARROW_DISPONIVEL", False):
+        salvar_dataset(df_anual, saida, exportar_csv=False)
+        resultado = ler_dataset(saida)
+
+    assert not caminho_parquet(saida).exists()
+    assert len(resultado) == 3
+
+
+def test_ler_dataset_operador_invalido(tmp_path):
+    with pytest.raises(ValueError, match="Operadores de filtro inválidos"):
+        ler_dataset(tmp_path / "x.csv", filtros=[("ano", "LIKE", 1)])
@@ -0,0 +1,139 @@
+import numpy as np
+import pandas as pd
+
+from domain.crimes import merge_seguro
+from util.dimensao_ra import (
+    COLUNA_RA_ID,
+    NOMES_CANONICOS,
+    TIPO_RA,
+    alinhar_categorias_ra,
+    categorizar_ra,
+    centroide_ra,
+    codificar_ra,
+    dimensao_ra,
+    nome_canonico,
+    resolver_ra,
+)
+from util.padronizacao import MAPEAMENTO_REGIOES_ADMINISTRATIVAS
+
+
+# ============================================================
+# resolução de nomes
+# ============================================================
+def test_resolver_ra_aceita_acentos_caixa_e_apelidos():
+    assert resolver_ra("Ceilândia") == 9
+    assert resolver_ra("  ceilandia ") == 9
+    assert resolver_ra("Brasília") == 1
+    assert resolver_ra("SOL NASCENTE") == 32
+    assert resolver_ra("DISTRITO FEDERAL") is None
+    assert resolver_ra(None) is None
+    assert resolver_ra(np.nan) is None
+
+
+def test_todos_os_nomes_do_mapeamento_resolvem_para_uma_ra():
+    for variante, canonico in MAPEAMENTO_REGIOES_ADMINISTRATIVAS.items():
+        assert resolver_ra(variante) == resolver_ra(canonico), variante
+
+
+def test_nome_canonico():
+    assert nome_canonico("plano piloto") == "PLANO PILOTO"
+    assert nome_canonico("Arniqueira") == "ARNIQUEIRAS"
+    assert nome_canonico("RA FANTASMA") is None
+
+
+def test_centroide_ra_busca_por_apelido():
+    assert centroide_ra("PLANO PILOTO") is not None
+    assert centroide_ra("RA FANTASMA") is None
+
+
+# ============================================================
+# dimensão e codificação
+# ============================================================
+def test_dimensao_ra_uma_linha_por_ra_com_chave_inteira():
+    dim = dimensao_ra()
+
+    assert len(dim) == len(NOMES_CANONICOS) == 35
+    assert dim[COLUNA_RA_ID].dtype == np.int16
+    assert dim[COLUNA_RA_ID].is_unique
+    assert dim["nome"].tolist() == list(NOMES_CANONICOS)
+
+
+def test_codificar_ra_devolve_int16_com_nulo_para_desconhecidas():
+    serie = pd.Series(["Gama", "GAMA", "DISTRITO FEDERAL", None], index=[10, 11, 12, 13])
+
+    ids = codificar_ra(serie)
+
+    assert str(ids.dtype) == "Int16"
+    assert ids.index.tolist() == [10, 11, 12, 13]
+    assert ids.iloc[:2].tolist() == [2, 2]
+    assert ids.iloc[2:].isna().all()
+
+
+def test_categorizar_ra_troca_por_canonico_e_insere_ra_id_apos_a_coluna():
+    df = pd.DataFrame(
+        {
+            "ano": [2023, 2023, 2023],
+            "regiao_administrativa": ["Brasília", "ceilandia", "DISTRITO FEDERAL"],
+            "total": [1, 2, 3],
+        }
+    )
+
+    resultado = categorizar_ra(df)
+
+    assert resultado.columns.tolist() == ["ano", "regiao_administrativa", "ra_id", "total"]
+    assert isinstance(resultado["regiao_administrativa"].dtype, pd.CategoricalDtype)
+    assert resultado["regiao_administrativa"].tolist() == [
+        "PLANO PILOTO",
+        "CEILANDIA",
+        "DISTRITO FEDERAL",
+    ]
+    assert resultado["ra_id"].tolist()[:2] == [1, 9]
+    assert pd.isna(resultado["ra_id"].iloc[2])
+    # original intacto
+    assert df["regiao_administrativa"].dtype == object
+
+
+def test_categorizar_ra_reaplicado_nao_duplica_ra_id():
+    df = pd.DataFrame({"regiao_administrativa": ["Gama"], "total": [1]})
+
+    resultado = categorizar_ra(categorizar_ra(df))
+
+    assert resultado.columns.tolist() == ["regiao_administrativa", "ra_id", "total"]
+
+
+def test_categorizar_ra_sem_coluna_devolve_o_mesmo_df():
+    df = pd.DataFrame({"ano": [2023]})
+    assert categorizar_ra(df) is df
+
+
+# ============================================================
+# merge pelos códigos
+# ============================================================
+def test_alinhar_categorias_ra_usa_o_mesmo_dtype_em_todos():
+    a = pd.DataFrame({"regiao_administrativa": ["GAMA", "TOTAL"]})
+    b = pd.DataFrame({"regiao_administrativa": ["CEILANDIA"]})
+
+    alinhados = alinhar_categorias_ra([a, b])
+
+    assert alinhados[0]["regiao_administrativa"].dtype == alinhados[1]["regiao_administrativa"].dtype
+    assert list(alinhados[0]["regiao_administrativa"].cat.categories[: len(NOMES_CANONICOS)]) == list(
+        TIPO_RA.categories
+    )
+
+
+def test_merge_seguro_em_varios_dfs_junta_pela_ra_categorica():
+    roubo = pd.DataFrame(
+        {"ano": [2023, 2023], "regiao_administrativa": ["GAMA", "CEILANDIA"], "roubo": [1, 2]}
+    )
+    furto = pd.DataFrame(
+        {"ano": [2023, 2023], "regiao_administrativa": ["CEILANDIA", "TOTAL"], "furto": [5, 7]}
+    )
+
+    resultado = merge_seguro([roubo, furto], ["ano", "regiao_administrativa"])
+
+    assert isinstance(resultado["regiao_administrativa"].dtype, pd.CategoricalDtype)
+    linhas = resultado.set_index("regiao_administrativa")
+    assert linhas.loc["CEILANDIA", "roubo"] == 2
+    assert linhas.loc["CEILANDIA", "furto"] == 5
+    assert pd.isna(linhas.loc["GAMA", "furto"])
+    assert pd.isna(linhas.loc["TOTAL", "roubo"])
@@ -263,6 +263,49 @@ def test_padronizar_regiao_normaliza_maiuscula_sem_acento_sem_espacos():
     assert pd.isna(resultado["regiao"].tolist()[2])
 
 
+def test_padronizar_regiao_normaliza_apenas_valores_distintos(monkeypatch):
+    chamadas = []
+
+    def _normalizar(valor):
+        chamadas.append(valor)
+        return valor.strip().upper()
+
+    monkeypatch.setattr("util.padronizacao._normalizar_nome_regiao", _normalizar)
+    df = pd.DataFrame({"regiao": ["Gama", "Guara", "Gama"] * 1000})
+
+    resultado = padronizar_regiao(df, "regiao")
+
+    assert sorted(chamadas) == ["Gama", "Guara"]
+    assert resultado["regiao"].tolist()[:3] == ["GAMA", "GUARA", "GAMA"]
+
+
+def test_padronizar_regiao_aplica_mapeamento_na_mesma_passada():
+    df = pd.DataFrame(
+        {"regiao": ["Brasília (Plano Piloto)", " sudoeste ", "Arniqueira", "Gama", None]}
+    )
+
+    resultado = padronizar_regiao(
+        df, "regiao", mapeamento=MAPEAMENTO_REGIOES_ADMINISTRATIVAS
+    )
+
+    assert resultado["regiao"].tolist()[:4] == [
+        "PLANO PILOTO",
+        "SUDOESTE/OCTOGONAL",
+        "ARNIQUEIRAS",
+        "GAMA",
+    ]
+    assert pd.isna(resultado["regiao"].tolist()[4])
+
+
+def test_padronizar_regiao_texto_nan_vira_nulo():
+    df = pd.DataFrame({"regiao": ["nan", "Gama"]})
+
+    resultado = padronizar_regiao(df, "regiao")
+
+    assert pd.isna(resultado["regiao"].iloc[0])
+    assert resultado["regiao"].iloc[1] == "GAMA"
+
+
 # ============================================================
 # transformar_wide_para_long
 # ============================================================
@@ -0,0 +1,155 @@
+# util/armazenamento.py
+"""
+Armazenamento colunar (Parquet) das camadas silver/gold.
+
+Cada tabela tratada é gravada como Parquet tipado ao lado do CSV de saída
+(`<nome>.parquet`, particionado por `ano` quando a coluna existe). O CSV `;`
+continua sendo gerado como formato de exportação, conforme a seção
+`armazenamento` do config.yaml.
+
+A leitura (`ler_dataset`) prefere o Parquet — preservando dtypes e aplicando
+projeção de colunas e filtros direto no arquivo — e cai para o CSV quando o
+Parquet não existe ou o pyarrow não está instalado.
+"""
+
+import os
+import shutil
+from pathlib import Path
+
+import pandas as pd
+
+from util.config_loader import get_config
+from util.log import logs
+
+try:
+    import pyarrow.parquet as pq
+    PYARROW_DISPONIVEL = True
+except ImportError:  # pragma: no cover - depende do ambiente
+    PYARROW_DISPONIVEL = False
+
+logger = logs()
+
+_config_armazenamento = get_config().get("armazenamento", {})
+
+EXPORTAR_CSV = bool(_config_armazenamento.get("exportar_csv", True))
+COLUNA_PARTICAO = _config_armazenamento.get("coluna_particao", "ano")
+
+_OPERADORES = {
+    "==": lambda serie, valor: serie == valor,
+    "!=": lambda serie, valor: serie != valor,
+    ">": lambda serie, valor: serie > valor,
+    ">=": lambda serie, valor: serie >= valor,
+    "<": lambda serie, valor: serie < valor,
+    "<=": lambda serie, valor: serie <= valor,
+    "in": lambda serie, valor: serie.isin(valor),
+}
+
+
+def caminho_parquet(caminho_csv) -> Path:
+    """Caminho do dataset Parquet correspondente a um CSV de saída."""
+    return Path(caminho_csv).with_suffix(".parquet")
+
+
+def salvar_dataset(df: pd.DataFrame, caminho_csv, exportar_csv: bool | None = None) -> None:
+    """
+    Grava `df` como Parquet (particionado por ano, quando houver a coluna) e,
+    se `exportar_csv`, também no CSV `;` de sempre.
+    """
+    exportar_csv = EXPORTAR_CSV if exportar_csv is None else exportar_csv
+
+    if exportar_csv or not PYARROW_DISPONIVEL:
+        df.to_csv(caminho_csv, sep=";", index=False, encoding="utf-8")
+
+    if not PYARROW_DISPONIVEL:
+        logger.warning("pyarrow indisponível; %s gravado apenas em CSV", caminho_csv)
+        return
+
+    # grava ao lado e troca no fim: uma falha no meio não deixa um dataset
+    # parcial (ou partições de execução anterior) para o `ler_dataset`
+    destino = caminho_parquet(caminho_csv)
+    temporario = destino.with_name(f"{destino.name}.tmp")
+    _remover(temporario)
+
+    try:
+        if COLUNA_PARTICAO in df.columns and df[COLUNA_PARTICAO].notna().all():
+            df.to_parquet(temporario, index=False, partition_cols=[COLUNA_PARTICAO])
+        else:
+            df.to_parquet(temporario, index=False)
+    except BaseException:
+        _remover(temporario)
+        raise
+
+    _remover(destino)
+    os.replace(temporario, destino)
+
+    logger.info("Dataset colunar salvo: %s", destino)
+
+
+def _remover(caminho: Path) -> None:
+    """Remove um dataset Parquet (diretório particionado ou arquivo único)."""
+    if caminho.is_dir():
+        shutil.rmtree(caminho)
+    elif caminho.exists():
+        caminho.unlink()
+
+
+def _aplicar_filtros(df: pd.DataFrame, filtros) -> pd.DataFrame:
+    for coluna, operador, valor in filtros:
+        df = df[_OPERADORES[operador](df[coluna], valor)]
+    return df.reset_index(drop=True)
+
+
+def _esquema_armazenado(origem: Path) -> dict:
+    """Colunas na ordem original e seus dtypes, dos metadados pandas do Parquet."""
+    arquivo = next(origem.rglob("*.parquet"), None)
+    if arquivo is None:
+        return {}
+    metadados = pq.read_schema(arquivo).pandas_metadata or {}
+    return {
+        c["name"]: c.get("numpy_type")
+        for c in metadados.get("columns", [])
+        if c.get("name")
+    }
+
+
+def ler_dataset(caminho_csv, colunas=None, filtros=None) -> pd.DataFrame:
+    """
+    Lê uma tabela silver/gold preferindo o Parquet.
+
+    :param colunas: projeção (lista de colunas) aplicada na leitura.
+    :param filtros: lista de `(coluna, operador, valor)` no formato do
+        pyarrow (`==`, `!=`, `>`, `>=`, `<`, `<=`, `in`); no Parquet
+        particionado, partições fora do filtro nem são abertas.
+    """
+    filtros = list(filtros or [])
+    desconhecidos = {op for _, op, _ in filtros} - set(_OPERADORES)
+    if desconhecidos:
+        raise ValueError(f"Operadores de filtro inválidos: {sorted(desconhecidos)}")
+
+    origem = caminho_parquet(caminho_csv)
+
+    if PYARROW_DISPONIVEL and origem.exists():
+        df = pd.read_parquet(origem, columns=colunas, filters=filtros or None)
+
+        if origem.is_dir() and COLUNA_PARTICAO in df.columns:
+            # partição volta como category e no fim: restaura o dtype e a
+            # posição gravados, para o frame sair igual ao lido do CSV
+            esquema = _esquema_armazenado(origem)
+            particao = df[COLUNA_PARTICAO]
+            if isinstance(particao.dtype, pd.CategoricalDtype):
+                particao = particao.astype(particao.cat.categories.dtype)
+            df[COLUNA_PARTICAO] = particao.astype(esquema.get(COLUNA_PARTICAO) or particao.dtype)
+            ordem = list(colunas) if colunas is not None else list(esquema)
+            ordenadas = [c for c in ordem if c in df.columns]
+            df = df[ordenadas + [c for c in df.columns if c not in ordenadas]]
+
+        return df
+
+    usecols = None
+    if colunas is not None:
+        usecols = list(dict.fromkeys([*colunas, *(c for c, _, _ in filtros)]))
+
+    df = _aplicar_filtros(
+        pd.read_csv(caminho_csv, sep=";", encoding="utf-8", usecols=usecols), filtros
+    )
+    return df if colunas is None else df[list(colunas)]
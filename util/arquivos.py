@@ -1,9 +1,13 @@
+import contextlib
 import glob
 import os
+import random
+import shutil
 import time
 from time import sleep
 import requests
 from tqdm import tqdm
+from util import cache_downloads
 from util.config_loader import get_config
 from util.log import logs, fechar_loggers
 from urllib.parse import urlparse
@@ -13,11 +17,22 @@ from urllib.parse import urlparse
 config = get_config()
 logger = logs()
 
+# Backoff exponencial com jitter entre tentativas (segundos)
+BACKOFF_BASE = float(config.get("coleta", {}).get("backoff_base", 2))
+BACKOFF_MAXIMO = float(config.get("coleta", {}).get("backoff_maximo", 60))
+TIMEOUT_REQUISICAO = 30
 
-def limpar_diretorios():
+
+def limpar_diretorios(preservar_bronze: bool = False):
     """
-    Remove arquivos CSV, XLSX, XLS, PDF, ZIP e LOG antes da execução.
-    Não remove diretórios, apenas os arquivos internos.
+    Remove arquivos CSV, XLSX, XLS, PDF, ZIP e LOG antes da execução, além
+    dos datasets Parquet de saída (`<nome>.parquet`, arquivo ou diretório
+    particionado): `ler_dataset` prefere o Parquet ao CSV, então um Parquet
+    de execução anterior não pode sobreviver à limpeza.
+    As pastas em si são mantidas.
+
+    Com `preservar_bronze=True` os arquivos baixados (bronze) são mantidos,
+    para que o cache de downloads possa revalidá-los em vez de rebaixar.
     """
     global logger  # Permite reatribuir a variável global 'logger' ao final
 
@@ -34,8 +49,16 @@ def limpar_diretorios():
         "./data/bronze/zip/*.zip": "Arquivos ZIP",
         "./logs/*.log": "Arquivos de LOG",
         "./data/silver/output/*.csv": "Arquivos CSV de saída",
+        "./data/silver/output/*.parquet": "Datasets Parquet de saída",
     }
 
+    if preservar_bronze:
+        pastas = {
+            padrao: descricao
+            for padrao, descricao in pastas.items()
+            if not padrao.startswith("./data/bronze/")
+        }
+
     for padrao, descricao in pastas.items():
         arquivos = glob.glob(padrao)
 
@@ -45,7 +68,10 @@ def limpar_diretorios():
 
         for arquivo in arquivos:
             try:
-                os.remove(arquivo)
+                if os.path.isdir(arquivo):
+                    shutil.rmtree(arquivo)
+                else:
+                    os.remove(arquivo)
                 print(f"Removido: {arquivo}")
             except Exception as e:  # pragma: no cover
                 print(f"Erro ao remover {arquivo}: {e}")
@@ -61,46 +87,104 @@ def limpar_diretorios():
     return logger
 
 
-def download_arquivo(url: str, nome_arquivo: str, max_tentativas: int = 5):
+def tempo_espera(tentativa: int) -> float:
+    """Backoff exponencial (base * 2^(n-1), limitado) com jitter de até 50%."""
+    teto = min(BACKOFF_MAXIMO, BACKOFF_BASE * 2 ** (tentativa - 1))
+    return random.uniform(teto / 2, teto)
+
+
+def download_arquivo(
+    url: str,
+    nome_arquivo: str,
+    max_tentativas: int = 5,
+    usar_cache: bool | None = None,
+    sessao: requests.Session | None = None,
+    prazo: float | None = None,
+):
+    """
+    Baixa `url` para a pasta bronze correspondente à extensão detectada.
+
+    Com o cache ativo (`coleta.cache_downloads`), envia os validadores
+    guardados no manifesto (`util/cache_downloads.py`); se o servidor
+    responder 304, o arquivo local é reaproveitado sem novo download.
+
+    :param sessao: sessão compartilhada (pool keep-alive); sem ela, cada
+        tentativa abre e fecha a própria sessão.
+    :param prazo: instante limite (`time.monotonic()`) para novas tentativas.
+
+    Se o stream cair no meio e o servidor aceitar `Range`, o `.tmp` parcial
+    é mantido e a próxima tentativa continua de onde parou.
+    """
+    usar_cache = cache_downloads.CACHE_ATIVO if usar_cache is None else usar_cache
     start = time.time()
     logger.info(f"Iniciando download: {nome_arquivo}")
     logger.info(f"URL: {url}")
 
     file_path = None
     tentativas_realizadas = 0
+    # (caminho do .tmp, bytes já gravados, ETag/Last-Modified) para Range
+    retomada = None
 
     for tentativa in range(1, max_tentativas + 1):
+        if prazo is not None and time.monotonic() >= prazo:
+            logger.error(f"Prazo da coleta esgotado antes da tentativa {tentativa}.")
+            break
+
         tentativas_realizadas = tentativa
         temp_file_path = None
+        response = None
+        manter_parcial = False
 
         logger.info(f"--- Tentativa {tentativa} de {max_tentativas} ---")
 
-        try:
-            sleep(1)
+        timeout = TIMEOUT_REQUISICAO
+        if prazo is not None:
+            timeout = max(1.0, min(timeout, prazo - time.monotonic()))
 
-            # Cria uma nova sessão HTTP a cada tentativa
-            with requests.Session() as session:
-                # Limpa cookies e força uma nova conexão
-                session.cookies.clear()
+        try:
+            if sessao is None:
+                # Sem sessão compartilhada: nova sessão HTTP a cada tentativa
+                contexto = requests.Session()
+            else:
+                contexto = contextlib.nullcontext(sessao)
 
+            with contexto as session:
                 headers = {
                     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)",
-                    "Connection": "close",
-                    "Cache-Control": "no-cache",
-                    "Pragma": "no-cache",
                 }
 
+                if sessao is None:
+                    # Limpa cookies e força uma nova conexão
+                    session.cookies.clear()
+                    headers["Connection"] = "close"
+
+                if retomada is not None:
+                    headers["Range"] = f"bytes={retomada[1]}-"
+                    if retomada[2]:
+                        headers["If-Range"] = retomada[2]
+                elif usar_cache:
+                    headers.update(cache_downloads.cabecalhos_condicionais(url))
+                else:
+                    headers.update({"Cache-Control": "no-cache", "Pragma": "no-cache"})
+
                 response = session.get(
                     url,
                     headers=headers,
                     stream=True,
-                    timeout=30,
+                    timeout=timeout,
                     allow_redirects=True,
                 )
 
             logger.info(f"Status Code: {response.status_code}")
             logger.info(f"URL final: {response.url}")
 
+            if usar_cache and response.status_code == 304:
+                caminho_cache = cache_downloads.arquivo_em_cache(url)
+                if caminho_cache is not None:
+                    logger.info(f"Recurso não modificado; usando cache: {caminho_cache}")
+                    logger.info("*****************************************************\n")
+                    return caminho_cache
+
             content_type = response.headers.get("Content-Type", "").lower()
             logger.info(f"Content-Type: {content_type}")
 
@@ -138,30 +222,50 @@ def download_arquivo(url: str, nome_arquivo: str, max_tentativas: int = 5):
             file_path = os.path.join(folder, f"{base_name}{ext}")
             temp_file_path = f"{file_path}.tmp"
 
-            # Garante download do zero
-            if os.path.exists(file_path):
-                os.remove(file_path)
-            if os.path.exists(temp_file_path):
+            retomando = (
+                retomada is not None
+                and response.status_code == 206
+                and retomada[0] == temp_file_path
+            )
+            if retomada is not None and not retomando:
+                logger.info("Servidor não retomou o download parcial; reiniciando.")
+            retomada = None
+
+            # Resto de tentativa anterior; o definitivo só é trocado no os.replace
+            if not retomando and os.path.exists(temp_file_path):
                 os.remove(temp_file_path)
 
+            total_bytes = os.path.getsize(temp_file_path) if retomando else 0
             total_size = int(response.headers.get("Content-Length", 0))
-            total_bytes = 0
+            if total_size > 0:
+                total_size += total_bytes
+
+            aceita_range = (
+                str(response.headers.get("Accept-Ranges", "")).lower() == "bytes"
+                or retomando
+            )
 
             with (
-                open(temp_file_path, "wb") as f,
+                open(temp_file_path, "ab" if retomando else "wb") as f,
                 tqdm(
                     total=total_size if total_size > 0 else None,
+                    initial=total_bytes,
                     unit="B",
                     unit_scale=True,
                     desc=f"Baixando {nome_arquivo} (Tentativa {tentativa})",
                     ncols=80,
                 ) as progress,
             ):
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-                        progress.update(len(chunk))
-                        total_bytes += len(chunk)
+                try:
+                    for chunk in response.iter_content(chunk_size=8192):
+                        if chunk:
+                            f.write(chunk)
+                            progress.update(len(chunk))
+                            total_bytes += len(chunk)
+                except Exception:
+                    # Stream interrompido: guarda o parcial se der para retomar
+                    manter_parcial = aceita_range and total_bytes > 0
+                    raise
 
             if total_bytes == 0:
                 if os.path.exists(temp_file_path):
@@ -173,6 +277,13 @@ def download_arquivo(url: str, nome_arquivo: str, max_tentativas: int = 5):
             os.replace(temp_file_path, file_path)
 
             logger.info(f"Arquivo salvo em: {file_path}")
+
+            if usar_cache:
+                # Manifesto é só otimização: falha aqui não invalida o download
+                try:
+                    cache_downloads.registrar_download(url, file_path, response.headers)
+                except Exception as e:
+                    logger.warning(f"Não foi possível registrar o download no cache: {e}")
             logger.info("Download concluído com sucesso!")
 
             tempo_total = time.time() - start
@@ -194,12 +305,26 @@ def download_arquivo(url: str, nome_arquivo: str, max_tentativas: int = 5):
 
         finally:
             if temp_file_path and os.path.exists(temp_file_path):
-                os.remove(temp_file_path)
+                if manter_parcial:
+                    validador = response.headers.get("ETag") or response.headers.get(
+                        "Last-Modified"
+                    )
+                    retomada = (temp_file_path, total_bytes, validador)
+                    logger.info(
+                        f"Download parcial mantido ({total_bytes} bytes) para retomada."
+                    )
+                else:
+                    os.remove(temp_file_path)
 
         if tentativa < max_tentativas:
-            tempo_espera = 5 * tentativa
-            logger.info(f"Aguardando {tempo_espera}s antes da próxima tentativa...")
-            sleep(tempo_espera)
+            espera = tempo_espera(tentativa)
+            if prazo is not None:
+                espera = min(espera, max(0.0, prazo - time.monotonic()))
+            logger.info(f"Aguardando {espera:.1f}s antes da próxima tentativa...")
+            sleep(espera)
+
+    if retomada is not None and os.path.exists(retomada[0]):
+        os.remove(retomada[0])
 
     # Remove arquivo vazio caso exista
     if file_path and os.path.exists(file_path) and os.path.getsize(file_path) == 0:
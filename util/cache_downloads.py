@@ -0,0 +1,115 @@
+# util/cache_downloads.py
+"""
+Cache endereçado por conteúdo dos downloads da camada bronze.
+
+Para cada URL baixada o manifesto (`data/bronze/manifesto_downloads.json`)
+guarda o arquivo gravado, o SHA-256 do conteúdo e os validadores HTTP
+(ETag / Last-Modified) devolvidos pelo servidor. Na coleta seguinte,
+`download_arquivo` envia `If-None-Match` / `If-Modified-Since`; um
+`304 Not Modified` reaproveita o arquivo local sem baixar nada.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+
+from util.config_loader import get_config
+from util.log import logs
+
+logger = logs()
+
+CAMINHO_MANIFESTO = "./data/bronze/manifesto_downloads.json"
+
+CACHE_ATIVO = bool(get_config().get("coleta", {}).get("cache_downloads", True))
+
+_lock = threading.Lock()
+
+
+def _ler_manifesto() -> dict:
+    if not os.path.exists(CAMINHO_MANIFESTO):
+        return {}
+
+    try:
+        with open(CAMINHO_MANIFESTO, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        logger.warning(f"Manifesto de downloads ilegível, ignorando: {CAMINHO_MANIFESTO}")
+        return {}
+
+
+def _gravar_manifesto(manifesto: dict) -> None:
+    os.makedirs(os.path.dirname(CAMINHO_MANIFESTO) or ".", exist_ok=True)
+    temporario = f"{CAMINHO_MANIFESTO}.tmp"
+
+    with open(temporario, "w", encoding="utf-8") as f:
+        json.dump(manifesto, f, ensure_ascii=False, indent=2)
+
+    os.replace(temporario, CAMINHO_MANIFESTO)
+
+
+def hash_arquivo(caminho: str) -> str:
+    """SHA-256 do conteúdo do arquivo (leitura em blocos)."""
+    sha = hashlib.sha256()
+
+    with open(caminho, "rb") as f:
+        for bloco in iter(lambda: f.read(1024 * 1024), b""):
+            sha.update(bloco)
+
+    return sha.hexdigest()
+
+
+def arquivo_em_cache(url: str) -> str | None:
+    """Arquivo local já baixado para `url`, se ainda existir em disco."""
+    with _lock:
+        entrada = _ler_manifesto().get(url)
+
+    if entrada and os.path.exists(entrada.get("arquivo", "")):
+        return entrada["arquivo"]
+
+    return None
+
+
+def cabecalhos_condicionais(url: str) -> dict:
+    """Headers `If-None-Match` / `If-Modified-Since` para revalidar `url`."""
+    if arquivo_em_cache(url) is None:
+        return {}
+
+    with _lock:
+        entrada = _ler_manifesto()[url]
+
+    cabecalhos = {}
+    if entrada.get("etag"):
+        cabecalhos["If-None-Match"] = entrada["etag"]
+    if entrada.get("last_modified"):
+        cabecalhos["If-Modified-Since"] = entrada["last_modified"]
+
+    return cabecalhos
+
+
+def registrar_download(url: str, caminho: str, headers) -> str:
+    """
+    Registra no manifesto o arquivo recém-baixado e seus validadores.
+
+    :return: SHA-256 do conteúdo.
+    """
+    sha256 = hash_arquivo(caminho)
+
+    with _lock:
+        manifesto = _ler_manifesto()
+        anterior = manifesto.get(url, {})
+
+        if anterior.get("sha256") == sha256:
+            logger.info(f"Conteúdo idêntico ao download anterior: {caminho}")
+
+        manifesto[url] = {
+            "arquivo": caminho,
+            "sha256": sha256,
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "baixado_em": datetime.now().isoformat(timespec="seconds"),
+        }
+        _gravar_manifesto(manifesto)
+
+    return sha256
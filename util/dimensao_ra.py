@@ -0,0 +1,205 @@
+# util/dimensao_ra.py
+"""
+Dimensão canônica das Regiões Administrativas (RA) do DF.
+
+Cada RA tem uma chave inteira (`ra_id`, o número oficial da RA), o nome
+canônico usado nas tabelas gold, os apelidos/variantes conhecidos e o
+centróide de `geoespacial/centroides.py`. A dimensão é materializada no
+Postgres (`dim_regiao_administrativa`) pelo pipeline gold, e as tabelas gold
+passam a carregar `ra_id` ao lado do nome.
+
+Em memória, `categorizar_ra` troca a coluna de nomes por um `pd.Categorical`
+com as RAs canônicas como categorias: merges, filtros e comparações passam a
+operar sobre os códigos inteiros, e a coluna ocupa 1-2 bytes por linha em vez
+de um objeto Python.
+"""
+
+from functools import lru_cache
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from geoespacial.centroides import CENTROIDES_RA
+from util.padronizacao import MAPEAMENTO_REGIOES_ADMINISTRATIVAS, _normalizar_nome_regiao
+
+TABELA_DIMENSAO_RA = "dim_regiao_administrativa"
+
+COLUNA_RA = "regiao_administrativa"
+COLUNA_RA_ID = "ra_id"
+
+# (número oficial da RA, nome canônico, apelidos). Os apelidos incluem as
+# chaves de MAPEAMENTO_REGIOES_ADMINISTRATIVAS e de CENTROIDES_RA.
+REGIOES_ADMINISTRATIVAS: Tuple[Tuple[int, str, Tuple[str, ...]], ...] = (
+    (1, "PLANO PILOTO", ("BRASILIA", "BRASILIA (PLANO PILOTO)")),
+    (2, "GAMA", ()),
+    (3, "TAGUATINGA", ()),
+    (4, "BRAZLANDIA", ()),
+    (5, "SOBRADINHO", ()),
+    (6, "PLANALTINA", ()),
+    (7, "PARANOA", ()),
+    (8, "NUCLEO BANDEIRANTE", ()),
+    (9, "CEILANDIA", ()),
+    (10, "GUARA", ()),
+    (11, "CRUZEIRO", ()),
+    (12, "SAMAMBAIA", ()),
+    (13, "SANTA MARIA", ()),
+    (14, "SAO SEBASTIAO", ()),
+    (15, "RECANTO DAS EMAS", ()),
+    (16, "LAGO SUL", ()),
+    (17, "RIACHO FUNDO", ()),
+    (18, "LAGO NORTE", ()),
+    (19, "CANDANGOLANDIA", ()),
+    (20, "AGUAS CLARAS", ()),
+    (21, "RIACHO FUNDO II", ()),
+    (22, "SUDOESTE/OCTOGONAL", ("SUDOESTE", "OCTOGONAL")),
+    (23, "VARJAO", ()),
+    (24, "PARK WAY", ()),
+    (25, "SCIA/ESTRUTURAL", ("SCIA", "ESTRUTURAL", "SCIA E ESTRUTURAL")),
+    (26, "SOBRADINHO II", ()),
+    (27, "JARDIM BOTANICO", ()),
+    (28, "ITAPOA", ()),
+    (29, "SIA (SETOR DE INDUSTRIA E ABASTECIMENTO)", ("SIA",)),
+    (30, "VICENTE PIRES", ()),
+    (31, "FERCAL", ()),
+    (32, "POR DO SOL/SOL NASCENTE", ("SOL NASCENTE/POR DO SOL", "SOL NASCENTE", "POR DO SOL")),
+    (33, "ARNIQUEIRAS", ("ARNIQUEIRA",)),
+    (34, "ARAPOANGA", ()),
+    (35, "AGUA QUENTE", ()),
+)
+
+NOMES_CANONICOS = tuple(nome for _, nome, _ in REGIOES_ADMINISTRATIVAS)
+
+# Categorias fixas: o código do Categorical é estável entre tabelas e execuções
+TIPO_RA = pd.CategoricalDtype(categories=NOMES_CANONICOS, ordered=False)
+
+
+def _tabela_aliases() -> dict:
+    """nome normalizado (canônico ou apelido) -> ra_id."""
+    tabela = {}
+    for ra_id, nome, aliases in REGIOES_ADMINISTRATIVAS:
+        for variante in (nome, *aliases):
+            tabela[_normalizar_nome_regiao(variante)] = ra_id
+
+    for variante, canonico in MAPEAMENTO_REGIOES_ADMINISTRATIVAS.items():
+        ra_id = tabela.get(_normalizar_nome_regiao(canonico))
+        if ra_id is not None:
+            tabela.setdefault(_normalizar_nome_regiao(variante), ra_id)
+
+    return tabela
+
+
+_ALIASES = _tabela_aliases()
+_NOME_POR_ID = {ra_id: nome for ra_id, nome, _ in REGIOES_ADMINISTRATIVAS}
+
+
+@lru_cache(maxsize=1024)
+def resolver_ra(valor) -> Optional[int]:
+    """`ra_id` de um nome de RA (qualquer grafia/apelido conhecido) ou None."""
+    if valor is None or (isinstance(valor, float) and np.isnan(valor)):
+        return None
+    return _ALIASES.get(_normalizar_nome_regiao(str(valor)))
+
+
+def nome_canonico(valor) -> Optional[str]:
+    ra_id = resolver_ra(valor)
+    return _NOME_POR_ID.get(ra_id) if ra_id is not None else None
+
+
+def centroide_ra(valor) -> Optional[Tuple[float, float]]:
+    """Centróide (lat, lon) da RA, buscando por qualquer apelido em CENTROIDES_RA."""
+    ra_id = resolver_ra(valor)
+    if ra_id is None:
+        return None
+
+    for variante in (_NOME_POR_ID[ra_id], *REGIOES_ADMINISTRATIVAS[ra_id - 1][2]):
+        centroide = CENTROIDES_RA.get(_normalizar_nome_regiao(variante))
+        if centroide is not None:
+            return centroide
+
+    return None
+
+
+@lru_cache(maxsize=1)
+def dimensao_ra() -> pd.DataFrame:
+    """DataFrame da dimensão (uma linha por RA), no formato gravado no banco."""
+    registros = []
+    for ra_id, nome, aliases in REGIOES_ADMINISTRATIVAS:
+        lat, lon = centroide_ra(nome) or (np.nan, np.nan)
+        registros.append(
+            {
+                COLUNA_RA_ID: ra_id,
+                "nome": nome,
+                "aliases": "|".join(aliases),
+                "latitude": lat,
+                "longitude": lon,
+            }
+        )
+
+    df = pd.DataFrame(registros)
+    df[COLUNA_RA_ID] = df[COLUNA_RA_ID].astype("int16")
+    return df
+
+
+def codificar_ra(serie: pd.Series) -> pd.Series:
+    """
+    `ra_id` (Int16, nulo quando a RA não é reconhecida) para cada linha.
+
+    Resolve apenas os valores distintos e devolve pelos códigos do factorize.
+    """
+    codigos, unicos = pd.factorize(serie)
+    ids = [resolver_ra(valor) for valor in unicos]
+    valores = pd.array([*ids, None], dtype="Int16")[codigos]
+    return pd.Series(valores, index=serie.index, name=COLUNA_RA_ID)
+
+
+def alinhar_categorias_ra(dfs, coluna: str = COLUNA_RA) -> list:
+    """
+    Converte `coluna` de todos os DataFrames para o mesmo Categorical (RAs
+    canônicas + valores extras encontrados), sem alterar os nomes: o merge
+    entre eles passa a comparar códigos inteiros.
+    """
+    presentes = [df for df in dfs if coluna in df.columns]
+    valores = set()
+    for df in presentes:
+        valores.update(pd.unique(df[coluna].dropna().astype(object)))
+
+    extras = sorted(valores - set(NOMES_CANONICOS), key=str)
+    tipo = TIPO_RA if not extras else pd.CategoricalDtype([*NOMES_CANONICOS, *extras])
+
+    return [
+        df.assign(**{coluna: df[coluna].astype(object).astype(tipo)})
+        if coluna in df.columns
+        else df
+        for df in dfs
+    ]
+
+
+def categorizar_ra(
+    df: pd.DataFrame, coluna: str = COLUNA_RA, incluir_id: bool = True
+) -> pd.DataFrame:
+    """
+    Converte `coluna` para Categorical com as RAs canônicas e adiciona `ra_id`.
+
+    Nomes reconhecidos são trocados pelo canônico; valores fora da dimensão
+    (ex.: totalizadores como "DISTRITO FEDERAL") são preservados como
+    categorias extras, após as canônicas, e ficam com `ra_id` nulo.
+    """
+    if coluna not in df.columns:
+        return df
+
+    ids = codificar_ra(df[coluna])
+    nomes = ids.map(_NOME_POR_ID).astype(object)
+    nomes = nomes.where(ids.notna(), df[coluna].astype(object))
+
+    extras = sorted(set(nomes.dropna()) - set(NOMES_CANONICOS))
+    tipo = TIPO_RA if not extras else pd.CategoricalDtype([*NOMES_CANONICOS, *extras])
+
+    df = df.copy()
+    df[coluna] = pd.Categorical(nomes, dtype=tipo)
+
+    if incluir_id:
+        df = df.drop(columns=[COLUNA_RA_ID], errors="ignore")
+        df.insert(df.columns.get_loc(coluna) + 1, COLUNA_RA_ID, ids.to_numpy())
+
+    return df
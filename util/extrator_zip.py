@@ -1,5 +1,10 @@
+import hashlib
+import io
 import zipfile
 import os
+from dataclasses import dataclass, field
+from typing import Callable, Iterator, Optional
+from util.config_loader import get_config
 from util.log import logs
 
 logger = logs()
@@ -7,24 +12,98 @@ logger = logs()
 diretorio_zip = "./data/bronze/zip"
 diretorio_destino = "./data/bronze/planilha"
 
+# "disco": extrai os ZIPs para a pasta de planilhas (comportamento original);
+# "streaming": os leitores abrem os membros direto do ZIP, sem extrair.
+MODO_EXTRACAO = get_config().get("processamento", {}).get("extracao_zip", "disco")
+
 os.makedirs(diretorio_destino, exist_ok=True)
 logger.info(f"Diretório de destino garantido: {diretorio_destino}")
 
 
+@dataclass(frozen=True)
+class MembroZip:
+    """Arquivo lido de dentro de um ZIP, já validado e com hash do conteúdo."""
+
+    zip_path: str
+    nome: str
+    sha256: str
+    conteudo: bytes = field(repr=False)
+
+    def __str__(self) -> str:
+        return f"{self.zip_path}::{self.nome}"
+
+    @property
+    def nome_base(self) -> str:
+        return os.path.basename(self.nome)
+
+    def abrir(self) -> io.BytesIO:
+        """Buffer em memória aceito por pd.read_excel / pd.read_csv."""
+        return io.BytesIO(self.conteudo)
+
+
+def _validar_membro(zip_path, member: str, destino: str) -> str:
+    """Caminho final de `member` sob `destino`; rejeita entradas fora dele."""
+    raiz = os.path.abspath(destino)
+    destino_final = os.path.abspath(os.path.join(destino, member))
+
+    # 🛡️ Proteção contra Zip Slip
+    if not destino_final.startswith(raiz):
+        logger.error(
+            f"Tentativa de Zip Slip detectada no arquivo {zip_path} "
+            f"(entrada maliciosa: {member})"
+        )
+        raise Exception("Tentativa de Zip Slip detectada")
+
+    return destino_final
+
+
+def hash_membro(zip_ref: zipfile.ZipFile, member: str) -> str:
+    """SHA-256 do conteúdo descompactado de `member`, lido em blocos."""
+    sha = hashlib.sha256()
+
+    with zip_ref.open(member) as f:
+        for bloco in iter(lambda: f.read(1024 * 1024), b""):
+            sha.update(bloco)
+
+    return sha.hexdigest()
+
+
+def _hash_arquivo(caminho: str) -> str:
+    sha = hashlib.sha256()
+
+    with open(caminho, "rb") as f:
+        for bloco in iter(lambda: f.read(1024 * 1024), b""):
+            sha.update(bloco)
+
+    return sha.hexdigest()
+
+
+def _membro_inalterado(zip_ref, member: str, destino_final: str) -> bool:
+    """True quando o arquivo já extraído tem exatamente o conteúdo do membro."""
+    try:
+        info = zip_ref.getinfo(member)
+        if os.path.getsize(destino_final) != info.file_size:
+            return False
+        return _hash_arquivo(destino_final) == hash_membro(zip_ref, member)
+    except (KeyError, OSError):
+        return False
+
+
 def extrair_zip_seguro(zip_path: str, destino: str) -> None:
     logger.info(f"Iniciando extração segura do ZIP: {zip_path}")
 
     with zipfile.ZipFile(zip_path, "r") as zip_ref:
+        alterados = []
+
         for member in zip_ref.namelist():
-            destino_final = os.path.abspath(os.path.join(destino, member))
+            destino_final = _validar_membro(zip_path, member, destino)
 
-            # 🛡️ Proteção contra Zip Slip
-            if not destino_final.startswith(os.path.abspath(destino)):
-                logger.error(
-                    f"Tentativa de Zip Slip detectada no arquivo {zip_path} "
-                    f"(entrada maliciosa: {member})"
-                )
-                raise Exception("Tentativa de Zip Slip detectada")
+            # ⏭️ Mesmo conteúdo já extraído: não reescreve
+            if os.path.isfile(destino_final) and _membro_inalterado(
+                zip_ref, member, destino_final
+            ):
+                logger.info(f"Arquivo inalterado, extração ignorada: {destino_final}")
+                continue
 
             # 🧹 Remove arquivo existente antes de extrair
             if os.path.exists(destino_final):
@@ -38,11 +117,53 @@ def extrair_zip_seguro(zip_path: str, destino: str) -> None:
                     )
                     raise
 
-        zip_ref.extractall(destino)
+            alterados.append(member)
+
+        if alterados:
+            zip_ref.extractall(destino, members=alterados)
 
     logger.info(f"Extração concluída com sucesso: {zip_path}")
 
 
+def iterar_membros_zip(
+    zip_path: str,
+    filtro: Optional[Callable[[str], bool]] = None,
+) -> Iterator[MembroZip]:
+    """
+    Lê os membros de `zip_path` direto do ZIP aberto, um por vez, sem gravar
+    nada em disco.
+
+    Aplica a mesma proteção contra Zip Slip da extração. `filtro` recebe o
+    nome do membro (ex.: por extensão/padrão) e evita descompactar os demais.
+    """
+    with zipfile.ZipFile(zip_path, "r") as zip_ref:
+        for info in zip_ref.infolist():
+            if info.is_dir():
+                continue
+
+            _validar_membro(zip_path, info.filename, diretorio_destino)
+
+            if filtro is not None and not filtro(info.filename):
+                continue
+
+            conteudo = zip_ref.read(info)
+            sha256 = hashlib.sha256(conteudo).hexdigest()
+
+            yield MembroZip(str(zip_path), info.filename, sha256, conteudo)
+
+
+def listar_zips(diretorio: str = None) -> list[str]:
+    diretorio = diretorio or diretorio_zip
+
+    if not os.path.isdir(diretorio):
+        return []
+
+    with os.scandir(diretorio) as entradas:
+        return sorted(
+            e.path for e in entradas if e.is_file() and e.name.lower().endswith(".zip")
+        )
+
+
 def arquivos_zip_execucao() -> None:
     logger.info(f"Procurando arquivos ZIP em: {diretorio_zip}")
 
@@ -50,10 +171,7 @@ def arquivos_zip_execucao() -> None:
         logger.error(f"Diretório ZIP não encontrado: {diretorio_zip}")
         return
 
-    with os.scandir(diretorio_zip) as entradas:
-        arquivos_zip = [
-            e.path for e in entradas if e.is_file() and e.name.lower().endswith(".zip")
-        ]
+    arquivos_zip = listar_zips(diretorio_zip)
 
     if not arquivos_zip:
         logger.warning("Nenhum arquivo ZIP encontrado para extração.")
@@ -61,6 +179,10 @@ def arquivos_zip_execucao() -> None:
 
     logger.info(f"{len(arquivos_zip)} arquivo(s) ZIP encontrado(s).")
 
+    if MODO_EXTRACAO == "streaming":
+        logger.info("Modo streaming: planilhas serão lidas direto dos ZIPs.")
+        return
+
     for zip_file in arquivos_zip:
         logger.info(f"Iniciando processamento do arquivo ZIP: {zip_file}")
         extrair_zip_seguro(zip_file, diretorio_destino)
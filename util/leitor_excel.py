@@ -1,12 +1,38 @@
+import importlib.util
+import multiprocessing
 import os
 import re
 import pandas as pd
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, islice
 from pathlib import Path
-from typing import Iterable, Sequence
+from typing import Callable, Iterable, Iterator, Sequence
+from util import extrator_zip
+from util.cache_downloads import hash_arquivo
+from util.config_loader import get_config
+from util.extrator_zip import MembroZip, iterar_membros_zip, listar_zips
 from util.log import logs
 
 logger = logs()
 
+_config_processamento = get_config().get("processamento", {})
+
+# calamine (Rust) lê xls/xlsx bem mais rápido que openpyxl/xlrd; usado quando
+# o pacote python-calamine estiver instalado.
+MOTOR_EXCEL = "calamine" if importlib.util.find_spec("python_calamine") else None
+
+# Planilhas lidas em paralelo (processos); 1 = serial
+WORKERS_PLANILHAS = int(_config_processamento.get("workers_planilhas", os.cpu_count() or 1))
+# Planilhas submetidas ao pool por processo, à frente da que está sendo
+# consumida: limita quantos membros de ZIP ficam em memória ao mesmo tempo.
+EM_VOO_POR_WORKER = 2
+
+# Abas já lidas, por hash do arquivo: re-execuções sobre a mesma pasta bronze
+# não voltam a abrir o Excel.
+CACHE_PLANILHAS_ATIVO = bool(_config_processamento.get("cache_planilhas", True))
+DIRETORIO_CACHE_PLANILHAS = "./data/.cache/planilhas"
+
 def extrair_ano(nome_arquivo: str) -> int:
     """
     Extrai o ano do nome do arquivo.
@@ -108,29 +134,125 @@ def listar_arquivos_por_padrao(
 
     return sorted(arquivos)
 
+def listar_membros_por_padrao(
+    diretorio_zip: str,
+    padroes: Iterable[str],
+    extensoes: Sequence[str] = (".xls", ".xlsx"),
+) -> Iterator[MembroZip]:
+    """
+    Mesmo critério de `listar_arquivos_por_padrao`, aplicado aos membros dos
+    ZIPs de `diretorio_zip` (modo streaming). Os membros são lidos um a um,
+    direto do ZIP, sem extração em disco.
+    """
+    padroes = tuple(padroes)
+
+    def _filtro(nome_membro: str) -> bool:
+        nome = os.path.basename(nome_membro).lower()
+        return (
+            Path(nome).suffix in extensoes
+            and not nome.startswith("~$")
+            and any(p in nome for p in padroes)
+        )
+
+    for zip_path in listar_zips(diretorio_zip):
+        yield from iterar_membros_zip(zip_path, filtro=_filtro)
+
+PADROES_POPULACAO = ("pop", "populacao", "estimativa", "uf_")
+
+PADROES_CRIMES = (
+    "roubo",
+    "racismo",
+    "lesao",
+    "latro",
+    "injuria",
+    "homi",
+    "furto",
+    "feminicidio",
+    "crime",
+)
+
 def listar_arquivos_populacao(diretorio: str) -> list[str]:
-    padroes = ("pop", "populacao", "estimativa", "uf_")
-    return listar_arquivos_por_padrao(diretorio, padroes)
+    return listar_arquivos_por_padrao(diretorio, PADROES_POPULACAO)
 
 def listar_arquivos_crimes(diretorio: str) -> list[str]:
-    padroes = (
-        "roubo",
-        "racismo",
-        "lesao",
-        "latro",
-        "injuria",
-        "homi",
-        "furto",
-        "feminicidio",
-        "crime",
+    return listar_arquivos_por_padrao(diretorio, PADROES_CRIMES)
+
+def _nome_membro(membro: MembroZip) -> str:
+    """Nome do membro com o do ZIP, para o ano sair do ZIP quando faltar no membro."""
+    return f"{membro.nome_base} ({Path(membro.zip_path).stem})"
+
+def _hash_fonte(fonte) -> str | None:
+    if isinstance(fonte, MembroZip):
+        return fonte.sha256
+
+    try:
+        return hash_arquivo(fonte)
+    except (OSError, TypeError):
+        return None
+
+def ler_planilha_cache(fonte, tipo: str, leitor: Callable) -> pd.DataFrame:
+    """
+    `leitor(fonte)` com cache em disco por hash do conteúdo.
+
+    A chave é `<sha256>_<tipo>_<motor>`: o mesmo arquivo (solto ou dentro de
+    um ZIP) não é relido enquanto não mudar. Fontes sem hash (buffers,
+    arquivos inexistentes) são lidas direto.
+    """
+    chave = _hash_fonte(fonte) if CACHE_PLANILHAS_ATIVO else None
+    if chave is None:
+        return leitor(fonte)
+
+    caminho = Path(DIRETORIO_CACHE_PLANILHAS) / f"{chave}_{tipo}_{MOTOR_EXCEL or 'padrao'}.pkl"
+
+    if caminho.exists():
+        try:
+            df = pd.read_pickle(caminho)
+            logger.info("Planilha servida do cache: %s", fonte)
+            return df
+        except Exception:
+            logger.warning("Cache de planilha ilegível, relendo: %s", caminho)
+
+    df = leitor(fonte)
+
+    caminho.parent.mkdir(parents=True, exist_ok=True)
+    temporario = caminho.with_suffix(f".{os.getpid()}.tmp")
+    df.to_pickle(temporario)
+    os.replace(temporario, caminho)
+
+    return df
+
+def _abrir(fonte):
+    return fonte.abrir() if isinstance(fonte, MembroZip) else fonte
+
+def _ler_aba_populacao(fonte) -> pd.DataFrame:
+    return pd.read_excel(_abrir(fonte), header=2, engine=MOTOR_EXCEL)
+
+def _ler_aba_crimes(fonte) -> pd.DataFrame:
+    xls = pd.ExcelFile(_abrir(fonte), engine=MOTOR_EXCEL)
+
+    sheet_index = 1 if len(xls.sheet_names) > 1 else 0
+    header = 2 if sheet_index > 0 else 0
+
+    return pd.read_excel(
+        xls,
+        sheet_name=sheet_index,
+        header=header,
     )
-    return listar_arquivos_por_padrao(diretorio, padroes)
 
-def processar_arquivo(caminho: str) -> pd.DataFrame:
-    nome = os.path.basename(caminho)
+def processar_arquivo(caminho, nome: str | None = None) -> pd.DataFrame:
+    """
+    Extrai a população do DF de uma planilha do IBGE.
+
+    `caminho` pode ser um caminho ou um buffer (membro de ZIP); neste caso
+    `nome` identifica o arquivo para extrair o ano.
+    """
+    if isinstance(caminho, MembroZip):
+        nome = nome or _nome_membro(caminho)
+
+    nome = nome or os.path.basename(caminho)
     ano = extrair_ano(nome)
 
-    df = pd.read_excel(caminho, header=2)
+    df = ler_planilha_cache(caminho, "populacao", _ler_aba_populacao)
     df = normalizar_colunas(df)
     df = filtrar_distrito_federal(df)
 
@@ -149,55 +271,89 @@ def processar_arquivo(caminho: str) -> pd.DataFrame:
         }
     )
 
-def processar_dados_crimes(caminho: str) -> pd.DataFrame:
-    logger.info("Processando arquivo de crimes: %s", caminho)
-
-    try:
-        xls = pd.ExcelFile(caminho)
+def processar_dados_crimes(caminho, nome: str | None = None) -> pd.DataFrame:
+    if isinstance(caminho, MembroZip):
+        nome = nome or caminho.nome_base
 
-       
-        sheet_index = 1 if len(xls.sheet_names) > 1 else 0
-        header = 2 if sheet_index > 0 else 0
+    nome = nome or os.path.basename(caminho)
+    logger.info("Processando arquivo de crimes: %s", nome)
 
-        df = pd.read_excel(
-            xls,
-            sheet_name=sheet_index,
-            header=header,
-        )
+    try:
+        df = ler_planilha_cache(caminho, "crimes", _ler_aba_crimes)
 
         df = normalizar_colunas(df)
 
         if df.empty:
-            logger.warning("Arquivo de crimes sem dados válidos: %s", caminho)
+            logger.warning("Arquivo de crimes sem dados válidos: %s", nome)
             return pd.DataFrame()
 
-        df["arquivo"] = os.path.basename(caminho)
+        df["arquivo"] = nome
 
         logger.info(
             "Arquivo de crimes processado com sucesso: %s (%d registros)",
-            caminho,
+            nome,
             len(df),
         )
 
         return df
 
     except Exception as exc:
-        logger.exception("Erro ao processar arquivo de crimes: %s", caminho)
+        logger.exception("Erro ao processar arquivo de crimes: %s", nome)
         raise exc
 
-def consolidar_historico(lista_arquivos: list[str]) -> pd.DataFrame:
-    historico = []
+def _mapear_planilhas(
+    funcao: Callable, fontes: Iterable, max_workers: int | None = None
+) -> Iterator[tuple]:
+    """
+    Pares `(fonte, funcao(fonte))`, na ordem das fontes, em um pool de
+    processos quando houver mais de uma planilha e `max_workers` > 1.
 
-    for arquivo in lista_arquivos:
-        try:
-            logger.info(f"Processando: {arquivo}")
-            df = processar_arquivo(arquivo)
+    As fontes são consumidas à medida que o pool libera vaga (no máximo
+    `EM_VOO_POR_WORKER` por processo em andamento): membros de ZIP carregam o
+    conteúdo em memória e não são lidos todos de uma vez.
+    """
+    max_workers = WORKERS_PLANILHAS if max_workers is None else max_workers
+    fontes = iter(fontes)
+    iniciais = list(islice(fontes, max(max_workers, 1) * EM_VOO_POR_WORKER))
 
-            if not df.empty:
-                historico.append(df)
+    if max_workers <= 1 or len(iniciais) <= 1:
+        for fonte in chain(iniciais, fontes):
+            yield fonte, funcao(fonte)
+        return
+
+    logger.info("Lendo planilhas com %d processos", max_workers)
+    # spawn: o processo pai roda threads (executor, API) e um fork herdaria
+    # locks presos por elas
+    contexto = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=contexto) as executor:
+        pendentes = deque((fonte, executor.submit(funcao, fonte)) for fonte in iniciais)
+        while pendentes:
+            fonte, futuro = pendentes.popleft()
+            for proxima in islice(fontes, 1):
+                pendentes.append((proxima, executor.submit(funcao, proxima)))
+            yield fonte, futuro.result()
+
+def _processar_arquivo_seguro(arquivo):
+    """processar_arquivo que devolve o erro em vez de lançar (uso no pool)."""
+    try:
+        logger.info(f"Processando: {arquivo}")
+        return processar_arquivo(arquivo), None
+    except Exception as e:
+        return None, e
+
+def consolidar_historico(
+    lista_arquivos: Iterable, max_workers: int | None = None
+) -> pd.DataFrame:
+    """Consolida a população anual; aceita caminhos e membros de ZIP (`MembroZip`)."""
+    historico = []
 
-        except Exception as e:
-            logger.error(f"Erro ao processar {arquivo}: {e}", exc_info=True)
+    for arquivo, (df, erro) in _mapear_planilhas(
+        _processar_arquivo_seguro, lista_arquivos, max_workers
+    ):
+        if erro is not None:
+            logger.error(f"Erro ao processar {arquivo}: {erro}", exc_info=erro)
+        elif not df.empty:
+            historico.append(df)
 
     if not historico:
         return pd.DataFrame()
@@ -239,15 +395,32 @@ def salvar_historico_csv(
     
 def processar_populacao():
     arquivos = listar_arquivos_populacao("./data/bronze/planilha")
+
+    if extrator_zip.MODO_EXTRACAO == "streaming":
+        # planilhas soltas + as de dentro dos ZIPs do IBGE, sem extrair
+        arquivos = chain(
+            arquivos,
+            listar_membros_por_padrao(extrator_zip.diretorio_zip, PADROES_POPULACAO),
+        )
+
     df_historico = consolidar_historico(arquivos)
     salvar_historico_csv(df_historico, "./data/bronze/csv/populacao_df_historico.csv")
 
-def processar_crimes(caminho_planilhas: Path, caminho_saida: Path):
+def processar_crimes(
+    caminho_planilhas: Path, caminho_saida: Path, max_workers: int | None = None
+):
     arquivos = listar_arquivos_crimes(caminho_planilhas)
     arquivos = [a for a in arquivos if not Path(a).name.startswith("~$")]
-    
-    for arquivo in arquivos:
-        nome_csv = Path(arquivo).stem + ".csv"
-        df = processar_dados_crimes(arquivo)
+
+    if extrator_zip.MODO_EXTRACAO == "streaming":
+        arquivos = chain(
+            arquivos,
+            listar_membros_por_padrao(extrator_zip.diretorio_zip, PADROES_CRIMES),
+        )
+
+    # leitura em paralelo; gravação dos CSVs segue no processo principal
+    for arquivo, df in _mapear_planilhas(processar_dados_crimes, arquivos, max_workers):
+        nome = arquivo.nome_base if isinstance(arquivo, MembroZip) else arquivo
+        nome_csv = Path(nome).stem + ".csv"
         logger.info(f"Arquivos de crimes encontrados: {arquivo}")
         salvar_historico_csv(df, caminho_saida / nome_csv)   
\ No newline at end of file
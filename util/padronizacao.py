@@ -1,6 +1,8 @@
 from util.log import logs
+import numpy as np
 import pandas as pd
 import unicodedata
+from functools import lru_cache
 from itertools import combinations
 
 logger = logs()
@@ -161,7 +163,7 @@ def remover_acentos(texto):
             .decode("utf-8")
         )
 
-        logger.debug(f"Texto original: {texto} | Sem acento: {resultado}")
+        logger.debug("Texto original: %s | Sem acento: %s", texto, resultado)
         return resultado
 
     except Exception:
@@ -208,9 +210,32 @@ def normalizar_colunas(df):
         logger.exception("Erro ao normalizar nomes das colunas")
         raise
     
-def padronizar_regiao(df, coluna):
+@lru_cache(maxsize=4096)
+def _normalizar_nome_regiao(valor: str) -> str | None:
+    """strip + maiúsculas + sem acentos; "NAN" (vindo de conversão) vira nulo."""
+    resultado = (
+        unicodedata.normalize("NFKD", valor.strip().upper())
+        .encode("ASCII", "ignore")
+        .decode("utf-8")
+    )
+    return None if resultado == "NAN" else resultado
+
+
+def padronizar_regiao(df, coluna, mapeamento: dict | None = None):
+    """
+    Padroniza os nomes da coluna (sem espaços nas pontas, maiúsculas, sem
+    acentos).
+
+    A normalização roda só sobre os valores distintos (colunas de RA têm
+    poucas dezenas), com tabela memoizada entre chamadas, e o resultado é
+    devolvido às linhas pelos códigos do `pd.factorize`.
+
+    :param mapeamento: variantes de nome {valor: canônico} aplicadas na mesma
+        passada (ex.: `MAPEAMENTO_REGIOES_ADMINISTRATIVAS`); as chaves passam
+        pela mesma normalização.
+    """
     logger.info(f"Iniciando padronização da coluna: {coluna}")
-    logger.debug(f"Shape inicial: {df.shape}")
+    logger.debug("Shape inicial: %s", df.shape)
 
     try:
         if coluna not in df.columns:
@@ -219,24 +244,31 @@ def padronizar_regiao(df, coluna):
 
         nulos_antes = df[coluna].isna().sum()
 
-        # 🔥 EVITA SettingWithCopyWarning
-        df.loc[:, coluna] = (
-            df[coluna]
-            .astype("string")  # melhor que str (preserva NA)
-            .str.strip()
-            .str.upper()
-            .apply(remover_acentos)
-        )
+        codigos, unicos = pd.factorize(df[coluna].astype("string"))
+
+        tabela = [_normalizar_nome_regiao(valor) for valor in unicos]
+
+        if mapeamento:
+            mapa = {_normalizar_nome_regiao(k): v for k, v in mapeamento.items()}
+            afetados = int(np.isin(codigos, [i for i, v in enumerate(tabela) if v in mapa]).sum())
+            logger.info(
+                f"Aplicando mapeamento de RA na coluna '{coluna}': "
+                f"{afetados} registro(s) afetado(s) ({len(mapa)} regra(s) conhecidas)"
+            )
+            tabela = [mapa.get(v, v) for v in tabela]
+
+        # código -1 (nulo) cai no último elemento
+        valores = np.array([*tabela, None], dtype=object)[codigos]
 
-        # Corrige "NAN" gerado na conversão
-        df.loc[:, coluna] = df[coluna].replace("NAN", None)
+        # 🔥 EVITA SettingWithCopyWarning
+        df.loc[:, coluna] = pd.Series(valores, index=df.index, dtype="string")
 
         nulos_depois = df[coluna].isna().sum()
 
         logger.info(f"Padronização concluída para coluna: {coluna}")
-        logger.debug(f"Nulos antes: {nulos_antes} | Nulos depois: {nulos_depois}")
-        logger.debug(f"Valores únicos (amostra): {df[coluna].dropna().unique()[:10]}")
-        logger.debug(f"Shape final: {df.shape}")
+        logger.debug("Nulos antes: %s | Nulos depois: %s", nulos_antes, nulos_depois)
+        logger.debug("Valores únicos: %d", len(tabela))
+        logger.debug("Shape final: %s", df.shape)
 
         return df
 
@@ -11,8 +11,6 @@ Registro declarativo de schemas por camada.
 from functools import partial
 from pathlib import Path
 
-import pandas as pd
-
 from validation.schema import (
     DATA,
     NUMERICO,
@@ -23,6 +21,7 @@ from validation.schema import (
     validador_de_esquema,
     validar_schema,
 )
+from util.armazenamento import caminho_parquet, ler_dataset
 from util.log import logs
 
 logger = logs()
@@ -277,10 +276,10 @@ def validar_saida_silver(nome_step: str, resultado) -> None:
         return
 
     caminho = PASTA_SILVER_OUTPUT / caminho_csv
-    if not caminho.exists():
+    if not caminho.exists() and not caminho_parquet(caminho).exists():
         raise ErroSchema(f"[{esquema.nome}] arquivo de saída não encontrado: {caminho}")
 
-    df = pd.read_csv(caminho, sep=";")
+    df = ler_dataset(caminho)
     logger.info(
         "Relendo saída silver para schema check",
         extra={"step": nome_step, "arquivo": str(caminho)},
@@ -50,6 +50,9 @@ class EsquemaTabela:
 
 def _tipo_ok(serie: pd.Series, tipo: str) -> bool:
     if tipo == TEXTO:
+        if isinstance(serie.dtype, pd.CategoricalDtype):
+            # ex.: RA codificada pela dimensão (util/dimensao_ra.py)
+            serie = serie.cat.categories.to_series()
         return (
             pd.api.types.is_object_dtype(serie)
             or pd.api.types.is_string_dtype(serie)